@@ -8,6 +8,8 @@ Version: 2.0
 """
 
 import sys
+import asyncio
+import importlib
 import logging
 from pathlib import Path
 
@@ -15,194 +17,187 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+# Start the clock before the heavy imports
+from src.utils.startup import startup_timer
+from telegram import Update
 from telegram.ext import (
     Application,
     CommandHandler,
     CallbackQueryHandler,
+    TypeHandler,
 )
 from config.settings import config, setup_logging
 
-# Import handlers
-from src.handlers.basic_handlers import (
-    start_command,
-    help_command,
-    menu_command,
-    admin_info_command
-)
-from src.handlers.system_handlers import (
-    system_command,
-    cpu_command,
-    memory_command,
-    uptime_command,
-    processes_command,
-    users_command
-)
-from src.handlers.disk_handlers import (
-    disk_command,
-    partitions_command,
-    diskio_command
-)
-from src.handlers.network_handlers import (
-    network_command,
-    netstats_command,
-    connections_command,
-    publicip_command,
-    ping_command,
-    route_command,
-    dns_command
-)
-from src.handlers.service_handlers import (
-    services_command,
-    services_running_command,
-    services_failed_command,
-    service_status_command,
-    service_logs_command,
-    service_start_command,
-    service_stop_command,
-    service_restart_command
-)
-from src.handlers.device_handlers import (
-    device_command,
-    sensors_command,
-    battery_command
-)
-from src.handlers.chart_handlers import (
-    chart_cpu_command,
-    chart_memory_command,
-    chart_disk_command,
-    chart_network_command,
-    charts_menu_command
-)
-from src.handlers.alert_handlers import (
-    alerts_menu_command
-)
-from src.handlers.report_handlers import (
-    reports_menu_command
-)
-from src.handlers.process_handlers import (
-    processes_menu_command
-)
-from src.handlers.docker_handlers import (
-    docker_menu_command
-)
-from src.handlers.package_handlers import (
-    packages_menu_command
-)
-from src.handlers.firewall_handlers import (
-    firewall_menu_command
-)
-from src.handlers.scripts_handlers import (
-    scripts_menu_command
-)
-from src.handlers.logs_handlers import (
-    logs_menu_command
-)
-from src.handlers.service_manager_handlers import (
-    service_manager_menu_command
-)
-from src.handlers.network_tools_handlers import (
-    network_tools_menu_command
-)
 from src.handlers.callback_handler import button_handler
+from src.handlers.lazy import lazy_handler, warm_up
 from src.modules.scheduler import BackgroundScheduler
+from src.modules.metrics import metrics_collector, metrics_history
+from src.utils.executor import blocking_executor
 
 # Setup logging
 setup_logging()
 logger = logging.getLogger(__name__)
 
+startup_timer.mark('imports done')
 
-def register_handlers(application: Application):
-    """Register all command handlers"""
-    
+# command -> (handler module, handler function)
+# With LAZY_LOADING the modules are imported on first use / by the warm-up
+COMMANDS = [
     # Basic commands
-    application.add_handler(CommandHandler("start", start_command))
-    application.add_handler(CommandHandler("help", help_command))
-    application.add_handler(CommandHandler("menu", menu_command))
-    application.add_handler(CommandHandler("admininfo", admin_info_command))
-    
+    ('start', 'src.handlers.basic_handlers', 'start_command'),
+    ('help', 'src.handlers.basic_handlers', 'help_command'),
+    ('menu', 'src.handlers.basic_handlers', 'menu_command'),
+    ('admininfo', 'src.handlers.basic_handlers', 'admin_info_command'),
+
     # System commands
-    application.add_handler(CommandHandler("system", system_command))
-    application.add_handler(CommandHandler("cpu", cpu_command))
-    application.add_handler(CommandHandler("memory", memory_command))
-    application.add_handler(CommandHandler("uptime", uptime_command))
-    application.add_handler(CommandHandler("processes", processes_command))
-    application.add_handler(CommandHandler("users", users_command))
-    
+    ('system', 'src.handlers.system_handlers', 'system_command'),
+    ('cpu', 'src.handlers.system_handlers', 'cpu_command'),
+    ('memory', 'src.handlers.system_handlers', 'memory_command'),
+    ('uptime', 'src.handlers.system_handlers', 'uptime_command'),
+    ('processes', 'src.handlers.system_handlers', 'processes_command'),
+    ('users', 'src.handlers.system_handlers', 'users_command'),
+
     # Disk commands
-    application.add_handler(CommandHandler("disk", disk_command))
-    application.add_handler(CommandHandler("partitions", partitions_command))
-    application.add_handler(CommandHandler("diskio", diskio_command))
-    
+    ('disk', 'src.handlers.disk_handlers', 'disk_command'),
+    ('partitions', 'src.handlers.disk_handlers', 'partitions_command'),
+    ('diskio', 'src.handlers.disk_handlers', 'diskio_command'),
+
     # Network commands
-    application.add_handler(CommandHandler("network", network_command))
-    application.add_handler(CommandHandler("netstats", netstats_command))
-    application.add_handler(CommandHandler("connections", connections_command))
-    application.add_handler(CommandHandler("publicip", publicip_command))
-    application.add_handler(CommandHandler("ping", ping_command))
-    application.add_handler(CommandHandler("route", route_command))
-    application.add_handler(CommandHandler("dns", dns_command))
-    
+    ('network', 'src.handlers.network_handlers', 'network_command'),
+    ('netstats', 'src.handlers.network_handlers', 'netstats_command'),
+    ('connections', 'src.handlers.network_handlers', 'connections_command'),
+    ('publicip', 'src.handlers.network_handlers', 'publicip_command'),
+    ('ping', 'src.handlers.network_handlers', 'ping_command'),
+    ('route', 'src.handlers.network_handlers', 'route_command'),
+    ('dns', 'src.handlers.network_handlers', 'dns_command'),
+
     # Service commands
-    application.add_handler(CommandHandler("services", services_command))
-    application.add_handler(CommandHandler("services_running", services_running_command))
-    application.add_handler(CommandHandler("services_failed", services_failed_command))
-    application.add_handler(CommandHandler("service_status", service_status_command))
-    application.add_handler(CommandHandler("service_logs", service_logs_command))
-    application.add_handler(CommandHandler("service_start", service_start_command))
-    application.add_handler(CommandHandler("service_stop", service_stop_command))
-    application.add_handler(CommandHandler("service_restart", service_restart_command))
-    
+    ('services', 'src.handlers.service_handlers', 'services_command'),
+    ('services_running', 'src.handlers.service_handlers', 'services_running_command'),
+    ('services_failed', 'src.handlers.service_handlers', 'services_failed_command'),
+    ('service_status', 'src.handlers.service_handlers', 'service_status_command'),
+    ('service_logs', 'src.handlers.service_handlers', 'service_logs_command'),
+    ('service_start', 'src.handlers.service_handlers', 'service_start_command'),
+    ('service_stop', 'src.handlers.service_handlers', 'service_stop_command'),
+    ('service_restart', 'src.handlers.service_handlers', 'service_restart_command'),
+
     # Device commands
-    application.add_handler(CommandHandler("device", device_command))
-    application.add_handler(CommandHandler("sensors", sensors_command))
-    application.add_handler(CommandHandler("battery", battery_command))
-    
+    ('device', 'src.handlers.device_handlers', 'device_command'),
+    ('sensors', 'src.handlers.device_handlers', 'sensors_command'),
+    ('battery', 'src.handlers.device_handlers', 'battery_command'),
+
     # Chart commands
-    application.add_handler(CommandHandler("chart_cpu", chart_cpu_command))
-    application.add_handler(CommandHandler("chart_memory", chart_memory_command))
-    application.add_handler(CommandHandler("chart_disk", chart_disk_command))
-    application.add_handler(CommandHandler("chart_network", chart_network_command))
-    application.add_handler(CommandHandler("charts", charts_menu_command))
-    
-    # Alert commands
-    application.add_handler(CommandHandler("alerts", alerts_menu_command))
-    
-    # Report commands
-    application.add_handler(CommandHandler("reports", reports_menu_command))
-    
-    # Process commands
-    application.add_handler(CommandHandler("processes", processes_menu_command))
-    
-    # Docker commands
-    application.add_handler(CommandHandler("docker", docker_menu_command))
-    
-    # Package commands
-    application.add_handler(CommandHandler("packages", packages_menu_command))
-    
-    # Firewall commands
-    application.add_handler(CommandHandler("firewall", firewall_menu_command))
-    
-    # Scripts commands
-    application.add_handler(CommandHandler("scripts", scripts_menu_command))
-    
-    # Logs commands
-    application.add_handler(CommandHandler("logs", logs_menu_command))
-    
-    # Service Manager commands
-    application.add_handler(CommandHandler("servicemanager", service_manager_menu_command))
+    ('chart_cpu', 'src.handlers.chart_handlers', 'chart_cpu_command'),
+    ('chart_memory', 'src.handlers.chart_handlers', 'chart_memory_command'),
+    ('chart_disk', 'src.handlers.chart_handlers', 'chart_disk_command'),
+    ('chart_network', 'src.handlers.chart_handlers', 'chart_network_command'),
+    ('charts', 'src.handlers.chart_handlers', 'charts_menu_command'),
+
+    # Alert, report and process commands
+    ('alerts', 'src.handlers.alert_handlers', 'alerts_menu_command'),
+    ('reports', 'src.handlers.report_handlers', 'reports_menu_command'),
+    ('processes', 'src.handlers.process_handlers', 'processes_menu_command'),
+
+    # Management commands
+    ('docker', 'src.handlers.docker_handlers', 'docker_menu_command'),
+    ('packages', 'src.handlers.package_handlers', 'packages_menu_command'),
+    ('firewall', 'src.handlers.firewall_handlers', 'firewall_menu_command'),
+    ('scripts', 'src.handlers.scripts_handlers', 'scripts_menu_command'),
+    ('logs', 'src.handlers.logs_handlers', 'logs_menu_command'),
+    ('logsearch', 'src.handlers.logs_handlers', 'logs_search_command'),
+    ('servicemanager', 'src.handlers.service_manager_handlers', 'service_manager_menu_command'),
+    ('networktools', 'src.handlers.network_tools_handlers', 'network_tools_menu_command'),
+]
+
+# Imported in every chart worker process during warm-up
+CPU_MODULES = ['src.modules.charts.render']
+
+
+def register_handlers(application: Application):
+    """Register all command handlers"""
     
-    # Network Tools commands
-    application.add_handler(CommandHandler("networktools", network_tools_menu_command))
+    for command, module, function in COMMANDS:
+        if config.LAZY_LOADING:
+            handler = lazy_handler(module, function)
+        else:
+            handler = getattr(importlib.import_module(module), function)
+        application.add_handler(CommandHandler(command, handler))
     
     # Callback query handler (inline keyboards)
     application.add_handler(CallbackQueryHandler(button_handler))
     
-    logger.info("All handlers registered successfully")
+    # Startup timing: first update seen (group -1) and fully handled (group 1)
+    application.add_handler(TypeHandler(Update, first_update_received), group=-1)
+    application.add_handler(TypeHandler(Update, first_update_handled), group=1)
+    
+    logger.info(f"All handlers registered successfully ({'lazy' if config.LAZY_LOADING else 'eager'} loading)")
+
+
+async def first_update_received(update, context):
+    """Record when the first update arrived"""
+    startup_timer.mark('first update received')
+
+
+async def first_update_handled(update, context):
+    """Record when the first update was answered"""
+    if startup_timer.get('first update handled') is None:
+        startup_timer.mark('first update handled')
+        logger.info(f"Startup timing: {startup_timer.get_stats()}")
+
+
+async def on_startup(application: Application):
+    """Runs right before polling starts"""
+    startup_timer.mark('polling started')
+    if config.LAZY_LOADING and config.WARMUP_DELAY >= 0:
+        modules = list(dict.fromkeys(module for _, module, _ in COMMANDS))
+        application.create_task(warm_up(modules, CPU_MODULES, delay=config.WARMUP_DELAY))
+
+    if config.DOCKER_EVENTS:
+        from src.modules.docker import docker_events
+
+        async def notify_admins(text: str):
+            for user_id in config.ADMIN_USER_IDS:
+                try:
+                    await application.bot.send_message(chat_id=user_id, text=text, parse_mode='HTML')
+                except Exception as e:
+                    logger.error(f"Failed to send Docker notification to {user_id}: {e}")
+
+        docker_events.start(notify=notify_admins)
+
+    if config.LOG_INDEX:
+        # Before the follower starts, so the index sees its backlog
+        from src.modules.logs import log_index
+        log_index.start()
+    if config.JOURNAL_FOLLOW:
+        from src.modules.logs import journal_follower
+        journal_follower.start()
+
+
+async def on_stop(application: Application):
+    """Runs after polling has stopped"""
+    if config.DOCKER_EVENTS:
+        from src.modules.docker import docker_events
+        await docker_events.stop()
+    if config.JOURNAL_FOLLOW:
+        from src.modules.logs import journal_follower
+        await journal_follower.stop()
+    if config.LOG_INDEX:
+        from src.modules.logs import log_index
+        await log_index.stop()
+    from src.utils.follow import follow_hub
+    await follow_hub.stop()
 
 
 async def error_handler(update, context):
     """Log errors"""
     logger.error(f"Update {update} caused error {context.error}", exc_info=context.error)
+    
+    # Blocking call did not finish in time (e.g. hung NFS mount)
+    if isinstance(context.error, asyncio.TimeoutError) and getattr(update, 'effective_message', None):
+        try:
+            await update.effective_message.reply_text("⏱️ Operasi terlalu lama, coba lagi nanti.")
+        except Exception as e:
+            logger.error(f"Failed to send timeout notice: {e}")
 
 
 def main():
@@ -230,7 +225,15 @@ def main():
     
     try:
         # Create application
-        application = Application.builder().token(config.TOKEN).build()
+        application = (
+            Application.builder()
+            .token(config.TOKEN)
+            # Slow handlers (apt, traceroute, ...) must not hold up other chats
+            .concurrent_updates(config.CONCURRENT_UPDATES)
+            .post_init(on_startup)
+            .post_stop(on_stop)
+            .build()
+        )
         
         # Register all handlers
         register_handlers(application)
@@ -238,6 +241,12 @@ def main():
         # Add error handler
         application.add_error_handler(error_handler)
         
+        # Fork chart workers before any other thread exists
+        blocking_executor.start()
+        
+        # Start shared metrics collector
+        metrics_collector.start()
+        
         # Initialize and start background scheduler
         scheduler = BackgroundScheduler(application)
         scheduler.start(interval_minutes=5)  # Check every 5 minutes
@@ -249,14 +258,25 @@ def main():
         
         application.run_polling(allowed_updates=['message', 'callback_query'])
         
+        # run_polling returns normally on SIGINT/SIGTERM
+        metrics_collector.stop()
+        metrics_history.close()
+        blocking_executor.shutdown()
+        
     except KeyboardInterrupt:
         logger.info("Bot stopped by user")
         if 'scheduler' in locals():
             scheduler.stop()
+        metrics_collector.stop()
+        metrics_history.close()
+        blocking_executor.shutdown()
     except Exception as e:
         logger.error(f"Fatal error: {e}", exc_info=True)
         if 'scheduler' in locals():
             scheduler.stop()
+        metrics_collector.stop()
+        metrics_history.close()
+        blocking_executor.shutdown()
         sys.exit(1)
 
 
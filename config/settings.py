@@ -36,7 +36,60 @@ class BotConfig:
     # Features
     ENABLE_SERVICE_CONTROL: bool = os.getenv('ENABLE_SERVICE_CONTROL', 'true').lower() == 'true'
     MAX_MESSAGE_LENGTH: int = int(os.getenv('MAX_MESSAGE_LENGTH', '4000'))
-    
+
+    # Metrics collector
+    METRICS_INTERVAL: float = float(os.getenv('METRICS_INTERVAL', '5'))
+    METRICS_RETENTION: int = int(os.getenv('METRICS_RETENTION', '3600'))
+    METRICS_HISTORY_ENABLED: bool = os.getenv('METRICS_HISTORY_ENABLED', 'true').lower() == 'true'
+    METRICS_INTERFACES: str = os.getenv('METRICS_INTERFACES', '')
+
+    # Process table sampler
+    PROCESS_SAMPLE_INTERVAL: float = float(os.getenv('PROCESS_SAMPLE_INTERVAL', '0.5'))
+    PROCESS_TABLE_TTL: float = float(os.getenv('PROCESS_TABLE_TTL', '5'))
+
+    # Container stats from cgroup files
+    CONTAINER_SAMPLE_INTERVAL: float = float(os.getenv('CONTAINER_SAMPLE_INTERVAL', '0.5'))
+    CONTAINER_STATS_TTL: float = float(os.getenv('CONTAINER_STATS_TTL', '2'))
+
+    # Concurrency
+    CONCURRENT_UPDATES: int = int(os.getenv('CONCURRENT_UPDATES', '32'))
+    MAX_CONCURRENT_COMMANDS: int = int(os.getenv('MAX_CONCURRENT_COMMANDS', '8'))
+    EXECUTOR_THREADS: int = int(os.getenv('EXECUTOR_THREADS', '8'))
+    EXECUTOR_PROCESSES: int = int(os.getenv('EXECUTOR_PROCESSES', '2'))
+    EXECUTOR_PER_FUNCTION: int = int(os.getenv('EXECUTOR_PER_FUNCTION', '2'))
+    EXECUTOR_TIMEOUT: float = float(os.getenv('EXECUTOR_TIMEOUT', '30'))
+
+    # Paginated list snapshots (services, packages, processes)
+    SESSION_TTL: float = float(os.getenv('SESSION_TTL', '300'))
+    SESSION_MAX_SNAPSHOTS: int = int(os.getenv('SESSION_MAX_SNAPSHOTS', '128'))
+
+    # Seconds before installed tools (docker, ufw, apt, ...) are detected again
+    CAPABILITY_TTL: float = float(os.getenv('CAPABILITY_TTL', '300'))
+
+    # Docker Engine API socket ('' = always use the docker CLI)
+    DOCKER_SOCKET: str = os.getenv('DOCKER_SOCKET', '/var/run/docker.sock')
+    # Follow the daemon's event stream (container table + crash notifications)
+    DOCKER_EVENTS: bool = os.getenv('DOCKER_EVENTS', 'true').lower() == 'true'
+    # Containers started / stopped / removed at the same time by bulk actions
+    DOCKER_BULK_PARALLELISM: int = int(os.getenv('DOCKER_BULK_PARALLELISM', '4'))
+
+    # Follow the systemd journal for the log summary counters
+    JOURNAL_FOLLOW: bool = os.getenv('JOURNAL_FOLLOW', 'true').lower() == 'true'
+    # In-memory search index over the last hours of the journal (+ extra log files)
+    LOG_INDEX: bool = os.getenv('LOG_INDEX', 'true').lower() == 'true'
+    LOG_INDEX_HOURS: float = float(os.getenv('LOG_INDEX_HOURS', '6'))
+    LOG_INDEX_MAX_ENTRIES: int = int(os.getenv('LOG_INDEX_MAX_ENTRIES', '200000'))
+    LOG_INDEX_FILES: str = os.getenv('LOG_INDEX_FILES', '')
+
+    # Live follow mode (logs / containers): seconds between edits of a
+    # followed message, and seconds before following pauses by itself
+    FOLLOW_EDIT_INTERVAL: float = float(os.getenv('FOLLOW_EDIT_INTERVAL', '3'))
+    FOLLOW_TIMEOUT: float = float(os.getenv('FOLLOW_TIMEOUT', '600'))
+
+    # Startup
+    LAZY_LOADING: bool = os.getenv('LAZY_LOADING', 'true').lower() == 'true'
+    WARMUP_DELAY: float = float(os.getenv('WARMUP_DELAY', '3'))
+
     def __init__(self):
         """Initialize configuration"""
         self._load_admin_config()
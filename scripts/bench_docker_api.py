@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Docker Engine API socket vs docker CLI
+
+Compare the latency of the container list, inspect and stats calls made
+by DockerManager through the unix socket (docker_api, one kept-alive
+connection) against the docker CLI path (one process per call).
+
+Usage:
+    python scripts/bench_docker_api.py                     # first running container
+    python scripts/bench_docker_api.py --container web --repeat 10
+
+Needs a running daemon and permission to use its socket (docker group).
+Run from the project root with the bot's .env in place (config is loaded
+on import).
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.modules.docker import DockerManager
+from src.modules.docker.api import docker_api
+
+
+async def measure(call, repeat):
+    """Return (cold seconds, warm median seconds)"""
+    start = time.perf_counter()
+    await call()
+    cold = time.perf_counter() - start
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await call()
+        timings.append(time.perf_counter() - start)
+    return cold, statistics.median(timings)
+
+
+async def run(args):
+    api = DockerManager()
+    cli = DockerManager(use_api=False)
+
+    if not await api.check_available() or not api.api_active:
+        print(f"Docker API not reachable on {docker_api.socket_path}, nothing to compare")
+        return 1
+    if not await cli.check_available():
+        print("docker CLI not available, nothing to compare")
+        return 1
+
+    container = args.container
+    if not container:
+        running = await api.get_containers('running')
+        if not running:
+            print("No running container to inspect / sample")
+            return 1
+        container = running[0]['id']
+
+    calls = [
+        ('list', lambda manager: manager.get_containers('all')),
+        ('inspect', lambda manager: manager.get_container_details(container)),
+        ('stats', lambda manager: manager.get_container_stats(container)),
+    ]
+
+    results = []
+    for name, call in calls:
+        api_times = await measure(lambda: call(api), args.repeat)
+        cli_times = await measure(lambda: call(cli), args.repeat)
+        results.append((name, api_times, cli_times))
+
+    print(f"\ncontainer {container}, {args.repeat} warm calls each\n")
+    print(f"{'call':<10}{'api cold ms':>13}{'api warm ms':>13}{'cli cold ms':>13}{'cli warm ms':>13}{'speedup':>9}")
+    for name, (api_cold, api_warm), (cli_cold, cli_warm) in results:
+        print(f"{name:<10}{api_cold * 1000:>13.1f}{api_warm * 1000:>13.1f}"
+              f"{cli_cold * 1000:>13.1f}{cli_warm * 1000:>13.1f}{cli_warm / api_warm:>8.1f}x")
+
+    stats = docker_api.get_stats()
+    print(f"\nAPI: {stats['requests']} requests over {stats['connects']} connection(s)")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--container', help='container name or ID (default: first running)')
+    parser.add_argument('--repeat', type=int, default=5, help='warm calls per method')
+    args = parser.parse_args()
+    return asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
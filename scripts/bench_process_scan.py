@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark: psutil process_iter vs /proc reader
+
+Compare one full process-table scan done through psutil.process_iter
+(the path used by the old process views) against procfs.ProcfsReader.
+Reports wall time per scan and peak Python allocations (tracemalloc).
+
+Usage:
+    python scripts/bench_process_scan.py                 # current processes
+    python scripts/bench_process_scan.py --spawn 10000   # add 10k idle processes
+
+--spawn needs a ulimit -u / pid_max that allows that many processes.
+Run from the project root with the bot's .env in place (config is loaded
+on import).
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import psutil
+
+from src.modules.process import procfs
+
+LEGACY_ATTRS = ['pid', 'name', 'username', 'cpu_percent', 'memory_percent', 'status', 'create_time']
+
+
+def scan_psutil():
+    """One scan the way process views did it: Process objects + info dicts"""
+    rows = []
+    for proc in psutil.process_iter(LEGACY_ATTRS):
+        try:
+            rows.append(proc.info)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return len(rows)
+
+
+def make_scan_procfs():
+    reader = procfs.ProcfsReader()
+
+    def scan_procfs():
+        records = reader.scan()
+        # Resolve the same fields the psutil path returns
+        for record in records.values():
+            reader.username(record.uid)
+        return len(records)
+
+    return scan_procfs
+
+
+def measure(name, func, repeat):
+    """Return (count, cold seconds, warm median seconds, peak KiB)"""
+    start = time.perf_counter()
+    count = func()
+    cold = time.perf_counter() - start
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return count, cold, statistics.median(timings), peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--spawn', type=int, default=0, help='idle processes to start first')
+    parser.add_argument('--repeat', type=int, default=5, help='warm scans per method')
+    args = parser.parse_args()
+
+    if not procfs.is_available():
+        print("/proc not available, nothing to compare")
+        return 1
+
+    children = []
+    try:
+        if args.spawn:
+            print(f"Spawning {args.spawn} idle processes...")
+            for _ in range(args.spawn):
+                children.append(subprocess.Popen(['sleep', '3600']))
+
+        results = [
+            ('psutil.process_iter', measure('psutil', scan_psutil, args.repeat)),
+            ('procfs.ProcfsReader', measure('procfs', make_scan_procfs(), args.repeat)),
+        ]
+    finally:
+        for child in children:
+            child.kill()
+        for child in children:
+            child.wait()
+
+    print(f"\n{'method':<22}{'procs':>8}{'cold ms':>10}{'warm ms':>10}{'peak KiB':>11}")
+    for name, (count, cold, warm, peak) in results:
+        print(f"{name:<22}{count:>8}{cold * 1000:>10.1f}{warm * 1000:>10.1f}{peak:>11.0f}")
+
+    (_, (_, cold_a, warm_a, peak_a)), (_, (_, cold_b, warm_b, peak_b)) = results
+    print(f"\nprocfs speedup: cold {cold_a / cold_b:.1f}x, warm {warm_a / warm_b:.1f}x, "
+          f"peak allocations {peak_a / max(peak_b, 1):.1f}x lower")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
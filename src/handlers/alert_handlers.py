@@ -6,9 +6,11 @@ from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from telegram.constants import ParseMode
 from src.utils.decorators import require_admin
+from src.utils.executor import blocking_executor
 from src.modules.alerts import alert_manager
 from src.modules.alerts.thresholds import AlertThresholds
 from src.modules.alerts.checker import AlertChecker
+from src.handlers.router import callback_route
 
 # Initialize
 thresholds = AlertThresholds()
@@ -43,6 +45,7 @@ Manage system alerts and notifications
     )
 
 
+@callback_route('alert_settings', pass_query=True)
 async def show_alert_settings(query):
     """Show alert settings menu"""
     text = thresholds.format_thresholds_text()
@@ -56,6 +59,7 @@ async def show_alert_settings(query):
             InlineKeyboardButton("💾 Disk Settings", callback_data='alert_set_disk'),
             InlineKeyboardButton("💿 Swap Settings", callback_data='alert_set_swap')
         ],
+        [InlineKeyboardButton("🐢 Container Throttling", callback_data='alert_set_container_throttle')],
         [InlineKeyboardButton("◀️ Back", callback_data='menu_alerts')],
         [InlineKeyboardButton("🏠 Main Menu", callback_data='main_menu')]
     ]
@@ -68,6 +72,7 @@ async def show_alert_settings(query):
     )
 
 
+@callback_route('alert_set_{metric}', pass_query=True)
 async def show_alert_metric_settings(query, metric):
     """Show settings for specific metric"""
     config = thresholds.get_threshold(metric)
@@ -94,12 +99,11 @@ Configure alert settings:
     else:
         keyboard.append([InlineKeyboardButton("✅ Enable", callback_data=f'alert_enable_{metric}')])
     
-    # Threshold presets
+    # Threshold presets (throttling: % of CPU periods)
+    presets = [10, 25, 50, 75] if metric == 'container_throttle' else [70, 80, 90, 95]
     keyboard.append([
-        InlineKeyboardButton("70%", callback_data=f'alert_thresh_{metric}_70'),
-        InlineKeyboardButton("80%", callback_data=f'alert_thresh_{metric}_80'),
-        InlineKeyboardButton("90%", callback_data=f'alert_thresh_{metric}_90'),
-        InlineKeyboardButton("95%", callback_data=f'alert_thresh_{metric}_95')
+        InlineKeyboardButton(f"{value}%", callback_data=f'alert_thresh_{metric}_{value}')
+        for value in presets
     ])
     
     # Duration presets (for CPU/Memory)
@@ -122,6 +126,7 @@ Configure alert settings:
     )
 
 
+@callback_route('alert_active', pass_query=True)
 async def show_active_alerts(query):
     """Show active alerts"""
     text = alert_manager.format_active_alerts()
@@ -140,6 +145,7 @@ async def show_active_alerts(query):
     )
 
 
+@callback_route('alert_history', pass_query=True)
 async def show_alert_history(query):
     """Show alert history"""
     text = alert_manager.format_history(20)
@@ -161,11 +167,12 @@ async def show_alert_history(query):
     )
 
 
+@callback_route('alert_check', pass_query=True)
 async def check_alerts_now(query):
     """Check all alerts immediately"""
     await query.edit_message_text("🔍 Checking all metrics...")
     
-    alerts = checker.check_all()
+    alerts = await blocking_executor.run(checker.check_all)
     
     if alerts:
         text = f"*⚠️ ALERT CHECK RESULTS*\n\n"
@@ -189,6 +196,11 @@ async def check_alerts_now(query):
     )
 
 
+@callback_route('alert_enable_{metric}', pass_query=True, action='enable')
+@callback_route('alert_disable_{metric}', pass_query=True, action='disable')
+@callback_route('alert_thresh_{metric}_{value:word}', pass_query=True, action='threshold')
+@callback_route('alert_dur_{metric}_{value:word}', pass_query=True, action='duration')
+@callback_route('alert_clear_history', pass_query=True, action='clear_history')
 async def handle_alert_action(query, action, metric=None, value=None):
     """Handle alert configuration actions"""
     try:
@@ -5,6 +5,17 @@ from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from telegram.constants import ParseMode
 from src.utils.decorators import require_admin
+from src.utils.executor import blocking_executor
+from src.utils.runner import command_runner
+from src.utils.startup import startup_timer
+from src.utils.capabilities import capabilities
+from src.utils.cache import response_cache
+from src.utils.sessions import session_store
+from src.modules.docker.api import docker_api
+from src.modules.docker.events import docker_events
+from src.modules.logs.index import log_index
+from src.modules.logs.journal import journal_follower
+from src.utils.follow import follow_hub
 from config.settings import config
 import logging
 
@@ -137,6 +148,85 @@ Pilih kategori monitoring:
 @require_admin
 async def admin_info_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Tampilkan informasi admin configuration"""
+    # /admininfo refresh - deteksi ulang tools dan kosongkan cache data
+    if context.args and context.args[0] == 'refresh':
+        capabilities.refresh()
+        response_cache.invalidate()
+        docker_api.reset()
+    
     info = config.get_admin_info()
+    info += "\n" + format_runtime_stats()
     await update.message.reply_text(info, parse_mode=ParseMode.MARKDOWN)
 
+
+def format_runtime_stats() -> str:
+    """Load of command runner and executor pools, caches, tools, startup timings"""
+    commands = command_runner.get_stats()
+    text = "⚙️ *Runtime*\n\n"
+    text += (
+        f"*Commands:* {commands['running']}/{commands['limit']} running, {commands['waiting']} waiting, "
+        f"{commands['following']} following\n"
+    )
+    
+    for name, stats in blocking_executor.get_stats().items():
+        text += (
+            f"*{name.capitalize()}:* {stats['running']}/{stats['workers']} busy, "
+            f"{stats['queued']} queued, {stats['capped']} capped\n"
+            f"  wait avg {stats['avg_wait_ms']} ms, max {stats['max_wait_ms']} ms, "
+            f"{stats['timeouts']} timeout(s)\n"
+        )
+    
+    cache = response_cache.get_stats()
+    lookups = cache['hits'] + cache['shared'] + cache['misses']
+    hit_rate = (cache['hits'] + cache['shared']) / lookups * 100 if lookups else 0
+    text += (
+        f"*Cache:* {cache['entries']} entries, {cache['hits']} hits, {cache['shared']} shared, "
+        f"{cache['misses']} misses ({hit_rate:.0f}% hit rate)\n"
+    )
+    
+    sessions = session_store.get_stats()
+    text += (
+        f"*Sessions:* {sessions['snapshots']}/{sessions['limit']} snapshots, {sessions['hits']} page hits, "
+        f"{sessions['builds']} builds, {sessions['evictions']} evicted\n"
+    )
+    
+    docker = docker_api.get_stats()
+    if docker['requests'] or docker['failures']:
+        text += (
+            f"*Docker API:* {'socket' if docker['usable'] else 'CLI fallback'}, {docker['requests']} requests "
+            f"over {docker['connects']} connection(s), {docker['idle']} idle\n"
+        )
+    events = docker_events.get_stats()
+    if events['live'] or events['events']:
+        text += (
+            f"*Docker events:* {'live' if events['live'] else 'reconnecting'}, {events['containers']} containers, "
+            f"{events['events']} events, {events['notifications']} notification(s)\n"
+        )
+    journal = journal_follower.get_stats()
+    if journal['live'] or journal['entries']:
+        text += (
+            f"*Journal:* {'live' if journal['live'] else 'catching up'}, {journal['entries']} entries counted, "
+            f"{journal['restarts']} restart(s)\n"
+        )
+    index = log_index.get_stats()
+    if index['added']:
+        text += (
+            f"*Log index:* {index['entries']} entries, {index['tokens']} tokens, "
+            f"{index['searches']} search(es)\n"
+        )
+    follow = follow_hub.get_stats()
+    if follow['edits']:
+        text += (
+            f"*Follow:* {follow['readers']} reader(s), {follow['watches']} live message(s), "
+            f"{follow['edits']} edits\n"
+        )
+    
+    tools = capabilities.get_stats()
+    text += "*Tools:* " + " ".join(f"{name} {'✅' if ok else '❌'}" for name, ok in tools.items()) + "\n"
+    
+    marks = startup_timer.get_stats()
+    if marks:
+        text += "*Startup:* " + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in marks.items()) + "\n"
+    
+    return text
+
@@ -6,20 +6,18 @@ from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from telegram.constants import ParseMode
 from src.utils.decorators import require_admin
-from src.modules.charts import (
-    generate_cpu_chart, generate_memory_chart,
-    generate_disk_chart, generate_network_chart
-)
+from src.modules.charts import generate_chart
+from src.handlers.router import callback_route
 
 
 @require_admin
 async def chart_cpu_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Generate CPU usage chart"""
-    await update.message.reply_text("📊 Generating CPU chart... (this may take a moment)")
+    await update.message.reply_text("📊 Generating CPU chart...")
     
     try:
         # Generate chart
-        chart = generate_cpu_chart(duration_minutes=60)
+        chart = await generate_chart('cpu', duration_minutes=60)
         
         # Send chart
         await update.message.reply_photo(
@@ -38,7 +36,7 @@ async def chart_memory_command(update: Update, context: ContextTypes.DEFAULT_TYP
     
     try:
         # Generate chart
-        chart = generate_memory_chart()
+        chart = await generate_chart('memory')
         
         # Send chart
         await update.message.reply_photo(
@@ -57,7 +55,7 @@ async def chart_disk_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
     
     try:
         # Generate chart
-        chart = generate_disk_chart()
+        chart = await generate_chart('disk')
         
         # Send chart
         await update.message.reply_photo(
@@ -72,16 +70,16 @@ async def chart_disk_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
 @require_admin
 async def chart_network_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Generate network traffic chart"""
-    await update.message.reply_text("📊 Generating network chart... (monitoring for 60 seconds)")
+    await update.message.reply_text("📊 Generating network chart...")
     
     try:
-        # Generate chart (will take 60 seconds)
-        chart = generate_network_chart(duration_seconds=60)
+        # Generate chart
+        chart = await generate_chart('network', duration_minutes=60)
         
         # Send chart
         await update.message.reply_photo(
             photo=chart,
-            caption="🌐 *Network Traffic Chart - 60 Seconds*",
+            caption="🌐 *Network Traffic Chart - Last 60 Minutes*",
             parse_mode=ParseMode.MARKDOWN
         )
     except Exception as e:
@@ -116,6 +114,10 @@ Generate visual charts untuk monitoring:
     )
 
 
+@callback_route('chart_cpu', pass_query=True, chart_type='cpu')
+@callback_route('chart_memory', pass_query=True, chart_type='memory')
+@callback_route('chart_disk', pass_query=True, chart_type='disk')
+@callback_route('chart_network', pass_query=True, chart_type='network')
 async def handle_chart_callback(query, chart_type):
     """Handle chart generation from callback"""
     try:
@@ -123,18 +125,17 @@ async def handle_chart_callback(query, chart_type):
         
         # Generate chart based on type
         if chart_type == 'cpu':
-            chart = generate_cpu_chart(duration_minutes=60)
+            chart = await generate_chart('cpu', duration_minutes=60)
             caption = "📊 *CPU Usage Chart - Last 60 Minutes*"
         elif chart_type == 'memory':
-            chart = generate_memory_chart()
+            chart = await generate_chart('memory')
             caption = "🧠 *Memory Usage Chart*"
         elif chart_type == 'disk':
-            chart = generate_disk_chart()
+            chart = await generate_chart('disk')
             caption = "💾 *Disk Usage Chart*"
         elif chart_type == 'network':
-            await query.edit_message_text("📊 Generating network chart... (monitoring for 60 seconds)")
-            chart = generate_network_chart(duration_seconds=60)
-            caption = "🌐 *Network Traffic Chart - 60 Seconds*"
+            chart = await generate_chart('network', duration_minutes=60)
+            caption = "🌐 *Network Traffic Chart - Last 60 Minutes*"
         else:
             await query.edit_message_text("❌ Unknown chart type")
             return
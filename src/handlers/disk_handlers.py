@@ -4,6 +4,7 @@ Disk Handlers
 from telegram import Update
 from telegram.ext import ContextTypes
 from src.utils.decorators import require_admin
+from src.utils.cache import response_cache
 from src.utils.helpers import send_long_message
 from src.modules.disk import (
     get_disk_info,
@@ -15,19 +16,19 @@ from src.modules.disk import (
 @require_admin
 async def disk_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handler untuk /disk"""
-    info = get_disk_info()
+    info = await response_cache.run(get_disk_info)
     await send_long_message(update, info)
 
 
 @require_admin
 async def partitions_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handler untuk /partitions"""
-    info = get_partitions_info()
+    info = await response_cache.run(get_partitions_info)
     await send_long_message(update, info)
 
 
 @require_admin
 async def diskio_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handler untuk /diskio"""
-    info = get_disk_io_stats()
+    info = await response_cache.run(get_disk_io_stats)
     await send_long_message(update, info)
@@ -5,15 +5,21 @@ Handles Docker monitoring and management commands via inline keyboard.
 Full button-based interface - no typing required!
 """
 
+import asyncio
+import logging
+
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from telegram.constants import ParseMode
 
-from ..modules.docker.manager import DockerManager
+from ..modules.docker import docker_manager
+from src.handlers.router import callback_route
+from src.utils.follow import follow_hub
 
+logger = logging.getLogger(__name__)
 
-# Initialize Docker manager
-docker_manager = DockerManager()
+# Seconds between progress edits of a bulk action message (Telegram rate limits edits)
+PROGRESS_EDIT_INTERVAL = 2
 
 
 async def docker_menu_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -21,17 +27,18 @@ async def docker_menu_command(update: Update, context: ContextTypes.DEFAULT_TYPE
     await show_docker_menu(update, context)
 
 
+@callback_route('menu_docker')
 async def show_docker_menu(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Show main Docker menu with inline keyboard"""
     query = update.callback_query
     
-    if not docker_manager.docker_available:
+    if not await docker_manager.check_available():
         text = (
             "❌ <b>Docker Not Available</b>\n\n"
             "Docker is not installed or not running on this system.\n"
             "Please install Docker and ensure it's running."
         )
-        keyboard = [[InlineKeyboardButton("🏠 Main Menu", callback_data="menu_main")]]
+        keyboard = [[InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")]]
         
         if query:
             await query.answer()
@@ -60,6 +67,11 @@ async def show_docker_menu(update: Update, context: ContextTypes.DEFAULT_TYPE) -
             InlineKeyboardButton("🔴 Stopped", callback_data="docker_stopped")
         ],
         [InlineKeyboardButton("📋 All Containers", callback_data="docker_all")],
+        [
+            InlineKeyboardButton("📈 Top CPU", callback_data="docker_top_cpu"),
+            InlineKeyboardButton("🧠 Top Memory", callback_data="docker_top_memory")
+        ],
+        [InlineKeyboardButton("🐢 Throttled", callback_data="docker_top_throttled")],
         [
             InlineKeyboardButton("▶️ Start All", callback_data="docker_start_all"),
             InlineKeyboardButton("⏹️ Stop All", callback_data="docker_stop_all")
@@ -83,12 +95,15 @@ async def show_docker_menu(update: Update, context: ContextTypes.DEFAULT_TYPE) -
         )
 
 
+@callback_route('docker_all', status='all')
+@callback_route('docker_running', status='running')
+@callback_route('docker_stopped', status='stopped')
 async def show_containers(update: Update, context: ContextTypes.DEFAULT_TYPE, status: str = 'all') -> None:
     """Show list of containers"""
     query = update.callback_query
     await query.answer()
     
-    containers = docker_manager.get_containers(status)
+    containers = await docker_manager.get_containers(status)
     
     if not containers:
         status_text = {
@@ -128,12 +143,44 @@ async def show_containers(update: Update, context: ContextTypes.DEFAULT_TYPE, st
     )
 
 
+@callback_route('docker_top_{sort_by:word}')
+async def show_top_containers(update: Update, context: ContextTypes.DEFAULT_TYPE, sort_by: str) -> None:
+    """Show running containers ranked by CPU, memory or throttling"""
+    query = update.callback_query
+    await query.answer()
+    
+    table = await docker_manager.get_stats_table()
+    
+    if table is None:
+        text = "❌ Container cgroups are not readable from here."
+    elif not len(table):
+        text = "🐳 <b>Docker Containers</b>\n\nNo running containers found."
+    else:
+        text = docker_manager.format_top_containers(table, sort_by)
+    
+    keyboard = []
+    if table:
+        for usage in table.top(sort_by, 10):
+            keyboard.append([
+                InlineKeyboardButton(usage.name, callback_data=f"docker_detail_{usage.id}")
+            ])
+    keyboard.append([InlineKeyboardButton("🔄 Refresh", callback_data=f"docker_top_{sort_by}")])
+    keyboard.append([InlineKeyboardButton("🔙 Back", callback_data="menu_docker")])
+    
+    await query.edit_message_text(
+        text=text,
+        reply_markup=InlineKeyboardMarkup(keyboard),
+        parse_mode=ParseMode.HTML
+    )
+
+
+@callback_route('docker_detail_{container_id}')
 async def show_container_detail(update: Update, context: ContextTypes.DEFAULT_TYPE, container_id: str) -> None:
     """Show detailed information about a container"""
     query = update.callback_query
     await query.answer()
     
-    details = docker_manager.get_container_details(container_id)
+    details = await docker_manager.get_container_details(container_id)
     
     if not details:
         text = "❌ Container not found or error retrieving details."
@@ -177,12 +224,13 @@ async def show_container_detail(update: Update, context: ContextTypes.DEFAULT_TY
     )
 
 
+@callback_route('docker_stats_{container_id}')
 async def show_container_stats(update: Update, context: ContextTypes.DEFAULT_TYPE, container_id: str) -> None:
     """Show container statistics"""
     query = update.callback_query
     await query.answer()
     
-    details = docker_manager.get_container_details(container_id)
+    details = await docker_manager.get_container_details(container_id)
     if not details:
         text = "❌ Container not found."
         keyboard = [[InlineKeyboardButton("🔙 Back", callback_data="menu_docker")]]
@@ -193,7 +241,7 @@ async def show_container_stats(update: Update, context: ContextTypes.DEFAULT_TYP
         )
         return
     
-    stats = docker_manager.get_container_stats(container_id)
+    stats = await docker_manager.get_container_stats(container_id)
     
     if not stats:
         text = f"❌ Unable to retrieve stats for {details['name']}."
@@ -220,12 +268,13 @@ async def show_container_stats(update: Update, context: ContextTypes.DEFAULT_TYP
     )
 
 
+@callback_route('docker_logs_{container_id}')
 async def show_container_logs(update: Update, context: ContextTypes.DEFAULT_TYPE, container_id: str) -> None:
     """Show container logs"""
     query = update.callback_query
     await query.answer()
     
-    details = docker_manager.get_container_details(container_id)
+    details = await docker_manager.get_container_details(container_id)
     if not details:
         text = "❌ Container not found."
         keyboard = [[InlineKeyboardButton("🔙 Back", callback_data="menu_docker")]]
@@ -236,7 +285,7 @@ async def show_container_logs(update: Update, context: ContextTypes.DEFAULT_TYPE
         )
         return
     
-    logs = docker_manager.get_container_logs(container_id, lines=30)
+    logs = await docker_manager.get_container_logs(container_id, lines=30)
     
     text = (
         f"📜 <b>Logs: {details['name']}</b>\n"
@@ -245,7 +294,10 @@ async def show_container_logs(update: Update, context: ContextTypes.DEFAULT_TYPE
     )
     
     keyboard = [
-        [InlineKeyboardButton("🔄 Refresh", callback_data=f"docker_logs_{container_id}")],
+        [
+            InlineKeyboardButton("🔄 Refresh", callback_data=f"docker_logs_{container_id}"),
+            InlineKeyboardButton("📡 Follow", callback_data=f"docker_follow_{container_id}")
+        ],
         [InlineKeyboardButton("🔙 Back", callback_data=f"docker_detail_{container_id}")]
     ]
     
@@ -256,6 +308,34 @@ async def show_container_logs(update: Update, context: ContextTypes.DEFAULT_TYPE
     )
 
 
+@callback_route('docker_follow_{container_id}')
+async def follow_container_logs(update: Update, context: ContextTypes.DEFAULT_TYPE, container_id: str) -> None:
+    """Show new container log lines live in this message"""
+    query = update.callback_query
+    await query.answer("Following...")
+    
+    details = await docker_manager.get_container_details(container_id)
+    if not details:
+        keyboard = [[InlineKeyboardButton("🔙 Back", callback_data="menu_docker")]]
+        await query.edit_message_text(
+            text="❌ Container not found.",
+            reply_markup=InlineKeyboardMarkup(keyboard),
+            parse_mode=ParseMode.HTML
+        )
+        return
+    
+    await follow_hub.watch(
+        context.bot, query.message.chat.id, query.message.message_id,
+        f"docker:{container_id}", f"📡 <b>Logs: {details['name']}</b>",
+        lambda: docker_manager.follow_container_logs(container_id),
+        f"docker_follow_{container_id}", f"docker_logs_{container_id}"
+    )
+
+
+@callback_route('docker_start_{container_id}', action='start')
+@callback_route('docker_stop_{container_id}', action='stop')
+@callback_route('docker_restart_{container_id}', action='restart')
+@callback_route('docker_remove_{container_id}', action='remove')
 async def handle_container_action(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE,
@@ -267,23 +347,23 @@ async def handle_container_action(
     await query.answer()
     
     # Get container name for better feedback
-    details = docker_manager.get_container_details(container_id)
+    details = await docker_manager.get_container_details(container_id)
     container_name = details['name'] if details else container_id
     
     success = False
     action_text = ""
     
     if action == 'start':
-        success = docker_manager.start_container(container_id)
+        success = await docker_manager.start_container(container_id)
         action_text = "started"
     elif action == 'stop':
-        success = docker_manager.stop_container(container_id)
+        success = await docker_manager.stop_container(container_id)
         action_text = "stopped"
     elif action == 'restart':
-        success = docker_manager.restart_container(container_id)
+        success = await docker_manager.restart_container(container_id)
         action_text = "restarted"
     elif action == 'remove':
-        success = docker_manager.remove_container(container_id)
+        success = await docker_manager.remove_container(container_id)
         action_text = "removed"
     
     if success:
@@ -304,28 +384,46 @@ async def handle_container_action(
     )
 
 
+@callback_route('docker_start_all', action='start_all')
+@callback_route('docker_stop_all', action='stop_all')
+@callback_route('docker_remove_stopped', action='remove_stopped')
 async def handle_bulk_action(update: Update, context: ContextTypes.DEFAULT_TYPE, action: str) -> None:
-    """Handle bulk actions (start all, stop all, remove stopped)"""
+    """Handle bulk actions (start all, stop all, remove stopped) with live progress"""
     query = update.callback_query
     await query.answer()
     
-    count = 0
-    action_text = ""
-    
-    if action == 'start_all':
-        count = docker_manager.start_all_containers()
-        action_text = "started"
-    elif action == 'stop_all':
-        count = docker_manager.stop_all_containers()
-        action_text = "stopped"
-    elif action == 'remove_stopped':
-        count = docker_manager.remove_stopped_containers()
-        action_text = "removed"
-    
-    if count > 0:
-        text = f"✅ Successfully {action_text} {count} container(s)!"
-    else:
+    runs = {
+        'start_all': docker_manager.start_all_containers,
+        'stop_all': docker_manager.stop_all_containers,
+        'remove_stopped': docker_manager.remove_stopped_containers,
+    }
+    # This request's own operation, once the container list is read
+    started = []
+    task = asyncio.create_task(runs[action](on_start=started.append))
+    
+    # Edit the message with the outcomes so far until the operation ends
+    shown = None
+    while not task.done():
+        # First update soon, so the action is acknowledged quickly
+        await asyncio.wait({task}, timeout=PROGRESS_EDIT_INTERVAL if shown else 0.5)
+        running = started[0] if started else None
+        if task.done() or running is None or running.done:
+            continue
+        text = docker_manager.format_bulk_operation(running)
+        if text != shown:
+            try:
+                await query.edit_message_text(text=text, parse_mode=ParseMode.HTML)
+                shown = text
+            except Exception as e:
+                logger.debug(f"Bulk progress edit failed: {e}")
+    
+    operation = task.result()
+    if operation is None:
+        text = "⏳ Another bulk action is still running, try again when it finishes."
+    elif not operation.outcomes:
         text = f"ℹ️ No containers to {action.replace('_', ' ')}."
+    else:
+        text = docker_manager.format_bulk_operation(operation)
     
     keyboard = [[InlineKeyboardButton("🔙 Back", callback_data="menu_docker")]]
     
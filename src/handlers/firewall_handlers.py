@@ -5,15 +5,14 @@ Handles UFW firewall management via inline keyboard.
 Full button-based interface - no typing required!
 """
 
+from typing import Optional
+
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from telegram.constants import ParseMode
 
-from ..modules.firewall.manager import FirewallManager
-
-
-# Initialize firewall manager
-firewall_manager = FirewallManager()
+from ..modules.firewall import firewall_manager
+from src.handlers.router import callback_route
 
 
 async def firewall_menu_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -21,6 +20,7 @@ async def firewall_menu_command(update: Update, context: ContextTypes.DEFAULT_TY
     await show_firewall_menu(update, context)
 
 
+@callback_route('menu_firewall')
 async def show_firewall_menu(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Show main Firewall management menu with inline keyboard"""
     query = update.callback_query
@@ -49,7 +49,7 @@ async def show_firewall_menu(update: Update, context: ContextTypes.DEFAULT_TYPE)
         return
     
     # Get firewall status
-    status = firewall_manager.get_status()
+    status = await firewall_manager.get_status()
     text = firewall_manager.format_status(status)
     
     enabled = status.get('enabled', False)
@@ -89,12 +89,13 @@ async def show_firewall_menu(update: Update, context: ContextTypes.DEFAULT_TYPE)
         )
 
 
+@callback_route('fw_rules')
 async def show_firewall_rules(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Show list of firewall rules"""
     query = update.callback_query
     await query.answer("Loading rules...")
     
-    rules = firewall_manager.get_rules()
+    rules = await firewall_manager.get_rules()
     text = firewall_manager.format_rules(rules)
     
     keyboard = []
@@ -121,6 +122,7 @@ async def show_firewall_rules(update: Update, context: ContextTypes.DEFAULT_TYPE
     )
 
 
+@callback_route('fw_add_menu')
 async def show_add_rule_menu(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Show menu for adding firewall rules"""
     query = update.callback_query
@@ -175,6 +177,7 @@ async def show_add_rule_menu(update: Update, context: ContextTypes.DEFAULT_TYPE)
     )
 
 
+@callback_route('fw_add_db_menu')
 async def show_database_services(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Show database services for firewall rules"""
     query = update.callback_query
@@ -197,6 +200,7 @@ async def show_database_services(update: Update, context: ContextTypes.DEFAULT_T
     )
 
 
+@callback_route('fw_add_other_menu')
 async def show_other_services(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Show other services for firewall rules"""
     query = update.callback_query
@@ -219,12 +223,13 @@ async def show_other_services(update: Update, context: ContextTypes.DEFAULT_TYPE
     )
 
 
+@callback_route('fw_policies')
 async def show_default_policies(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Show default policies menu"""
     query = update.callback_query
     await query.answer()
     
-    status = firewall_manager.get_status()
+    status = await firewall_manager.get_status()
     
     text = (
         "⚙️ <b>Default Policies</b>\n\n"
@@ -247,6 +252,8 @@ async def show_default_policies(update: Update, context: ContextTypes.DEFAULT_TY
     )
 
 
+@callback_route('fw_policy_incoming', direction='incoming')
+@callback_route('fw_policy_outgoing', direction='outgoing')
 async def show_policy_options(update: Update, context: ContextTypes.DEFAULT_TYPE, direction: str) -> None:
     """Show policy options for a direction"""
     query = update.callback_query
@@ -271,6 +278,12 @@ async def show_policy_options(update: Update, context: ContextTypes.DEFAULT_TYPE
     )
 
 
+@callback_route('fw_add_{value}', action='add_rule')
+@callback_route('fw_enable', action='enable')
+@callback_route('fw_disable', action='disable')
+@callback_route('fw_reset', action='reset')
+@callback_route('fw_delete_{value:word}', action='delete_rule')
+@callback_route('fw_setpolicy_{value}', action='set_policy')
 async def handle_firewall_action(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE,
@@ -286,15 +299,15 @@ async def handle_firewall_action(
     
     if action == 'enable':
         await query.edit_message_text("🟢 Enabling firewall...", parse_mode=ParseMode.HTML)
-        success, message = firewall_manager.enable()
+        success, message = await firewall_manager.enable()
     
     elif action == 'disable':
         await query.edit_message_text("🔴 Disabling firewall...", parse_mode=ParseMode.HTML)
-        success, message = firewall_manager.disable()
+        success, message = await firewall_manager.disable()
     
     elif action == 'reset':
         await query.edit_message_text("🔄 Resetting firewall...", parse_mode=ParseMode.HTML)
-        success, message = firewall_manager.reset()
+        success, message = await firewall_manager.reset()
     
     elif action == 'add_rule' and value:
         services = firewall_manager.get_preset_services()
@@ -304,14 +317,14 @@ async def handle_firewall_action(
                 f"➕ Adding rule for {service['name']}...",
                 parse_mode=ParseMode.HTML
             )
-            success, message = firewall_manager.add_rule(
+            success, message = await firewall_manager.add_rule(
                 service['port'],
                 service['protocol']
             )
     
     elif action == 'delete_rule' and value:
         await query.edit_message_text(f"🗑️ Deleting rule #{value}...", parse_mode=ParseMode.HTML)
-        success, message = firewall_manager.delete_rule(value)
+        success, message = await firewall_manager.delete_rule(value)
     
     elif action == 'set_policy' and value:
         parts = value.split('_')
@@ -321,7 +334,7 @@ async def handle_firewall_action(
                 f"⚙️ Setting {direction} policy to {policy}...",
                 parse_mode=ParseMode.HTML
             )
-            success, message = firewall_manager.set_default_policy(direction, policy)
+            success, message = await firewall_manager.set_default_policy(direction, policy)
     
     # Show result
     icon = "✅" if success else "❌"
@@ -336,6 +349,9 @@ async def handle_firewall_action(
     )
 
 
+@callback_route('fw_disable_confirm', action='disable')
+@callback_route('fw_reset_confirm', action='reset')
+@callback_route('fw_delete_{value:word}_confirm', action='delete_rule')
 async def confirm_firewall_action(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE,
@@ -365,7 +381,7 @@ async def confirm_firewall_action(
         confirm_callback = "fw_reset"
     
     elif action == 'delete_rule' and value:
-        rules = firewall_manager.get_rules()
+        rules = await firewall_manager.get_rules()
         rule = next((r for r in rules if r['number'] == value), None)
         rule_info = f"{rule['port_proto']} - {rule['action']}" if rule else f"Rule #{value}"
         
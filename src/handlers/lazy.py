@@ -0,0 +1,97 @@
+"""
+Lazy Handlers
+Register command handlers without importing their modules at startup
+"""
+import asyncio
+import importlib
+import logging
+import sys
+import time
+from typing import Callable, Iterable, Set
+
+from src.utils.capabilities import capabilities
+from src.utils.executor import blocking_executor
+from src.utils.startup import startup_timer
+
+logger = logging.getLogger(__name__)
+
+# Modules fully imported through load_module()
+_ready: Set[str] = set()
+
+
+def _import(module: str) -> float:
+    """Import module (worker side); returns seconds spent"""
+    start = time.monotonic()
+    importlib.import_module(module)
+    return time.monotonic() - start
+
+
+async def load_module(module: str):
+    """
+    Import a module without blocking the event loop
+
+    The import runs in the thread pool (matplotlib alone takes ~0.3s);
+    Python's import lock makes concurrent loads of the same module safe.
+    """
+    if module not in _ready:
+        duration = await blocking_executor.run(_import, module)
+        if module not in _ready:
+            _ready.add(module)
+            logger.info(f"Loaded {module} in {duration:.2f}s")
+    return sys.modules[module]
+
+
+def lazy_handler(module: str, function: str) -> Callable:
+    """
+    Light stub for a handler that lives in `module`
+
+    The module is imported on the first call (or earlier by warm_up()),
+    after that the stub only does a dict lookup.
+    """
+    async def handler(update, context):
+        target = getattr(await load_module(module), function)
+        return await target(update, context)
+
+    handler.__name__ = function
+    handler.__qualname__ = f"{module}.{function}"
+    return handler
+
+
+async def warm_up(modules: Iterable[str], cpu_modules: Iterable[str] = (), delay: float = 0):
+    """
+    Import modules in the background after polling has started
+
+    Args:
+        modules: Imported one by one in the thread pool
+        cpu_modules: Also imported in every process pool worker
+            (chart renderer), so the first chart does not pay for it
+        delay: Seconds to wait first, so the first updates are served
+            before the warm-up competes for the pools
+    """
+    await asyncio.sleep(delay)
+    start = time.monotonic()
+
+    for module in list(modules) + list(cpu_modules):
+        try:
+            await load_module(module)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Warm-up failed for {module}: {e}")
+
+    # Fill the capability cache (PATH lookups) before the first tap needs it
+    await blocking_executor.run(capabilities.get_stats)
+
+    for module in cpu_modules:
+        try:
+            await asyncio.gather(*(
+                blocking_executor.run_cpu(_import, module)
+                for _ in range(blocking_executor.max_processes)
+            ))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Warm-up failed for {module} in worker processes: {e}")
+
+    logger.info(f"Warm-up finished in {time.monotonic() - start:.2f}s")
+    startup_timer.mark('warm-up done')
@@ -5,22 +5,30 @@ Provides inline keyboard handlers for logs viewing.
 Full button interface - no typing required!
 """
 
+import html
+
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from telegram.constants import ParseMode
-from src.modules.logs import LogsManager
+from src.modules.logs import logs_manager
+from src.modules.logs.pager import journal_pager
+from src.handlers.router import callback_route
+from src.utils.decorators import require_admin
+from src.utils.follow import follow_hub
+from src.utils.runner import command_runner
 
 
+@callback_route('menu_logs')
+@callback_route('logs_menu')
 async def show_logs_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show main logs menu"""
     query = update.callback_query
     if query:
         await query.answer()
     
-    logs_manager = LogsManager()
     
     # Get log summary
-    summary = logs_manager.get_log_summary()
+    summary = await logs_manager.get_log_summary()
     
     text = (
         "📊 <b>System Logs Viewer</b>\n\n"
@@ -38,7 +46,8 @@ async def show_logs_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
             InlineKeyboardButton("📋 Syslog", callback_data="logs_type_syslog")
         ],
         [
-            InlineKeyboardButton("📱 Application Logs", callback_data="logs_apps")
+            InlineKeyboardButton("📱 Application Logs", callback_data="logs_apps"),
+            InlineKeyboardButton("🧩 Log Patterns", callback_data="logs_patterns")
         ],
         [
             InlineKeyboardButton("🔄 Refresh", callback_data="logs_menu"),
@@ -53,12 +62,12 @@ async def show_logs_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
 
+@callback_route('logs_type_{log_type}')
 async def show_log_type(update: Update, context: ContextTypes.DEFAULT_TYPE, log_type: str):
     """Show logs for a specific type"""
     query = update.callback_query
     await query.answer()
     
-    logs_manager = LogsManager()
     
     # Show time range options first
     context.user_data['current_log_type'] = log_type
@@ -92,12 +101,63 @@ async def show_log_type(update: Update, context: ContextTypes.DEFAULT_TYPE, log_
     await query.edit_message_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
 
+@callback_route('logs_patterns')
+async def show_pattern_sources(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Choose the log to summarise into templates"""
+    query = update.callback_query
+    await query.answer()
+    
+    text = (
+        "🧩 <b>Log Patterns</b>\n\n"
+        f"Ringkas {logs_manager.PATTERN_LINES:,} baris terakhir menjadi pola (template) "
+        "yang paling sering muncul.\n\n"
+        "Pilih sumber logs:"
+    )
+    
+    keyboard = []
+    for log_type, log_info in logs_manager.get_log_types().items():
+        keyboard.append([
+            InlineKeyboardButton(log_info['name'], callback_data=f"logs_patterns_{log_type}")
+        ])
+    keyboard.append([
+        InlineKeyboardButton("◀️ Back", callback_data="logs_menu")
+    ])
+    
+    reply_markup = InlineKeyboardMarkup(keyboard)
+    await query.edit_message_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
+
+
+@callback_route('logs_patterns_{log_type}')
+async def view_log_patterns(update: Update, context: ContextTypes.DEFAULT_TYPE, log_type: str):
+    """Most frequent templates of the last lines of a log"""
+    query = update.callback_query
+    await query.answer("Analysing logs...")
+    
+    log_name = logs_manager.LOG_TYPES.get(log_type, {}).get('name', log_type)
+    summary = await logs_manager.summarise_logs(log_type)
+    
+    text = (
+        f"🧩 <b>{log_name} Patterns</b>\n"
+        f"{summary}"
+    )
+    
+    keyboard = [
+        [
+            InlineKeyboardButton("🔄 Refresh", callback_data=f"logs_patterns_{log_type}"),
+            InlineKeyboardButton("◀️ Back", callback_data="logs_patterns")
+        ]
+    ]
+    reply_markup = InlineKeyboardMarkup(keyboard)
+    
+    await query.edit_message_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
+
+
+@callback_route('logs_apps')
 async def show_application_logs(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show application logs selection"""
     query = update.callback_query
     await query.answer()
     
-    logs_manager = LogsManager()
     
     text = (
         "📱 <b>Application Logs</b>\n\n"
@@ -120,16 +180,16 @@ async def show_application_logs(update: Update, context: ContextTypes.DEFAULT_TY
     await query.edit_message_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
 
+@callback_route('logs_app_{app_name}')
 async def view_application_logs(update: Update, context: ContextTypes.DEFAULT_TYPE, app_name: str):
     """View logs for specific application"""
     query = update.callback_query
     await query.answer("Loading logs...")
     
-    logs_manager = LogsManager()
     app_label = logs_manager.APPLICATIONS.get(app_name, app_name)
     
     # Get logs
-    logs = logs_manager.get_application_log(app_name, lines=100)
+    logs = await logs_manager.get_application_log(app_name, lines=100)
     formatted_logs = logs_manager.format_logs(logs)
     
     text = (
@@ -140,6 +200,9 @@ async def view_application_logs(update: Update, context: ContextTypes.DEFAULT_TY
     keyboard = [
         [
             InlineKeyboardButton("🔄 Refresh", callback_data=f"logs_app_{app_name}"),
+            InlineKeyboardButton("📡 Follow", callback_data=f"logs_followapp_{app_name}")
+        ],
+        [
             InlineKeyboardButton("◀️ Back", callback_data="logs_apps")
         ]
     ]
@@ -148,33 +211,65 @@ async def view_application_logs(update: Update, context: ContextTypes.DEFAULT_TY
     await query.edit_message_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
 
-async def view_logs(update: Update, context: ContextTypes.DEFAULT_TYPE, log_type: str, time_range: str):
-    """View logs with filters"""
+def page_buttons(page, callback_prefix: str) -> list:
+    """Older / Newer buttons of a journal page (callback_prefix + direction)"""
+    row = []
+    if page.has_older:
+        row.append(InlineKeyboardButton("⬅️ Older", callback_data=f"{callback_prefix}_older"))
+    if page.has_newer:
+        row.append(InlineKeyboardButton("Newer ➡️", callback_data=f"{callback_prefix}_newer"))
+    return [row] if row else []
+
+
+@callback_route('logs_view_{log_type}_{time_range:word}')
+@callback_route('logs_page_{log_type}_{time_range:word}_{direction:word}')
+async def view_logs(update: Update, context: ContextTypes.DEFAULT_TYPE, log_type: str, time_range: str,
+                    direction: str = 'latest'):
+    """View logs with filters (journal views page by cursor)"""
     query = update.callback_query
     await query.answer("Loading logs...")
     
-    logs_manager = LogsManager()
     log_info = logs_manager.LOG_TYPES.get(log_type, {})
     log_name = log_info.get('name', log_type)
     method = log_info.get('method', 'journal')
+    time_label = logs_manager.TIME_RANGES.get(time_range, 'All')
+    
+    page = await logs_manager.get_journal_page(query.message.chat.id, log_type, time_range, direction=direction)
+    if page is not None:
+        text = (
+            f"<b>{log_name}</b>\n"
+            f"⏱️ {time_label}\n\n"
+            f"{journal_pager.format_page(page)}"
+        )
+        keyboard = page_buttons(page, f"logs_page_{log_type}_{time_range}")
+        keyboard += [
+            [
+                InlineKeyboardButton("⏭️ Latest", callback_data=f"logs_view_{log_type}_{time_range}"),
+                InlineKeyboardButton("⏱️ Change Time", callback_data=f"logs_type_{log_type}")
+            ],
+            [
+                InlineKeyboardButton("📡 Follow", callback_data=f"logs_follow_{log_type}"),
+                InlineKeyboardButton("◀️ Back to Logs", callback_data="logs_menu")
+            ]
+        ]
+        await query.edit_message_text(text, reply_markup=InlineKeyboardMarkup(keyboard), parse_mode=ParseMode.HTML)
+        return
     
     # Get logs based on type
     if method == 'journal':
         since = None if time_range == 'all' else time_range
-        logs = logs_manager.get_journal_logs(lines=100, since=since)
+        logs = await logs_manager.get_journal_logs(lines=100, since=since)
     elif method == 'auth':
-        logs = logs_manager.get_auth_logs(lines=100)
+        logs = await logs_manager.get_auth_logs(lines=100)
     elif method == 'kernel':
-        logs = logs_manager.get_kernel_logs(lines=100)
+        logs = await logs_manager.get_kernel_logs(lines=100)
     elif method == 'syslog':
-        logs = logs_manager.get_syslog(lines=100)
+        logs = await logs_manager.get_syslog(lines=100)
     else:
         logs = "Unknown log type"
     
     formatted_logs = logs_manager.format_logs(logs)
     
-    time_label = logs_manager.TIME_RANGES.get(time_range, 'All')
-    
     text = (
         f"<b>{log_name}</b>\n"
         f"⏱️ {time_label}\n\n"
@@ -187,6 +282,7 @@ async def view_logs(update: Update, context: ContextTypes.DEFAULT_TYPE, log_type
             InlineKeyboardButton("⏱️ Change Time", callback_data=f"logs_type_{log_type}")
         ],
         [
+            InlineKeyboardButton("📡 Follow", callback_data=f"logs_follow_{log_type}"),
             InlineKeyboardButton("◀️ Back to Logs", callback_data="logs_menu")
         ]
     ]
@@ -195,12 +291,42 @@ async def view_logs(update: Update, context: ContextTypes.DEFAULT_TYPE, log_type
     await query.edit_message_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
 
+@callback_route('logs_follow_{log_type}')
+@callback_route('logs_followapp_{app_name}')
+async def follow_logs(update: Update, context: ContextTypes.DEFAULT_TYPE, log_type: str = None,
+                      app_name: str = None):
+    """Show new lines of a log live in this message"""
+    query = update.callback_query
+    await query.answer("Following...")
+    
+    command = await logs_manager.follow_command(log_type=log_type, app_name=app_name)
+    if app_name is not None:
+        key, resume, back = f"app:{app_name}", f"logs_followapp_{app_name}", f"logs_app_{app_name}"
+        title = f"📡 <b>{logs_manager.APPLICATIONS.get(app_name, app_name)} Logs</b>"
+    else:
+        key, resume, back = f"log:{log_type}", f"logs_follow_{log_type}", f"logs_type_{log_type}"
+        title = f"📡 <b>{logs_manager.LOG_TYPES.get(log_type, {}).get('name', log_type)}</b>"
+    
+    if command is None:
+        keyboard = [[InlineKeyboardButton("◀️ Back", callback_data=back)]]
+        await query.edit_message_text(
+            f"{title}\n\n❌ Logs not available for live view",
+            reply_markup=InlineKeyboardMarkup(keyboard), parse_mode=ParseMode.HTML
+        )
+        return
+    
+    await follow_hub.watch(
+        context.bot, query.message.chat.id, query.message.message_id, key, title,
+        lambda: command_runner.follow(command, merge_stderr=True), resume, back
+    )
+
+
+@callback_route('logs_filter')
 async def show_priority_filter(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show priority filter options for system logs"""
     query = update.callback_query
     await query.answer()
     
-    logs_manager = LogsManager()
     
     text = (
         "🔍 <b>Filter by Priority</b>\n\n"
@@ -223,15 +349,23 @@ async def show_priority_filter(update: Update, context: ContextTypes.DEFAULT_TYP
     await query.edit_message_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
 
-async def view_logs_by_priority(update: Update, context: ContextTypes.DEFAULT_TYPE, priority: str):
+@callback_route('logs_priority_{priority}')
+@callback_route('logs_prio_{priority:word}_{direction:word}')
+async def view_logs_by_priority(update: Update, context: ContextTypes.DEFAULT_TYPE, priority: str,
+                                direction: str = 'latest'):
     """View logs filtered by priority"""
     query = update.callback_query
     await query.answer("Loading logs...")
     
-    logs_manager = LogsManager()
-    
-    logs = logs_manager.get_journal_logs(lines=100, priority=priority)
-    formatted_logs = logs_manager.format_logs(logs)
+    keyboard = []
+    page = await logs_manager.get_journal_page(query.message.chat.id, 'system', priority=priority,
+                                               direction=direction)
+    if page is not None:
+        formatted_logs = journal_pager.format_page(page)
+        keyboard = page_buttons(page, f"logs_prio_{priority}")
+    else:
+        logs = await logs_manager.get_journal_logs(lines=100, priority=priority)
+        formatted_logs = logs_manager.format_logs(logs)
     
     priority_label = logs_manager.PRIORITIES.get(priority, priority)
     
@@ -241,7 +375,7 @@ async def view_logs_by_priority(update: Update, context: ContextTypes.DEFAULT_TY
         f"{formatted_logs}"
     )
     
-    keyboard = [
+    keyboard += [
         [
             InlineKeyboardButton("🔄 Refresh", callback_data=f"logs_priority_{priority}"),
             InlineKeyboardButton("🔍 Change Filter", callback_data="logs_filter")
@@ -259,3 +393,42 @@ async def view_logs_by_priority(update: Update, context: ContextTypes.DEFAULT_TY
 async def logs_menu_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /logs command"""
     await show_logs_menu(update, context)
+
+
+@require_admin
+async def logs_search_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle /logsearch [unit=<unit>] [priority=<level>] [summary] <text>"""
+    unit = priority = None
+    summarise = False
+    words = []
+    for arg in context.args or []:
+        if arg.startswith('unit='):
+            unit = arg[5:] or None
+        elif arg.startswith('priority='):
+            priority = arg[9:].lower() or None
+        elif arg == 'summary':
+            summarise = True
+        else:
+            words.append(arg)
+    
+    if not words or (priority and priority not in logs_manager.PRIORITIES and not priority.isdigit()):
+        await update.message.reply_text(
+            "Usage: <code>/logsearch [unit=&lt;unit&gt;] [priority=err|warning|info] [summary] &lt;text&gt;</code>\n"
+            "Contoh: <code>/logsearch unit=ssh failed password</code>",
+            parse_mode=ParseMode.HTML
+        )
+        return
+    
+    text = ' '.join(words)
+    result = await logs_manager.search_logs(text, lines=30, summarise=summarise, unit=unit, priority=priority)
+    
+    if not summarise:
+        # Newest matches last; keep as many as fit in one message
+        if len(result) > 3500:
+            result = result[-3500:].split('\n', 1)[-1]
+        result = f"<pre>{html.escape(result)}</pre>"
+    
+    await update.message.reply_text(
+        f"🔍 <b>Log search:</b> <code>{html.escape(text)}</code>\n{result}",
+        parse_mode=ParseMode.HTML
+    )
@@ -8,9 +8,12 @@ Full button interface - no typing required!
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from telegram.constants import ParseMode
-from src.modules.network_tools import NetworkTools
+from src.modules.network_tools import network_tools
+from src.handlers.router import callback_route
 
 
+@callback_route('menu_nettools')
+@callback_route('nettools_menu')
 async def show_network_tools_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show main network tools menu"""
     query = update.callback_query
@@ -48,13 +51,13 @@ async def show_network_tools_menu(update: Update, context: ContextTypes.DEFAULT_
         await update.message.reply_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
 
+@callback_route('nettools_ping')
 async def show_ping_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show ping tool menu with common hosts"""
     query = update.callback_query
     await query.answer()
     
-    net_tools = NetworkTools()
-    common_hosts = net_tools.get_common_hosts()
+    common_hosts = network_tools.get_common_hosts()
     
     text = (
         "🏓 <b>Ping Tool</b>\n\n"
@@ -79,13 +82,13 @@ async def show_ping_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await query.edit_message_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
 
+@callback_route('nettools_ping_cat_{category}')
 async def show_ping_category(update: Update, context: ContextTypes.DEFAULT_TYPE, category: str):
     """Show hosts in ping category"""
     query = update.callback_query
     await query.answer()
     
-    net_tools = NetworkTools()
-    common_hosts = net_tools.get_common_hosts()
+    common_hosts = network_tools.get_common_hosts()
     
     category_labels = {
         'dns': '🌐 DNS Servers',
@@ -115,6 +118,7 @@ async def show_ping_category(update: Update, context: ContextTypes.DEFAULT_TYPE,
     await query.edit_message_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
 
+@callback_route('nettools_ping_exec_{host}')
 async def execute_ping(update: Update, context: ContextTypes.DEFAULT_TYPE, host: str):
     """Execute ping to host"""
     query = update.callback_query
@@ -127,9 +131,8 @@ async def execute_ping(update: Update, context: ContextTypes.DEFAULT_TYPE, host:
         parse_mode=ParseMode.HTML
     )
     
-    net_tools = NetworkTools()
-    result = net_tools.ping_host(host, count=4)
-    formatted = net_tools.format_ping_result(result)
+    result = await network_tools.ping_host(host, count=4)
+    formatted = network_tools.format_ping_result(result)
     
     keyboard = [
         [
@@ -145,6 +148,7 @@ async def execute_ping(update: Update, context: ContextTypes.DEFAULT_TYPE, host:
     await query.edit_message_text(formatted, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
 
+@callback_route('nettools_trace')
 async def show_traceroute_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show traceroute menu"""
     query = update.callback_query
@@ -170,13 +174,13 @@ async def show_traceroute_menu(update: Update, context: ContextTypes.DEFAULT_TYP
     await query.edit_message_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
 
+@callback_route('nettools_trace_cat_{category}')
 async def show_traceroute_category(update: Update, context: ContextTypes.DEFAULT_TYPE, category: str):
     """Show hosts in traceroute category"""
     query = update.callback_query
     await query.answer()
     
-    net_tools = NetworkTools()
-    common_hosts = net_tools.get_common_hosts()
+    common_hosts = network_tools.get_common_hosts()
     
     category_labels = {
         'dns': '🌐 DNS Servers',
@@ -205,6 +209,7 @@ async def show_traceroute_category(update: Update, context: ContextTypes.DEFAULT
     await query.edit_message_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
 
+@callback_route('nettools_trace_exec_{host}')
 async def execute_traceroute(update: Update, context: ContextTypes.DEFAULT_TYPE, host: str):
     """Execute traceroute to host"""
     query = update.callback_query
@@ -216,9 +221,8 @@ async def execute_traceroute(update: Update, context: ContextTypes.DEFAULT_TYPE,
         parse_mode=ParseMode.HTML
     )
     
-    net_tools = NetworkTools()
-    result = net_tools.traceroute(host, max_hops=20)
-    formatted = net_tools.format_traceroute_result(result, max_lines=15)
+    result = await network_tools.traceroute(host, max_hops=20)
+    formatted = network_tools.format_traceroute_result(result, max_lines=15)
     
     keyboard = [
         [
@@ -231,6 +235,7 @@ async def execute_traceroute(update: Update, context: ContextTypes.DEFAULT_TYPE,
     await query.edit_message_text(formatted, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
 
+@callback_route('nettools_portscan')
 async def show_portscan_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show port scanner menu"""
     query = update.callback_query
@@ -263,13 +268,13 @@ async def show_portscan_menu(update: Update, context: ContextTypes.DEFAULT_TYPE)
     await query.edit_message_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
 
+@callback_route('nettools_port_cat_{category}')
 async def show_portscan_category(update: Update, context: ContextTypes.DEFAULT_TYPE, category: str):
     """Show ports in category"""
     query = update.callback_query
     await query.answer()
     
-    net_tools = NetworkTools()
-    common_ports = net_tools.get_common_ports()
+    common_ports = network_tools.get_common_ports()
     
     category_labels = {
         'web': '🌐 Web Ports',
@@ -301,13 +306,13 @@ async def show_portscan_category(update: Update, context: ContextTypes.DEFAULT_T
     await query.edit_message_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
 
+@callback_route('nettools_port_scan_{host}_{port:int}')
 async def execute_portscan(update: Update, context: ContextTypes.DEFAULT_TYPE, host: str, port: int):
     """Execute port scan"""
     query = update.callback_query
     await query.answer(f"Scanning port {port}...")
     
-    net_tools = NetworkTools()
-    result = net_tools.port_scan(host, port, timeout=3.0)
+    result = network_tools.port_scan(host, port, timeout=3.0)
     
     if result['open']:
         status = "✅ <b>OPEN</b>"
@@ -334,13 +339,13 @@ async def execute_portscan(update: Update, context: ContextTypes.DEFAULT_TYPE, h
     await query.edit_message_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
 
+@callback_route('nettools_dns')
 async def show_dns_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show DNS lookup menu"""
     query = update.callback_query
     await query.answer()
     
-    net_tools = NetworkTools()
-    record_types = net_tools.get_dns_record_types()
+    record_types = network_tools.get_dns_record_types()
     
     text = (
         "🌐 <b>DNS Lookup</b>\n\n"
@@ -362,13 +367,13 @@ async def show_dns_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await query.edit_message_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
 
+@callback_route('nettools_dns_type_{record_type}')
 async def show_dns_type_hosts(update: Update, context: ContextTypes.DEFAULT_TYPE, record_type: str):
     """Show common domains for DNS lookup"""
     query = update.callback_query
     await query.answer()
     
-    net_tools = NetworkTools()
-    record_types = net_tools.get_dns_record_types()
+    record_types = network_tools.get_dns_record_types()
     type_label = record_types.get(record_type, record_type)
     
     text = (
@@ -402,6 +407,7 @@ async def show_dns_type_hosts(update: Update, context: ContextTypes.DEFAULT_TYPE
     await query.edit_message_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
 
+@callback_route('nettools_dns_query_{record_type:word}_{domain}')
 async def execute_dns_lookup(update: Update, context: ContextTypes.DEFAULT_TYPE, domain: str, record_type: str):
     """Execute DNS lookup"""
     query = update.callback_query
@@ -413,9 +419,8 @@ async def execute_dns_lookup(update: Update, context: ContextTypes.DEFAULT_TYPE,
         parse_mode=ParseMode.HTML
     )
     
-    net_tools = NetworkTools()
-    result = net_tools.dns_lookup(domain, record_type)
-    formatted = net_tools.format_dns_result(result)
+    result = await network_tools.dns_lookup(domain, record_type)
+    formatted = network_tools.format_dns_result(result)
     
     keyboard = [
         [
@@ -5,15 +5,16 @@ Handles APT package management via inline keyboard.
 Full button-based interface - no typing required!
 """
 
+import asyncio
+from typing import Optional
+
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from telegram.constants import ParseMode
 
-from ..modules.packages.manager import PackageManager
-
-
-# Initialize package manager
-package_manager = PackageManager()
+from ..modules.packages import package_manager
+from ..utils.sessions import session_store
+from src.handlers.router import callback_route
 
 
 async def packages_menu_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -21,6 +22,7 @@ async def packages_menu_command(update: Update, context: ContextTypes.DEFAULT_TY
     await show_packages_menu(update, context)
 
 
+@callback_route('menu_packages')
 async def show_packages_menu(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Show main Package management menu with inline keyboard"""
     query = update.callback_query
@@ -49,7 +51,7 @@ async def show_packages_menu(update: Update, context: ContextTypes.DEFAULT_TYPE)
         return
     
     # Get package stats
-    stats = package_manager.get_package_count()
+    stats = await package_manager.get_package_count()
     
     text = (
         f"📦 <b>Package Management</b>\n\n"
@@ -91,18 +93,38 @@ async def show_packages_menu(update: Update, context: ContextTypes.DEFAULT_TYPE)
         )
 
 
-async def show_installed_packages(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+# Packages per page
+PACKAGES_PER_PAGE = 20
+
+
+@callback_route('pkg_installed')
+async def show_installed_packages(update: Update, context: ContextTypes.DEFAULT_TYPE,
+                                  page: int = 0, refresh: bool = True) -> None:
     """Show list of installed packages"""
     query = update.callback_query
     await query.answer("Loading installed packages...")
     
-    packages = package_manager.get_installed_packages(limit=20)
-    text = package_manager.format_package_list(packages, "Installed Packages")
+    # dpkg -l runs when the list is opened / refreshed, not on every page turn
+    snapshot = await session_store.get(
+        update.effective_chat.id, 'packages:installed',
+        lambda: package_manager.get_installed_packages(limit=None),
+        refresh=refresh
+    )
+    packages, page, pages = snapshot.page(page, PACKAGES_PER_PAGE)
+    text = package_manager.format_package_list(
+        packages, f"Installed Packages - page {page + 1}/{pages}", total=len(snapshot.items)
+    )
     
-    keyboard = [
-        [InlineKeyboardButton("🔄 Refresh", callback_data="pkg_installed")],
-        [InlineKeyboardButton("🔙 Back", callback_data="menu_packages")]
-    ]
+    keyboard = []
+    nav_buttons = []
+    if page > 0:
+        nav_buttons.append(InlineKeyboardButton("◀️ Prev", callback_data=f"pkg_installed_page_{page - 1}"))
+    if page < pages - 1:
+        nav_buttons.append(InlineKeyboardButton("Next ▶️", callback_data=f"pkg_installed_page_{page + 1}"))
+    if nav_buttons:
+        keyboard.append(nav_buttons)
+    keyboard.append([InlineKeyboardButton("🔄 Refresh", callback_data="pkg_installed")])
+    keyboard.append([InlineKeyboardButton("🔙 Back", callback_data="menu_packages")])
     
     await query.edit_message_text(
         text=text,
@@ -111,12 +133,19 @@ async def show_installed_packages(update: Update, context: ContextTypes.DEFAULT_
     )
 
 
+@callback_route('pkg_installed_page_{page:int}')
+async def show_installed_packages_page(update: Update, context: ContextTypes.DEFAULT_TYPE, page: int) -> None:
+    """Show another page of installed packages (from the session snapshot)"""
+    await show_installed_packages(update, context, page=page, refresh=False)
+
+
+@callback_route('pkg_upgradeable')
 async def show_upgradeable_packages(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Show list of upgradeable packages"""
     query = update.callback_query
     await query.answer("Checking for updates...")
     
-    packages = package_manager.get_upgradeable_packages()
+    packages = await package_manager.get_upgradeable_packages()
     
     if not packages:
         text = "✅ <b>All packages are up to date!</b>\n\nNo upgrades available."
@@ -135,6 +164,7 @@ async def show_upgradeable_packages(update: Update, context: ContextTypes.DEFAUL
     )
 
 
+@callback_route('pkg_categories')
 async def show_package_categories(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Show package categories"""
     query = update.callback_query
@@ -161,6 +191,7 @@ async def show_package_categories(update: Update, context: ContextTypes.DEFAULT_
     )
 
 
+@callback_route('pkg_cat_{category}')
 async def show_category_packages(update: Update, context: ContextTypes.DEFAULT_TYPE, category: str) -> None:
     """Show packages in a category"""
     query = update.callback_query
@@ -178,9 +209,13 @@ async def show_category_packages(update: Update, context: ContextTypes.DEFAULT_T
     
     text = f"<b>{category_names.get(category, 'Packages')}</b>\n\n"
     
+    # Check all packages at once instead of one dpkg call after another
+    installed_flags = await asyncio.gather(
+        *(package_manager.is_package_installed(pkg_name) for pkg_name in packages)
+    )
+    
     keyboard = []
-    for pkg_name, description in packages.items():
-        installed = package_manager.is_package_installed(pkg_name)
+    for pkg_name, installed in zip(packages, installed_flags):
         icon = "✅" if installed else "📦"
         keyboard.append([
             InlineKeyboardButton(
@@ -198,13 +233,14 @@ async def show_category_packages(update: Update, context: ContextTypes.DEFAULT_T
     )
 
 
+@callback_route('pkg_info_{category:word}_{package_name}')
 async def show_package_info(update: Update, context: ContextTypes.DEFAULT_TYPE, category: str, package_name: str) -> None:
     """Show detailed package information"""
     query = update.callback_query
     await query.answer("Loading package info...")
     
-    info = package_manager.get_package_info(package_name)
-    installed = package_manager.is_package_installed(package_name)
+    info = await package_manager.get_package_info(package_name)
+    installed = await package_manager.is_package_installed(package_name)
     
     if info:
         text = package_manager.format_package_info(info)
@@ -231,6 +267,11 @@ async def show_package_info(update: Update, context: ContextTypes.DEFAULT_TYPE,
     )
 
 
+@callback_route('pkg_update', action='update')
+@callback_route('pkg_upgrade_all', action='upgrade_all')
+@callback_route('pkg_autoremove', action='autoremove')
+@callback_route('pkg_install_{package_name}', action='install')
+@callback_route('pkg_remove_{package_name}', action='remove')
 async def handle_package_action(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE,
@@ -265,15 +306,15 @@ async def handle_package_action(
     message = ""
     
     if action == 'update':
-        success, message = package_manager.update_package_list()
+        success, message = await package_manager.update_package_list()
     elif action == 'upgrade_all':
-        success, message = package_manager.upgrade_packages()
+        success, message = await package_manager.upgrade_packages()
     elif action == 'install' and package_name:
-        success, message = package_manager.install_package(package_name)
+        success, message = await package_manager.install_package(package_name)
     elif action == 'remove' and package_name:
-        success, message = package_manager.remove_package(package_name)
+        success, message = await package_manager.remove_package(package_name)
     elif action == 'autoremove':
-        success, message = package_manager.autoremove()
+        success, message = await package_manager.autoremove()
     
     # Show result
     if success:
@@ -292,6 +333,9 @@ async def handle_package_action(
     )
 
 
+@callback_route('pkg_upgrade_all_confirm', action='upgrade_all', package_name='')
+@callback_route('pkg_install_{package_name}_confirm', action='install')
+@callback_route('pkg_remove_{package_name}_confirm', action='remove')
 async def confirm_action(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE,
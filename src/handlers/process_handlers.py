@@ -2,12 +2,17 @@
 Process Handlers
 Advanced process management via inline keyboard
 """
+from functools import partial
+
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes, ConversationHandler
 from telegram.constants import ParseMode
 from src.utils.decorators import require_admin
+from src.utils.executor import blocking_executor
 from src.modules.process import ProcessManager
 import json
+from src.handlers.router import callback_route
+from src.utils.sessions import session_store
 
 # Conversation states
 SEARCH_INPUT, KILL_CONFIRM, NICE_INPUT = range(3)
@@ -15,6 +20,9 @@ SEARCH_INPUT, KILL_CONFIRM, NICE_INPUT = range(3)
 # Initialize manager
 process_manager = ProcessManager()
 
+# Processes per page
+PROCESSES_PER_PAGE = 10
+
 
 @require_admin
 async def processes_menu_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -48,6 +56,8 @@ Advanced process management tools
     )
 
 
+@callback_route('menu_processes', pass_query=True)
+@callback_route('proc_refresh', pass_query=True)
 async def show_processes_menu(query):
     """Show process manager menu"""
     text = """
@@ -79,12 +89,25 @@ Advanced process management tools
     )
 
 
-async def show_top_processes(query, sort_by='cpu'):
+@callback_route('proc_top_cpu', pass_query=True, sort_by='cpu')
+@callback_route('proc_top_memory', pass_query=True, sort_by='memory')
+@callback_route('proc_all', pass_query=True, sort_by='pid')
+async def show_top_processes(query, sort_by='cpu', page=0, refresh=True):
     """Show top processes"""
-    await query.edit_message_text("⏳ Loading processes...")
+    if refresh:
+        await query.edit_message_text("⏳ Loading processes...")
     
     try:
-        processes = process_manager.get_all_processes(sort_by=sort_by, limit=15)
+        # The ranking is frozen when the list is opened, so rows do not
+        # jump between pages while the user browses
+        snapshot = await session_store.get(
+            query.message.chat.id, f"processes:{sort_by}",
+            lambda: blocking_executor.run(
+                partial(process_manager.get_all_processes, sort_by=sort_by, limit=None)
+            ),
+            refresh=refresh
+        )
+        processes, page, pages = snapshot.page(page, PROCESSES_PER_PAGE)
         
         if sort_by == 'cpu':
             title = "📊 TOP CPU PROCESSES"
@@ -93,11 +116,14 @@ async def show_top_processes(query, sort_by='cpu'):
         else:
             title = "📋 ALL PROCESSES"
         
-        text = process_manager.format_process_list(processes, title)
+        text = process_manager.format_process_list(
+            processes, f"{title} ({page + 1}/{pages})", total=len(snapshot.items)
+        )
+        text += f"_Snapshot {int(snapshot.age)}s old_"
         
         # Create keyboard with process buttons
         keyboard = []
-        for i, proc in enumerate(processes[:10]):  # Max 10 for buttons
+        for i, proc in enumerate(processes):
             keyboard.append([
                 InlineKeyboardButton(
                     f"{proc['name'][:20]} [{proc['pid']}]",
@@ -105,6 +131,16 @@ async def show_top_processes(query, sort_by='cpu'):
                 )
             ])
         
+        nav_buttons = []
+        if page > 0:
+            nav_buttons.append(InlineKeyboardButton("◀️ Prev", callback_data=f"proc_page_{sort_by}_{page - 1}"))
+        if page < pages - 1:
+            nav_buttons.append(InlineKeyboardButton("Next ▶️", callback_data=f"proc_page_{sort_by}_{page + 1}"))
+        if nav_buttons:
+            keyboard.append(nav_buttons)
+        
+        refresh_data = {'cpu': 'proc_top_cpu', 'memory': 'proc_top_memory'}.get(sort_by, 'proc_all')
+        keyboard.append([InlineKeyboardButton("🔄 Refresh", callback_data=refresh_data)])
         keyboard.append([InlineKeyboardButton("◀️ Back", callback_data='menu_processes')])
         keyboard.append([InlineKeyboardButton("🏠 Main Menu", callback_data='main_menu')])
         
@@ -123,6 +159,13 @@ async def show_top_processes(query, sort_by='cpu'):
         )
 
 
+@callback_route('proc_page_{sort_by:word}_{page:int}', pass_query=True)
+async def show_processes_page(query, sort_by, page):
+    """Show another page of the process list (from the session snapshot)"""
+    await show_top_processes(query, sort_by, page=page, refresh=False)
+
+
+@callback_route('proc_search_menu', pass_query=True)
 async def show_search_menu(query):
     """Show search options"""
     text = """
@@ -158,6 +201,7 @@ Quick search by common process names:
     )
 
 
+@callback_route('proc_filter_menu', pass_query=True)
 async def show_filter_menu(query):
     """Show filter options"""
     text = """
@@ -188,9 +232,10 @@ Filter by status or user:
     )
 
 
+@callback_route('proc_filter_users', pass_query=True)
 async def show_users_filter(query):
     """Show user filter options"""
-    users = process_manager.get_users()
+    users = await blocking_executor.run(process_manager.get_users)
     
     text = """
 👤 *FILTER BY USER*
@@ -217,12 +262,13 @@ Select user:
     )
 
 
+@callback_route('proc_search_{search_term}', pass_query=True)
 async def search_processes(query, search_term):
     """Search and display processes"""
     await query.edit_message_text(f"🔍 Searching for '{search_term}'...")
     
     try:
-        processes = process_manager.search_processes(search_term)
+        processes = await blocking_executor.run(process_manager.search_processes, search_term)
         
         title = f"🔍 SEARCH: {search_term.upper()}"
         text = process_manager.format_process_list(processes, title)
@@ -255,16 +301,18 @@ async def search_processes(query, search_term):
         )
 
 
+@callback_route('proc_filter_{filter_value}', pass_query=True, filter_type='status')
+@callback_route('proc_user_{filter_value}', pass_query=True, filter_type='user')
 async def filter_processes(query, filter_type, filter_value):
     """Filter and display processes"""
     await query.edit_message_text(f"🗂️ Filtering by {filter_type}...")
     
     try:
         if filter_type == 'status':
-            processes = process_manager.filter_by_status(filter_value)
+            processes = await blocking_executor.run(process_manager.filter_by_status, filter_value)
             title = f"🗂️ STATUS: {filter_value.upper()}"
         elif filter_type == 'user':
-            processes = process_manager.filter_by_user(filter_value)
+            processes = await blocking_executor.run(process_manager.filter_by_user, filter_value)
             title = f"👤 USER: {filter_value}"
         else:
             processes = []
@@ -300,12 +348,13 @@ async def filter_processes(query, filter_type, filter_value):
         )
 
 
+@callback_route('proc_detail_{pid:int}', pass_query=True)
 async def show_process_detail(query, pid):
     """Show detailed process info with action buttons"""
     await query.edit_message_text(f"⏳ Loading process {pid}...")
     
     try:
-        info = process_manager.get_process_info(pid)
+        info = await blocking_executor.run(process_manager.get_process_info, pid)
         
         if not info:
             await query.edit_message_text(
@@ -348,6 +397,7 @@ async def show_process_detail(query, pid):
         )
 
 
+@callback_route('proc_priority_{pid:int}', pass_query=True)
 async def show_priority_menu(query, pid):
     """Show priority change menu"""
     text = f"""
@@ -386,27 +436,32 @@ _Requires root for values < 0_
     )
 
 
+@callback_route('proc_kill_{pid:int}', pass_query=True, action='kill')
+@callback_route('proc_forcekill_{pid:int}', pass_query=True, action='forcekill')
+@callback_route('proc_suspend_{pid:int}', pass_query=True, action='suspend')
+@callback_route('proc_resume_{pid:int}', pass_query=True, action='resume')
+@callback_route('proc_nice_{pid:int}_{value:int}', pass_query=True, action='nice')
 async def handle_process_action(query, action, pid, value=None):
     """Handle process actions"""
     try:
         if action == 'kill':
-            success, message = process_manager.kill_process(int(pid), force=False)
+            success, message = await blocking_executor.run(partial(process_manager.kill_process, int(pid), force=False))
             icon = "✅" if success else "❌"
             
         elif action == 'forcekill':
-            success, message = process_manager.kill_process(int(pid), force=True)
+            success, message = await blocking_executor.run(partial(process_manager.kill_process, int(pid), force=True))
             icon = "✅" if success else "❌"
             
         elif action == 'suspend':
-            success, message = process_manager.suspend_process(int(pid))
+            success, message = await blocking_executor.run(process_manager.suspend_process, int(pid))
             icon = "✅" if success else "❌"
             
         elif action == 'resume':
-            success, message = process_manager.resume_process(int(pid))
+            success, message = await blocking_executor.run(process_manager.resume_process, int(pid))
             icon = "✅" if success else "❌"
             
         elif action == 'nice':
-            success, message = process_manager.change_priority(int(pid), int(value))
+            success, message = await blocking_executor.run(process_manager.change_priority, int(pid), int(value))
             icon = "✅" if success else "❌"
         
         else:
@@ -6,9 +6,11 @@ from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from telegram.constants import ParseMode
 from src.utils.decorators import require_admin
+from src.utils.executor import blocking_executor
 from src.modules.reports import ReportGenerator
 import json
 from pathlib import Path
+from src.handlers.router import callback_route
 
 
 @require_admin
@@ -39,6 +41,7 @@ Generate and schedule system reports
     )
 
 
+@callback_route('menu_reports', pass_query=True)
 async def show_reports_menu(query):
     """Show reports menu"""
     text = """
@@ -67,13 +70,14 @@ Generate and schedule system reports
     )
 
 
+@callback_route('report_generate_daily', pass_query=True)
 async def generate_daily_report(query):
     """Generate and send daily report"""
     await query.edit_message_text("⏳ Generating daily report...")
     
     try:
         generator = ReportGenerator()
-        report = generator.generate_daily_report()
+        report = await blocking_executor.run(generator.generate_daily_report)
         text = generator.format_daily_report(report)
         
         keyboard = [
@@ -94,13 +98,14 @@ async def generate_daily_report(query):
         )
 
 
+@callback_route('report_generate_weekly', pass_query=True)
 async def generate_weekly_report(query):
     """Generate and send weekly report"""
     await query.edit_message_text("⏳ Generating weekly report...")
     
     try:
         generator = ReportGenerator()
-        report = generator.generate_weekly_report()
+        report = await blocking_executor.run(generator.generate_weekly_report)
         text = generator.format_weekly_report(report)
         
         keyboard = [
@@ -121,6 +126,7 @@ async def generate_weekly_report(query):
         )
 
 
+@callback_route('report_settings', pass_query=True)
 async def show_report_settings(query):
     """Show report schedule settings"""
     # Load settings
@@ -172,6 +178,7 @@ _Scheduled reports will be sent automatically_
     )
 
 
+@callback_route('report_set_daily', pass_query=True)
 async def show_daily_settings(query):
     """Show daily report settings"""
     settings_file = Path('config/report_settings.json')
@@ -219,6 +226,7 @@ Configure daily report schedule:
     )
 
 
+@callback_route('report_set_weekly', pass_query=True)
 async def show_weekly_settings(query):
     """Show weekly report settings"""
     settings_file = Path('config/report_settings.json')
@@ -279,6 +287,7 @@ Configure weekly report schedule:
     )
 
 
+@callback_route('report_history', pass_query=True)
 async def show_report_history(query):
     """Show report history"""
     report_dir = Path('logs/reports')
@@ -321,6 +330,14 @@ async def show_report_history(query):
     )
 
 
+@callback_route('report_daily_enable', pass_query=True, action='daily_enable')
+@callback_route('report_daily_disable', pass_query=True, action='daily_disable')
+@callback_route('report_daily_time_{value:int}', pass_query=True, action='daily_time')
+@callback_route('report_weekly_enable', pass_query=True, action='weekly_enable')
+@callback_route('report_weekly_disable', pass_query=True, action='weekly_disable')
+@callback_route('report_weekly_day_{value}', pass_query=True, action='weekly_day')
+@callback_route('report_weekly_time_{value:int}', pass_query=True, action='weekly_time')
+@callback_route('report_clear_history', pass_query=True, action='clear_history')
 async def handle_report_action(query, action, value=None):
     """Handle report configuration actions"""
     try:
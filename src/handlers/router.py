@@ -0,0 +1,222 @@
+"""
+Callback Router
+Table-driven dispatch of inline keyboard callback_data to handlers
+"""
+import importlib
+import logging
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.handlers.lazy import load_module
+
+logger = logging.getLogger(__name__)
+
+# Argument types usable in patterns: {name}, {name:word}, {name:int}
+#   str  - anything, greedy (may contain '_')
+#   word - no '_' (first/middle fields that were split on '_')
+#   int  - integer, converted before the handler is called
+PARAM_TYPES = {
+    'str': (r'.+', str),
+    'word': (r'[^_]+', str),
+    'int': (r'-?\d+', int),
+}
+
+_PARAM = re.compile(r'\{(\w+)(?::(\w+))?\}')
+
+
+class Route:
+    """One compiled callback pattern"""
+
+    __slots__ = ('pattern', 'handler', 'fixed', 'pass_query', 'prefix', 'regex',
+                 'converters', 'specificity')
+
+    def __init__(self, pattern: str, handler: Callable, fixed: Dict[str, Any], pass_query: bool):
+        self.pattern = pattern
+        self.handler = handler
+        self.fixed = fixed
+        self.pass_query = pass_query
+
+        regex = []
+        self.converters: Dict[str, Callable] = {}
+        position = 0
+        for match in _PARAM.finditer(pattern):
+            name, kind = match.group(1), match.group(2) or 'str'
+            if kind not in PARAM_TYPES:
+                raise ValueError(f"Unknown parameter type '{kind}' in {pattern}")
+            expr, convert = PARAM_TYPES[kind]
+            regex.append(re.escape(pattern[position:match.start()]))
+            regex.append(f'(?P<{name}>{expr})')
+            self.converters[name] = convert
+            position = match.end()
+        regex.append(re.escape(pattern[position:]))
+
+        first = _PARAM.search(pattern)
+        self.prefix = pattern[:first.start()] if first else pattern
+        self.regex = re.compile(''.join(regex)) if first else None
+        # More literal text = more specific (pkg_install_{p}_confirm before pkg_install_{p})
+        self.specificity = len(_PARAM.sub('', pattern))
+
+    def match(self, data: str) -> Optional[Dict[str, Any]]:
+        """Parsed arguments, or None if data does not fit the pattern"""
+        if self.regex is None:
+            return {} if data == self.pattern else None
+        found = self.regex.fullmatch(data)
+        if found is None:
+            return None
+        try:
+            return {name: self.converters[name](value) for name, value in found.groupdict().items()}
+        except ValueError:
+            return None
+
+
+class _Node:
+    """Prefix trie node (one per character)"""
+
+    __slots__ = ('children', 'routes', 'module')
+
+    def __init__(self):
+        self.children: Dict[str, '_Node'] = {}
+        self.routes: List[Route] = []
+        self.module: Optional[str] = None
+
+
+class CallbackRouter:
+    """
+    Map callback_data to handlers
+
+    - literal callbacks ('menu_docker') are a dict lookup
+    - patterns ('docker_stop_{container_id}') live in a prefix trie keyed
+      by their literal prefix; lookup walks at most len(data) nodes
+      (callback_data is limited to 64 bytes), so dispatch cost does not
+      grow with the number of routes
+    - literal routes win over patterns, longer prefixes over shorter ones,
+      and among patterns with the same prefix the most specific one wins
+    - handler modules register their routes with @callback_route when
+      imported; lazy() names the module owning a prefix so it is only
+      imported when one of its callbacks is first pressed
+    """
+
+    def __init__(self):
+        self.exact: Dict[str, Route] = {}
+        self.root = _Node()
+        self._loaded = set()
+
+    # ------------------------------------------------------------------
+    # Registration
+    # ------------------------------------------------------------------
+
+    def add(self, pattern: str, handler: Callable, pass_query: bool = False, **fixed):
+        """
+        Register a handler
+
+        Args:
+            pattern: Literal callback_data or pattern with {name:type} fields
+            handler: Coroutine called as handler(update, context, **args),
+                or handler(query, **args) when pass_query is True
+            fixed: Constant keyword arguments passed to the handler
+        """
+        route = Route(pattern, handler, fixed, pass_query)
+        if route.regex is None:
+            if pattern in self.exact:
+                logger.warning(f"Callback route {pattern} registered twice, keeping the latest")
+            self.exact[pattern] = route
+            return route
+
+        node = self._node(route.prefix)
+        node.routes.append(route)
+        node.routes.sort(key=lambda r: r.specificity, reverse=True)
+        return route
+
+    def route(self, pattern: str, pass_query: bool = False, **fixed):
+        """Decorator form of add(); stack it to register several callbacks"""
+        def decorator(func):
+            self.add(pattern, func, pass_query, **fixed)
+            return func
+        return decorator
+
+    def lazy(self, module: str, *prefixes: str):
+        """Import `module` the first time a callback starting with a prefix arrives"""
+        for prefix in prefixes:
+            self._node(prefix).module = module
+
+    def _node(self, prefix: str) -> _Node:
+        node = self.root
+        for char in prefix:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = _Node()
+            node = child
+        return node
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def _walk(self, data: str) -> List[_Node]:
+        """Trie nodes along data, shortest prefix first"""
+        nodes = []
+        node = self.root
+        for char in data:
+            node = node.children.get(char)
+            if node is None:
+                break
+            nodes.append(node)
+        return nodes
+
+    def owner(self, data: str) -> Optional[str]:
+        """Module owning the longest lazy prefix of data"""
+        for node in reversed(self._walk(data)):
+            if node.module is not None:
+                return node.module
+        return None
+
+    def _load_owner(self, data: str):
+        """Import the owning module (synchronously) if not loaded yet"""
+        module = self.owner(data)
+        if module is not None and module not in self._loaded:
+            self._loaded.add(module)
+            importlib.import_module(module)
+            logger.info(f"Loaded callback handlers from {module}")
+
+    def resolve(self, data: str) -> Optional[Tuple[Route, Dict[str, Any]]]:
+        """Find the route and parsed arguments for callback_data"""
+        self._load_owner(data)
+
+        route = self.exact.get(data)
+        if route is not None:
+            return route, {}
+
+        for node in reversed(self._walk(data)):
+            for route in node.routes:
+                args = route.match(data)
+                if args is not None:
+                    return route, args
+        return None
+
+    async def dispatch(self, update, context) -> bool:
+        """Run the handler for update.callback_query; False if nothing matched"""
+        query = update.callback_query
+        data = query.data or ''
+
+        # Import the owning module off the event loop before resolving
+        module = self.owner(data)
+        if module is not None and module not in self._loaded:
+            await load_module(module)
+            self._loaded.add(module)
+
+        resolved = self.resolve(data)
+        if resolved is None:
+            return False
+
+        route, args = resolved
+        args.update(route.fixed)
+        if route.pass_query:
+            await route.handler(query, **args)
+        else:
+            await route.handler(update, context, **args)
+        return True
+
+
+# Global router instance
+callback_router = CallbackRouter()
+callback_route = callback_router.route
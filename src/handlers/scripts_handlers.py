@@ -9,11 +9,8 @@ from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from telegram.constants import ParseMode
 
-from ..modules.scripts.manager import ScriptsManager
-
-
-# Initialize scripts manager
-scripts_manager = ScriptsManager()
+from ..modules.scripts import scripts_manager
+from src.handlers.router import callback_route
 
 
 async def scripts_menu_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -21,6 +18,7 @@ async def scripts_menu_command(update: Update, context: ContextTypes.DEFAULT_TYP
     await show_scripts_menu(update, context)
 
 
+@callback_route('menu_scripts')
 async def show_scripts_menu(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Show main Scripts menu with inline keyboard"""
     query = update.callback_query
@@ -57,6 +55,7 @@ async def show_scripts_menu(update: Update, context: ContextTypes.DEFAULT_TYPE)
         )
 
 
+@callback_route('script_cat_{category}')
 async def show_category_scripts(update: Update, context: ContextTypes.DEFAULT_TYPE, category: str) -> None:
     """Show scripts in a category"""
     query = update.callback_query
@@ -87,6 +86,7 @@ async def show_category_scripts(update: Update, context: ContextTypes.DEFAULT_TY
     )
 
 
+@callback_route('script_info_{category:word}_{script_id}')
 async def show_script_info(update: Update, context: ContextTypes.DEFAULT_TYPE, category: str, script_id: str) -> None:
     """Show script information and execution option"""
     query = update.callback_query
@@ -117,6 +117,7 @@ async def show_script_info(update: Update, context: ContextTypes.DEFAULT_TYPE, c
     )
 
 
+@callback_route('script_exec_{category:word}_{script_id}_confirm')
 async def confirm_script_execution(update: Update, context: ContextTypes.DEFAULT_TYPE, category: str, script_id: str) -> None:
     """Show confirmation dialog for script execution"""
     query = update.callback_query
@@ -149,6 +150,7 @@ async def confirm_script_execution(update: Update, context: ContextTypes.DEFAULT
     )
 
 
+@callback_route('script_exec_{category:word}_{script_id}')
 async def execute_script(update: Update, context: ContextTypes.DEFAULT_TYPE, category: str, script_id: str) -> None:
     """Execute a script"""
     query = update.callback_query
@@ -174,7 +176,7 @@ async def execute_script(update: Update, context: ContextTypes.DEFAULT_TYPE, cat
     )
     
     # Execute script
-    success, stdout, stderr = scripts_manager.execute_script(script['script'], timeout=30)
+    success, stdout, stderr = await scripts_manager.execute_script(script['script'], timeout=30)
     
     # Prepare output
     output = stdout if stdout else stderr
@@ -210,6 +212,7 @@ async def execute_script(update: Update, context: ContextTypes.DEFAULT_TYPE, cat
     )
 
 
+@callback_route('script_history')
 async def show_script_history(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Show script execution history"""
     query = update.callback_query
@@ -235,6 +238,7 @@ async def show_script_history(update: Update, context: ContextTypes.DEFAULT_TYPE
     )
 
 
+@callback_route('script_clear_history_confirm')
 async def confirm_clear_history(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Show confirmation for clearing history"""
     query = update.callback_query
@@ -260,6 +264,7 @@ async def confirm_clear_history(update: Update, context: ContextTypes.DEFAULT_TY
     )
 
 
+@callback_route('script_clear_history')
 async def clear_script_history(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Clear script execution history"""
     query = update.callback_query
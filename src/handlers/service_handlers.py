@@ -4,6 +4,8 @@ Service Handlers
 from telegram import Update
 from telegram.ext import ContextTypes
 from src.utils.decorators import require_admin
+from src.utils.cache import response_cache
+from src.utils.executor import blocking_executor
 from src.utils.helpers import send_long_message
 from src.modules.service import (
     list_services,
@@ -25,21 +27,21 @@ async def services_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         if filter_status not in ['running', 'failed', 'inactive']:
             filter_status = None
     
-    info = list_services(filter_status)
+    info = await response_cache.run(list_services, filter_status)
     await send_long_message(update, info)
 
 
 @require_admin
 async def services_running_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handler untuk /services_running"""
-    info = list_services('running')
+    info = await response_cache.run(list_services, 'running')
     await send_long_message(update, info)
 
 
 @require_admin
 async def services_failed_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handler untuk /services_failed"""
-    info = list_services('failed')
+    info = await response_cache.run(list_services, 'failed')
     await update.message.reply_text(info, parse_mode='Markdown')
 
 
@@ -55,7 +57,7 @@ async def service_status_command(update: Update, context: ContextTypes.DEFAULT_T
         return
     
     service_name = context.args[0]
-    info = get_service_status(service_name)
+    info = await response_cache.run(get_service_status, service_name)
     await send_long_message(update, info)
 
 
@@ -79,7 +81,7 @@ async def service_logs_command(update: Update, context: ContextTypes.DEFAULT_TYP
             pass
     
     await update.message.reply_text("⏳ Mengambil logs...")
-    info = get_service_logs(service_name, lines)
+    info = await response_cache.run(get_service_logs, service_name, lines)
     await send_long_message(update, info)
 
 
@@ -104,7 +106,8 @@ async def service_start_command(update: Update, context: ContextTypes.DEFAULT_TY
         return
     
     service_name = context.args[0]
-    info = start_service(service_name)
+    info = await blocking_executor.run(start_service, service_name)
+    response_cache.invalidate('src.modules.service')
     await update.message.reply_text(info, parse_mode='Markdown')
 
 
@@ -129,7 +132,8 @@ async def service_stop_command(update: Update, context: ContextTypes.DEFAULT_TYP
         return
     
     service_name = context.args[0]
-    info = stop_service(service_name)
+    info = await blocking_executor.run(stop_service, service_name)
+    response_cache.invalidate('src.modules.service')
     await update.message.reply_text(info, parse_mode='Markdown')
 
 
@@ -154,5 +158,6 @@ async def service_restart_command(update: Update, context: ContextTypes.DEFAULT_
         return
     
     service_name = context.args[0]
-    info = restart_service(service_name)
+    info = await blocking_executor.run(restart_service, service_name)
+    response_cache.invalidate('src.modules.service')
     await update.message.reply_text(info, parse_mode='Markdown')
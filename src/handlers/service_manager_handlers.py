@@ -8,17 +8,21 @@ Full button interface - no typing required!
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from telegram.constants import ParseMode
-from src.modules.service.advanced_manager import ServiceManager
+from src.modules.service import service_manager
+from src.utils.cache import response_cache
+from src.utils.sessions import session_store
+from src.handlers.router import callback_route
 
 
+@callback_route('menu_servicemanager')
+@callback_route('svcmgr_menu')
 async def show_service_manager_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show main service manager menu"""
     query = update.callback_query
     if query:
         await query.answer()
     
-    service_manager = ServiceManager()
-    counts = service_manager.get_service_counts()
+    counts = await service_manager.get_service_counts()
     
     text = (
         "⚙️ <b>Service Manager Advanced</b>\n\n"
@@ -59,13 +63,24 @@ async def show_service_manager_menu(update: Update, context: ContextTypes.DEFAUL
         await update.message.reply_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
 
-async def show_services_list(update: Update, context: ContextTypes.DEFAULT_TYPE, filter_type: str):
+# Services per page
+SERVICES_PER_PAGE = 15
+
+
+@callback_route('svcmgr_list_{filter_type}')
+async def show_services_list(update: Update, context: ContextTypes.DEFAULT_TYPE, filter_type: str,
+                             page: int = 0, refresh: bool = True):
     """Show list of services with filter"""
     query = update.callback_query
     await query.answer()
     
-    service_manager = ServiceManager()
-    services = service_manager.get_services_list(filter_type)
+    # Opening the list / Refresh scans systemd, Prev/Next reuse the snapshot
+    snapshot = await session_store.get(
+        update.effective_chat.id, f"services:{filter_type}",
+        lambda: service_manager.get_services_list(filter_type),
+        refresh=refresh
+    )
+    services = snapshot.items
     
     filter_labels = {
         'all': '📋 All Services',
@@ -85,15 +100,12 @@ async def show_services_list(update: Update, context: ContextTypes.DEFAULT_TYPE,
         await query.edit_message_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
         return
     
-    # Pagination - 15 per page
-    page = context.user_data.get('svcmgr_page', 0)
-    per_page = 15
-    start_idx = page * per_page
-    end_idx = start_idx + per_page
-    page_services = services[start_idx:end_idx]
+    page_services, page, pages = snapshot.page(page, SERVICES_PER_PAGE)
+    start_idx = page * SERVICES_PER_PAGE
     
     text = f"<b>{title}</b>\n\n"
-    text += f"Showing {start_idx + 1}-{min(end_idx, len(services))} of {len(services)} services:\n\n"
+    text += f"Showing {start_idx + 1}-{start_idx + len(page_services)} of {len(services)} services:\n"
+    text += f"<i>Snapshot {snapshot.age:.0f}s old</i>\n\n"
     
     keyboard = []
     for svc in page_services:
@@ -107,7 +119,7 @@ async def show_services_list(update: Update, context: ContextTypes.DEFAULT_TYPE,
     nav_buttons = []
     if page > 0:
         nav_buttons.append(InlineKeyboardButton("◀️ Prev", callback_data=f"svcmgr_page_{filter_type}_{page-1}"))
-    if end_idx < len(services):
+    if page < pages - 1:
         nav_buttons.append(InlineKeyboardButton("Next ▶️", callback_data=f"svcmgr_page_{filter_type}_{page+1}"))
     if nav_buttons:
         keyboard.append(nav_buttons)
@@ -121,13 +133,19 @@ async def show_services_list(update: Update, context: ContextTypes.DEFAULT_TYPE,
     await query.edit_message_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
 
+@callback_route('svcmgr_page_{filter_type}_{page:int}')
+async def show_services_page(update: Update, context: ContextTypes.DEFAULT_TYPE, filter_type: str, page: int):
+    """Show another page of the services list (from the session snapshot)"""
+    await show_services_list(update, context, filter_type, page=page, refresh=False)
+
+
+@callback_route('svcmgr_detail_{service_name}')
 async def show_service_detail(update: Update, context: ContextTypes.DEFAULT_TYPE, service_name: str):
     """Show detailed information about a service"""
     query = update.callback_query
     await query.answer("Loading service details...")
     
-    service_manager = ServiceManager()
-    details = service_manager.get_service_detail(service_name)
+    details = await service_manager.get_service_detail(service_name)
     
     icon = service_manager.get_status_icon(details['active'])
     
@@ -144,6 +162,8 @@ async def show_service_detail(update: Update, context: ContextTypes.DEFAULT_TYPE
         text += f"<b>Memory:</b> {details['memory']}\n"
     if details['cpu'] != 'N/A':
         text += f"<b>CPU:</b> {details['cpu']}\n"
+    if details['restarts']:
+        text += f"<b>Restarts:</b> {details['restarts']}\n"
     
     if details['description'] != 'N/A':
         text += f"\n<i>{details['description'][:100]}</i>"
@@ -187,13 +207,13 @@ async def show_service_detail(update: Update, context: ContextTypes.DEFAULT_TYPE
     await query.edit_message_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
 
+@callback_route('svcmgr_logs_{service_name}')
 async def show_service_logs(update: Update, context: ContextTypes.DEFAULT_TYPE, service_name: str):
     """Show service logs"""
     query = update.callback_query
     await query.answer("Loading logs...")
     
-    service_manager = ServiceManager()
-    logs = service_manager.get_service_logs(service_name, lines=100)
+    logs = await service_manager.get_service_logs(service_name, lines=100)
     formatted_logs = service_manager.format_logs(logs)
     
     text = (
@@ -212,13 +232,13 @@ async def show_service_logs(update: Update, context: ContextTypes.DEFAULT_TYPE,
     await query.edit_message_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
 
+@callback_route('svcmgr_deps_{service_name}')
 async def show_service_dependencies(update: Update, context: ContextTypes.DEFAULT_TYPE, service_name: str):
     """Show service dependencies"""
     query = update.callback_query
     await query.answer("Loading dependencies...")
     
-    service_manager = ServiceManager()
-    deps = service_manager.get_service_dependencies(service_name)
+    deps = await service_manager.get_service_dependencies(service_name)
     
     # Format and truncate
     if len(deps) > 3000:
@@ -239,6 +259,7 @@ async def show_service_dependencies(update: Update, context: ContextTypes.DEFAUL
     await query.edit_message_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
 
+@callback_route('svcmgr_common')
 async def show_common_services(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show common services menu"""
     query = update.callback_query
@@ -267,12 +288,12 @@ async def show_common_services(update: Update, context: ContextTypes.DEFAULT_TYP
     await query.edit_message_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
 
+@callback_route('svcmgr_cat_{category}')
 async def show_common_category(update: Update, context: ContextTypes.DEFAULT_TYPE, category: str):
     """Show services in a common category"""
     query = update.callback_query
     await query.answer()
     
-    service_manager = ServiceManager()
     common_services = service_manager.get_common_services()
     
     category_labels = {
@@ -301,13 +322,17 @@ async def show_common_category(update: Update, context: ContextTypes.DEFAULT_TYP
     await query.edit_message_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
 
+@callback_route('svcmgr_start_{service_name}', action='start')
+@callback_route('svcmgr_reload_{service_name}', action='reload')
+@callback_route('svcmgr_enable_{service_name}', action='enable')
+@callback_route('svcmgr_confirm_{action:word}_{service_name}')
 async def handle_service_action(update: Update, context: ContextTypes.DEFAULT_TYPE, service_name: str, action: str):
     """Handle service control actions"""
     query = update.callback_query
     await query.answer(f"{action.capitalize()}ing service...")
     
-    service_manager = ServiceManager()
-    success, message = service_manager.control_service(service_name, action)
+    success, message = await service_manager.control_service(service_name, action)
+    response_cache.invalidate('src.modules.service')
     
     # Show result
     icon = "✅" if success else "❌"
@@ -318,6 +343,9 @@ async def handle_service_action(update: Update, context: ContextTypes.DEFAULT_TY
     await show_service_detail(update, context, service_name)
 
 
+@callback_route('svcmgr_stop_{service_name}', action='stop')
+@callback_route('svcmgr_restart_{service_name}', action='restart')
+@callback_route('svcmgr_disable_{service_name}', action='disable')
 async def confirm_service_action(update: Update, context: ContextTypes.DEFAULT_TYPE, service_name: str, action: str):
     """Show confirmation for destructive actions"""
     query = update.callback_query
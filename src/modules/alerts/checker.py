@@ -2,9 +2,9 @@
 Alert Checker
 Background task to check thresholds and trigger alerts
 """
-import psutil
-import time
 from datetime import datetime, timedelta
+from src.modules.metrics import get_snapshot
+from src.modules.docker.cgroups import container_stats
 from .thresholds import AlertThresholds
 from .manager import AlertManager
 
@@ -23,7 +23,7 @@ class AlertChecker:
         if not config.get('enabled'):
             return None
         
-        cpu_percent = psutil.cpu_percent(interval=1)
+        cpu_percent = get_snapshot().cpu_percent
         threshold = config['threshold']
         
         if cpu_percent >= threshold:
@@ -68,7 +68,7 @@ class AlertChecker:
         if not config.get('enabled'):
             return None
         
-        memory = psutil.virtual_memory()
+        memory = get_snapshot().memory
         memory_percent = memory.percent
         threshold = config['threshold']
         
@@ -90,21 +90,18 @@ class AlertChecker:
         threshold = config['threshold']
         alerts = []
         
-        for partition in psutil.disk_partitions():
-            if partition.fstype:
-                try:
-                    usage = psutil.disk_usage(partition.mountpoint)
-                    if usage.percent >= threshold:
-                        alert = self._create_alert(
-                            f'disk_{partition.device}',
-                            usage.percent,
-                            threshold,
-                            f"Disk {partition.device} at {partition.mountpoint} is {usage.percent:.1f}% full!"
-                        )
-                        if alert:
-                            alerts.append(alert)
-                except:
-                    continue
+        for disk in get_snapshot().disks:
+            if not disk.fstype or disk.percent is None:
+                continue
+            if disk.percent >= threshold:
+                alert = self._create_alert(
+                    f'disk_{disk.device}',
+                    disk.percent,
+                    threshold,
+                    f"Disk {disk.device} at {disk.mountpoint} is {disk.percent:.1f}% full!"
+                )
+                if alert:
+                    alerts.append(alert)
         
         return alerts if alerts else None
     
@@ -114,7 +111,7 @@ class AlertChecker:
         if not config.get('enabled'):
             return None
         
-        swap = psutil.swap_memory()
+        swap = get_snapshot().swap
         if swap.total == 0:
             return None
         
@@ -130,12 +127,47 @@ class AlertChecker:
         
         return None
     
+    def check_container_throttle(self):
+        """Check CPU throttling of containers with a CPU quota"""
+        config = self.thresholds.get_threshold('container_throttle')
+        if not config.get('enabled') or not container_stats.available:
+            return None
+        
+        threshold = config['threshold']
+        alerts = []
+        seen = set()
+        
+        # Ratio since the previous check (or a short priming pass)
+        for usage in container_stats.get_all().rows:
+            metric = f'container_throttle_{usage.name}'
+            seen.add(metric)
+            if usage.has_quota and usage.throttled_ratio >= threshold:
+                alert = self._create_alert(
+                    metric,
+                    usage.throttled_ratio,
+                    threshold,
+                    f"Container {usage.name} was throttled in {usage.throttled_ratio:.1f}% of CPU periods "
+                    f"({usage.throttled_percent or 0:.1f}% of the time)!"
+                )
+                if alert:
+                    alerts.append(alert)
+            elif metric in self.manager.active_alerts:
+                self.manager.resolve_alert(metric)
+        
+        # Containers that stopped
+        for metric in list(self.manager.active_alerts):
+            if metric.startswith('container_throttle_') and metric not in seen:
+                self.manager.resolve_alert(metric)
+        
+        return alerts if alerts else None
+    
     def check_all(self):
         """Check all metrics"""
         alerts = []
         
         # Check each metric
-        for check_func in [self.check_cpu, self.check_memory, self.check_disk, self.check_swap]:
+        for check_func in [self.check_cpu, self.check_memory, self.check_disk, self.check_swap,
+                           self.check_container_throttle]:
             result = check_func()
             if result:
                 if isinstance(result, list):
@@ -16,14 +16,22 @@ class AlertThresholds:
     
     def _load_thresholds(self):
         """Load thresholds from file"""
+        defaults = self._default_thresholds()
         if self.config_file.exists():
             try:
                 with open(self.config_file, 'r') as f:
-                    return json.load(f)
+                    thresholds = json.load(f)
+                # Metrics added after the file was saved
+                for metric, values in defaults.items():
+                    thresholds.setdefault(metric, values)
+                return thresholds
             except:
                 pass
         
-        # Default thresholds
+        return defaults
+    
+    def _default_thresholds(self):
+        """Default thresholds"""
         return {
             'cpu': {
                 'enabled': True,
@@ -48,6 +56,13 @@ class AlertThresholds:
                 'threshold': 80,
                 'duration': 5,
                 'last_alert': None
+            },
+            # % of CPU quota periods in which a container was throttled
+            'container_throttle': {
+                'enabled': True,
+                'threshold': 25,
+                'duration': 0,
+                'last_alert': None
             }
         }
     
@@ -1,4 +1,7 @@
 """
 Charts module for visualization
 """
-from .generator import generate_cpu_chart, generate_memory_chart, generate_disk_chart, generate_network_chart
+from .generator import (
+    generate_chart, generate_cpu_chart, generate_memory_chart,
+    generate_disk_chart, generate_network_chart
+)
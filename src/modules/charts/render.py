@@ -0,0 +1,206 @@
+"""
+Chart Renderer
+Pure matplotlib rendering from plain data, safe to run in worker processes
+"""
+import matplotlib
+matplotlib.use('Agg')  # Non-GUI backend
+import matplotlib.dates as mdates
+from matplotlib.figure import Figure
+from datetime import datetime
+from io import BytesIO
+
+# Figures are created without pyplot: no global state, so renders can run
+# in parallel threads or processes.
+
+
+def _dates(timestamps):
+    """Epoch seconds to datetimes for the x-axis"""
+    return [datetime.fromtimestamp(t) for t in timestamps]
+
+
+def _format_time_axis(ax):
+    """Format x-axis as wall-clock time"""
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
+    for label in ax.get_xticklabels():
+        label.set_rotation(45)
+
+
+def _save(fig):
+    """Render figure to PNG bytes"""
+    fig.tight_layout()
+    buf = BytesIO()
+    fig.savefig(buf, format='png', dpi=100, bbox_inches='tight')
+    return buf.getvalue()
+
+
+def render_cpu_chart(data):
+    """
+    Render CPU usage chart
+
+    Args:
+        data: Dict with duration_minutes, timestamps, values
+
+    Returns:
+        bytes: PNG image
+    """
+    timestamps = _dates(data['timestamps'])
+    cpu_percent = data['values']
+
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    ax.plot(timestamps, cpu_percent, linewidth=2, color='#2196F3', marker='o', markersize=2)
+    ax.fill_between(timestamps, cpu_percent, alpha=0.3, color='#2196F3')
+
+    ax.set_xlabel('Time', fontsize=12)
+    ax.set_ylabel('CPU Usage (%)', fontsize=12)
+    ax.set_title(f"CPU Usage - Last {data['duration_minutes']} Minutes", fontsize=14, fontweight='bold')
+    ax.grid(True, alpha=0.3)
+    ax.set_ylim(0, 100)
+    _format_time_axis(ax)
+
+    return _save(fig)
+
+
+def render_memory_chart(data):
+    """
+    Render memory chart (distribution pie + RAM/SWAP history)
+
+    Args:
+        data: Dict with duration_minutes, memory, swap (current values
+            in bytes / percent) and ram / swap_history series
+
+    Returns:
+        bytes: PNG image
+    """
+    memory = data['memory']
+    swap = data['swap']
+
+    labels = ['Used RAM', 'Free RAM', 'Used SWAP', 'Free SWAP']
+    sizes = [
+        memory['used'] / (1024**3),
+        memory['available'] / (1024**3),
+        swap['used'] / (1024**3) if swap['total'] > 0 else 0,
+        (swap['total'] - swap['used']) / (1024**3) if swap['total'] > 0 else 0
+    ]
+    colors = ['#FF5252', '#4CAF50', '#FF9800', '#8BC34A']
+    explode = (0.1, 0, 0.1, 0) if swap['total'] > 0 else (0.1, 0, 0, 0)
+
+    fig = Figure(figsize=(14, 6))
+    ax1, ax2 = fig.subplots(1, 2)
+
+    # Pie chart
+    ax1.pie(sizes, explode=explode, labels=labels, colors=colors, autopct='%1.1f%%',
+            shadow=True, startangle=90)
+    ax1.axis('equal')
+    ax1.set_title('Memory Distribution', fontsize=14, fontweight='bold')
+
+    # Usage history
+    ram_times, ram_percent = data['ram_history']
+    swap_times, swap_percent = data['swap_history']
+
+    ax2.plot(_dates(ram_times), ram_percent, linewidth=2, color='#2196F3',
+             label=f"RAM ({memory['percent']:.1f}%)")
+    if swap['total'] > 0:
+        ax2.plot(_dates(swap_times), swap_percent, linewidth=2, color='#FF9800',
+                 label=f"SWAP ({swap['percent']:.1f}%)")
+    ax2.set_ylabel('Usage (%)', fontsize=12)
+    ax2.set_title(f"Memory Usage - Last {data['duration_minutes']} Minutes", fontsize=14, fontweight='bold')
+    ax2.set_ylim(0, 100)
+    ax2.grid(True, alpha=0.3)
+    ax2.legend(loc='upper left', fontsize=10)
+    _format_time_axis(ax2)
+
+    return _save(fig)
+
+
+def render_disk_chart(data):
+    """
+    Render disk usage bars plus I/O history
+
+    Args:
+        data: Dict with duration_minutes, partitions [(device, percent)],
+            read / write series in KB/s
+
+    Returns:
+        bytes: PNG image
+    """
+    devices = [device for device, _ in data['partitions']]
+    usage_percent = [percent for _, percent in data['partitions']]
+    colors_list = []
+    for percent in usage_percent:
+        # Color based on usage
+        if percent >= 90:
+            colors_list.append('#F44336')  # Red
+        elif percent >= 70:
+            colors_list.append('#FF9800')  # Orange
+        else:
+            colors_list.append('#4CAF50')  # Green
+
+    if not devices:
+        devices = ['No Data']
+        usage_percent = [0]
+        colors_list = ['#CCCCCC']
+
+    bar_height = max(6, len(devices) * 0.5)
+    fig = Figure(figsize=(12, bar_height + 5))
+    ax, ax_io = fig.subplots(2, 1, gridspec_kw={'height_ratios': [bar_height, 5]})
+
+    bars = ax.barh(devices, usage_percent, color=colors_list)
+    ax.set_xlabel('Usage (%)', fontsize=12)
+    ax.set_title('Disk Usage by Partition', fontsize=14, fontweight='bold')
+    ax.set_xlim(0, 100)
+    ax.grid(True, alpha=0.3, axis='x')
+
+    # Add value labels
+    for bar, percent in zip(bars, usage_percent):
+        width = bar.get_width()
+        ax.text(width + 2, bar.get_y() + bar.get_height()/2.,
+                f'{percent:.1f}%', ha='left', va='center', fontweight='bold')
+
+    # Disk I/O history
+    read_times, read_rate = data['read']
+    write_times, write_rate = data['write']
+
+    ax_io.plot(_dates(read_times), read_rate, linewidth=2, color='#2196F3', label='Read')
+    ax_io.plot(_dates(write_times), write_rate, linewidth=2, color='#FF5722', label='Write')
+    ax_io.set_ylabel('Speed (KB/s)', fontsize=12)
+    ax_io.set_title(f"Disk I/O - Last {data['duration_minutes']} Minutes", fontsize=14, fontweight='bold')
+    ax_io.grid(True, alpha=0.3)
+    ax_io.legend(loc='upper right', fontsize=10)
+    _format_time_axis(ax_io)
+
+    return _save(fig)
+
+
+def render_network_chart(data):
+    """
+    Render network traffic chart
+
+    Args:
+        data: Dict with duration_minutes, sent / recv series in KB/s
+
+    Returns:
+        bytes: PNG image
+    """
+    sent_times, bytes_sent_list = data['sent']
+    recv_times, bytes_recv_list = data['recv']
+    sent_times = _dates(sent_times)
+    recv_times = _dates(recv_times)
+
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
+
+    ax.plot(sent_times, bytes_sent_list, linewidth=2, color='#FF5722', label='Upload')
+    ax.plot(recv_times, bytes_recv_list, linewidth=2, color='#2196F3', label='Download')
+
+    ax.fill_between(sent_times, bytes_sent_list, alpha=0.3, color='#FF5722')
+    ax.fill_between(recv_times, bytes_recv_list, alpha=0.3, color='#2196F3')
+
+    ax.set_xlabel('Time', fontsize=12)
+    ax.set_ylabel('Speed (KB/s)', fontsize=12)
+    ax.set_title(f"Network Traffic - Last {data['duration_minutes']} Minutes", fontsize=14, fontweight='bold')
+    ax.legend(loc='upper right', fontsize=10)
+    ax.grid(True, alpha=0.3)
+    _format_time_axis(ax)
+
+    return _save(fig)
@@ -2,8 +2,10 @@
 Battery Information Module
 """
 import psutil
+from src.utils.cache import cacheable
 
 
+@cacheable(ttl=10)
 def get_battery_info() -> str:
     """Informasi battery (untuk laptop)"""
     info = f"🔋 *INFORMASI BATTERY*\n\n"
@@ -3,8 +3,11 @@ Device Information Module
 """
 import platform
 import subprocess
+from src.utils.capabilities import capabilities
+from src.utils.cache import cacheable
 
 
+@cacheable()
 def get_device_info() -> str:
     """Informasi device/hardware"""
     info = f"🔧 *INFORMASI DEVICE*\n\n"
@@ -17,25 +20,28 @@ def get_device_info() -> str:
     info += f"*Processor:* {uname.processor or platform.processor()}\n\n"
     
     # Try to get more hardware info from dmidecode (requires root)
-    try:
-        # Get system manufacturer and product
-        result = subprocess.run(
-            ['sudo', 'dmidecode', '-t', 'system'],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
+    if not capabilities.has('dmidecode'):
+        info += "*DMI Info:* Tidak tersedia (dmidecode tidak terinstall)\n\n"
+    else:
+        try:
+            # Get system manufacturer and product
+            result = subprocess.run(
+                ['sudo', 'dmidecode', '-t', 'system'],
+                capture_output=True,
+                text=True,
+                timeout=5
+            )
         
-        if result.returncode == 0:
-            info += "*SYSTEM INFO (DMI):*\n"
-            lines = result.stdout.split('\n')
-            for line in lines:
-                line = line.strip()
-                if 'Manufacturer:' in line or 'Product Name:' in line or 'Version:' in line or 'Serial Number:' in line:
-                    info += f"{line}\n"
-            info += "\n"
-    except:
-        info += "*DMI Info:* Tidak tersedia (perlu sudo)\n\n"
+            if result.returncode == 0:
+                info += "*SYSTEM INFO (DMI):*\n"
+                lines = result.stdout.split('\n')
+                for line in lines:
+                    line = line.strip()
+                    if 'Manufacturer:' in line or 'Product Name:' in line or 'Version:' in line or 'Serial Number:' in line:
+                        info += f"{line}\n"
+                info += "\n"
+        except:
+            info += "*DMI Info:* Tidak tersedia (perlu sudo)\n\n"
     
     # USB devices
     try:
@@ -3,8 +3,10 @@ Sensors Information Module
 Temperature, fans, etc
 """
 import psutil
+from src.utils.cache import cacheable
 
 
+@cacheable(ttl=5)
 def get_sensors_info() -> str:
     """Informasi sensor (temperature, fans)"""
     info = f"🌡️ *INFORMASI SENSORS*\n\n"
@@ -3,8 +3,10 @@ Disk Information Module
 """
 import psutil
 from src.utils.formatters import format_bytes
+from src.utils.cache import cacheable
 
 
+@cacheable(ttl=5)
 def get_disk_info() -> str:
     """Informasi disk semua partisi"""
     info = f"💾 *INFORMASI DISK*\n\n"
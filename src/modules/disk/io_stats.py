@@ -3,8 +3,10 @@ Disk IO Statistics Module
 """
 import psutil
 from src.utils.formatters import format_bytes
+from src.utils.cache import cacheable
 
 
+@cacheable(ttl=2)
 def get_disk_io_stats() -> str:
     """Statistik IO disk"""
     info = f"📊 *DISK IO STATISTICS*\n\n"
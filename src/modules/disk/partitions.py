@@ -3,8 +3,10 @@ Disk Partitions Module
 """
 import psutil
 from src.utils.formatters import format_bytes
+from src.utils.cache import cacheable
 
 
+@cacheable(ttl=30)
 def get_partitions_info() -> str:
     """Informasi detail partisi"""
     info = f"💿 *PARTISI DISK*\n\n"
@@ -5,6 +5,12 @@ This module provides Docker monitoring and management functionality.
 Requires Docker to be installed and running on the system.
 """
 
+from .api import DockerAPI, DockerAPIError, docker_api
+from .events import DockerEventMonitor, docker_events
 from .manager import DockerManager
 
-__all__ = ['DockerManager']
+# Global Docker manager instance
+docker_manager = DockerManager()
+
+__all__ = ['DockerAPI', 'DockerAPIError', 'DockerEventMonitor', 'DockerManager',
+           'docker_api', 'docker_events', 'docker_manager']
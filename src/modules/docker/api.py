@@ -0,0 +1,448 @@
+"""
+Docker Engine API
+Minimal HTTP/1.1 client for the daemon's unix socket with connection reuse
+"""
+import asyncio
+import codecs
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import quote, urlencode
+
+from config.settings import config
+
+logger = logging.getLogger(__name__)
+
+# Open connections at most (also the number of concurrent requests)
+MAX_CONNECTIONS = 8
+
+# Seconds a CPU sample is used as the previous one for the next stats call
+STATS_SAMPLE_AGE = 60
+
+# Errors that mean the socket itself is unusable (CLI fallback)
+TRANSPORT_ERRORS = (OSError, EOFError, ValueError)
+
+
+class DockerAPIError(Exception):
+    """The daemon answered with an error status (404 no such container, ...)"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+        self.message = message
+
+
+@dataclass
+class Response:
+    """One HTTP response"""
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+
+    def json(self) -> Any:
+        return json.loads(self.body) if self.body else None
+
+
+async def _read_head(reader: asyncio.StreamReader) -> Tuple[str, int, Dict[str, str]]:
+    """Status line and headers; (HTTP version, status, lower-cased headers)"""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionResetError("connection closed by the daemon")
+    version, status, *_ = status_line.decode('latin-1').split(' ', 2)
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    return version, int(status), headers
+
+
+def _request_head(method: str, path: str, params: Optional[Dict[str, Any]], length: int,
+                  json_body: bool = False) -> bytes:
+    query = f"?{urlencode(params)}" if params else ''
+    return (
+        f"{method} {path}{query} HTTP/1.1\r\n"
+        f"Host: docker\r\n"
+        f"Content-Length: {length}\r\n"
+        + ("Content-Type: application/json\r\n" if json_body else '')
+        + "\r\n"
+    ).encode('latin-1')
+
+
+def _error_message(body: bytes) -> str:
+    try:
+        return json.loads(body).get('message', '').strip()
+    except (ValueError, AttributeError):
+        return body.decode('utf-8', errors='replace').strip()
+
+
+async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+    """Body sent with Transfer-Encoding: chunked"""
+    chunks = []
+    while True:
+        size_line = await reader.readline()
+        if not size_line:
+            raise EOFError("connection closed inside a chunked body")
+        size = int(size_line.split(b';', 1)[0].strip(), 16)
+        if size == 0:
+            # Trailer section ends with an empty line
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass
+            return b''.join(chunks)
+        chunks.append(await reader.readexactly(size))
+        await reader.readline()
+
+
+async def _stream_body(reader: asyncio.StreamReader, chunked: bool) -> AsyncIterator[bytes]:
+    """Body data of a streaming response as it arrives, until the daemon ends it"""
+    while True:
+        if chunked:
+            size_line = await reader.readline()
+            if not size_line:
+                return
+            size = int(size_line.split(b';', 1)[0].strip(), 16)
+            if size == 0:
+                return
+            data = await reader.readexactly(size)
+            await reader.readline()
+        else:
+            data = await reader.read(65536)
+            if not data:
+                return
+        yield data
+
+
+def demux_logs(data: bytes, multiplexed: Optional[bool] = None) -> str:
+    """
+    Text of a /logs response
+
+    Containers without a TTY send stdout / stderr frames, each with an
+    8-byte header (stream, 0, 0, 0, big-endian size).
+    """
+    if multiplexed is None:
+        multiplexed = len(data) >= 8 and data[0] in (0, 1, 2) and data[1:4] == b'\0\0\0'
+    if multiplexed:
+        frames = []
+        offset = 0
+        while offset + 8 <= len(data):
+            size = int.from_bytes(data[offset + 4:offset + 8], 'big')
+            frames.append(data[offset + 8:offset + 8 + size])
+            offset += 8 + size
+        data = b''.join(frames)
+    return data.decode('utf-8', errors='replace')
+
+
+class DockerAPI:
+    """
+    Talk to dockerd over /var/run/docker.sock
+
+    - connections are kept open (HTTP keep-alive) and reused, so a call
+      costs one request/response instead of starting the docker CLI
+    - a connection is only put back after a complete response; one
+      interrupted by a timeout or cancellation is closed
+    - when the socket is missing or refuses connections the API is
+      skipped for CAPABILITY_TTL seconds and callers use the CLI
+    """
+
+    def __init__(self, socket_path: Optional[str] = None, max_connections: int = MAX_CONNECTIONS):
+        self.socket_path = config.DOCKER_SOCKET if socket_path is None else socket_path
+        self.max_connections = max_connections
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._failed_at: Optional[float] = None
+        self._samples: Dict[str, Tuple[float, Dict]] = {}
+        self.requests = 0
+        self.connects = 0
+        self.failures = 0
+
+    @property
+    def usable(self) -> bool:
+        """Socket configured, present and not failing recently"""
+        if not self.socket_path:
+            return False
+        if self._failed_at is not None and time.monotonic() - self._failed_at < config.CAPABILITY_TTL:
+            return False
+        return os.path.exists(self.socket_path)
+
+    def mark_failed(self, error: Exception):
+        """Skip the API for a while (socket gone, permission denied, ...)"""
+        if self._failed_at is None:
+            logger.warning(f"Docker API on {self.socket_path} unusable, using the CLI: {error}")
+        self._failed_at = time.monotonic()
+        self.failures += 1
+        self.close()
+
+    def reset(self):
+        """Try the socket again on the next call"""
+        self._failed_at = None
+
+    def close(self):
+        """Close idle connections"""
+        for _, writer in self._idle:
+            writer.close()
+        self._idle.clear()
+
+    async def request(self, method: str, path: str, params: Optional[Dict[str, Any]] = None,
+                      body: Any = None, timeout: float = 10) -> Response:
+        """
+        Send one request and read the whole response
+
+        Raises:
+            DockerAPIError: status >= 400
+            asyncio.TimeoutError: no complete response in time
+            OSError / EOFError / ValueError: socket unusable or garbled reply
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_connections)
+        async with self._slots:
+            response = await asyncio.wait_for(self._exchange(method, path, params, body), timeout)
+
+        self.requests += 1
+        if response.status >= 400:
+            raise DockerAPIError(response.status, _error_message(response.body))
+        return response
+
+    async def _exchange(self, method: str, path: str, params: Optional[Dict[str, Any]],
+                        body: Any) -> Response:
+        data = json.dumps(body).encode() if body is not None else b''
+        payload = _request_head(method, path, params, len(data), body is not None) + data
+
+        # A reused connection may have been closed by the daemon in the
+        # meantime; that shows up before any byte of the response
+        while self._idle:
+            reader, writer = self._idle.pop()
+            try:
+                return await self._send(reader, writer, method, payload)
+            except (ConnectionResetError, BrokenPipeError):
+                continue
+
+        reader, writer = await asyncio.open_unix_connection(self.socket_path)
+        self.connects += 1
+        return await self._send(reader, writer, method, payload)
+
+    async def _send(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                    method: str, payload: bytes) -> Response:
+        try:
+            writer.write(payload)
+            await writer.drain()
+
+            version, status, headers = await _read_head(reader)
+            keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+            if status in (204, 304) or method == 'HEAD':
+                body = b''
+            elif 'chunked' in headers.get('transfer-encoding', '').lower():
+                body = await _read_chunked(reader)
+            elif 'content-length' in headers:
+                body = await reader.readexactly(int(headers['content-length']))
+            else:
+                body = await reader.read()
+                keep_alive = False
+        except BaseException:
+            # Unknown position in the stream: never reuse this connection
+            writer.close()
+            raise
+
+        if keep_alive and len(self._idle) < self.max_connections:
+            self._idle.append((reader, writer))
+        else:
+            writer.close()
+        return Response(status, headers, body)
+
+    async def get_json(self, path: str, params: Optional[Dict[str, Any]] = None,
+                       timeout: float = 10) -> Any:
+        return (await self.request('GET', path, params, timeout=timeout)).json()
+
+    # ---- Endpoints -------------------------------------------------------
+
+    async def ping(self) -> bool:
+        """Daemon reachable through the socket"""
+        if not self.usable:
+            return False
+        try:
+            await self.request('GET', '/_ping', timeout=5)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        except (DockerAPIError, *TRANSPORT_ERRORS) as e:
+            self.mark_failed(e)
+            return False
+
+    async def containers(self, include_stopped: bool = True,
+                         filters: Optional[Dict[str, List[str]]] = None) -> List[Dict]:
+        """GET /containers/json (same data as `docker ps`)"""
+        params = {'all': 'true' if include_stopped else 'false'}
+        if filters:
+            params['filters'] = json.dumps(filters)
+        return await self.get_json('/containers/json', params)
+
+    async def inspect(self, container_id: str) -> Dict:
+        """GET /containers/{id}/json (same data as `docker inspect`)"""
+        return await self.get_json(f"/containers/{quote(container_id, safe='')}/json")
+
+    async def stats(self, container_id: str) -> Dict:
+        """
+        One stats sample with precpu_stats filled in
+
+        The daemon needs two samples for a CPU percentage; with
+        stream=false it waits a second for the second one. When this
+        container was sampled recently that earlier sample is used as
+        precpu_stats and the daemon is asked for a one-shot sample.
+        """
+        path = f"/containers/{quote(container_id, safe='')}/stats"
+        now = time.monotonic()
+        previous = self._samples.get(container_id)
+        if previous is not None and now - previous[0] < STATS_SAMPLE_AGE:
+            stats = await self.get_json(path, {'stream': 'false', 'one-shot': 'true'})
+            if not (stats.get('precpu_stats') or {}).get('system_cpu_usage'):
+                stats['precpu_stats'] = previous[1]
+        else:
+            stats = await self.get_json(path, {'stream': 'false'}, timeout=15)
+
+        self._samples = {key: sample for key, sample in self._samples.items()
+                         if now - sample[0] < STATS_SAMPLE_AGE}
+        self._samples[container_id] = (now, stats.get('cpu_stats') or {})
+        return stats
+
+    async def logs(self, container_id: str, tail: int = 50) -> str:
+        """GET /containers/{id}/logs (stdout and stderr)"""
+        response = await self.request(
+            'GET', f"/containers/{quote(container_id, safe='')}/logs",
+            {'stdout': 'true', 'stderr': 'true', 'tail': str(tail)}
+        )
+        content_type = response.headers.get('content-type', '')
+        multiplexed = None
+        if 'multiplexed-stream' in content_type:
+            multiplexed = True
+        elif 'raw-stream' in content_type:
+            multiplexed = False
+        return demux_logs(response.body, multiplexed)
+
+    async def container_action(self, container_id: str, action: str, timeout: float = 10) -> bool:
+        """POST /containers/{id}/start|stop|restart (304 = already in that state)"""
+        await self.request('POST', f"/containers/{quote(container_id, safe='')}/{action}", timeout=timeout)
+        return True
+
+    async def remove(self, container_id: str, force: bool = False) -> bool:
+        """DELETE /containers/{id}"""
+        await self.request('DELETE', f"/containers/{quote(container_id, safe='')}",
+                           {'force': 'true' if force else 'false'})
+        return True
+
+    async def events(self, since: Optional[float] = None,
+                     filters: Optional[Dict[str, List[str]]] = None) -> AsyncIterator[Dict]:
+        """
+        GET /events: yield events as the daemon sends them
+
+        Uses its own connection (not the pool) and never times out; the
+        iteration ends when the daemon closes the stream.
+
+        Args:
+            since: Unix time to replay events from (after a reconnect)
+            filters: e.g. {'type': ['container']}
+        """
+        params = {}
+        if since is not None:
+            params['since'] = f"{since:.9f}"
+        if filters:
+            params['filters'] = json.dumps(filters)
+
+        reader, writer = await asyncio.open_unix_connection(self.socket_path)
+        self.connects += 1
+        try:
+            writer.write(_request_head('GET', '/events', params, 0))
+            await writer.drain()
+            _, status, headers = await _read_head(reader)
+            if status >= 400:
+                raise DockerAPIError(status, _error_message(await reader.read()))
+
+            chunked = 'chunked' in headers.get('transfer-encoding', '').lower()
+            text = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            decoder = json.JSONDecoder()
+            buffer = ''
+            async for data in _stream_body(reader, chunked):
+                # One event per line, but a chunk may hold several or half of one
+                buffer += text.decode(data)
+                while True:
+                    buffer = buffer.lstrip()
+                    if not buffer:
+                        break
+                    try:
+                        event, end = decoder.raw_decode(buffer)
+                    except ValueError:
+                        break
+                    buffer = buffer[end:]
+                    yield event
+        finally:
+            writer.close()
+
+    async def follow_logs(self, container_id: str, tail: int = 20) -> AsyncIterator[str]:
+        """
+        GET /containers/{id}/logs?follow=true: yield lines as they are written
+
+        Like events(): own connection, no timeout; the iteration ends when
+        the container stops.
+        """
+        params = {'stdout': 'true', 'stderr': 'true', 'follow': 'true', 'tail': str(tail)}
+        reader, writer = await asyncio.open_unix_connection(self.socket_path)
+        self.connects += 1
+        try:
+            writer.write(_request_head('GET', f"/containers/{quote(container_id, safe='')}/logs", params, 0))
+            await writer.drain()
+            _, status, headers = await _read_head(reader)
+            if status >= 400:
+                raise DockerAPIError(status, _error_message(await reader.read()))
+
+            chunked = 'chunked' in headers.get('transfer-encoding', '').lower()
+            content_type = headers.get('content-type', '')
+            multiplexed = None
+            if 'multiplexed-stream' in content_type:
+                multiplexed = True
+            elif 'raw-stream' in content_type:
+                multiplexed = False
+            text = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            frames = b''
+            buffer = ''
+            async for data in _stream_body(reader, chunked):
+                if multiplexed is None:
+                    multiplexed = len(data) >= 8 and data[0] in (0, 1, 2) and data[1:4] == b'\0\0\0'
+                if multiplexed:
+                    # Frames may be split across chunks: keep the incomplete one
+                    frames += data
+                    payload = []
+                    offset = 0
+                    while offset + 8 <= len(frames):
+                        size = int.from_bytes(frames[offset + 4:offset + 8], 'big')
+                        if offset + 8 + size > len(frames):
+                            break
+                        payload.append(frames[offset + 8:offset + 8 + size])
+                        offset += 8 + size
+                    frames = frames[offset:]
+                    data = b''.join(payload)
+
+                buffer += text.decode(data)
+                *lines, buffer = buffer.split('\n')
+                for line in lines:
+                    yield line.rstrip('\r')
+            if buffer:
+                yield buffer
+        finally:
+            writer.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'usable': self.usable,
+            'requests': self.requests,
+            'connects': self.connects,
+            'idle': len(self._idle),
+            'failures': self.failures,
+        }
+
+
+# Global Docker API client
+docker_api = DockerAPI()
@@ -0,0 +1,128 @@
+"""
+Docker Bulk Operations
+Run one action over many containers at once, in Compose dependency order
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BulkOutcome:
+    """Result for one container of a bulk operation"""
+    id: str
+    name: str
+    status: str = 'pending'       # pending / running / ok / failed / skipped
+    detail: str = ''
+    duration: float = 0.0
+
+
+class BulkOperation:
+    """
+    start / stop / remove over a list of containers (get_containers() rows)
+
+    - at most `parallelism` containers are handled at the same time
+    - within a Compose project a container waits for the services it
+      depends on when starting, and for its dependents when stopping;
+      containers whose dependency failed to start are skipped
+    - dependency cycles are ignored (those containers are not ordered)
+    - outcomes are updated in place, so progress can be shown while it runs
+    """
+
+    def __init__(self, action: str, containers: List[Dict[str, Any]], parallelism: int = 4):
+        self.action = action
+        self.parallelism = max(1, parallelism)
+        self.outcomes: Dict[str, BulkOutcome] = {
+            container['id']: BulkOutcome(container['id'], container.get('name') or container['id'])
+            for container in containers
+        }
+        self.waits = self._plan(containers) if action in ('start', 'stop') else {}
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def _plan(self, containers: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+        """Container ID -> IDs in this batch it has to wait for"""
+        by_service: Dict[tuple, List[str]] = {}
+        for container in containers:
+            if container.get('project') and container.get('service'):
+                by_service.setdefault((container['project'], container['service']), []).append(container['id'])
+
+        waits: Dict[str, List[str]] = {container['id']: [] for container in containers}
+        for container in containers:
+            for service in container.get('depends_on') or []:
+                for dependency in by_service.get((container.get('project'), service), []):
+                    if self.action == 'start':
+                        waits[container['id']].append(dependency)
+                    else:
+                        # Stop dependents before what they depend on
+                        waits[dependency].append(container['id'])
+
+        # Kahn's algorithm; whatever is left sits on (or behind) a cycle
+        remaining = {container_id: set(deps) for container_id, deps in waits.items()}
+        ready = [container_id for container_id, deps in remaining.items() if not deps]
+        while ready:
+            done = ready.pop()
+            del remaining[done]
+            for container_id, deps in remaining.items():
+                if done in deps:
+                    deps.discard(done)
+                    if not deps:
+                        ready.append(container_id)
+        cyclic = list(remaining)
+        if cyclic:
+            logger.warning(f"Compose dependency cycle between {', '.join(cyclic)}, not ordering them")
+            for container_id in cyclic:
+                waits[container_id] = [dep for dep in waits[container_id] if dep not in cyclic]
+        return waits
+
+    async def run(self, operation: Callable[[str], Awaitable[bool]]) -> 'BulkOperation':
+        """Apply operation(container_id) to every container"""
+        self.started_at = time.monotonic()
+        semaphore = asyncio.Semaphore(self.parallelism)
+        finished = {container_id: asyncio.Event() for container_id in self.outcomes}
+
+        async def handle(container_id: str):
+            outcome = self.outcomes[container_id]
+            try:
+                for dependency in self.waits.get(container_id, []):
+                    await finished[dependency].wait()
+                failed = [self.outcomes[dep].name for dep in self.waits.get(container_id, [])
+                          if self.outcomes[dep].status != 'ok']
+                if failed and self.action == 'start':
+                    outcome.status = 'skipped'
+                    outcome.detail = f"{', '.join(failed)} did not start"
+                    return
+
+                async with semaphore:
+                    outcome.status = 'running'
+                    start = time.monotonic()
+                    try:
+                        ok = await operation(container_id)
+                    except Exception as e:
+                        ok = False
+                        outcome.detail = str(e)
+                    outcome.duration = time.monotonic() - start
+                    outcome.status = 'ok' if ok else 'failed'
+            finally:
+                finished[container_id].set()
+
+        await asyncio.gather(*(handle(container_id) for container_id in self.outcomes))
+        self.finished_at = time.monotonic()
+        return self
+
+    def count(self, status: str) -> int:
+        return sum(1 for outcome in self.outcomes.values() if outcome.status == status)
+
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
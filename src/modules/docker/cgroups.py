@@ -0,0 +1,562 @@
+"""
+Container Stats Engine
+Read CPU, memory, I/O and pids of every container from its cgroup files
+"""
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+import psutil
+
+from config.settings import config
+
+logger = logging.getLogger(__name__)
+
+CGROUP_ROOT = '/sys/fs/cgroup'
+
+# Where dockerd puts container cgroups (systemd and cgroupfs drivers)
+DOCKER_PARENTS = ('system.slice', 'docker')
+
+# cgroup v1 controller directories (first existing one is used)
+V1_CONTROLLERS = {
+    'cpu': ('cpuacct', 'cpu,cpuacct'),
+    'throttle': ('cpu', 'cpu,cpuacct'),
+    'memory': ('memory',),
+    'io': ('blkio',),
+    'pids': ('pids',),
+}
+
+# Seconds a pass stays usable as the "previous" one for rates in views
+MAX_DELTA_AGE = 60
+
+# Seconds a pass is kept at all (the alert check samples less often)
+MAX_KEEP_AGE = 3600
+
+# Passes remembered per container for throttling / pressure history
+HISTORY_SIZE = 60
+
+
+def _container_id(entry: str) -> Optional[str]:
+    """Full container ID from a cgroup directory name"""
+    if entry.startswith('docker-') and entry.endswith('.scope'):
+        entry = entry[len('docker-'):-len('.scope')]
+    if len(entry) == 64 and all(c in '0123456789abcdef' for c in entry):
+        return entry
+    return None
+
+
+def _read(path: str) -> str:
+    with open(path) as f:
+        return f.read()
+
+
+def _read_int(path: str, default: int = 0) -> int:
+    try:
+        value = _read(path).strip()
+    except OSError:
+        return default
+    return int(value) if value.isdigit() else default
+
+
+def _read_pressure(path: str) -> Optional[Dict[str, int]]:
+    """
+    PSI file: stall time (total, µs) per line, e.g.
+    'some avg10=0.00 avg60=0.00 avg300=0.00 total=1234'
+
+    Returns:
+        {'some': µs, 'full': µs}, or None when PSI is not available
+    """
+    try:
+        content = _read(path)
+    except OSError:
+        return None
+    totals = {}
+    for line in content.splitlines():
+        kind, _, rest = line.partition(' ')
+        for item in rest.split():
+            key, _, value = item.partition('=')
+            if key == 'total' and value.isdigit():
+                totals[kind] = int(value)
+    return totals
+
+
+def _read_keyed(path: str) -> Dict[str, int]:
+    """'key value' lines (cpu.stat, memory.stat)"""
+    values = {}
+    try:
+        for line in _read(path).splitlines():
+            key, _, value = line.partition(' ')
+            if value.isdigit():
+                values[key] = int(value)
+    except OSError:
+        pass
+    return values
+
+
+@dataclass
+class CgroupPaths:
+    """cgroup directories of one container (all the same on cgroup v2)"""
+    id: str
+    cpu: str
+    memory: str
+    io: str
+    pids: str
+    throttle: str = ''      # cpu controller (v1 may mount it apart from cpuacct)
+
+
+@dataclass
+class CgroupSample:
+    """Counters of one container at one moment"""
+    cpu_usec: int
+    memory: int
+    memory_limit: int
+    io_read: int
+    io_write: int
+    pids: int
+    net_rx: int
+    net_tx: int
+    # CPU quota enforcement (cpu.stat); periods stay 0 without a quota
+    nr_periods: int = 0
+    nr_throttled: int = 0
+    throttled_usec: int = 0
+    # Memory events: over memory.high, hit memory.max, OOM kills
+    memory_high: int = 0
+    memory_max: int = 0
+    oom_kill: int = 0
+    # Cumulative PSI stall time (µs); None without per-cgroup PSI
+    cpu_pressure: Optional[int] = None
+    memory_pressure: Optional[int] = None
+    memory_full_pressure: Optional[int] = None
+    timestamp: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class ContainerUsage:
+    """Stats row of one container (rates over the last sampling window)"""
+    id: str
+    name: str
+    cpu_percent: float          # 100% = one full core, like `docker stats`
+    memory: int
+    memory_limit: int
+    io_read_rate: float         # bytes/s
+    io_write_rate: float
+    net_rx: int
+    net_tx: int
+    pids: int
+    has_quota: bool = False
+    throttled_ratio: float = 0.0        # % of quota periods that were throttled
+    throttled_percent: float = 0.0      # throttled time per wall time, %
+    memory_high_events: int = 0         # events during the window
+    memory_max_events: int = 0
+    oom_kills: int = 0
+    cpu_pressure: Optional[float] = None            # % of the window with stalled tasks
+    memory_pressure: Optional[float] = None
+    memory_full_pressure: Optional[float] = None
+    peak_throttled_ratio: float = 0.0   # highest ratio in the history
+
+    @property
+    def memory_percent(self) -> float:
+        return self.memory / self.memory_limit * 100 if self.memory_limit else 0.0
+
+
+class ContainerStatsTable:
+    """Snapshot of all sampled containers shared by every container view"""
+
+    def __init__(self, rows: List[ContainerUsage], timestamp: float, window: float,
+                 requested: Optional[Set[str]] = None):
+        self.rows = rows
+        self.timestamp = timestamp
+        self.window = window
+        # IDs asked for, including containers whose cgroup was not found
+        self.requested = requested if requested is not None else {row.id for row in rows}
+        self._by_id = {row.id: row for row in rows}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __contains__(self, container_id: str) -> bool:
+        return container_id in self._by_id
+
+    def get(self, container_id: str) -> Optional[ContainerUsage]:
+        return self._by_id.get(container_id)
+
+    def top(self, sort_by: str = 'cpu', limit: Optional[int] = 20) -> List[ContainerUsage]:
+        """Rows sorted by cpu, memory, io, throttled or pressure"""
+        if sort_by == 'memory':
+            key = lambda row: row.memory
+        elif sort_by == 'io':
+            key = lambda row: row.io_read_rate + row.io_write_rate
+        elif sort_by == 'throttled':
+            key = lambda row: (row.throttled_ratio, row.throttled_percent)
+        elif sort_by == 'pressure':
+            key = lambda row: max(row.cpu_pressure or 0, row.memory_pressure or 0)
+        else:
+            key = lambda row: row.cpu_percent
+        return sorted(self.rows, key=key, reverse=True)[:limit]
+
+
+class CgroupReader:
+    """
+    Locate container cgroups once and read their counters
+
+    The ID -> directory map is built by listing the docker parent
+    directories; it is rebuilt only when asked for an unknown container
+    or when a directory disappears.
+    """
+
+    def __init__(self, root: str = CGROUP_ROOT):
+        self.root = root
+        self.version = 2 if os.path.exists(os.path.join(root, 'cgroup.controllers')) else 1
+        self._paths: Dict[str, CgroupPaths] = {}
+        self._short: Dict[str, CgroupPaths] = {}
+        self.rescans = 0
+
+    @property
+    def available(self) -> bool:
+        return os.path.isdir(self.root)
+
+    def _scan_parents(self, base: str) -> Dict[str, str]:
+        found = {}
+        for parent in DOCKER_PARENTS:
+            directory = os.path.join(base, parent)
+            try:
+                entries = os.listdir(directory)
+            except OSError:
+                continue
+            for entry in entries:
+                container_id = _container_id(entry)
+                if container_id:
+                    found[container_id] = os.path.join(directory, entry)
+        return found
+
+    def rescan(self):
+        """Rebuild the container ID -> cgroup directories map"""
+        self.rescans += 1
+        if self.version == 2:
+            self._paths = {
+                container_id: CgroupPaths(container_id, path, path, path, path, path)
+                for container_id, path in self._scan_parents(self.root).items()
+            }
+        else:
+            self._paths = self._scan_v1()
+        # `docker ps` shows 12-character IDs
+        self._short = {container_id[:12]: paths for container_id, paths in self._paths.items()}
+
+    def _scan_v1(self) -> Dict[str, CgroupPaths]:
+        per_controller = {}
+        for controller, names in V1_CONTROLLERS.items():
+            per_controller[controller] = {}
+            for name in names:
+                base = os.path.join(self.root, name)
+                if os.path.isdir(base):
+                    per_controller[controller] = self._scan_parents(base)
+                    break
+        return {
+            container_id: CgroupPaths(
+                container_id,
+                path,
+                per_controller['memory'].get(container_id, ''),
+                per_controller['io'].get(container_id, ''),
+                per_controller['pids'].get(container_id, ''),
+                per_controller['throttle'].get(container_id, ''),
+            )
+            for container_id, path in per_controller['cpu'].items()
+        }
+
+    def locate(self, container_ids: Iterable[str]) -> Dict[str, CgroupPaths]:
+        """cgroup paths for container IDs (full or 12-character IDs)"""
+        wanted = list(container_ids)
+        located = self._match(wanted)
+        if len(located) < len(wanted):
+            self.rescan()
+            located = self._match(wanted)
+        return located
+
+    def _match(self, container_ids: List[str]) -> Dict[str, CgroupPaths]:
+        located = {}
+        for container_id in container_ids:
+            paths = self._paths.get(container_id) or self._short.get(container_id)
+            if paths is not None:
+                located[container_id] = paths
+        return located
+
+    def known(self) -> List[str]:
+        """Full IDs of every container with a cgroup (running containers)"""
+        self.rescan()
+        return list(self._paths)
+
+    def forget(self, container_id: str):
+        self._paths.pop(container_id, None)
+        self._short.pop(container_id[:12], None)
+
+    def read(self, paths: CgroupPaths, total_memory: int) -> CgroupSample:
+        """
+        Read one container's counters
+
+        Raises:
+            FileNotFoundError: the container's cgroup is gone
+        """
+        if self.version == 2:
+            cpu_stat = _read_keyed(os.path.join(paths.cpu, 'cpu.stat'))
+            cpu_usec = cpu_stat['usage_usec']
+            throttled_usec = cpu_stat.get('throttled_usec', 0)
+            memory = _read_int(os.path.join(paths.memory, 'memory.current'))
+            limit = _read_int(os.path.join(paths.memory, 'memory.max'))
+            inactive = _read_keyed(os.path.join(paths.memory, 'memory.stat')).get('inactive_file', 0)
+            events = _read_keyed(os.path.join(paths.memory, 'memory.events'))
+            memory_high, memory_max, oom_kill = events.get('high', 0), events.get('max', 0), events.get('oom_kill', 0)
+            io_read, io_write = self._io_v2(paths.io)
+            cpu_pressure = _read_pressure(os.path.join(paths.cpu, 'cpu.pressure'))
+            memory_pressure = _read_pressure(os.path.join(paths.memory, 'memory.pressure'))
+        else:
+            cpu_usec = int(_read(os.path.join(paths.cpu, 'cpuacct.usage'))) // 1000
+            cpu_stat = _read_keyed(os.path.join(paths.throttle, 'cpu.stat')) if paths.throttle else {}
+            throttled_usec = cpu_stat.get('throttled_time', 0) // 1000
+            memory = _read_int(os.path.join(paths.memory, 'memory.usage_in_bytes'))
+            limit = _read_int(os.path.join(paths.memory, 'memory.limit_in_bytes'))
+            inactive = _read_keyed(os.path.join(paths.memory, 'memory.stat')).get('total_inactive_file', 0)
+            # v1 has no memory.high; failcnt counts hits of the limit
+            memory_high = 0
+            memory_max = _read_int(os.path.join(paths.memory, 'memory.failcnt'))
+            oom_kill = _read_keyed(os.path.join(paths.memory, 'memory.oom_control')).get('oom_kill', 0)
+            io_read, io_write = self._io_v1(paths.io)
+            cpu_pressure = memory_pressure = None
+
+        # Unlimited containers report 'max' (v2) or a huge number (v1)
+        if not limit or limit > total_memory:
+            limit = total_memory
+
+        net_rx, net_tx = self._net(paths.memory or paths.cpu)
+        return CgroupSample(
+            cpu_usec=cpu_usec,
+            memory=max(0, memory - inactive),
+            memory_limit=limit,
+            io_read=io_read,
+            io_write=io_write,
+            pids=_read_int(os.path.join(paths.pids, 'pids.current')) if paths.pids else 0,
+            net_rx=net_rx,
+            net_tx=net_tx,
+            nr_periods=cpu_stat.get('nr_periods', 0),
+            nr_throttled=cpu_stat.get('nr_throttled', 0),
+            throttled_usec=throttled_usec,
+            memory_high=memory_high,
+            memory_max=memory_max,
+            oom_kill=oom_kill,
+            cpu_pressure=cpu_pressure.get('some') if cpu_pressure else None,
+            memory_pressure=memory_pressure.get('some') if memory_pressure else None,
+            memory_full_pressure=memory_pressure.get('full') if memory_pressure else None,
+        )
+
+    def _io_v2(self, directory: str) -> Tuple[int, int]:
+        """io.stat: '8:0 rbytes=.. wbytes=.. rios=.. wios=..' per device"""
+        read = write = 0
+        try:
+            for line in _read(os.path.join(directory, 'io.stat')).splitlines():
+                for field_ in line.split()[1:]:
+                    key, _, value = field_.partition('=')
+                    if key == 'rbytes':
+                        read += int(value)
+                    elif key == 'wbytes':
+                        write += int(value)
+        except OSError:
+            pass
+        return read, write
+
+    def _io_v1(self, directory: str) -> Tuple[int, int]:
+        """blkio.throttle.io_service_bytes_recursive: '8:0 Read 123' per device"""
+        read = write = 0
+        if not directory:
+            return read, write
+        try:
+            for line in _read(os.path.join(directory, 'blkio.throttle.io_service_bytes_recursive')).splitlines():
+                parts = line.split()
+                if len(parts) == 3 and parts[2].isdigit():
+                    if parts[1] == 'Read':
+                        read += int(parts[2])
+                    elif parts[1] == 'Write':
+                        write += int(parts[2])
+        except OSError:
+            pass
+        return read, write
+
+    def _net(self, directory: str) -> Tuple[int, int]:
+        """Bytes received / sent in the network namespace of the container's first process"""
+        try:
+            pid = _read(os.path.join(directory, 'cgroup.procs')).split()[0]
+            lines = _read(f'/proc/{pid}/net/dev').splitlines()[2:]
+        except (OSError, IndexError):
+            return 0, 0
+        rx = tx = 0
+        for line in lines:
+            name, _, counters = line.partition(':')
+            if name.strip() == 'lo':
+                continue
+            values = counters.split()
+            if len(values) >= 9:
+                rx += int(values[0])
+                tx += int(values[8])
+        return rx, tx
+
+
+class ContainerStatsEngine:
+    """
+    Stats for many containers from cgroup files, one pass at a time
+
+    Rates (CPU%, I/O per second, throttling, PSI stall time) are deltas
+    against the previous pass. When a container has no pass young enough,
+    a priming pass is taken `interval` seconds earlier, like the process
+    sampler. Tables are cached for `ttl` seconds and shared by all
+    callers. The last HISTORY_SIZE throttling / pressure values of each
+    container are kept for the throttling view.
+    """
+
+    def __init__(self, interval: Optional[float] = None, ttl: Optional[float] = None,
+                 root: str = CGROUP_ROOT):
+        self.interval = interval or config.CONTAINER_SAMPLE_INTERVAL
+        self.ttl = ttl or config.CONTAINER_STATS_TTL
+        self.reader = CgroupReader(root)
+        self._previous: Dict[str, CgroupSample] = {}
+        self._table: Optional[ContainerStatsTable] = None
+        self._lock = threading.Lock()
+        # Container ID -> deque of (time, throttled %, cpu PSI %, memory PSI %)
+        self.history: Dict[str, Deque[Tuple[float, float, Optional[float], Optional[float]]]] = {}
+        # Names seen in get_table() calls, for passes without a container list
+        self.names: Dict[str, str] = {}
+
+    @property
+    def available(self) -> bool:
+        return self.reader.available
+
+    def get_table(self, containers: Dict[str, str], max_age: Optional[float] = None,
+                  max_window: float = MAX_DELTA_AGE) -> ContainerStatsTable:
+        """
+        Cached table covering `containers`, or a fresh one
+
+        A fresh table only replaces the cached one when it covers the same
+        containers or more (or the cached one is older than ttl).
+
+        Args:
+            containers: Container ID -> name
+            max_age: Seconds a cached table may be old (default ttl)
+            max_window: Oldest previous pass used for rates; older ones
+                are replaced by a priming pass
+        """
+        max_age = self.ttl if max_age is None else max_age
+        self.names.update({container_id[:12]: name for container_id, name in containers.items()
+                           if name != container_id})
+
+        def usable(table):
+            return (table is not None and time.time() - table.timestamp <= max_age
+                    and table.requested.issuperset(containers))
+
+        table = self._table
+        if usable(table):
+            return table
+
+        with self._lock:
+            # Another caller may have refreshed while we waited
+            table = self._table
+            if usable(table):
+                return table
+            fresh = self.sample(containers, max_window)
+            # A one-container request must not replace the shared full table
+            if (table is None or fresh.requested.issuperset(table.requested)
+                    or time.time() - table.timestamp > self.ttl):
+                self._table = fresh
+            return fresh
+
+    def get_all(self, max_window: float = MAX_KEEP_AGE) -> ContainerStatsTable:
+        """
+        Table of every container found in the cgroup tree
+
+        For background checks that have no container list from Docker;
+        names come from earlier get_table() calls. The default window
+        reaches back to the previous check instead of priming.
+        """
+        containers = {container_id[:12]: self.names.get(container_id[:12], container_id[:12])
+                      for container_id in self.reader.known()}
+        return self.get_table(containers, max_age=0, max_window=max_window)
+
+    def _pass(self, located: Dict[str, CgroupPaths]) -> Dict[str, CgroupSample]:
+        samples = {}
+        total_memory = psutil.virtual_memory().total
+        for container_id, paths in located.items():
+            try:
+                samples[container_id] = self.reader.read(paths, total_memory)
+            except (OSError, KeyError, ValueError):
+                # Container stopped between listing and reading
+                self.reader.forget(paths.id)
+        return samples
+
+    def sample(self, containers: Dict[str, str], max_window: float = MAX_DELTA_AGE) -> ContainerStatsTable:
+        """One pass over all containers (two if some have no recent previous pass)"""
+        located = self.reader.locate(containers)
+        now = time.monotonic()
+        if any(container_id not in self._previous or now - self._previous[container_id].timestamp > max_window
+               for container_id in located):
+            self._previous.update(self._pass(located))
+            time.sleep(self.interval)
+
+        current = self._pass(located)
+        rows = []
+        windows = []
+        for container_id, sample in current.items():
+            previous = self._previous.get(container_id)
+            elapsed = sample.timestamp - previous.timestamp if previous else 0
+            if elapsed > 0:
+                windows.append(elapsed)
+            rows.append(self._usage(container_id, containers.get(container_id, container_id),
+                                    sample, previous, elapsed))
+
+        self._previous.update(current)
+        self._previous = {container_id: sample for container_id, sample in self._previous.items()
+                          if now - sample.timestamp <= MAX_KEEP_AGE}
+        for container_id in [key for key in self.history if key not in self._previous]:
+            del self.history[container_id]
+        window = sum(windows) / len(windows) if windows else 0.0
+        return ContainerStatsTable(rows, time.time(), window, set(containers))
+
+    def _usage(self, container_id: str, name: str, sample: CgroupSample,
+               previous: Optional[CgroupSample], elapsed: float) -> ContainerUsage:
+        """Row for one container: rates over `elapsed` seconds since `previous`"""
+        usage = ContainerUsage(
+            container_id, name, 0.0, sample.memory, sample.memory_limit,
+            0.0, 0.0, sample.net_rx, sample.net_tx, sample.pids,
+            has_quota=sample.nr_periods > 0,
+        )
+        if elapsed <= 0:
+            return usage
+
+        def rate(now: Optional[int], before: Optional[int]) -> Optional[float]:
+            """Share of the window (%) for a cumulative µs counter"""
+            if now is None or before is None:
+                return None
+            return round(max(0, now - before) / (elapsed * 1e6) * 100, 2)
+
+        usage.cpu_percent = rate(sample.cpu_usec, previous.cpu_usec)
+        usage.io_read_rate = max(0, sample.io_read - previous.io_read) / elapsed
+        usage.io_write_rate = max(0, sample.io_write - previous.io_write) / elapsed
+
+        periods = sample.nr_periods - previous.nr_periods
+        if periods > 0:
+            usage.throttled_ratio = round(max(0, sample.nr_throttled - previous.nr_throttled) / periods * 100, 1)
+        usage.throttled_percent = rate(sample.throttled_usec, previous.throttled_usec)
+        usage.memory_high_events = max(0, sample.memory_high - previous.memory_high)
+        usage.memory_max_events = max(0, sample.memory_max - previous.memory_max)
+        usage.oom_kills = max(0, sample.oom_kill - previous.oom_kill)
+        usage.cpu_pressure = rate(sample.cpu_pressure, previous.cpu_pressure)
+        usage.memory_pressure = rate(sample.memory_pressure, previous.memory_pressure)
+        usage.memory_full_pressure = rate(sample.memory_full_pressure, previous.memory_full_pressure)
+
+        history = self.history.setdefault(container_id, deque(maxlen=HISTORY_SIZE))
+        history.append((time.time(), usage.throttled_ratio, usage.cpu_pressure, usage.memory_pressure))
+        usage.peak_throttled_ratio = max(entry[1] for entry in history)
+        return usage
+
+
+# Global container stats engine
+container_stats = ContainerStatsEngine()
@@ -0,0 +1,299 @@
+"""
+Docker Events
+Keep an in-memory container table current from the daemon's event stream
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from config.settings import config
+from .api import DockerAPIError, TRANSPORT_ERRORS, docker_api
+
+logger = logging.getLogger(__name__)
+
+# Seconds between reconnect attempts (doubles up to the maximum)
+RECONNECT_MIN = 1
+RECONNECT_MAX = 30
+
+# Seconds after a kill / stop in which a non-zero exit is expected
+STOP_GRACE = 60
+
+# Seconds between two notifications about the same container
+NOTIFY_COOLDOWN = 60
+
+
+def compose_fields(labels: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Compose project, service and depends_on (service names) from labels
+
+    depends_on is "db:service_started:false,cache:service_healthy:true"
+    (older Compose versions leave out the last field).
+    """
+    depends_on = labels.get('com.docker.compose.depends_on', '')
+    return {
+        'project': labels.get('com.docker.compose.project', ''),
+        'service': labels.get('com.docker.compose.service', ''),
+        'depends_on': [entry.split(':')[0] for entry in depends_on.split(',') if entry.strip()],
+    }
+
+
+def parse_label_string(labels: str) -> Dict[str, str]:
+    """`docker ps` Labels column ("a=1,b=x,y") to a dict (values may contain commas)"""
+    parsed: Dict[str, str] = {}
+    key = None
+    for part in labels.split(','):
+        if '=' in part:
+            key, _, value = part.partition('=')
+            parsed[key] = value
+        elif key is not None:
+            parsed[key] += f",{part}"
+    return parsed
+
+
+def container_summary(container: Dict[str, Any]) -> Dict[str, Any]:
+    """GET /containers/json entry in the `docker ps` row format"""
+    ports = []
+    for port in container.get('Ports') or []:
+        target = f"{port.get('PrivatePort')}/{port.get('Type', 'tcp')}"
+        if port.get('PublicPort'):
+            ports.append(f"{port.get('IP', '')}:{port['PublicPort']}->{target}")
+        else:
+            ports.append(target)
+    created = container.get('Created')
+    return {
+        'id': container.get('Id', '')[:12],
+        'name': ','.join(name.lstrip('/') for name in container.get('Names') or []),
+        'image': container.get('Image', ''),
+        'status': container.get('State', ''),
+        'created': datetime.fromtimestamp(created).strftime('%Y-%m-%d %H:%M:%S') if created else '',
+        'ports': ', '.join(ports),
+        **compose_fields(container.get('Labels') or {})
+    }
+
+
+class ContainerTable:
+    """
+    Containers as last reported by the daemon
+
+    Rows use the get_containers() format plus 'health'. Inspect results
+    are cached per container and dropped on any event for it.
+    """
+
+    def __init__(self):
+        self._rows: Dict[str, Dict[str, Any]] = {}
+        self._details: Dict[str, Dict[str, Any]] = {}
+        self.synced_at: Optional[float] = None
+
+    def replace(self, containers: List[Dict[str, Any]]):
+        """Full resync from GET /containers/json?all=true"""
+        health = {container_id: row.get('health') for container_id, row in self._rows.items()}
+        self._rows = {}
+        for container in containers:
+            row = container_summary(container)
+            row['health'] = health.get(row['id'])
+            self._rows[row['id']] = row
+        self._details.clear()
+        self.synced_at = time.time()
+
+    def list(self, status: str = 'all') -> List[Dict[str, Any]]:
+        """Rows like `docker ps` (-a / status=exited), newest first"""
+        rows = list(self._rows.values())
+        if status == 'running':
+            rows = [row for row in rows if row['status'] == 'running']
+        elif status == 'stopped':
+            rows = [row for row in rows if row['status'] == 'exited']
+        return sorted(rows, key=lambda row: row['created'], reverse=True)
+
+    def get(self, container_id: str) -> Optional[Dict[str, Any]]:
+        return self._rows.get(container_id[:12])
+
+    def get_details(self, container_id: str) -> Optional[Dict[str, Any]]:
+        """Cached inspect result (by 12-character ID)"""
+        return self._details.get(container_id[:12])
+
+    def set_details(self, container_id: str, details: Dict[str, Any]):
+        if container_id[:12] in self._rows:
+            self._details[container_id[:12]] = details
+
+    def apply(self, event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Update the row an event refers to
+
+        Returns:
+            The row before the change (None for unknown containers)
+        """
+        actor = event.get('Actor') or {}
+        attributes = actor.get('Attributes') or {}
+        container_id = (actor.get('ID') or event.get('id') or '')[:12]
+        action = event.get('Action') or event.get('status') or ''
+        if not container_id or action.startswith('exec_'):
+            return None
+
+        row = self._rows.get(container_id)
+        before = dict(row) if row else None
+        # Any change may alter what inspect returns
+        self._details.pop(container_id, None)
+
+        if action == 'destroy':
+            self._rows.pop(container_id, None)
+            return before
+        if row is None:
+            created = event.get('time')
+            row = self._rows[container_id] = {
+                'id': container_id,
+                'name': attributes.get('name', ''),
+                'image': attributes.get('image', ''),
+                'status': 'created',
+                'created': datetime.fromtimestamp(created).strftime('%Y-%m-%d %H:%M:%S') if created else '',
+                'ports': '',
+                'health': None,
+                # Event attributes carry the container's labels
+                **compose_fields(attributes),
+            }
+
+        if action in ('start', 'restart', 'unpause'):
+            row['status'] = 'running'
+        elif action == 'die':
+            row['status'] = 'exited'
+        elif action == 'pause':
+            row['status'] = 'paused'
+        elif action == 'rename':
+            row['name'] = attributes.get('name', row['name'])
+        elif action.startswith('health_status'):
+            row['health'] = action.partition(':')[2].strip() or None
+        return before
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+class DockerEventMonitor:
+    """
+    One long-lived consumer of GET /events (container events)
+
+    - the table is filled with a full list once per connection, then
+      updated from events; views read it instead of asking the daemon
+    - after a disconnect it reconnects with backoff and replays events
+      since the last one seen, so crashes in between are still reported
+    - notify(text) is awaited for non-zero exits (not caused by a stop /
+      kill), OOM kills and containers turning unhealthy
+    - needs the Engine API socket; without it views keep polling
+    """
+
+    def __init__(self):
+        self.table = ContainerTable()
+        self.connected = False
+        self.events = 0
+        self.notifications = 0
+        self._task: Optional[asyncio.Task] = None
+        self._notify: Optional[Callable[[str], Awaitable[None]]] = None
+        self._last_time: Optional[float] = None
+        self._stopping: Dict[str, float] = {}      # id -> time of kill / stop
+        self._oom: Dict[str, float] = {}           # id -> time of oom
+        self._notified: Dict[str, float] = {}      # id -> last notification
+
+    @property
+    def live(self) -> bool:
+        """Table is current (stream connected and synced)"""
+        return self.connected and self.table.synced_at is not None
+
+    def start(self, notify: Optional[Callable[[str], Awaitable[None]]] = None):
+        """Start consuming events in the running event loop"""
+        if self._task is None or self._task.done():
+            self._notify = notify
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.connected = False
+
+    async def _run(self):
+        delay = RECONNECT_MIN
+        while True:
+            if not docker_api.usable:
+                await asyncio.sleep(config.CAPABILITY_TTL)
+                continue
+            try:
+                # Events from the moment of the list on (or since the last
+                # one seen) are replayed, so nothing falls between the two
+                since = self._last_time or time.time()
+                self.table.replace(await docker_api.containers(True))
+                stream = docker_api.events(since=since, filters={'type': ['container']})
+                self.connected = True
+                delay = RECONNECT_MIN
+                logger.info(f"Docker events connected ({len(self.table)} containers)")
+                async for event in stream:
+                    await self._handle(event)
+                logger.warning("Docker events stream closed by the daemon")
+            except asyncio.CancelledError:
+                raise
+            except (DockerAPIError, asyncio.TimeoutError, *TRANSPORT_ERRORS) as e:
+                logger.warning(f"Docker events disconnected: {e}")
+            except Exception as e:
+                logger.error(f"Docker events consumer failed: {e}", exc_info=True)
+            self.connected = False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX)
+
+    async def _handle(self, event: Dict[str, Any]):
+        self.events += 1
+        timestamp = event.get('timeNano')
+        self._last_time = timestamp / 1e9 if timestamp else event.get('time', self._last_time)
+
+        before = self.table.apply(event)
+        row = self.table.get((event.get('Actor') or {}).get('ID', ''))
+        action = event.get('Action') or ''
+        attributes = (event.get('Actor') or {}).get('Attributes') or {}
+        container_id = (event.get('Actor') or {}).get('ID', '')[:12]
+        name = attributes.get('name') or (row or before or {}).get('name') or container_id
+        now = time.monotonic()
+
+        if action in ('kill', 'stop'):
+            self._stopping[container_id] = now
+        elif action == 'oom':
+            self._oom[container_id] = now
+            await self._send(container_id, f"💥 <b>{name}</b> was OOM-killed (memory limit reached)")
+        elif action == 'die':
+            exit_code = attributes.get('exitCode', '0')
+            stopped = now - self._stopping.pop(container_id, 0) < STOP_GRACE
+            oom = now - self._oom.pop(container_id, 0) < STOP_GRACE
+            if exit_code != '0' and not stopped and not oom:
+                await self._send(container_id, f"🔴 <b>{name}</b> exited with code {exit_code}")
+        elif action.startswith('health_status') and row and row.get('health') == 'unhealthy':
+            if not before or before.get('health') != 'unhealthy':
+                await self._send(container_id, f"🩺 <b>{name}</b> is unhealthy")
+        elif action == 'destroy':
+            for pending in (self._stopping, self._oom, self._notified):
+                pending.pop(container_id, None)
+
+    async def _send(self, container_id: str, text: str):
+        """Notify, at most once per NOTIFY_COOLDOWN per container (restart loops)"""
+        now = time.monotonic()
+        if self._notify is None or now - self._notified.get(container_id, -NOTIFY_COOLDOWN) < NOTIFY_COOLDOWN:
+            return
+        self._notified[container_id] = now
+        self.notifications += 1
+        try:
+            await self._notify(f"🐳 <b>Docker</b>\n\n{text}")
+        except Exception as e:
+            logger.error(f"Docker event notification failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'live': self.live,
+            'containers': len(self.table),
+            'events': self.events,
+            'notifications': self.notifications,
+        }
+
+
+# Global Docker events consumer
+docker_events = DockerEventMonitor()
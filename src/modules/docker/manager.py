@@ -4,48 +4,88 @@ Docker Manager Module
 Provides Docker container monitoring and management functionality.
 """
 
-import subprocess
+import asyncio
 import json
-from typing import List, Dict, Optional, Any
+import logging
+from typing import AsyncIterator, Callable, List, Dict, Optional, Any, Tuple
 from datetime import datetime
 
+from ...utils.runner import command_runner
+from ...utils.capabilities import capabilities
+from ...utils.executor import blocking_executor
+from ...utils.formatters import format_bytes
+from config.settings import config
+from .api import DockerAPIError, TRANSPORT_ERRORS, docker_api
+from .bulk import BulkOperation
+from .cgroups import ContainerStatsTable, ContainerUsage, container_stats
+from .events import compose_fields, container_summary, docker_events, parse_label_string
+
+logger = logging.getLogger(__name__)
+
 
 class DockerManager:
-    """Manages Docker container operations and monitoring"""
+    """
+    Manages Docker container operations and monitoring
+    
+    Uses the Engine API on the daemon socket when it is reachable and
+    falls back to the docker CLI otherwise.
+    """
+    
+    def __init__(self, use_api: bool = True):
+        self.use_api = use_api
+        # Held while a bulk operation runs (one at a time)
+        self._bulk_lock: Optional[asyncio.Lock] = None
+    
+    @property
+    def api_active(self) -> bool:
+        """Calls go through the socket (not the CLI)"""
+        return self.use_api and docker_api.usable
     
-    def __init__(self):
-        """Initialize Docker manager"""
-        self.docker_available = self._check_docker()
+    @property
+    def docker_available(self) -> bool:
+        """Socket usable, or binary installed and daemon up at the last check_available()"""
+        if self.api_active:
+            return True
+        return capabilities.has('docker') and capabilities.last('docker-daemon')
     
-    def _check_docker(self) -> bool:
-        """Check if Docker is installed and running"""
+    async def check_available(self) -> bool:
+        """Check if Docker is installed and the daemon is running (cached)"""
+        if self.use_api and await docker_api.ping():
+            return True
+        return await capabilities.check('docker-daemon', ['docker', 'info', '--format', '{{.ServerVersion}}'])
+    
+    async def _api(self, call: str, *args, **kwargs) -> Tuple[bool, Any]:
+        """
+        Call docker_api.<call>
+        
+        Returns:
+            Tuple of (handled, result). handled is False when the socket
+            is not usable and the CLI should be tried; result is None when
+            the daemon reported an error or did not answer in time.
+        """
+        if not self.api_active:
+            return False, None
         try:
-            result = subprocess.run(
-                ['docker', 'info'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            return result.returncode == 0
-        except (subprocess.SubprocessError, FileNotFoundError):
-            return False
+            return True, await getattr(docker_api, call)(*args, **kwargs)
+        except DockerAPIError as e:
+            logger.debug(f"Docker API {call}{args}: {e}")
+            return True, None
+        except asyncio.TimeoutError:
+            logger.warning(f"Docker API {call}{args} timed out")
+            return True, None
+        except TRANSPORT_ERRORS as e:
+            docker_api.mark_failed(e)
+            return False, None
     
-    def _run_command(self, command: List[str]) -> Optional[str]:
+    async def _run_command(self, command: List[str], cancellable: bool = True,
+                           timeout: float = 10) -> Optional[str]:
         """Run a Docker command and return output"""
-        try:
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            if result.returncode == 0:
-                return result.stdout.strip()
-            return None
-        except (subprocess.SubprocessError, FileNotFoundError):
-            return None
+        result = await command_runner.run(command, timeout=timeout, cancellable=cancellable)
+        if result.ok:
+            return result.stdout.strip()
+        return None
     
-    def get_containers(self, status: str = 'all') -> List[Dict[str, Any]]:
+    async def get_containers(self, status: str = 'all') -> List[Dict[str, Any]]:
         """
         Get list of Docker containers
         
@@ -58,6 +98,15 @@ class DockerManager:
         if not self.docker_available:
             return []
         
+        # Kept current by the events stream, no daemon round trip
+        if self.use_api and docker_events.live:
+            return [dict(row) for row in docker_events.table.list(status)]
+        
+        filters = {'status': ['exited']} if status == 'stopped' else None
+        handled, data = await self._api('containers', status != 'running', filters)
+        if handled:
+            return [container_summary(container) for container in data or []]
+        
         cmd = ['docker', 'ps', '--format', '{{json .}}']
         
         if status == 'all':
@@ -65,7 +114,7 @@ class DockerManager:
         elif status == 'stopped':
             cmd.extend(['-a', '--filter', 'status=exited'])
         
-        output = self._run_command(cmd)
+        output = await self._run_command(cmd)
         if not output:
             return []
         
@@ -80,14 +129,15 @@ class DockerManager:
                         'image': container.get('Image', ''),
                         'status': container.get('State', ''),
                         'created': container.get('CreatedAt', ''),
-                        'ports': container.get('Ports', '')
+                        'ports': container.get('Ports', ''),
+                        **compose_fields(parse_label_string(container.get('Labels', '')))
                     })
                 except json.JSONDecodeError:
                     continue
         
         return containers
     
-    def get_container_details(self, container_id: str) -> Optional[Dict[str, Any]]:
+    async def get_container_details(self, container_id: str) -> Optional[Dict[str, Any]]:
         """
         Get detailed information about a container
         
@@ -100,21 +150,31 @@ class DockerManager:
         if not self.docker_available:
             return None
         
-        output = self._run_command(['docker', 'inspect', container_id])
-        if not output:
+        live = self.use_api and docker_events.live
+        if live:
+            cached = docker_events.table.get_details(container_id)
+            if cached is not None:
+                return cached
+        
+        handled, container = await self._api('inspect', container_id)
+        if not handled:
+            output = await self._run_command(['docker', 'inspect', container_id])
+            if not output:
+                return None
+            try:
+                data = json.loads(output)
+            except json.JSONDecodeError:
+                return None
+            container = data[0] if data else None
+        if not container:
             return None
         
         try:
-            data = json.loads(output)
-            if not data:
-                return None
-            
-            container = data[0]
             state = container.get('State', {})
             config = container.get('Config', {})
             network = container.get('NetworkSettings', {})
             
-            return {
+            details = {
                 'id': container.get('Id', '')[:12],
                 'name': container.get('Name', '').lstrip('/'),
                 'image': config.get('Image', ''),
@@ -129,8 +189,12 @@ class DockerManager:
                 'env': config.get('Env', []),
                 'cmd': ' '.join(config.get('Cmd', [])) if config.get('Cmd') else ''
             }
-        except (json.JSONDecodeError, KeyError, IndexError):
+        except (KeyError, AttributeError):
             return None
+        
+        if live:
+            docker_events.table.set_details(details['id'], details)
+        return details
     
     def _format_ports(self, ports: Dict) -> str:
         """Format container ports for display"""
@@ -147,7 +211,7 @@ class DockerManager:
         
         return ', '.join(port_list) if port_list else 'None'
     
-    def get_container_stats(self, container_id: str) -> Optional[Dict[str, Any]]:
+    async def get_container_stats(self, container_id: str) -> Optional[Dict[str, Any]]:
         """
         Get real-time stats for a container
         
@@ -160,7 +224,18 @@ class DockerManager:
         if not self.docker_available:
             return None
         
-        output = self._run_command([
+        # cgroup files first: no daemon round trip, no sampling wait when warm
+        if container_stats.available:
+            table = await blocking_executor.run(container_stats.get_table, {container_id: container_id})
+            usage = table.get(container_id)
+            if usage is not None:
+                return self._usage_summary(usage)
+        
+        handled, stats = await self._api('stats', container_id)
+        if handled:
+            return self._stats_summary(stats) if stats else None
+        
+        output = await self._run_command([
             'docker', 'stats', '--no-stream', '--format',
             '{{json .}}', container_id
         ])
@@ -181,7 +256,71 @@ class DockerManager:
         except (json.JSONDecodeError, KeyError):
             return None
     
-    def get_container_logs(self, container_id: str, lines: int = 50) -> Optional[str]:
+    def _stats_summary(self, stats: Dict[str, Any]) -> Dict[str, Any]:
+        """Engine API stats sample in the `docker stats` format (same formulas as the CLI)"""
+        cpu = stats.get('cpu_stats') or {}
+        precpu = stats.get('precpu_stats') or {}
+        cpu_delta = cpu.get('cpu_usage', {}).get('total_usage', 0) - precpu.get('cpu_usage', {}).get('total_usage', 0)
+        system_delta = cpu.get('system_cpu_usage', 0) - precpu.get('system_cpu_usage', 0)
+        online = cpu.get('online_cpus') or len(cpu.get('cpu_usage', {}).get('percpu_usage') or []) or 1
+        cpu_percent = cpu_delta / system_delta * online * 100 if cpu_delta > 0 and system_delta > 0 else 0.0
+        
+        memory = stats.get('memory_stats') or {}
+        details = memory.get('stats') or {}
+        # Page cache is not counted (cgroup v2: inactive_file, v1: total_inactive_file)
+        used = memory.get('usage', 0) - details.get('inactive_file', details.get('total_inactive_file', 0))
+        limit = memory.get('limit', 0)
+        
+        rx = sum(net.get('rx_bytes', 0) for net in (stats.get('networks') or {}).values())
+        tx = sum(net.get('tx_bytes', 0) for net in (stats.get('networks') or {}).values())
+        
+        block_read = block_write = 0
+        for entry in (stats.get('blkio_stats') or {}).get('io_service_bytes_recursive') or []:
+            op = entry.get('op', '').lower()
+            if op == 'read':
+                block_read += entry.get('value', 0)
+            elif op == 'write':
+                block_write += entry.get('value', 0)
+        
+        return {
+            'cpu': f"{cpu_percent:.2f}%",
+            'memory': f"{format_bytes(max(used, 0))} / {format_bytes(limit)}",
+            'memory_percent': f"{used / limit * 100:.2f}%" if limit else '0%',
+            'net_io': f"{format_bytes(rx)} / {format_bytes(tx)}",
+            'block_io': f"{format_bytes(block_read)} / {format_bytes(block_write)}",
+            'pids': str((stats.get('pids_stats') or {}).get('current', 0))
+        }
+    
+    def _usage_summary(self, usage: ContainerUsage) -> Dict[str, Any]:
+        """cgroup stats row in the `docker stats` format (block I/O as rates)"""
+        return {
+            'cpu': f"{usage.cpu_percent:.2f}%",
+            'memory': f"{format_bytes(usage.memory)} / {format_bytes(usage.memory_limit)}",
+            'memory_percent': f"{usage.memory_percent:.2f}%",
+            'net_io': f"{format_bytes(usage.net_rx)} / {format_bytes(usage.net_tx)}",
+            'block_io': f"{format_bytes(usage.io_read_rate)}/s / {format_bytes(usage.io_write_rate)}/s",
+            'pids': str(usage.pids)
+        }
+    
+    async def get_stats_table(self) -> Optional[ContainerStatsTable]:
+        """
+        Stats of every running container in one cgroup pass
+        
+        Returns:
+            Table, or None when Docker or the containers' cgroups are
+            not visible from here (bot in another cgroup namespace)
+        """
+        if not self.docker_available or not container_stats.available:
+            return None
+        running = await self.get_containers('running')
+        if not running:
+            return ContainerStatsTable([], 0, 0)
+        table = await blocking_executor.run(
+            container_stats.get_table, {container['id']: container['name'] for container in running}
+        )
+        return table if len(table) else None
+    
+    async def get_container_logs(self, container_id: str, lines: int = 50) -> Optional[str]:
         """
         Get container logs
         
@@ -195,74 +334,121 @@ class DockerManager:
         if not self.docker_available:
             return None
         
-        output = self._run_command([
+        handled, output = await self._api('logs', container_id, lines)
+        if handled:
+            return output.strip() if output and output.strip() else 'No logs available'
+        
+        output = await self._run_command([
             'docker', 'logs', '--tail', str(lines), container_id
         ])
         
         return output if output else 'No logs available'
     
-    def start_container(self, container_id: str) -> bool:
+    def follow_container_logs(self, container_id: str, lines: int = 20) -> AsyncIterator[str]:
+        """
+        Container log lines as they are written (for the follow hub)
+        
+        Streams from the socket when it is usable, else `docker logs -f`.
+        """
+        if self.api_active:
+            return docker_api.follow_logs(container_id, lines)
+        return command_runner.follow(['docker', 'logs', '-f', '--tail', str(lines), container_id],
+                                     merge_stderr=True)
+    
+    async def start_container(self, container_id: str) -> bool:
         """Start a container"""
         if not self.docker_available:
             return False
         
-        output = self._run_command(['docker', 'start', container_id])
+        handled, done = await self._api('container_action', container_id, 'start')
+        if handled:
+            return bool(done)
+        
+        output = await self._run_command(['docker', 'start', container_id], cancellable=False)
         return output is not None
     
-    def stop_container(self, container_id: str) -> bool:
+    async def stop_container(self, container_id: str) -> bool:
         """Stop a container"""
         if not self.docker_available:
             return False
         
-        output = self._run_command(['docker', 'stop', container_id])
+        handled, done = await self._api('container_action', container_id, 'stop', timeout=30)
+        if handled:
+            return bool(done)
+        
+        output = await self._run_command(['docker', 'stop', container_id], cancellable=False, timeout=30)
         return output is not None
     
-    def restart_container(self, container_id: str) -> bool:
+    async def restart_container(self, container_id: str) -> bool:
         """Restart a container"""
         if not self.docker_available:
             return False
         
-        output = self._run_command(['docker', 'restart', container_id])
+        handled, done = await self._api('container_action', container_id, 'restart', timeout=30)
+        if handled:
+            return bool(done)
+        
+        output = await self._run_command(['docker', 'restart', container_id], cancellable=False, timeout=30)
         return output is not None
     
-    def remove_container(self, container_id: str, force: bool = False) -> bool:
+    async def remove_container(self, container_id: str, force: bool = False) -> bool:
         """Remove a container"""
         if not self.docker_available:
             return False
         
+        handled, done = await self._api('remove', container_id, force)
+        if handled:
+            return bool(done)
+        
         cmd = ['docker', 'rm', container_id]
         if force:
             cmd.insert(2, '-f')
         
-        output = self._run_command(cmd)
+        output = await self._run_command(cmd, cancellable=False)
         return output is not None
     
-    def start_all_containers(self) -> int:
-        """Start all stopped containers"""
-        stopped = self.get_containers('stopped')
-        count = 0
-        for container in stopped:
-            if self.start_container(container['id']):
-                count += 1
-        return count
+    async def _run_bulk(self, action: str, status: str, operation,
+                        on_start: Optional[Callable[[BulkOperation], None]] = None) -> Optional[BulkOperation]:
+        """
+        Run operation(container_id) over all containers with the given status
+        
+        The lock is taken before the container list is read, so a second
+        request arriving meanwhile is refused instead of running as well.
+        
+        Args:
+            on_start: Called with the operation before it runs (for progress display)
+        
+        Returns:
+            The finished BulkOperation, or None when another one is running
+        """
+        if self._bulk_lock is None:
+            self._bulk_lock = asyncio.Lock()
+        if self._bulk_lock.locked():
+            return None
+        async with self._bulk_lock:
+            containers = await self.get_containers(status)
+            bulk = BulkOperation(action, containers, config.DOCKER_BULK_PARALLELISM)
+            if on_start is not None:
+                on_start(bulk)
+            return await bulk.run(operation)
+    
+    async def start_all_containers(
+        self, on_start: Optional[Callable[[BulkOperation], None]] = None
+    ) -> Optional[BulkOperation]:
+        """Start all stopped containers (Compose dependencies first)"""
+        return await self._run_bulk('start', 'stopped', self.start_container, on_start)
     
-    def stop_all_containers(self) -> int:
-        """Stop all running containers"""
-        running = self.get_containers('running')
-        count = 0
-        for container in running:
-            if self.stop_container(container['id']):
-                count += 1
-        return count
+    async def stop_all_containers(
+        self, on_start: Optional[Callable[[BulkOperation], None]] = None
+    ) -> Optional[BulkOperation]:
+        """Stop all running containers (Compose dependents first)"""
+        return await self._run_bulk('stop', 'running', self.stop_container, on_start)
     
-    def remove_stopped_containers(self) -> int:
+    async def remove_stopped_containers(
+        self, on_start: Optional[Callable[[BulkOperation], None]] = None
+    ) -> Optional[BulkOperation]:
         """Remove all stopped containers"""
-        stopped = self.get_containers('stopped')
-        count = 0
-        for container in stopped:
-            if self.remove_container(container['id']):
-                count += 1
-        return count
+        return await self._run_bulk('remove', 'stopped', self.remove_container, on_start)
     
     def format_container_list(self, containers: List[Dict[str, Any]]) -> str:
         """Format container list for Telegram display"""
@@ -319,6 +505,81 @@ class DockerManager:
         
         return '\n'.join(lines)
     
+    def format_top_containers(self, table: ContainerStatsTable, sort_by: str = 'cpu', limit: int = 15) -> str:
+        """Format containers ranked by CPU, memory or throttling for Telegram display"""
+        if sort_by == 'throttled':
+            return self._format_throttled(table, limit)
+        
+        title = 'Memory' if sort_by == 'memory' else 'CPU'
+        lines = [f"📈 <b>Top Containers by {title} ({len(table)})</b>\n"]
+        
+        for usage in table.top(sort_by, limit):
+            lines.append(
+                f"<b>{usage.name}</b> <code>{usage.id}</code>\n"
+                f"   CPU: {usage.cpu_percent:.1f}% | Mem: {format_bytes(usage.memory)} "
+                f"({usage.memory_percent:.1f}%) | PIDs: {usage.pids}\n"
+                f"   I/O: {format_bytes(usage.io_read_rate)}/s read, {format_bytes(usage.io_write_rate)}/s write"
+            )
+        
+        if table.window:
+            lines.append(f"\n<i>Rates over the last {table.window:.1f}s</i>")
+        return '\n'.join(lines)
+    
+    def _format_throttled(self, table: ContainerStatsTable, limit: int) -> str:
+        """Containers ranked by CPU throttling, with pressure and memory events"""
+        lines = [f"🐢 <b>Most Throttled Containers ({len(table)})</b>\n"]
+        
+        for usage in table.top('throttled', limit):
+            if usage.has_quota:
+                throttle = (
+                    f"Throttled: {usage.throttled_ratio:.1f}% of periods "
+                    f"(peak {usage.peak_throttled_ratio:.1f}%), {usage.throttled_percent or 0:.1f}% of time"
+                )
+            else:
+                throttle = "No CPU quota"
+            if usage.cpu_pressure is not None:
+                pressure = f"PSI cpu {usage.cpu_pressure:.1f}%, mem {usage.memory_pressure or 0:.1f}%"
+            else:
+                pressure = "PSI n/a"
+            lines.append(
+                f"<b>{usage.name}</b> <code>{usage.id}</code>\n"
+                f"   {throttle}\n"
+                f"   {pressure} | Mem events: high {usage.memory_high_events}, "
+                f"max {usage.memory_max_events}, OOM {usage.oom_kills}"
+            )
+        
+        if table.window:
+            lines.append(f"\n<i>Over the last {table.window:.1f}s</i>")
+        return '\n'.join(lines)
+    
+    def format_bulk_operation(self, operation: BulkOperation, limit: int = 40) -> str:
+        """Format bulk operation progress / per-container outcomes for Telegram display"""
+        past = {'start': 'started', 'stop': 'stopped', 'remove': 'removed'}[operation.action]
+        icons = {'pending': '🕓', 'running': '⏳', 'ok': '✅', 'failed': '❌', 'skipped': '⏭️'}
+        total = len(operation.outcomes)
+        
+        if operation.done:
+            header = f"🐳 <b>{operation.action.title()}: {operation.count('ok')}/{total} {past}</b>"
+        else:
+            header = f"⏳ <b>{operation.action.title()}: {operation.count('ok')}/{total} {past}...</b>"
+        summary = [f"{operation.count(status)} {status}" for status in ('failed', 'skipped') if operation.count(status)]
+        lines = [header, f"<i>{', '.join(summary + [f'{operation.elapsed:.1f}s'])}</i>\n"]
+        
+        # Unfinished and failed first, so they survive the limit
+        order = {'running': 0, 'failed': 1, 'skipped': 2, 'pending': 3, 'ok': 4}
+        outcomes = sorted(operation.outcomes.values(), key=lambda outcome: order[outcome.status])
+        for outcome in outcomes[:limit]:
+            line = f"{icons[outcome.status]} {outcome.name}"
+            if outcome.status in ('ok', 'failed'):
+                line += f" ({outcome.duration:.1f}s)"
+            if outcome.detail:
+                line += f" - {outcome.detail}"
+            lines.append(line)
+        if total > limit:
+            lines.append(f"... and {total - limit} more")
+        
+        return '\n'.join(lines)
+    
     def format_container_stats(self, stats: Dict[str, Any], name: str) -> str:
         """Format container stats for Telegram display"""
         return (
@@ -7,4 +7,7 @@ Requires UFW to be installed on the system.
 
 from .manager import FirewallManager
 
-__all__ = ['FirewallManager']
+# Global firewall manager instance
+firewall_manager = FirewallManager()
+
+__all__ = ['FirewallManager', 'firewall_manager']
@@ -4,52 +4,34 @@ Firewall Manager Module
 Provides UFW (Uncomplicated Firewall) management functionality.
 """
 
-import subprocess
 import re
 from typing import List, Dict, Optional, Tuple
 
+from ...utils.runner import command_runner
+from ...utils.capabilities import capabilities
+
 
 class FirewallManager:
     """Manages UFW firewall operations"""
     
-    def __init__(self):
-        """Initialize firewall manager"""
-        self.ufw_available = self._check_ufw()
-    
-    def _check_ufw(self) -> bool:
-        """Check if UFW is available"""
-        try:
-            result = subprocess.run(
-                ['which', 'ufw'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            return result.returncode == 0
-        except (subprocess.SubprocessError, FileNotFoundError):
-            return False
+    @property
+    def ufw_available(self) -> bool:
+        """Whether ufw is installed (cached registry lookup)"""
+        return capabilities.has('ufw')
     
-    def _run_command(self, command: List[str], timeout: int = 10) -> Tuple[bool, str]:
+    async def _run_command(self, command: List[str], timeout: int = 10,
+                           cancellable: bool = True) -> Tuple[bool, str]:
         """
         Run a command and return success status and output
         
         Returns:
             Tuple of (success, output)
         """
-        try:
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                timeout=timeout
-            )
-            return (result.returncode == 0, result.stdout + result.stderr)
-        except subprocess.TimeoutExpired:
-            return (False, "Command timed out")
-        except (subprocess.SubprocessError, FileNotFoundError) as e:
-            return (False, str(e))
+        result = await command_runner.run(command, timeout=timeout,
+                                          cancellable=cancellable, merge_stderr=True)
+        return (result.ok, result.output)
     
-    def get_status(self) -> Dict[str, any]:
+    async def get_status(self) -> Dict[str, any]:
         """
         Get firewall status
         
@@ -59,7 +41,7 @@ class FirewallManager:
         if not self.ufw_available:
             return {'available': False}
         
-        success, output = self._run_command(['sudo', 'ufw', 'status', 'verbose'])
+        success, output = await self._run_command(['sudo', 'ufw', 'status', 'verbose'])
         
         if not success:
             return {'available': True, 'enabled': False, 'error': output}
@@ -80,7 +62,7 @@ class FirewallManager:
             'default_routed': routed.split()[0]
         }
     
-    def get_rules(self) -> List[Dict[str, str]]:
+    async def get_rules(self) -> List[Dict[str, str]]:
         """
         Get list of firewall rules
         
@@ -90,7 +72,7 @@ class FirewallManager:
         if not self.ufw_available:
             return []
         
-        success, output = self._run_command(['sudo', 'ufw', 'status', 'numbered'])
+        success, output = await self._run_command(['sudo', 'ufw', 'status', 'numbered'])
         
         if not success:
             return []
@@ -110,7 +92,7 @@ class FirewallManager:
         
         return rules
     
-    def enable(self) -> Tuple[bool, str]:
+    async def enable(self) -> Tuple[bool, str]:
         """
         Enable firewall
         
@@ -121,14 +103,14 @@ class FirewallManager:
             return (False, "UFW not available")
         
         # Use --force to avoid interactive prompt
-        success, output = self._run_command(['sudo', 'ufw', '--force', 'enable'])
+        success, output = await self._run_command(['sudo', 'ufw', '--force', 'enable'], cancellable=False)
         
         if success:
             return (True, "Firewall enabled successfully!")
         else:
             return (False, f"Failed to enable firewall.\n{output[:500]}")
     
-    def disable(self) -> Tuple[bool, str]:
+    async def disable(self) -> Tuple[bool, str]:
         """
         Disable firewall
         
@@ -138,14 +120,14 @@ class FirewallManager:
         if not self.ufw_available:
             return (False, "UFW not available")
         
-        success, output = self._run_command(['sudo', 'ufw', 'disable'])
+        success, output = await self._run_command(['sudo', 'ufw', 'disable'], cancellable=False)
         
         if success:
             return (True, "Firewall disabled successfully!")
         else:
             return (False, f"Failed to disable firewall.\n{output[:500]}")
     
-    def add_rule(self, port: str, protocol: str = 'tcp', action: str = 'allow') -> Tuple[bool, str]:
+    async def add_rule(self, port: str, protocol: str = 'tcp', action: str = 'allow') -> Tuple[bool, str]:
         """
         Add a firewall rule
         
@@ -161,14 +143,14 @@ class FirewallManager:
             return (False, "UFW not available")
         
         cmd = ['sudo', 'ufw', action, f'{port}/{protocol}']
-        success, output = self._run_command(cmd)
+        success, output = await self._run_command(cmd, cancellable=False)
         
         if success or 'Rule added' in output or 'Rules updated' in output:
             return (True, f"Rule added: {action} {port}/{protocol}")
         else:
             return (False, f"Failed to add rule.\n{output[:500]}")
     
-    def delete_rule(self, rule_number: str) -> Tuple[bool, str]:
+    async def delete_rule(self, rule_number: str) -> Tuple[bool, str]:
         """
         Delete a firewall rule by number
         
@@ -182,14 +164,14 @@ class FirewallManager:
             return (False, "UFW not available")
         
         # Use --force to avoid interactive prompt
-        success, output = self._run_command(['sudo', 'ufw', '--force', 'delete', rule_number])
+        success, output = await self._run_command(['sudo', 'ufw', '--force', 'delete', rule_number], cancellable=False)
         
         if success or 'Deleting' in output:
             return (True, f"Rule #{rule_number} deleted successfully!")
         else:
             return (False, f"Failed to delete rule.\n{output[:500]}")
     
-    def reset(self) -> Tuple[bool, str]:
+    async def reset(self) -> Tuple[bool, str]:
         """
         Reset firewall to default settings
         
@@ -200,14 +182,14 @@ class FirewallManager:
             return (False, "UFW not available")
         
         # Use --force to avoid interactive prompt
-        success, output = self._run_command(['sudo', 'ufw', '--force', 'reset'])
+        success, output = await self._run_command(['sudo', 'ufw', '--force', 'reset'], cancellable=False)
         
         if success:
             return (True, "Firewall reset to default settings!")
         else:
             return (False, f"Failed to reset firewall.\n{output[:500]}")
     
-    def set_default_policy(self, direction: str, policy: str) -> Tuple[bool, str]:
+    async def set_default_policy(self, direction: str, policy: str) -> Tuple[bool, str]:
         """
         Set default policy
         
@@ -222,7 +204,7 @@ class FirewallManager:
             return (False, "UFW not available")
         
         cmd = ['sudo', 'ufw', 'default', policy, direction]
-        success, output = self._run_command(cmd)
+        success, output = await self._run_command(cmd, cancellable=False)
         
         if success:
             return (True, f"Default {direction} policy set to {policy}!")
@@ -5,6 +5,15 @@ This module provides system logs viewing functionality.
 Supports systemd journal, syslog, and application logs.
 """
 
+from .index import LogIndex, log_index
+from .journal import JournalFollower, journal_follower
 from .manager import LogsManager
+from .tail import LogTail, log_tail
 
-__all__ = ['LogsManager']
+# Global logs manager instance
+logs_manager = LogsManager()
+
+__all__ = [
+    'JournalFollower', 'LogIndex', 'LogTail', 'LogsManager',
+    'journal_follower', 'log_index', 'log_tail', 'logs_manager',
+]
@@ -0,0 +1,340 @@
+"""
+Log Index
+Rolling in-memory token index over recent journal and log file entries
+"""
+import asyncio
+import logging
+import os
+import re
+import time
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from config.settings import config
+from src.utils.capabilities import capabilities
+from src.utils.executor import blocking_executor
+from .journal import journal_follower
+
+logger = logging.getLogger(__name__)
+
+# Words of a message (lowercased); 1-character tokens are not indexed
+TOKEN = re.compile(r'[0-9a-z_]{2,}')
+
+# Longer tokens (hashes, base64) are cut to this length
+TOKEN_WIDTH = 32
+
+# Characters of a message indexed and kept
+MESSAGE_WIDTH = 2048
+
+# First / last query words shorter than this do not narrow a search
+MIN_SUBSTRING = 3
+
+# Seconds between reads of the indexed log files
+FILE_POLL = 5
+
+# Bytes read from a log file per poll (the first read starts this far from the end)
+MAX_FILE_READ = 4 << 20
+
+# journalctl -p names
+PRIORITY_NAMES = {'emerg': 0, 'alert': 1, 'crit': 2, 'err': 3, 'warning': 4, 'notice': 5, 'info': 6, 'debug': 7}
+
+# (timestamp, priority or None for file lines, unit / file name, message)
+Entry = Tuple[float, Optional[int], str, str]
+
+
+class FileCursor:
+    """Read position in one indexed log file"""
+    __slots__ = ('path', 'name', 'inode', 'offset', 'partial')
+
+    def __init__(self, path: str):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.inode: Optional[Tuple[int, int]] = None
+        self.offset = 0
+        self.partial = b''
+
+    def read_new(self) -> List[str]:
+        """Lines appended since the last call (runs in a worker thread)"""
+        try:
+            f = open(self.path, 'rb')
+        except OSError:
+            return []
+        with f:
+            stat = os.fstat(f.fileno())
+            inode = (stat.st_dev, stat.st_ino)
+            if self.inode is None:
+                # First read: only the end of the file
+                self.offset = max(0, stat.st_size - MAX_FILE_READ)
+                self.partial = b''
+            elif inode != self.inode or stat.st_size < self.offset:
+                # Rotated or truncated: the new file from its start
+                self.offset = 0
+                self.partial = b''
+            skip_first = self.inode is None and self.offset > 0
+            self.inode = inode
+            if stat.st_size - self.offset > MAX_FILE_READ:
+                self.offset = stat.st_size - MAX_FILE_READ
+                self.partial = b''
+                skip_first = True
+
+            f.seek(self.offset)
+            data = self.partial + f.read(stat.st_size - self.offset)
+            self.offset = stat.st_size
+            newline = data.rfind(b'\n')
+            if newline < 0:
+                self.partial = data
+                return []
+            self.partial = data[newline + 1:]
+            lines = data[:newline].split(b'\n')
+            if skip_first:
+                # Started in the middle of a line
+                lines = lines[1:]
+            return [line.decode('utf-8', 'replace') for line in lines if line]
+
+
+class LogIndex:
+    """
+    Inverted index of the last `hours` of log entries
+
+    - entries get increasing sequence numbers; every token of a message
+      maps to the (sorted) sequence numbers containing it
+    - the journal is fed by the journal follower (its backlog is extended
+      to the index window), log files are polled for appended lines
+    - entries older than the window, or beyond max_entries, are dropped
+      from the front; the posting lists are cut when half the entries
+      are gone
+    - search() takes the shortest posting list of the query words (the
+      first / last word may be part of a longer token) and checks the
+      entries newest first, so a search costs at most one posting list
+      instead of a scan of the journal
+    """
+
+    def __init__(self, hours: float = 6, max_entries: int = 200000, files: Optional[List[str]] = None):
+        self.window = hours * 3600
+        self.max_entries = max_entries
+        self.files = [FileCursor(path) for path in files or []]
+        self._entries: List[Entry] = []
+        # Sequence number of _entries[0] and index of the oldest live entry
+        self._base = 0
+        self._first = 0
+        self._postings: Dict[str, array] = {}
+        # Every token followed by a newline, for substring lookups with str.find
+        self._vocabulary = ''
+        self._new_tokens: List[str] = []
+        self._units: Dict[str, str] = {}
+        self._files_read = False
+        self._task: Optional[asyncio.Task] = None
+        self.enabled = False
+        self.added = 0
+        self.searches = 0
+
+    @property
+    def ready(self) -> bool:
+        """
+        Searches can be answered from the index
+
+        Where journalctl exists the journal must be indexed (follower
+        caught up); the log files alone would miss journal-only matches.
+        """
+        if not self.enabled:
+            return False
+        if capabilities.has('journalctl'):
+            return journal_follower.caught_up
+        return bool(self.files) and self._files_read
+
+    def __len__(self) -> int:
+        return len(self._entries) - self._first
+
+    def start(self):
+        """Subscribe to the journal follower (call before it starts) and poll the log files"""
+        self.enabled = True
+        if self.add_journal_entry not in journal_follower.listeners:
+            journal_follower.listeners.append(self.add_journal_entry)
+        journal_follower.backlog = max(journal_follower.backlog, int(self.window))
+        if self.files and (self._task is None or self._task.done()):
+            self._task = asyncio.get_running_loop().create_task(self._poll_files())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.add_journal_entry in journal_follower.listeners:
+            journal_follower.listeners.remove(self.add_journal_entry)
+        self.enabled = False
+
+    async def _poll_files(self):
+        while True:
+            for cursor in self.files:
+                try:
+                    lines = await blocking_executor.run(cursor.read_new)
+                except Exception as e:
+                    logger.warning(f"Cannot read {cursor.path} for the log index: {e}")
+                    continue
+                now = time.time()
+                for line in lines:
+                    self.add(now, None, cursor.name, line)
+            self._files_read = True
+            await asyncio.sleep(FILE_POLL)
+
+    def add_journal_entry(self, timestamp: float, priority: int, unit: str, message):
+        """Journal follower listener"""
+        if isinstance(message, list):
+            # Binary messages come as a list of byte values
+            message = bytes(message).decode('utf-8', 'replace')
+        elif not isinstance(message, str):
+            return
+        self.add(timestamp, priority, unit, message)
+
+    def add(self, timestamp: float, priority: Optional[int], unit: str, message: str):
+        message = message[:MESSAGE_WIDTH]
+        seq = self._base + len(self._entries)
+        self._entries.append((timestamp, priority, self._units.setdefault(unit, unit), message))
+        self.added += 1
+        for token in set(TOKEN.findall(message.lower())):
+            token = token[:TOKEN_WIDTH]
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = array('q')
+                self._new_tokens.append(token)
+            elif postings[-1] == seq:
+                # Two long tokens cut to the same prefix
+                continue
+            postings.append(seq)
+        self._expire(time.time() - self.window)
+
+    def _expire(self, cutoff: float):
+        entries = self._entries
+        while self._first < len(entries) and (
+                len(entries) - self._first > self.max_entries or entries[self._first][0] < cutoff):
+            self._first += 1
+        if self._first > 1000 and self._first * 2 > len(entries):
+            self._compact()
+
+    def _compact(self):
+        """Drop expired entries and their postings"""
+        self._base += self._first
+        self._entries = self._entries[self._first:]
+        self._first = 0
+        for token in list(self._postings):
+            postings = self._postings[token]
+            if postings[0] >= self._base:
+                continue
+            cut = bisect_left(postings, self._base)
+            if cut == len(postings):
+                del self._postings[token]
+            else:
+                self._postings[token] = postings[cut:]
+        self._vocabulary = ''.join(token + '\n' for token in self._postings)
+        self._new_tokens = []
+        units = {unit for _, _, unit, _ in self._entries}
+        self._units = {unit: unit for unit in units}
+
+    def _tokens_containing(self, word: str) -> List[str]:
+        if self._new_tokens:
+            self._vocabulary += ''.join(token + '\n' for token in self._new_tokens)
+            self._new_tokens = []
+        vocabulary = self._vocabulary
+        tokens = []
+        found = vocabulary.find(word)
+        while found >= 0:
+            start = vocabulary.rfind('\n', 0, found) + 1
+            end = vocabulary.find('\n', found)
+            tokens.append(vocabulary[start:end])
+            found = vocabulary.find(word, end)
+        return tokens
+
+    def _candidates(self, words: List[str]) -> Optional[List[int]]:
+        """Shortest sequence number list that every match is in (None: no word usable)"""
+        best: Optional[List[array]] = None
+        best_size = 0
+        for position, word in enumerate(words):
+            word = word[:TOKEN_WIDTH]
+            if position == 0 or position == len(words) - 1:
+                # Edge words may be cut off: "fail" finds "failed"
+                if len(word) < MIN_SUBSTRING:
+                    continue
+                lists = [self._postings[token] for token in self._tokens_containing(word)]
+            else:
+                lists = [self._postings[word]] if word in self._postings else []
+            size = sum(len(postings) for postings in lists)
+            if best is None or size < best_size:
+                best, best_size = lists, size
+            if size == 0:
+                break
+        if best is None:
+            return None
+        if len(best) == 1:
+            return best[0]
+        return sorted(set().union(*best))
+
+    def search(self, query: str, limit: int = 50, unit: Optional[str] = None,
+               priority: Optional[str] = None) -> List[Entry]:
+        """
+        Entries containing `query` (case-insensitive), newest last
+
+        Args:
+            query: Text searched for
+            limit: Maximum entries returned (the newest ones)
+            unit: Only entries of this unit / identifier / log file name
+            priority: Only journal entries of this priority or worse (name or 0-7)
+        """
+        self.searches += 1
+        needle = query.lower().strip()
+        level = None
+        if priority is not None:
+            level = PRIORITY_NAMES.get(str(priority).lower())
+            if level is None:
+                level = int(priority)
+        wanted = unit.lower() if unit else None
+
+        candidates = self._candidates(TOKEN.findall(needle)) if needle else None
+        if candidates is None:
+            sequence = range(self._base + len(self._entries) - 1, self._base + self._first - 1, -1)
+        else:
+            start = bisect_left(candidates, self._base + self._first)
+            sequence = (candidates[index] for index in range(len(candidates) - 1, start - 1, -1))
+
+        found: List[Entry] = []
+        for seq in sequence:
+            entry = self._entries[seq - self._base]
+            if level is not None and (entry[1] is None or entry[1] > level):
+                continue
+            if wanted is not None:
+                name = entry[2].lower()
+                if name != wanted and not name.startswith(wanted + '.'):
+                    continue
+            if needle in entry[3].lower():
+                found.append(entry)
+                if len(found) >= limit:
+                    break
+        return found[::-1]
+
+    @staticmethod
+    def format_entry(entry: Entry) -> str:
+        """One entry like `journalctl -o short` (file lines as they are)"""
+        timestamp, priority, unit, message = entry
+        if priority is None:
+            return f"{unit}: {message}"
+        return f"{datetime.fromtimestamp(timestamp).strftime('%b %d %H:%M:%S')} {unit}: {message}"
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'entries': len(self),
+            'tokens': len(self._postings),
+            'added': self.added,
+            'searches': self.searches,
+        }
+
+
+# Global log index
+log_index = LogIndex(
+    config.LOG_INDEX_HOURS,
+    config.LOG_INDEX_MAX_ENTRIES,
+    [path.strip() for path in config.LOG_INDEX_FILES.split(',') if path.strip()],
+)
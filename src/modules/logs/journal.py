@@ -0,0 +1,252 @@
+"""
+Journal Accounting
+Follow the systemd journal and keep rolling counters of recent entries
+"""
+import asyncio
+import json
+import logging
+import time
+from collections import Counter, deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from src.utils.capabilities import capabilities
+from src.utils.runner import command_runner
+
+logger = logging.getLogger(__name__)
+
+# Per-minute buckets kept (24 hours)
+RETENTION_MINUTES = 24 * 60
+
+# Seconds of exact entry times kept for the summary counts
+WINDOW = 3600
+
+# Seconds between restarts of journalctl (doubles up to the maximum)
+RECONNECT_MIN = 1
+RECONNECT_MAX = 60
+
+# Only what the counters need (the cursor is always included)
+OUTPUT_FIELDS = 'PRIORITY,_SYSTEMD_UNIT,SYSLOG_IDENTIFIER,MESSAGE'
+
+# Syslog priorities counted as errors / warnings (journalctl -p err / -p warning)
+ERROR_PRIORITY = 3
+WARNING_PRIORITY = 4
+
+
+class MinuteBucket:
+    """Counts of the entries logged in one minute"""
+    __slots__ = ('minute', 'priorities', 'units', 'ssh_failed')
+
+    def __init__(self, minute: int):
+        self.minute = minute
+        self.priorities = [0] * 8
+        # Warning or worse, by unit (or syslog identifier)
+        self.units: Counter = Counter()
+        self.ssh_failed = 0
+
+    @property
+    def total(self) -> int:
+        return sum(self.priorities)
+
+
+class JournalCounters:
+    """
+    Rolling counters fed one entry at a time
+
+    Minute buckets cover RETENTION_MINUTES; errors, warnings and failed
+    SSH logins also keep their times for WINDOW seconds, so counts over
+    the last hour are exact rather than rounded to whole minutes.
+    """
+
+    def __init__(self):
+        self.buckets: Deque[MinuteBucket] = deque()
+        self.times: Dict[str, Deque[float]] = {'err': deque(), 'warning': deque(), 'ssh': deque()}
+        self.entries = 0
+
+    def _bucket(self, timestamp: float) -> MinuteBucket:
+        minute = int(timestamp // 60)
+        if self.buckets and self.buckets[-1].minute >= minute:
+            # Same minute, or slightly out of order: newest matching bucket
+            for bucket in reversed(self.buckets):
+                if bucket.minute <= minute:
+                    return bucket
+            return self.buckets[0]
+        bucket = MinuteBucket(minute)
+        self.buckets.append(bucket)
+        while self.buckets and self.buckets[0].minute <= minute - RETENTION_MINUTES:
+            self.buckets.popleft()
+        return bucket
+
+    def add(self, timestamp: float, priority: int, unit: str, ssh_failed: bool = False):
+        self.entries += 1
+        bucket = self._bucket(timestamp)
+        bucket.priorities[min(max(priority, 0), 7)] += 1
+        if priority <= WARNING_PRIORITY:
+            bucket.units[unit] += 1
+            self.times['warning'].append(timestamp)
+            if priority <= ERROR_PRIORITY:
+                self.times['err'].append(timestamp)
+        if ssh_failed:
+            bucket.ssh_failed += 1
+            self.times['ssh'].append(timestamp)
+
+    def prune(self, now: Optional[float] = None):
+        cutoff = (now or time.time()) - WINDOW
+        for times in self.times.values():
+            while times and times[0] < cutoff:
+                times.popleft()
+
+    def count(self, kind: str, seconds: float = WINDOW) -> int:
+        """Exact number of 'err' / 'warning' / 'ssh' entries in the last `seconds` (<= WINDOW)"""
+        self.prune()
+        times = self.times[kind]
+        if seconds >= WINDOW:
+            return len(times)
+        cutoff = time.time() - seconds
+        count = 0
+        for timestamp in reversed(times):
+            if timestamp < cutoff:
+                break
+            count += 1
+        return count
+
+    def per_minute(self, minutes: int = 10) -> List[int]:
+        """Entries per minute, oldest first, ending with the current minute"""
+        now = int(time.time() // 60)
+        totals = {bucket.minute: bucket.total for bucket in self.buckets if bucket.minute > now - minutes}
+        return [totals.get(minute, 0) for minute in range(now - minutes + 1, now + 1)]
+
+    def top_units(self, minutes: int = 60, limit: int = 5) -> List[Tuple[str, int]]:
+        """Units with the most warnings or worse over the last `minutes`"""
+        since = int(time.time() // 60) - minutes
+        units: Counter = Counter()
+        for bucket in reversed(self.buckets):
+            if bucket.minute <= since:
+                break
+            units.update(bucket.units)
+        return units.most_common(limit)
+
+
+class JournalFollower:
+    """
+    Background `journalctl -f -o json` consumer feeding JournalCounters
+
+    - on start the last `backlog` seconds (at least WINDOW) are read once
+      (older buckets fill up with uptime), then the journal is followed
+      from the last cursor
+    - when journalctl exits it is restarted with --after-cursor, so no
+      entry is counted twice or missed
+    - live once the backlog has been read; until then the log summary
+      keeps scanning with journalctl
+    - listeners get every entry as (timestamp, priority, unit, message)
+    """
+
+    def __init__(self):
+        self.counters = JournalCounters()
+        self.cursor: Optional[str] = None
+        self.caught_up = False
+        self.following = False
+        self.restarts = 0
+        self.backlog = WINDOW
+        self.listeners: List[Callable[[float, int, str, Any], None]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def live(self) -> bool:
+        """Counters are complete and being updated"""
+        return self.caught_up and self.following
+
+    def start(self):
+        """Start following in the running event loop"""
+        if not capabilities.has('journalctl'):
+            logger.info("journalctl not available, journal accounting disabled")
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.following = False
+
+    def _command(self, follow: bool) -> List[str]:
+        cmd = ['sudo', 'journalctl', '-o', 'json', '--output-fields', OUTPUT_FIELDS, '--no-pager', '-q']
+        if self.cursor:
+            cmd.extend(['--after-cursor', self.cursor])
+        elif follow:
+            # Empty backlog: only what is logged from now on
+            cmd.extend(['-n', '0'])
+        else:
+            cmd.extend(['--since', f'-{max(self.backlog, WINDOW) // 60}min'])
+        if follow:
+            cmd.append('-f')
+        return cmd
+
+    async def _run(self):
+        delay = RECONNECT_MIN
+        while True:
+            try:
+                if not self.caught_up:
+                    started = time.monotonic()
+                    async for line in command_runner.follow(self._command(follow=False)):
+                        self._handle(line)
+                    self.caught_up = True
+                    self.counters.prune()
+                    logger.info(f"Journal backlog read: {self.counters.entries} entries "
+                                f"in {time.monotonic() - started:.1f}s")
+
+                self.following = True
+                async for line in command_runner.follow(self._command(follow=True)):
+                    self._handle(line)
+                    delay = RECONNECT_MIN
+                logger.warning("journalctl -f exited, restarting")
+            except asyncio.CancelledError:
+                raise
+            except (OSError, RuntimeError) as e:
+                logger.warning(f"Journal follower stopped: {e}")
+            except Exception as e:
+                logger.error(f"Journal follower failed: {e}", exc_info=True)
+            self.following = False
+            self.restarts += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX)
+
+    def _handle(self, line: str):
+        try:
+            entry: Dict[str, Any] = json.loads(line)
+        except ValueError:
+            return
+        self.cursor = entry.get('__CURSOR', self.cursor)
+        try:
+            timestamp = int(entry['__REALTIME_TIMESTAMP']) / 1e6
+        except (KeyError, TypeError, ValueError):
+            timestamp = time.time()
+        try:
+            priority = int(entry.get('PRIORITY', 6))
+        except (TypeError, ValueError):
+            priority = 6
+
+        identifier = entry.get('SYSLOG_IDENTIFIER') or ''
+        unit = entry.get('_SYSTEMD_UNIT') or identifier or 'kernel'
+        message = entry.get('MESSAGE')
+        # Binary messages come as a list of byte values
+        ssh_failed = (isinstance(identifier, str) and identifier.startswith('sshd')
+                      and isinstance(message, str) and 'Failed password' in message)
+        self.counters.add(timestamp, priority, str(unit), ssh_failed)
+        for listener in self.listeners:
+            listener(timestamp, priority, str(unit), message)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'live': self.live,
+            'entries': self.counters.entries,
+            'restarts': self.restarts,
+        }
+
+
+# Global journal follower
+journal_follower = JournalFollower()
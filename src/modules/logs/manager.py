@@ -4,47 +4,44 @@ Logs Manager Module
 Provides system logs viewing functionality.
 """
 
-import subprocess
+import asyncio
+import html
+import time
 from typing import List, Tuple, Optional
 from pathlib import Path
+from src.utils.runner import command_runner
+from src.utils.capabilities import capabilities
+from src.utils.executor import blocking_executor
+from .index import log_index
+from .journal import journal_follower
+from .pager import JournalPage, journal_pager
+from .tail import last_lines, log_tail
+from .templates import summarise_lines
 
 
 class LogsManager:
     """Manages system logs viewing"""
     
-    def __init__(self):
-        """Initialize logs manager"""
-        self.journalctl_available = self._check_journalctl()
+    @property
+    def journalctl_available(self) -> bool:
+        """Whether journalctl is installed (cached registry lookup)"""
+        return capabilities.has('journalctl')
     
-    def _check_journalctl(self) -> bool:
-        """Check if journalctl is available"""
-        try:
-            result = subprocess.run(
-                ['which', 'journalctl'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            return result.returncode == 0
-        except (subprocess.SubprocessError, FileNotFoundError):
-            return False
-    
-    def _run_command(self, command: List[str], timeout: int = 10) -> Tuple[bool, str]:
+    async def _run_command(self, command: List[str], timeout: int = 10) -> Tuple[bool, str]:
         """Run a command and return success status and output"""
-        try:
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                timeout=timeout
-            )
-            return (result.returncode == 0, result.stdout)
-        except subprocess.TimeoutExpired:
-            return (False, "Command timed out")
-        except (subprocess.SubprocessError, FileNotFoundError) as e:
-            return (False, str(e))
+        result = await command_runner.run(command, timeout=timeout)
+        if result.timed_out or result.error:
+            return (False, result.output)
+        return (result.ok, result.stdout)
+    
+    async def _tail_file(self, path: Path, lines: int) -> Tuple[bool, str]:
+        """Last lines of a log file, in-process when readable, else `sudo tail`"""
+        output = await blocking_executor.run(log_tail.read, str(path), lines)
+        if output is not None:
+            return (True, '\n'.join(output))
+        return await self._run_command(['sudo', 'tail', '-n', str(lines), str(path)])
     
-    def get_journal_logs(
+    async def get_journal_logs(
         self,
         lines: int = 50,
         priority: Optional[str] = None,
@@ -72,53 +69,83 @@ class LogsManager:
             cmd.extend(['-p', priority])
         
         if since:
-            cmd.extend(['--since', since])
+            # Relative ranges (1h, 7d) mean "that long ago" for journalctl
+            cmd.extend(['--since', f'-{since}' if since in self.TIME_RANGES else since])
         
         if unit:
             cmd.extend(['-u', unit])
         
-        success, output = self._run_command(cmd, timeout=15)
+        success, output = await self._run_command(cmd, timeout=15)
         
         if success and output:
             return output
         else:
             return "No logs available or error retrieving logs."
     
-    def get_auth_logs(self, lines: int = 50) -> str:
+    async def get_journal_page(
+        self,
+        chat_id: int,
+        log_type: str,
+        time_range: str = 'all',
+        priority: Optional[str] = None,
+        direction: str = 'latest'
+    ) -> Optional[JournalPage]:
+        """
+        Cursor-paged journal view (system / kernel logs, priority filter)
+        
+        Returns:
+            JournalPage, or None when the view is not journal-based here
+        """
+        method = self.LOG_TYPES.get(log_type, {}).get('method')
+        if not self.journalctl_available or method not in ('journal', 'kernel'):
+            return None
+        
+        filters = ['-k'] if method == 'kernel' else []
+        if priority:
+            filters.extend(['-p', priority])
+        since = None
+        if time_range in self.TIME_RANGES:
+            unit = {'h': 3600, 'd': 86400}[time_range[-1]]
+            since = time.time() - int(time_range[:-1]) * unit
+        
+        view = f"{log_type}:{time_range}:{priority or ''}"
+        return await journal_pager.get_page(chat_id, view, filters, direction, since)
+    
+    async def get_auth_logs(self, lines: int = 50) -> str:
         """Get authentication logs"""
         auth_log = Path('/var/log/auth.log')
         
         if not auth_log.exists():
             return "❌ /var/log/auth.log not found"
         
-        cmd = ['sudo', 'tail', '-n', str(lines), str(auth_log)]
-        success, output = self._run_command(cmd)
+        success, output = await self._tail_file(auth_log, lines)
         
         return output if success else "Error reading auth.log"
     
-    def get_syslog(self, lines: int = 50) -> str:
+    async def get_syslog(self, lines: int = 50) -> str:
         """Get system logs"""
         syslog = Path('/var/log/syslog')
         
         if not syslog.exists():
             return "❌ /var/log/syslog not found"
         
-        cmd = ['sudo', 'tail', '-n', str(lines), str(syslog)]
-        success, output = self._run_command(cmd)
+        success, output = await self._tail_file(syslog, lines)
         
         return output if success else "Error reading syslog"
     
-    def get_kernel_logs(self, lines: int = 50) -> str:
+    async def get_kernel_logs(self, lines: int = 50) -> str:
         """Get kernel logs"""
         if self.journalctl_available:
             cmd = ['sudo', 'journalctl', '-k', '-n', str(lines), '--no-pager']
+            success, output = await self._run_command(cmd)
         else:
-            cmd = ['sudo', 'dmesg', '-T', '|', 'tail', '-n', str(lines)]
+            success, output = await self._run_command(['sudo', 'dmesg', '-T'])
+            if success:
+                output = '\n'.join(output.splitlines()[-lines:])
         
-        success, output = self._run_command(cmd)
         return output if success else "Error reading kernel logs"
     
-    def get_application_log(self, app_name: str, lines: int = 50) -> str:
+    async def get_application_log(self, app_name: str, lines: int = 50) -> str:
         """
         Get application-specific logs
         
@@ -132,44 +159,151 @@ class LogsManager:
         # Try systemd unit first
         if self.journalctl_available:
             cmd = ['sudo', 'journalctl', '-u', app_name, '-n', str(lines), '--no-pager']
-            success, output = self._run_command(cmd)
+            success, output = await self._run_command(cmd)
             if success and output and 'No entries' not in output:
                 return output
         
         # Fallback to common log file locations
-        log_paths = {
-            'nginx': ['/var/log/nginx/error.log', '/var/log/nginx/access.log'],
-            'apache2': ['/var/log/apache2/error.log', '/var/log/apache2/access.log'],
-            'mysql': ['/var/log/mysql/error.log'],
-            'postgresql': ['/var/log/postgresql/postgresql.log'],
-            'docker': ['/var/log/docker.log'],
-            'redis': ['/var/log/redis/redis-server.log']
-        }
-        
-        if app_name in log_paths:
-            for log_path in log_paths[app_name]:
+        if app_name in self.APP_LOG_PATHS:
+            for log_path in self.APP_LOG_PATHS[app_name]:
                 log_file = Path(log_path)
                 if log_file.exists():
-                    cmd = ['sudo', 'tail', '-n', str(lines), str(log_file)]
-                    success, output = self._run_command(cmd)
+                    success, output = await self._tail_file(log_file, lines)
                     if success and output:
                         return f"=== {log_path} ===\n\n{output}"
         
         return f"❌ No logs found for {app_name}"
     
-    def search_logs(self, query: str, lines: int = 50) -> str:
-        """Search logs for a query"""
+    async def follow_command(self, log_type: Optional[str] = None, app_name: Optional[str] = None,
+                             lines: int = 20) -> Optional[List[str]]:
+        """
+        Command streaming new lines of a log type or application (follow mode)
+        
+        Applications use their journal unit when it has entries, like
+        get_application_log(), else their first existing log file.
+        
+        Returns:
+            Command, or None when the log is not available here
+        """
+        if app_name is not None:
+            if self.journalctl_available:
+                cmd = ['sudo', 'journalctl', '-u', app_name, '-n', '1', '-q', '--no-pager']
+                success, output = await self._run_command(cmd)
+                if success and output.strip():
+                    return ['sudo', 'journalctl', '-u', app_name, '-f', '-n', str(lines), '--no-pager', '-q']
+            paths = self.APP_LOG_PATHS.get(app_name, [])
+        else:
+            method = self.LOG_TYPES.get(log_type, {}).get('method')
+            if method in ('journal', 'kernel'):
+                if self.journalctl_available:
+                    cmd = ['sudo', 'journalctl', '-f', '-n', str(lines), '--no-pager', '-q']
+                    return cmd + ['-k'] if method == 'kernel' else cmd
+                return ['sudo', 'dmesg', '-T', '-w'] if method == 'kernel' else None
+            paths = {'auth': ['/var/log/auth.log'], 'syslog': ['/var/log/syslog']}.get(method, [])
+        
+        for log_path in paths:
+            if Path(log_path).exists():
+                return ['sudo', 'tail', '-F', '-n', str(lines), log_path]
+        return None
+    
+    async def search_logs(self, query: str, lines: int = 50, summarise: bool = False,
+                          unit: Optional[str] = None, priority: Optional[str] = None) -> str:
+        """
+        Search logs for a query
+        
+        Answered from the log index while it covers the journal, otherwise
+        with journalctl --grep.
+        
+        Args:
+            query: Text searched for
+            lines: Newest matches returned
+            summarise: Template summary of up to PATTERN_LINES matches instead
+            unit: Only this unit / syslog identifier (log file name for indexed files)
+            priority: Only this priority or worse (journalctl -p name)
+        """
+        if log_index.ready:
+            limit = self.PATTERN_LINES if summarise else lines
+            entries = log_index.search(query, limit, unit=unit, priority=priority)
+            if not entries:
+                return f"No matches found for: {query}"
+            if summarise:
+                return await self._summarise([entry[3] for entry in entries])
+            return '\n'.join(log_index.format_entry(entry) for entry in entries)
+        
         if not self.journalctl_available:
             return "❌ Search requires journalctl"
         
+        if summarise:
+            return await self.summarise_logs('system', query=query)
+        
         cmd = ['sudo', 'journalctl', '-n', str(lines), '--no-pager', '--grep', query]
-        success, output = self._run_command(cmd, timeout=15)
+        if unit:
+            cmd.extend(['-u', unit])
+        if priority:
+            cmd.extend(['-p', priority])
+        success, output = await self._run_command(cmd, timeout=15)
         
         if success and output:
             return output
         else:
             return f"No matches found for: {query}"
     
+    async def _collect_lines(self, log_type: str, lines: int, query: Optional[str]) -> Optional[List[str]]:
+        """Last lines of a log type for summarising (None when unavailable)"""
+        method = self.LOG_TYPES.get(log_type, {}).get('method')
+        
+        if method in ('journal', 'kernel') and self.journalctl_available:
+            cmd = ['sudo', 'journalctl', '-n', str(lines), '-o', 'short-unix', '--no-pager', '-q']
+            if method == 'kernel':
+                cmd.append('-k')
+            if query:
+                cmd.extend(['--grep', query])
+            success, output = await self._run_command(cmd, timeout=30)
+            return output.splitlines() if success else None
+        
+        path = {'auth': '/var/log/auth.log', 'syslog': '/var/log/syslog'}.get(method)
+        if path is None or not Path(path).exists():
+            return None
+        output = await blocking_executor.run(last_lines, path, lines)
+        if output is None:
+            success, text = await self._run_command(['sudo', 'tail', '-n', str(lines), path], timeout=30)
+            output = text.splitlines() if success else None
+        return output
+    
+    async def summarise_logs(self, log_type: str = 'system', lines: Optional[int] = None,
+                             query: Optional[str] = None, limit: int = 10) -> str:
+        """
+        Group the last lines of a log into templates (most frequent first)
+        
+        Args:
+            log_type: Key of LOG_TYPES
+            lines: Lines read (default PATTERN_LINES)
+            query: journalctl --grep pattern (journal logs only)
+            limit: Templates shown
+        """
+        collected = await self._collect_lines(log_type, lines or self.PATTERN_LINES, query)
+        if collected is None:
+            return "❌ Logs not available"
+        if not collected:
+            return "<i>No logs available</i>"
+        return await self._summarise(collected, limit)
+    
+    async def _summarise(self, collected: List[str], limit: int = 10) -> str:
+        """Template summary of log lines (HTML)"""
+        summary = await blocking_executor.run_cpu(summarise_lines, collected, limit)
+        
+        text = [f"<i>{summary['lines']:,} lines, {summary['templates']} templates</i>\n"]
+        for index, template in enumerate(summary['top'], 1):
+            pattern = template['template']
+            if len(pattern) > 200:
+                pattern = pattern[:199] + '…'
+            text.append(f"<b>{index}.</b> {template['count']:,}× <code>{html.escape(pattern)}</code>")
+            examples = [', '.join(values) for values in template['examples'][:3]]
+            if examples:
+                shown = html.escape(' | '.join(examples))
+                text.append(f"   <i>e.g. {shown[:200]}</i>")
+        return '\n'.join(text)
+    
     def format_logs(self, logs: str, max_length: int = 3500) -> str:
         """Format logs for Telegram display"""
         if not logs:
@@ -186,33 +320,58 @@ class LogsManager:
         
         return f"<pre>{logs}</pre>"
     
-    def get_log_summary(self) -> str:
+    async def get_log_summary(self) -> str:
         """Get a summary of recent log activity"""
+        if journal_follower.live:
+            return self._counter_summary()
+        
         summary_lines = []
         
-        # System errors (last hour)
-        if self.journalctl_available:
-            cmd = ['sudo', 'journalctl', '-p', 'err', '--since', '1h', '--no-pager']
-            success, output = self._run_command(cmd)
-            error_count = len(output.split('\n')) if success else 0
-            summary_lines.append(f"❌ Errors (last 1h): {error_count}")
-            
-            # Warnings (last hour)
-            cmd = ['sudo', 'journalctl', '-p', 'warning', '--since', '1h', '--no-pager']
-            success, output = self._run_command(cmd)
-            warning_count = len(output.split('\n')) if success else 0
-            summary_lines.append(f"⚠️ Warnings (last 1h): {warning_count}")
-        
-        # Failed SSH attempts
+        def count_lines(output: str) -> int:
+            return sum(1 for line in output.splitlines() if line.strip())
+        
+        # Errors, warnings and failed SSH (last hour), fetched in parallel
+        checks = []
         auth_log = Path('/var/log/auth.log')
-        if auth_log.exists():
-            cmd = ['sudo', 'grep', 'Failed password', str(auth_log), '|', 'tail', '-n', '100']
-            success, output = self._run_command(cmd)
-            failed_ssh = len(output.split('\n')) if success else 0
-            summary_lines.append(f"🔐 Failed SSH (recent): {failed_ssh}")
+        if self.journalctl_available:
+            checks.append(self._run_command(['sudo', 'journalctl', '-p', 'err', '--since', '-1h', '--no-pager', '-q']))
+            checks.append(self._run_command(['sudo', 'journalctl', '-p', 'warning', '--since', '-1h', '--no-pager', '-q']))
+            # Same entries the follower counts (sshd / sshd-session)
+            checks.append(self._run_command(['sudo', 'journalctl', '-t', 'sshd', '-t', 'sshd-session', '--since', '-1h',
+                                             '--grep', 'Failed password', '--no-pager', '-q']))
+        elif auth_log.exists():
+            checks.append(self._run_command(['sudo', 'grep', '-c', 'Failed password', str(auth_log)]))
+        
+        results = await asyncio.gather(*checks)
+        
+        if self.journalctl_available:
+            (err_ok, err_out), (warn_ok, warn_out), (ssh_ok, ssh_out) = results
+            summary_lines.append(f"❌ Errors (last 1h): {count_lines(err_out) if err_ok else 0}")
+            summary_lines.append(f"⚠️ Warnings (last 1h): {count_lines(warn_out) if warn_ok else 0}")
+            summary_lines.append(f"🔐 Failed SSH (last 1h): {count_lines(ssh_out) if ssh_ok else 0}")
+        elif auth_log.exists():
+            success, output = results[-1]
+            # grep -c exits 1 when there are no matches; counts the whole file
+            failed_ssh = int(output.strip()) if output.strip().isdigit() else 0
+            summary_lines.append(f"🔐 Failed SSH (auth.log): {failed_ssh}")
         
         return '\n'.join(summary_lines) if summary_lines else "No summary available"
     
+    def _counter_summary(self) -> str:
+        """Summary from the journal follower's counters (no journal scan)"""
+        counters = journal_follower.counters
+        rate = counters.per_minute(5)
+        lines = [
+            f"❌ Errors (last 1h): {counters.count('err')}",
+            f"⚠️ Warnings (last 1h): {counters.count('warning')}",
+            f"🔐 Failed SSH (last 1h): {counters.count('ssh')}",
+            f"📈 Entries/min (last 5m): {', '.join(str(count) for count in rate)}",
+        ]
+        top = counters.top_units(60, 3)
+        if top:
+            lines.append("🔝 Noisiest: " + ', '.join(f"{unit} ({count})" for unit, count in top))
+        return '\n'.join(lines)
+    
     # Preset log configurations
     LOG_TYPES = {
         'system': {
@@ -247,6 +406,16 @@ class LogsManager:
         'ssh': '🔐 SSH (sshd)'
     }
     
+    # Log files of applications without journal entries
+    APP_LOG_PATHS = {
+        'nginx': ['/var/log/nginx/error.log', '/var/log/nginx/access.log'],
+        'apache2': ['/var/log/apache2/error.log', '/var/log/apache2/access.log'],
+        'mysql': ['/var/log/mysql/error.log'],
+        'postgresql': ['/var/log/postgresql/postgresql.log'],
+        'docker': ['/var/log/docker.log'],
+        'redis': ['/var/log/redis/redis-server.log']
+    }
+    
     PRIORITIES = {
         'err': '❌ Errors Only',
         'warning': '⚠️ Warnings & Errors',
@@ -254,6 +423,9 @@ class LogsManager:
         'debug': '🔍 All (including Debug)'
     }
     
+    # Lines read for a template summary
+    PATTERN_LINES = 10000
+    
     TIME_RANGES = {
         '1h': '⏱️ Last Hour',
         '6h': '⏱️ Last 6 Hours',
@@ -0,0 +1,169 @@
+"""
+Journal Pager
+Page through the journal by cursor, one constant-size page at a time
+"""
+import html
+import json
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.settings import config
+from src.utils.runner import command_runner
+
+logger = logging.getLogger(__name__)
+
+# Entries per page (fits a Telegram message)
+PAGE_SIZE = 20
+
+# Characters of one message shown
+MESSAGE_WIDTH = 140
+
+FIELDS = 'SYSLOG_IDENTIFIER,_COMM,_PID,MESSAGE,PRIORITY'
+
+
+@dataclass
+class JournalPage:
+    """Entries of one page, oldest first, and the cursors around them"""
+    entries: List[Dict[str, Any]] = field(default_factory=list)
+    has_older: bool = False
+    has_newer: bool = False
+    # Oldest time of the view (unix seconds), fixed when it was opened
+    since: Optional[float] = None
+
+    @property
+    def first_cursor(self) -> Optional[str]:
+        return self.entries[0].get('__CURSOR') if self.entries else None
+
+    @property
+    def last_cursor(self) -> Optional[str]:
+        return self.entries[-1].get('__CURSOR') if self.entries else None
+
+
+class JournalPager:
+    """
+    Cursor-based journal pages per (chat, view)
+
+    - latest: `journalctl -r` from the end of the journal
+    - older: `journalctl --cursor <first> -r`, starting at the oldest
+      entry shown
+    - newer: `journalctl --after-cursor <last>`
+    journalctl refuses --since together with a cursor, so a view's time
+    range is applied to the entries instead. Output is read only until a
+    page (+1 to know whether more exist) is complete and journalctl is
+    stopped, so a page far back costs the same as the newest one. Cursors
+    are kept per chat (callback data is too small for them), the least
+    recently used view is dropped first.
+    """
+
+    def __init__(self, page_size: int = PAGE_SIZE, max_views: Optional[int] = None):
+        self.page_size = page_size
+        self.max_views = max_views or config.SESSION_MAX_SNAPSHOTS
+        self._pages: 'OrderedDict[Tuple[int, str], JournalPage]' = OrderedDict()
+
+    async def _read(self, args: List[str], limit: int) -> List[Dict[str, Any]]:
+        """Up to `limit` entries in journalctl output order"""
+        cmd = ['sudo', 'journalctl', '-o', 'json', '--output-fields', FIELDS, '--no-pager', '-q'] + args
+        entries = []
+        stream = command_runner.stream(cmd, timeout=15)
+        try:
+            async for line in stream:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    # stderr is merged into the stream
+                    logger.debug(f"journalctl: {line}")
+                    continue
+                if len(entries) >= limit:
+                    break
+        finally:
+            # Stops journalctl right away instead of at garbage collection
+            await stream.aclose()
+        return entries
+
+    @staticmethod
+    def _timestamp(entry: Dict[str, Any]) -> float:
+        try:
+            return int(entry['__REALTIME_TIMESTAMP']) / 1e6
+        except (KeyError, TypeError, ValueError):
+            return 0.0
+
+    async def _backwards(self, filters: List[str], since: Optional[float],
+                         cursor: Optional[str] = None) -> JournalPage:
+        """Page ending at the newest entry, or just before `cursor`"""
+        args = filters + (['--cursor', cursor] if cursor else []) + ['-r']
+        entries = await self._read(args, self.page_size + (2 if cursor else 1))
+        # --cursor includes the entry itself
+        entries = [entry for entry in entries if entry.get('__CURSOR') != cursor]
+        in_range = [entry for entry in entries if since is None or self._timestamp(entry) >= since]
+        has_older = len(in_range) > self.page_size
+        return JournalPage(in_range[:self.page_size][::-1], has_older=has_older,
+                           has_newer=cursor is not None, since=since)
+
+    async def get_page(self, chat_id: int, view: str, filters: List[str],
+                       direction: str = 'latest', since: Optional[float] = None) -> JournalPage:
+        """
+        Page of a journal view
+
+        Args:
+            chat_id: Telegram chat id
+            view: View name including its filter (e.g. 'system:1h')
+            filters: journalctl arguments of the view (-k, -p err, ...)
+            direction: 'latest', 'older' or 'newer' (relative to the page shown last)
+            since: Oldest entry time for a new view (unix seconds)
+        """
+        key = (chat_id, view)
+        current = self._pages.get(key)
+
+        if direction == 'older' and current is not None and current.first_cursor:
+            page = await self._backwards(filters, current.since, current.first_cursor)
+            if not page.entries:
+                current.has_older = False
+                page = current
+        elif direction == 'newer' and current is not None and current.last_cursor:
+            entries = await self._read(filters + ['--after-cursor', current.last_cursor], self.page_size + 1)
+            if len(entries) > self.page_size:
+                page = JournalPage(entries[:self.page_size], has_older=True, has_newer=True, since=current.since)
+            else:
+                # Reached the end: show a full newest page instead of a short one
+                page = await self._backwards(filters, current.since)
+        else:
+            page = await self._backwards(filters, since)
+
+        self._pages[key] = page
+        self._pages.move_to_end(key)
+        while len(self._pages) > self.max_views:
+            self._pages.popitem(last=False)
+        return page
+
+    @staticmethod
+    def format_entry(entry: Dict[str, Any]) -> str:
+        """One entry like `journalctl -o short` (HTML-escaped)"""
+        timestamp = JournalPager._timestamp(entry)
+        when = datetime.fromtimestamp(timestamp).strftime('%m-%d %H:%M:%S') if timestamp else '?'
+        identifier = entry.get('SYSLOG_IDENTIFIER') or entry.get('_COMM') or '?'
+        pid = f"[{entry['_PID']}]" if entry.get('_PID') else ''
+        message = entry.get('MESSAGE')
+        if isinstance(message, list):
+            message = bytes(message).decode('utf-8', 'replace')
+        elif message is None:
+            message = '[message too large]'
+        message = ' '.join(str(message).split())
+        if len(message) > MESSAGE_WIDTH:
+            message = message[:MESSAGE_WIDTH - 1] + '…'
+        return html.escape(f"{when} {identifier}{pid}: {message}")
+
+    def format_page(self, page: JournalPage) -> str:
+        """Page body for Telegram display"""
+        if not page.entries:
+            return "<i>No logs available</i>"
+        return "<pre>" + '\n'.join(self.format_entry(entry) for entry in page.entries) + "</pre>"
+
+    def get_stats(self) -> Dict[str, int]:
+        return {'views': len(self._pages), 'limit': self.max_views}
+
+
+# Global journal pager
+journal_pager = JournalPager()
@@ -0,0 +1,182 @@
+"""
+Log File Tail
+Read the last lines of log files in-process, following appends and rotation
+"""
+import gzip
+import logging
+import mmap
+import os
+import threading
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Lines kept per file between views
+MAX_LINES = 1000
+
+# Lines read on the first view of a file (more if a view asks for more)
+INITIAL_LINES = 200
+
+# Appended bytes read incrementally; beyond this the tail is located again
+MAX_INCREMENT = 4 << 20
+
+# Compressed rotated logs larger than this are not decompressed
+MAX_GZIP_SIZE = 8 << 20
+
+
+def _last_lines(f, size: int, count: int) -> List[bytes]:
+    """Last `count` lines of the first `size` bytes, scanning backwards through an mmap"""
+    if size <= 0 or count <= 0:
+        return []
+    with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mapped:
+        end = size - 1 if mapped[size - 1] == 0x0A else size
+        begin = end
+        for _ in range(count):
+            if begin <= 0:
+                break
+            begin = mapped.rfind(b'\n', 0, begin)
+        return mapped[begin + 1:end].split(b'\n') if end > begin + 1 else []
+
+
+class TailState:
+    """What is known about one log file"""
+    __slots__ = ('inode', 'offset', 'lines', 'complete', 'partial')
+
+    def __init__(self, inode: Tuple[int, int], offset: int, lines: List[bytes], complete: bool):
+        self.inode = inode
+        # End of the last complete line read
+        self.offset = offset
+        self.lines: Deque[bytes] = deque(lines, maxlen=MAX_LINES)
+        # lines holds everything from the start of the file
+        self.complete = complete
+        self.partial = b''
+
+
+class LogTail:
+    """
+    `tail -n` without a process
+
+    - the first view of a file finds its last lines by scanning backwards
+      through a memory map, so the cost depends on the lines read, not on
+      the file size
+    - later views only read the bytes appended since (by inode + offset)
+    - a new inode or a shrunk file means rotation / truncation: the file
+      is read again, and when it is still shorter than the view the
+      rotated sibling (.1 or .1.gz) supplies the older lines
+    - read() returns None when the file cannot be opened (e.g. no
+      permission), so the caller can fall back to `sudo tail`
+    """
+
+    def __init__(self):
+        self._files: Dict[str, TailState] = {}
+        self._siblings: Dict[str, Tuple[tuple, List[bytes]]] = {}
+        self._lock = threading.Lock()
+        self.fresh_reads = 0
+        self.incremental_reads = 0
+
+    def read(self, path: str, count: int = 50) -> Optional[List[str]]:
+        """Last `count` lines of a log file"""
+        count = min(count, MAX_LINES)
+        try:
+            f = open(path, 'rb')
+        except OSError:
+            return None
+        with f, self._lock:
+            stat = os.fstat(f.fileno())
+            inode = (stat.st_dev, stat.st_ino)
+            state = self._files.get(path)
+
+            if (state is None or state.inode != inode or stat.st_size < state.offset
+                    or stat.st_size - state.offset > MAX_INCREMENT
+                    or (count > len(state.lines) and not state.complete)):
+                state = self._fresh(f, stat.st_size, inode, count)
+                self._files[path] = state
+            elif stat.st_size > state.offset:
+                self._append(f, state, stat.st_size)
+
+            lines = list(state.lines)
+            if state.partial:
+                lines.append(state.partial)
+            if len(lines) < count and state.complete:
+                lines = self._rotated(path, count - len(lines)) + lines
+
+        return [line.decode('utf-8', 'replace') for line in lines[-count:]]
+
+    def _fresh(self, f, size: int, inode: Tuple[int, int], count: int) -> TailState:
+        self.fresh_reads += 1
+        want = min(max(count, INITIAL_LINES), MAX_LINES)
+        if size == 0:
+            return TailState(inode, 0, [], True)
+        with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mapped:
+            offset = mapped.rfind(b'\n') + 1
+            partial = mapped[offset:size]
+        lines = _last_lines(f, offset, want)
+        state = TailState(inode, offset, lines, len(lines) < want)
+        state.partial = partial
+        return state
+
+    def _append(self, f, state: TailState, size: int):
+        self.incremental_reads += 1
+        f.seek(state.offset)
+        data = f.read(size - state.offset)
+        newline = data.rfind(b'\n')
+        if newline < 0:
+            state.partial = data
+            return
+        state.lines.extend(data[:newline].split(b'\n'))
+        state.offset += newline + 1
+        state.partial = data[newline + 1:]
+
+    def _rotated(self, path: str, count: int) -> List[bytes]:
+        """Last lines of the most recent rotated file (path.1, else path.1.gz)"""
+        for sibling in (f"{path}.1", f"{path}.1.gz"):
+            try:
+                stat = os.stat(sibling)
+            except OSError:
+                continue
+            key = (stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            cached = self._siblings.get(sibling)
+            if cached is None or cached[0] != key:
+                try:
+                    lines = self._read_sibling(sibling, stat.st_size)
+                except (OSError, EOFError, gzip.BadGzipFile) as e:
+                    logger.debug(f"Cannot read rotated log {sibling}: {e}")
+                    continue
+                cached = self._siblings[sibling] = (key, lines)
+            return cached[1][-count:]
+        return []
+
+    @staticmethod
+    def _read_sibling(sibling: str, size: int) -> List[bytes]:
+        if not sibling.endswith('.gz'):
+            with open(sibling, 'rb') as f:
+                return _last_lines(f, size, MAX_LINES)
+        if size > MAX_GZIP_SIZE:
+            return []
+        with gzip.open(sibling, 'rb') as f:
+            return [line.rstrip(b'\n') for line in deque(f, maxlen=MAX_LINES)]
+
+    def forget(self, path: str):
+        self._files.pop(path, None)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'files': len(self._files),
+            'fresh_reads': self.fresh_reads,
+            'incremental_reads': self.incremental_reads,
+        }
+
+
+def last_lines(path: str, count: int) -> Optional[List[str]]:
+    """Last `count` lines of a file without caching (bulk reads), None when unreadable"""
+    try:
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            return [line.decode('utf-8', 'replace') for line in _last_lines(f, size, count)]
+    except OSError:
+        return None
+
+
+# Global log tail reader
+log_tail = LogTail()
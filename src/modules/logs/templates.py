@@ -0,0 +1,179 @@
+"""
+Log Templates
+Group log lines into templates (Drain) to summarise thousands of lines
+"""
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+WILDCARD = '<*>'
+
+# Numbers, IPs, times and hex ids are variables from the start:
+# sshd[812]: -> sshd[<*>]:, 10.0.0.1 -> <*> (ssh2 / eth0 stay as they are)
+VARIABLE = re.compile(r'\b[0-9a-f]*\d[0-9a-f.:]*')
+
+# Timestamp and host in front of syslog file lines and `journalctl -o short-unix`
+LINE_PREFIX = re.compile(r'^(?:[A-Z][a-z]{2} [ \d]\d \d\d:\d\d:\d\d|\d{4}-\d\d-\d\dT\S+|\d+\.\d+) \S+ ')
+
+# Distinct example values kept per variable position
+EXAMPLES = 3
+
+# Lines sampled for examples after a template change
+EXAMPLE_LINES = 32
+
+
+class LogCluster:
+    """One template and the lines it matched"""
+    __slots__ = ('template', 'count', 'examples', 'sampled', 'dead')
+
+    def __init__(self, tokens: List[str]):
+        self.template = tokens
+        self.count = 0
+        # Variable position -> distinct values seen (whole-token variables
+        # only: the pid in sshd[<*>]: is not worth showing)
+        self.examples: Dict[int, List[str]] = {}
+        self.sampled = 0
+        self.dead = False
+
+    def add_examples(self, values: List[str]):
+        self.sampled += 1
+        for position, token in enumerate(self.template):
+            if token == WILDCARD:
+                seen = self.examples.setdefault(position, [])
+                if len(seen) < EXAMPLES and values[position] not in seen:
+                    seen.append(values[position])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'template': ' '.join(self.template),
+            'count': self.count,
+            'examples': [values for position, values in sorted(self.examples.items())
+                         if self.template[position] == WILDCARD and values],
+        }
+
+
+class TemplateMiner:
+    """
+    Drain log template miner
+
+    - lines go down a fixed-depth tree: token count, then the first
+      depth - 2 tokens (at most max_children per node, the rest share a
+      wildcard branch); the leaf holds candidate clusters
+    - a line joins the most similar cluster when at least `threshold` of
+      its tokens match (the differing ones become wildcards), otherwise
+      it starts a new cluster
+    - lines identical after masking skip the tree through a bounded cache
+    - at most max_clusters are kept; the smallest are dropped first
+    """
+
+    def __init__(self, depth: int = 4, threshold: float = 0.4, max_children: int = 100,
+                 max_clusters: int = 1000, cache_size: int = 10000):
+        self.prefix = max(1, depth - 2)
+        self.threshold = threshold
+        self.max_children = max_children
+        self.max_clusters = max_clusters
+        self.cache_size = cache_size
+        self.root: Dict[int, Dict] = {}
+        self.clusters: List[LogCluster] = []
+        self._cache: Dict[str, LogCluster] = {}
+        self.lines = 0
+
+    def _group(self, tokens: List[str]) -> List[LogCluster]:
+        """Leaf of the parse tree for a token list"""
+        node = self.root.setdefault(len(tokens), {})
+        prefix = tokens[:self.prefix]
+        for index, token in enumerate(prefix):
+            child = node.get(token)
+            if child is None:
+                if len(node) >= self.max_children:
+                    token = WILDCARD
+                    child = node.get(token)
+                if child is None:
+                    child = node[token] = [] if index == len(prefix) - 1 else {}
+            node = child
+        return node
+
+    def _match(self, group: List[LogCluster], tokens: List[str]) -> Optional[LogCluster]:
+        best, best_similarity, best_params = None, -1.0, -1
+        for cluster in group:
+            same = params = 0
+            for template_token, token in zip(cluster.template, tokens):
+                if template_token == token:
+                    same += 1
+                elif template_token == WILDCARD:
+                    params += 1
+            similarity = same / len(tokens)
+            if similarity > best_similarity or (similarity == best_similarity and params > best_params):
+                best, best_similarity, best_params = cluster, similarity, params
+        return best if best is not None and best_similarity >= self.threshold else None
+
+    def add(self, line: str):
+        """Feed one line (timestamp / host prefix already removed)"""
+        masked = VARIABLE.sub(WILDCARD, line)
+        cluster = self._cache.get(masked)
+        if cluster is None or cluster.dead:
+            tokens = masked.split()
+            if not tokens:
+                return
+            group = self._group(tokens)
+            cluster = self._match(group, tokens)
+            if cluster is None:
+                cluster = LogCluster(tokens)
+                group.append(cluster)
+                self.clusters.append(cluster)
+                if len(self.clusters) > self.max_clusters:
+                    self._prune()
+            elif cluster.template != tokens:
+                template = [old if old == new else WILDCARD for old, new in zip(cluster.template, tokens)]
+                if template != cluster.template:
+                    cluster.template = template
+                    cluster.sampled = 0
+            if len(self._cache) >= self.cache_size:
+                self._cache.clear()
+            self._cache[masked] = cluster
+
+        self.lines += 1
+        cluster.count += 1
+        if cluster.sampled < EXAMPLE_LINES:
+            cluster.add_examples(line.split())
+
+    def _prune(self):
+        """Drop the smallest clusters down to 80% of max_clusters"""
+        self.clusters.sort(key=lambda cluster: cluster.count, reverse=True)
+        keep = int(self.max_clusters * 0.8)
+        for cluster in self.clusters[keep:]:
+            cluster.dead = True
+        self.clusters = self.clusters[:keep]
+        self._prune_tree(self.root)
+
+    def _prune_tree(self, node):
+        for key, child in list(node.items()):
+            if isinstance(child, list):
+                child[:] = [cluster for cluster in child if not cluster.dead]
+            else:
+                self._prune_tree(child)
+
+    def top(self, limit: int = 10) -> List[LogCluster]:
+        return sorted(self.clusters, key=lambda cluster: cluster.count, reverse=True)[:limit]
+
+
+def strip_prefix(line: str) -> str:
+    """Remove the timestamp and host a syslog / journal line starts with"""
+    match = LINE_PREFIX.match(line)
+    return line[match.end():] if match else line
+
+
+def summarise_lines(lines: Iterable[str], limit: int = 10) -> Dict[str, Any]:
+    """
+    Mine templates from log lines (runs in the process pool)
+
+    Returns:
+        Dict with lines, templates (count) and top (list of template dicts)
+    """
+    miner = TemplateMiner()
+    for line in lines:
+        miner.add(strip_prefix(line))
+    return {
+        'lines': miner.lines,
+        'templates': len(miner.clusters),
+        'top': [cluster.to_dict() for cluster in miner.top(limit)],
+    }
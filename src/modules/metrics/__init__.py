@@ -0,0 +1,46 @@
+"""
+Metrics Module
+Shared background collector, in-memory and on-disk history for system metrics
+"""
+from config.settings import config, LOG_DIR
+from .collector import MetricsCollector, MetricsSnapshot, DiskUsage
+from .timeseries import RingBuffer, TimeSeriesStore, snapshot_values
+from .history import MetricsHistory, HistoryPoint, Tier, default_tiers
+from .aggregates import summarize, summarize_period
+
+# Global metrics collector instance
+metrics_collector = MetricsCollector()
+
+# Global in-memory history, fed by the collector on every tick
+metrics_store = TimeSeriesStore(config.METRICS_RETENTION, metrics_collector.interval)
+metrics_collector.add_listener(metrics_store.record_snapshot)
+
+# Global persistent history (memory-mapped segments, multi-resolution)
+metrics_history = MetricsHistory(LOG_DIR / 'metrics', default_tiers(metrics_collector.interval))
+if config.METRICS_HISTORY_ENABLED:
+    metrics_collector.add_listener(metrics_history.record_snapshot)
+
+
+def get_snapshot() -> MetricsSnapshot:
+    """Get the latest metrics snapshot from the shared collector"""
+    return metrics_collector.get_snapshot()
+
+
+__all__ = [
+    'MetricsCollector',
+    'MetricsSnapshot',
+    'DiskUsage',
+    'RingBuffer',
+    'TimeSeriesStore',
+    'snapshot_values',
+    'MetricsHistory',
+    'HistoryPoint',
+    'Tier',
+    'default_tiers',
+    'summarize',
+    'summarize_period',
+    'metrics_collector',
+    'metrics_store',
+    'metrics_history',
+    'get_snapshot',
+]
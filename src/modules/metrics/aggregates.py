@@ -0,0 +1,103 @@
+"""
+Metrics Aggregates
+Vectorized summaries (min, mean, max, p95, time above threshold) over stored history
+"""
+import time
+from typing import Dict, Mapping, Optional
+
+import numpy as np
+
+from .history import MetricsHistory
+
+
+def summarize_slots(slots: np.ndarray, resolution: float,
+                    threshold: Optional[float] = None) -> Optional[Dict]:
+    """
+    Summarize history slots in one vectorized pass
+
+    min/max/mean are exact over all raw samples (slots keep min, max,
+    sum and count). p95 and time above threshold use per-bucket means,
+    so they are accurate to the tier resolution.
+
+    Returns:
+        Dict of statistics or None when there is no data
+    """
+    if not len(slots):
+        return None
+
+    counts = slots['count'].astype(np.float64)
+    means = slots['sum'] / counts
+    samples = counts.sum()
+    covered = len(slots) * resolution
+
+    summary = {
+        'min': round(float(slots['min'].min()), 2),
+        'mean': round(float(slots['sum'].sum() / samples), 2),
+        'max': round(float(slots['max'].max()), 2),
+        'p95': round(float(np.percentile(means, 95)), 2),
+        'samples': int(samples),
+        'covered_seconds': int(covered),
+        'resolution': resolution,
+    }
+
+    if threshold is not None:
+        above = int(np.count_nonzero(means > threshold)) * resolution
+        summary['threshold'] = threshold
+        summary['seconds_above'] = int(above)
+        summary['percent_above'] = round(above / covered * 100, 2)
+
+    return summary
+
+
+def summarize(history: MetricsHistory, metric: str, start: float,
+              end: Optional[float] = None, threshold: Optional[float] = None) -> Optional[Dict]:
+    """Summarize one metric over [start, end] from the coarsest needed tier"""
+    tier, slots = history.read_slots(metric, start, end)
+    return summarize_slots(slots, tier.resolution, threshold)
+
+
+def summarize_period(history: MetricsHistory, start: float, end: Optional[float] = None,
+                     thresholds: Optional[Mapping[str, float]] = None) -> Dict:
+    """
+    Summarize every stored metric for a report period
+
+    Args:
+        history: Persistent metrics history
+        start: Period start (epoch seconds)
+        end: Period end, defaults to now
+        thresholds: Alert thresholds by metric ('cpu', 'memory', 'swap', 'disk')
+
+    Returns:
+        Dict with cpu, memory, swap, load, disk (per mount), disk_io and
+        network (per interface) summaries
+    """
+    end = end or time.time()
+    thresholds = thresholds or {}
+
+    result = {
+        'cpu': summarize(history, 'cpu', start, end, thresholds.get('cpu')),
+        'memory': summarize(history, 'memory', start, end, thresholds.get('memory')),
+        'swap': summarize(history, 'swap', start, end, thresholds.get('swap')),
+        'load1': summarize(history, 'load1', start, end),
+        'disk_io': {
+            'read': summarize(history, 'disk.read', start, end),
+            'write': summarize(history, 'disk.write', start, end),
+        },
+        'disk': {},
+        'network': {},
+    }
+
+    for metric in history.metrics():
+        if metric.startswith('disk:'):
+            summary = summarize(history, metric, start, end, thresholds.get('disk'))
+            if summary:
+                result['disk'][metric[len('disk:'):]] = summary
+        elif metric.startswith(('net.sent:', 'net.recv:')):
+            direction, nic = metric[len('net.'):].split(':', 1)
+            summary = summarize(history, metric, start, end)
+            if summary:
+                # Rates are bytes/s, so mean * covered time ~= bytes moved
+                summary['total_mb'] = round(summary['mean'] * summary['covered_seconds'] / (1024**2), 2)
+                result['network'].setdefault(nic, {})[direction] = summary
+
+    return result
@@ -0,0 +1,352 @@
+"""
+Metrics Collector
+Background sampler that publishes immutable system snapshots
+"""
+import dataclasses
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import psutil
+
+from config.settings import config
+
+logger = logging.getLogger(__name__)
+
+# Seconds a tick waits for disk_usage() of the mounts; slower mounts are
+# reported as not responding instead of holding up the tick
+DISK_TIMEOUT = 2.0
+
+
+@dataclass(frozen=True)
+class DiskUsage:
+    """Usage of a single mounted partition"""
+    device: str
+    mountpoint: str
+    fstype: str
+    opts: str
+    total: Optional[int] = None
+    used: Optional[int] = None
+    free: Optional[int] = None
+    percent: Optional[float] = None
+    error: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class MetricsSnapshot:
+    """Immutable view of system metrics taken at one tick"""
+    timestamp: float
+    boot_time: float
+    cpu_percent: float
+    cpu_per_core: Tuple[float, ...]
+    cpu_count: int
+    cpu_count_physical: Optional[int]
+    cpu_freq: Any
+    load_avg: Tuple[float, float, float]
+    memory: Any
+    swap: Any
+    disks: Tuple[DiskUsage, ...]
+    disk_io: Any
+    disk_read_rate: float
+    disk_write_rate: float
+    net_io: Any
+    net_io_pernic: Mapping[str, Any]
+    net_sent_rate: float
+    net_recv_rate: float
+    net_rates_pernic: Mapping[str, Tuple[float, float]]
+    # Published more than 3 ticks ago (the collector is stuck or stopped)
+    stale: bool = False
+
+
+def _total_time(times) -> float:
+    """Total CPU time (guest time is already included in user/nice on Linux)"""
+    return sum(times) - getattr(times, 'guest', 0) - getattr(times, 'guest_nice', 0)
+
+
+def _busy_percent(prev, cur) -> float:
+    """CPU busy percentage between two cpu_times samples"""
+    prev_total = _total_time(prev)
+    cur_total = _total_time(cur)
+    prev_idle = prev.idle + getattr(prev, 'iowait', 0)
+    cur_idle = cur.idle + getattr(cur, 'iowait', 0)
+
+    total_delta = cur_total - prev_total
+    if total_delta <= 0:
+        return 0.0
+    busy_delta = total_delta - (cur_idle - prev_idle)
+    return round(max(0.0, min(100.0, busy_delta / total_delta * 100)), 1)
+
+
+def _rate(prev: Optional[int], cur: Optional[int], elapsed: float) -> float:
+    """Per-second rate of a monotonically increasing counter"""
+    if prev is None or cur is None or elapsed <= 0 or cur < prev:
+        return 0.0
+    return (cur - prev) / elapsed
+
+
+class DiskProbe:
+    """
+    disk_usage() of every mount, each in its own thread
+
+    A mount whose statvfs hangs (stuck NFS / CIFS) keeps its one thread
+    and is reported as not responding; no second probe is started for it
+    until the first one returns, so a hung mount costs one thread.
+    """
+
+    def __init__(self, timeout: float = DISK_TIMEOUT):
+        self.timeout = timeout
+        self._pending: Dict[str, threading.Thread] = {}
+        self._results: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _probe(self, mountpoint: str):
+        try:
+            result = psutil.disk_usage(mountpoint)
+        except Exception as e:
+            result = e
+        with self._lock:
+            self._results[mountpoint] = result
+            self._pending.pop(mountpoint, None)
+
+    def usage(self, partitions) -> List[DiskUsage]:
+        started = []
+        with self._lock:
+            for partition in partitions:
+                if partition.mountpoint in self._pending:
+                    continue
+                self._results.pop(partition.mountpoint, None)
+                thread = threading.Thread(target=self._probe, args=(partition.mountpoint,),
+                                          name='disk-probe', daemon=True)
+                self._pending[partition.mountpoint] = thread
+                started.append(thread)
+        for thread in started:
+            thread.start()
+
+        deadline = time.monotonic() + self.timeout
+        for thread in started:
+            thread.join(max(0.0, deadline - time.monotonic()))
+
+        disks = []
+        with self._lock:
+            for partition in partitions:
+                fields = dict(device=partition.device, mountpoint=partition.mountpoint,
+                              fstype=partition.fstype, opts=partition.opts)
+                result = self._results.get(partition.mountpoint)
+                if partition.mountpoint in self._pending or result is None:
+                    disks.append(DiskUsage(**fields, error='Not responding'))
+                elif isinstance(result, PermissionError):
+                    disks.append(DiskUsage(**fields, error='Permission denied'))
+                elif isinstance(result, Exception):
+                    disks.append(DiskUsage(**fields, error=str(result)))
+                else:
+                    disks.append(DiskUsage(**fields, total=result.total, used=result.used,
+                                           free=result.free, percent=result.percent))
+        return disks
+
+
+class MetricsCollector:
+    """
+    Sample CPU, memory, swap, load, disk and network on a fixed tick
+
+    Readers call get_snapshot() and never block on psutil intervals;
+    CPU usage is derived from cpu_times deltas between ticks. Disk usage
+    goes through DiskProbe, so a hung mount cannot stall a tick.
+    """
+
+    def __init__(self, interval: Optional[float] = None):
+        self.interval = interval or config.METRICS_INTERVAL
+        self._snapshot: Optional[MetricsSnapshot] = None
+        self._sample_lock = threading.Lock()
+        self._published = threading.Event()
+        self._disk_probe = DiskProbe()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._listeners: List[Callable[[MetricsSnapshot], None]] = []
+
+        # Previous counters for delta computation
+        self._prev_time: Optional[float] = None
+        self._prev_cpu_times = None
+        self._prev_disk_io = None
+        self._prev_net_io = None
+        self._prev_net_pernic = {}
+
+    @property
+    def running(self) -> bool:
+        """Whether the background thread is alive"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def add_listener(self, callback: Callable[[MetricsSnapshot], None]):
+        """Register a callback invoked with every new snapshot"""
+        self._listeners.append(callback)
+
+    def start(self):
+        """Start background sampling thread"""
+        if self.running:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name='metrics-collector',
+            daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Metrics collector started (every {self.interval}s)")
+
+    def stop(self):
+        """Stop background sampling thread"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+        logger.info("Metrics collector stopped")
+
+    def get_snapshot(self) -> MetricsSnapshot:
+        """
+        Get the latest published snapshot
+
+        Never waits behind a running tick for longer than one tick takes:
+        before the first snapshot exists it waits for it (or samples
+        itself when the collector is not running and nothing else is
+        sampling); an old snapshot is returned with stale=True.
+
+        Raises:
+            RuntimeError: no snapshot could be taken in time
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            if not self.running and self._sample_lock.acquire(blocking=False):
+                self._sample_lock.release()
+                return self.sample()
+            self._published.wait(self.interval + DISK_TIMEOUT + 1)
+            snapshot = self._snapshot
+            if snapshot is None:
+                raise RuntimeError("No metrics sample available yet")
+        if time.time() - snapshot.timestamp > self.interval * 3:
+            return dataclasses.replace(snapshot, stale=True)
+        return snapshot
+
+    def sample(self) -> MetricsSnapshot:
+        """Take one sample and publish it as the current snapshot"""
+        with self._sample_lock:
+            snapshot = self._collect()
+            self._snapshot = snapshot
+        self._published.set()
+
+        for callback in self._listeners:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                logger.error(f"Metrics listener failed: {e}")
+
+        return snapshot
+
+    def _run(self):
+        """Sampling loop on a fixed tick (no drift)"""
+        next_tick = time.monotonic()
+        while not self._stop_event.is_set():
+            try:
+                self.sample()
+            except Exception as e:
+                logger.error(f"Error collecting metrics: {e}")
+
+            next_tick += self.interval
+            delay = next_tick - time.monotonic()
+            if delay < 0:
+                # Sampling overran the tick, realign instead of bursting
+                next_tick = time.monotonic()
+                delay = 0
+            self._stop_event.wait(delay)
+
+    def _collect(self) -> MetricsSnapshot:
+        """Read every counter once and derive rates from the previous tick"""
+        cpu_times = psutil.cpu_times(percpu=True)
+        if self._prev_cpu_times is None:
+            # First sample ever: prime counters so usage is not zero
+            self._prev_cpu_times = cpu_times
+            time.sleep(0.1)
+            cpu_times = psutil.cpu_times(percpu=True)
+
+        now = time.time()
+        elapsed = now - self._prev_time if self._prev_time else 0.0
+
+        per_core = tuple(
+            _busy_percent(prev, cur)
+            for prev, cur in zip(self._prev_cpu_times, cpu_times)
+        )
+        cpu_percent = round(sum(per_core) / len(per_core), 1) if per_core else 0.0
+
+        try:
+            load_avg = psutil.getloadavg()
+        except (AttributeError, OSError):
+            load_avg = (0.0, 0.0, 0.0)
+
+        try:
+            cpu_freq = psutil.cpu_freq()
+        except Exception:
+            cpu_freq = None
+
+        # Disk usage per partition (bounded by DISK_TIMEOUT)
+        disks = self._disk_probe.usage(psutil.disk_partitions())
+
+        disk_io = psutil.disk_io_counters()
+        net_io = psutil.net_io_counters()
+        net_pernic = psutil.net_io_counters(pernic=True)
+
+        prev_disk, prev_net = self._prev_disk_io, self._prev_net_io
+        net_rates_pernic = {}
+        for nic, counters in net_pernic.items():
+            prev = self._prev_net_pernic.get(nic)
+            net_rates_pernic[nic] = (
+                _rate(prev.bytes_sent if prev else None, counters.bytes_sent, elapsed),
+                _rate(prev.bytes_recv if prev else None, counters.bytes_recv, elapsed)
+            )
+
+        snapshot = MetricsSnapshot(
+            timestamp=now,
+            boot_time=psutil.boot_time(),
+            cpu_percent=cpu_percent,
+            cpu_per_core=per_core,
+            cpu_count=psutil.cpu_count(logical=True) or len(per_core),
+            cpu_count_physical=psutil.cpu_count(logical=False),
+            cpu_freq=cpu_freq,
+            load_avg=tuple(load_avg),
+            memory=psutil.virtual_memory(),
+            swap=psutil.swap_memory(),
+            disks=tuple(disks),
+            disk_io=disk_io,
+            disk_read_rate=_rate(
+                prev_disk.read_bytes if prev_disk else None,
+                disk_io.read_bytes if disk_io else None,
+                elapsed
+            ),
+            disk_write_rate=_rate(
+                prev_disk.write_bytes if prev_disk else None,
+                disk_io.write_bytes if disk_io else None,
+                elapsed
+            ),
+            net_io=net_io,
+            net_io_pernic=MappingProxyType(dict(net_pernic)),
+            net_sent_rate=_rate(
+                prev_net.bytes_sent if prev_net else None,
+                net_io.bytes_sent if net_io else None,
+                elapsed
+            ),
+            net_recv_rate=_rate(
+                prev_net.bytes_recv if prev_net else None,
+                net_io.bytes_recv if net_io else None,
+                elapsed
+            ),
+            net_rates_pernic=MappingProxyType(net_rates_pernic)
+        )
+
+        self._prev_time = now
+        self._prev_cpu_times = cpu_times
+        self._prev_disk_io = disk_io
+        self._prev_net_io = net_io
+        self._prev_net_pernic = dict(net_pernic)
+
+        return snapshot
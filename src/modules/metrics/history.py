@@ -0,0 +1,380 @@
+"""
+Metrics History
+Persistent multi-resolution time-series stored in memory-mapped segments
+
+Layout: one fixed-size segment file per (tier, metric) under
+logs/metrics/<tier>/<metric>.seg. Each file has a small header followed by
+a ring of slots; slot i holds the aggregate (min, max, sum, count) of the
+time bucket with bucket % slots == i. Writing a sample updates one slot in
+every tier in place, so rollups happen incrementally and a write never
+touches more than one slot per file.
+"""
+import logging
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Tuple
+from urllib.parse import quote, unquote
+
+import numpy as np
+
+from .collector import MetricsSnapshot
+from .timeseries import snapshot_values
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'TSMH'
+VERSION = 1
+
+# magic, version, clean flag, resolution (seconds), slot count
+HEADER = struct.Struct('<4sHBxdI')
+HEADER_SIZE = 64
+CLEAN_OFFSET = 6
+
+# bucket, min, max, sum, count, crc32 of the preceding fields
+SLOT = struct.Struct('<qdddII')
+SLOT_SIZE = SLOT.size
+SLOT_BODY = struct.Struct('<qdddI')
+
+# Same slot layout for vectorized reads
+SLOT_DTYPE = np.dtype([
+    ('bucket', '<i8'), ('min', '<f8'), ('max', '<f8'),
+    ('sum', '<f8'), ('count', '<u4'), ('crc', '<u4'),
+])
+
+# Flush dirty pages to disk at most this often (seconds)
+FLUSH_INTERVAL = 60
+
+# Segments not written or read for this long are closed (seconds)
+IDLE_CLOSE = 3600
+
+# Look for segment files older than their tier's retention this often (seconds)
+EXPIRE_INTERVAL = 3600
+
+
+@dataclass(frozen=True)
+class Tier:
+    """One resolution level of the history"""
+    name: str
+    resolution: float
+    slots: int
+
+    @property
+    def retention(self) -> float:
+        """Seconds of history the tier can hold"""
+        return self.resolution * self.slots
+
+
+@dataclass(frozen=True)
+class HistoryPoint:
+    """Aggregate of all samples in one time bucket"""
+    timestamp: float
+    min: float
+    max: float
+    mean: float
+    count: int
+
+
+def default_tiers(interval: float) -> Tuple[Tier, ...]:
+    """Raw collector interval for 1 hour, 1 minute for 7 days, 1 hour for 1 year"""
+    return (
+        Tier('raw', interval, max(1, int(3600 / interval))),
+        Tier('1m', 60, 7 * 24 * 60),
+        Tier('1h', 3600, 365 * 24),
+    )
+
+
+def _slot_crc(bucket: int, vmin: float, vmax: float, vsum: float, count: int) -> int:
+    return zlib.crc32(SLOT_BODY.pack(bucket, vmin, vmax, vsum, count))
+
+
+class Segment:
+    """Fixed-size memory-mapped ring of aggregate slots for one metric"""
+
+    def __init__(self, path: Path, tier: Tier):
+        self.path = path
+        self.tier = tier
+        self.size = HEADER_SIZE + tier.slots * SLOT_SIZE
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+        self._open()
+
+    def _open(self):
+        """Open or create the segment, recovering after an unclean shutdown"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        if self.path.exists() and not self._header_matches():
+            # Different tier layout or corrupt header: keep it aside, start over
+            corrupt = self.path.with_suffix('.seg.old')
+            os.replace(self.path, corrupt)
+            logger.warning(f"Metrics segment {self.path} incompatible, moved to {corrupt}")
+
+        created = not self.path.exists()
+        self._file = open(self.path, 'w+b' if created else 'r+b')
+        if created or os.path.getsize(self.path) != self.size:
+            self._file.truncate(self.size)
+        self._map = mmap.mmap(self._file.fileno(), self.size)
+
+        if created:
+            self._map[:HEADER.size] = HEADER.pack(MAGIC, VERSION, 0, self.tier.resolution, self.tier.slots)
+        elif not self._map[CLEAN_OFFSET]:
+            self._recover()
+
+        # Mark dirty until close() runs
+        self._map[CLEAN_OFFSET] = 0
+
+    def _header_matches(self) -> bool:
+        """Check header of an existing file against the tier layout"""
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read(HEADER.size)
+            magic, version, _, resolution, slots = HEADER.unpack(data)
+        except (OSError, struct.error):
+            return False
+        return (
+            magic == MAGIC and version == VERSION
+            and resolution == self.tier.resolution and slots == self.tier.slots
+        )
+
+    def _recover(self):
+        """Clear slots whose checksum does not match (torn writes)"""
+        repaired = 0
+        for index in range(self.tier.slots):
+            offset = HEADER_SIZE + index * SLOT_SIZE
+            bucket, vmin, vmax, vsum, count, crc = SLOT.unpack_from(self._map, offset)
+            if bucket and crc != _slot_crc(bucket, vmin, vmax, vsum, count):
+                self._map[offset:offset + SLOT_SIZE] = bytes(SLOT_SIZE)
+                repaired += 1
+        if repaired:
+            logger.warning(f"Recovered metrics segment {self.path}: cleared {repaired} torn slots")
+
+    def write(self, timestamp: float, value: float):
+        """Merge a sample into its bucket slot (O(1), in place)"""
+        bucket = int(timestamp // self.tier.resolution)
+        offset = HEADER_SIZE + (bucket % self.tier.slots) * SLOT_SIZE
+        cur_bucket, vmin, vmax, vsum, count, crc = SLOT.unpack_from(self._map, offset)
+
+        if cur_bucket == bucket and count and crc == _slot_crc(cur_bucket, vmin, vmax, vsum, count):
+            vmin = min(vmin, value)
+            vmax = max(vmax, value)
+            vsum += value
+            count += 1
+        elif cur_bucket > bucket:
+            # Slot already holds a newer bucket (clock went backwards)
+            return
+        else:
+            vmin = vmax = vsum = value
+            count = 1
+
+        SLOT.pack_into(self._map, offset, bucket, vmin, vmax, vsum, count,
+                       _slot_crc(bucket, vmin, vmax, vsum, count))
+
+    def read(self, start: float, end: float) -> List[HistoryPoint]:
+        """Read buckets starting within [start, end], oldest first"""
+        resolution = self.tier.resolution
+        last = int(end // resolution)
+        first = max(math.ceil(start / resolution), last - self.tier.slots + 1)
+
+        points = []
+        for bucket in range(first, last + 1):
+            offset = HEADER_SIZE + (bucket % self.tier.slots) * SLOT_SIZE
+            slot_bucket, vmin, vmax, vsum, count, crc = SLOT.unpack_from(self._map, offset)
+            if slot_bucket != bucket or not count:
+                continue
+            if crc != _slot_crc(slot_bucket, vmin, vmax, vsum, count):
+                continue
+            points.append(HistoryPoint(bucket * resolution, vmin, vmax, vsum / count, count))
+        return points
+
+    def read_slots(self, start: float, end: float) -> np.ndarray:
+        """
+        Read buckets in [start, end] as a structured array (SLOT_DTYPE)
+
+        Checksums are not verified here: torn slots are cleared by
+        _recover() on open and live writes are serialized by the caller.
+        """
+        resolution = self.tier.resolution
+        last = int(end // resolution)
+        first = max(math.ceil(start / resolution), last - self.tier.slots + 1)
+
+        # Copy out of the mmap so no buffer export outlives close()
+        view = np.frombuffer(self._map, dtype=SLOT_DTYPE, count=self.tier.slots, offset=HEADER_SIZE)
+        slots = view.copy()
+        del view
+
+        mask = (slots['bucket'] >= first) & (slots['bucket'] <= last) & (slots['count'] > 0)
+        slots = slots[mask]
+        return slots[np.argsort(slots['bucket'], kind='stable')]
+
+    def flush(self):
+        """Write dirty pages to disk"""
+        if self._map is not None:
+            self._map.flush()
+
+    def close(self):
+        """Flush, mark clean and unmap"""
+        if self._map is None:
+            return
+        self._map[CLEAN_OFFSET] = 1
+        self._map.flush()
+        self._map.close()
+        self._file.close()
+        self._map = None
+        self._file = None
+
+
+class MetricsHistory:
+    """
+    On-disk history for every collected metric across all tiers
+
+    Segments are opened lazily on first use and closed again after
+    IDLE_CLOSE seconds without use, so metrics that stopped (unmounted
+    disk, removed interface) do not keep files open. Their files are
+    deleted once they are older than the tier's retention. Reads pick the
+    finest tier whose retention covers the requested window, so a 7-day
+    query only touches the 1-minute tier.
+    """
+
+    def __init__(self, directory: Path, tiers: Tuple[Tier, ...]):
+        self.directory = Path(directory)
+        self.tiers = tuple(sorted(tiers, key=lambda t: t.resolution))
+        self._segments: Dict[Tuple[str, str], Segment] = {}
+        # Segment key -> time.monotonic() of its last use
+        self._used: Dict[Tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        # First expiry pass on the first flush
+        self._last_expire = self._last_flush - EXPIRE_INTERVAL
+
+    def _path(self, tier: Tier, metric: str) -> Path:
+        return self.directory / tier.name / f"{quote(metric, safe='')}.seg"
+
+    def _segment(self, tier: Tier, metric: str, create: bool = True) -> Optional[Segment]:
+        """Get an open segment (caller holds the lock)"""
+        key = (tier.name, metric)
+        segment = self._segments.get(key)
+        if segment is None:
+            path = self._path(tier, metric)
+            if not create and not path.exists():
+                return None
+            segment = self._segments[key] = Segment(path, tier)
+        self._used[key] = time.monotonic()
+        return segment
+
+    def _close_idle(self, now: float):
+        """Close segments unused for IDLE_CLOSE seconds (caller holds the lock)"""
+        for key in [key for key, used in self._used.items() if now - used > IDLE_CLOSE]:
+            segment = self._segments.pop(key)
+            del self._used[key]
+            try:
+                segment.close()
+            except Exception as e:
+                logger.error(f"Error closing metrics segment {segment.path}: {e}")
+
+    def _expire_files(self):
+        """Delete closed segment files last written before the tier's retention (caller holds the lock)"""
+        now = time.time()
+        for tier in self.tiers:
+            tier_dir = self.directory / tier.name
+            if not tier_dir.is_dir():
+                continue
+            for path in tier_dir.glob('*.seg'):
+                if (tier.name, unquote(path.stem)) in self._segments:
+                    continue
+                try:
+                    if now - path.stat().st_mtime > tier.retention:
+                        path.unlink()
+                except OSError as e:
+                    logger.warning(f"Cannot expire metrics segment {path}: {e}")
+
+    def tier_for(self, start: float, now: Optional[float] = None) -> Tier:
+        """Finest tier whose retention reaches back to start"""
+        now = now or time.time()
+        for tier in self.tiers:
+            # One bucket of slack so "last 7 days" still fits the 7-day tier
+            if now - start <= tier.retention + tier.resolution:
+                return tier
+        return self.tiers[-1]
+
+    def metrics(self) -> List[str]:
+        """Names of metrics with stored history"""
+        names = set()
+        for tier in self.tiers:
+            tier_dir = self.directory / tier.name
+            if tier_dir.is_dir():
+                names.update(unquote(p.stem) for p in tier_dir.glob('*.seg'))
+        return sorted(names)
+
+    def record(self, timestamp: float, values: Mapping[str, float]):
+        """Write one sample per metric into every tier"""
+        with self._lock:
+            for name, value in values.items():
+                for tier in self.tiers:
+                    try:
+                        self._segment(tier, name).write(timestamp, float(value))
+                    except Exception as e:
+                        logger.error(f"Error writing metrics history {tier.name}/{name}: {e}")
+
+            now = time.monotonic()
+            if now - self._last_flush >= FLUSH_INTERVAL:
+                for segment in self._segments.values():
+                    segment.flush()
+                self._close_idle(now)
+                self._last_flush = now
+                if now - self._last_expire >= EXPIRE_INTERVAL:
+                    self._expire_files()
+                    self._last_expire = now
+
+    def record_snapshot(self, snapshot: MetricsSnapshot):
+        """Collector listener: persist every value from a snapshot"""
+        self.record(snapshot.timestamp, snapshot_values(snapshot))
+
+    def query(self, metric: str, start: float, end: Optional[float] = None,
+              tier: Optional[Tier] = None) -> Tuple[Tier, List[HistoryPoint]]:
+        """
+        Read aggregated history for a metric
+
+        Args:
+            metric: Metric name (see snapshot_values)
+            start: Window start (epoch seconds)
+            end: Window end, defaults to now
+            tier: Force a tier instead of picking by window length
+
+        Returns:
+            Tuple of (tier used, points oldest first)
+        """
+        end = end or time.time()
+        tier = tier or self.tier_for(start, end)
+        with self._lock:
+            segment = self._segment(tier, metric, create=False)
+            if segment is None:
+                return tier, []
+            return tier, segment.read(start, end)
+
+    def read_slots(self, metric: str, start: float, end: Optional[float] = None,
+                   tier: Optional[Tier] = None) -> Tuple[Tier, np.ndarray]:
+        """Like query() but returns raw slots as a numpy structured array"""
+        end = end or time.time()
+        tier = tier or self.tier_for(start, end)
+        with self._lock:
+            segment = self._segment(tier, metric, create=False)
+            if segment is None:
+                return tier, np.empty(0, dtype=SLOT_DTYPE)
+            return tier, segment.read_slots(start, end)
+
+    def close(self):
+        """Flush and close all segments"""
+        with self._lock:
+            for segment in self._segments.values():
+                try:
+                    segment.close()
+                except Exception as e:
+                    logger.error(f"Error closing metrics segment {segment.path}: {e}")
+            self._segments.clear()
+            self._used.clear()
@@ -0,0 +1,227 @@
+"""
+Time-Series Store
+Fixed-size ring buffers of metric history backed by typed arrays
+"""
+import os
+import threading
+from array import array
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from config.settings import config
+from .collector import MetricsSnapshot
+
+# Each sample is a float64 timestamp plus a float64 value
+BYTES_PER_SAMPLE = 16
+
+# Interfaces whose per-interface history is kept (empty: physical ones)
+INTERFACES = {name.strip() for name in config.METRICS_INTERFACES.split(',') if name.strip()}
+
+# Interface name -> has a device behind it (veth, bridges, lo do not)
+_physical: Dict[str, bool] = {}
+
+
+class RingBuffer:
+    """Fixed-capacity ring of (timestamp, value) samples"""
+
+    __slots__ = ('capacity', '_times', '_values', '_head', '_size')
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._times = array('d', bytes(8 * capacity))
+        self._values = array('d', bytes(8 * capacity))
+        self._head = 0  # next write position
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the sample arrays"""
+        return self.capacity * BYTES_PER_SAMPLE
+
+    def append(self, timestamp: float, value: float):
+        """Append a sample, overwriting the oldest when full"""
+        if self._size and timestamp < self._times[(self._head - 1) % self.capacity]:
+            # Out-of-order sample would break the sorted-time invariant
+            return
+        self._times[self._head] = timestamp
+        self._values[self._head] = value
+        self._head = (self._head + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def _physical(self, index: int) -> int:
+        """Map logical index (0 = oldest) to array position"""
+        return (self._head - self._size + index) % self.capacity
+
+    def _lower_bound(self, timestamp: float) -> int:
+        """First logical index with time >= timestamp"""
+        lo, hi = 0, self._size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._times[self._physical(mid)] < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _upper_bound(self, timestamp: float) -> int:
+        """First logical index with time > timestamp"""
+        lo, hi = 0, self._size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._times[self._physical(mid)] <= timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _slice(self, source: array, first: int, last: int) -> array:
+        """Copy logical range [first, last) into a contiguous array"""
+        if first >= last:
+            return array('d')
+        start = self._physical(first)
+        end = self._physical(last - 1) + 1
+        if start < end:
+            return source[start:end]
+        return source[start:] + source[:end]
+
+    def window(self, start: Optional[float] = None,
+               end: Optional[float] = None) -> Tuple[array, array]:
+        """
+        Get samples with start <= timestamp <= end
+
+        Returns:
+            Tuple of (timestamps, values) arrays, oldest first
+        """
+        first = 0 if start is None else self._lower_bound(start)
+        last = self._size if end is None else self._upper_bound(end)
+        return self._slice(self._times, first, last), self._slice(self._values, first, last)
+
+    def latest(self) -> Optional[Tuple[float, float]]:
+        """Most recent sample or None"""
+        if not self._size:
+            return None
+        pos = (self._head - 1) % self.capacity
+        return self._times[pos], self._values[pos]
+
+
+def tracked_interface(nic: str) -> bool:
+    """
+    Keep per-interface history for this interface
+
+    Container veth pairs come and go with every container start, so
+    only METRICS_INTERFACES (or, when unset, interfaces backed by a
+    device in /sys/class/net) get their own series.
+    """
+    if INTERFACES:
+        return nic in INTERFACES
+    physical = _physical.get(nic)
+    if physical is None:
+        if os.path.isdir('/sys/class/net'):
+            physical = os.path.exists(f'/sys/class/net/{nic}/device')
+        else:
+            physical = not nic.startswith('lo')
+        _physical[nic] = physical
+    return physical
+
+
+def snapshot_values(snapshot: MetricsSnapshot) -> Dict[str, float]:
+    """Flatten a snapshot into named metric values"""
+    values = {
+        'cpu': snapshot.cpu_percent,
+        'memory': snapshot.memory.percent,
+        'swap': snapshot.swap.percent,
+        'load1': snapshot.load_avg[0],
+        'disk.read': snapshot.disk_read_rate,
+        'disk.write': snapshot.disk_write_rate,
+        'net.sent': snapshot.net_sent_rate,
+        'net.recv': snapshot.net_recv_rate,
+    }
+
+    for disk in snapshot.disks:
+        if disk.fstype and disk.percent is not None:
+            values[f'disk:{disk.mountpoint}'] = disk.percent
+
+    for nic, (sent_rate, recv_rate) in snapshot.net_rates_pernic.items():
+        if not tracked_interface(nic):
+            continue
+        values[f'net.sent:{nic}'] = sent_rate
+        values[f'net.recv:{nic}'] = recv_rate
+
+    return values
+
+
+class TimeSeriesStore:
+    """
+    In-memory history for every collected metric
+
+    Each metric gets one RingBuffer sized for the retention window, so
+    memory use is capacity * 16 bytes per metric. A metric that stops
+    being reported (unmounted disk) is dropped once its newest sample
+    is older than the retention window.
+    """
+
+    def __init__(self, retention_seconds: float, interval: float):
+        self.retention_seconds = retention_seconds
+        self.interval = interval
+        self.capacity = int(retention_seconds / interval) + 1
+        self._series: Dict[str, RingBuffer] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def bytes_per_metric(self) -> int:
+        """Memory reserved for each metric"""
+        return self.capacity * BYTES_PER_SAMPLE
+
+    def memory_usage(self) -> int:
+        """Total bytes reserved by all series"""
+        with self._lock:
+            return sum(series.nbytes for series in self._series.values())
+
+    def metrics(self) -> List[str]:
+        """Names of all recorded metrics"""
+        with self._lock:
+            return sorted(self._series)
+
+    def record(self, timestamp: float, values: Mapping[str, float]):
+        """Append one sample per metric"""
+        with self._lock:
+            for name, value in values.items():
+                series = self._series.get(name)
+                if series is None:
+                    series = self._series[name] = RingBuffer(self.capacity)
+                series.append(timestamp, float(value))
+
+            if len(self._series) > len(values):
+                cutoff = timestamp - self.retention_seconds
+                for name in [name for name in self._series if name not in values]:
+                    latest = self._series[name].latest()
+                    if latest is None or latest[0] < cutoff:
+                        del self._series[name]
+
+    def record_snapshot(self, snapshot: MetricsSnapshot):
+        """Collector listener: store every value from a snapshot"""
+        self.record(snapshot.timestamp, snapshot_values(snapshot))
+
+    def window(self, metric: str, start: Optional[float] = None,
+               end: Optional[float] = None) -> Tuple[array, array]:
+        """
+        Get (timestamps, values) for a metric within a time range
+
+        Unknown metrics return empty arrays.
+        """
+        with self._lock:
+            series = self._series.get(metric)
+            if series is None:
+                return array('d'), array('d')
+            return series.window(start, end)
+
+    def latest(self, metric: str) -> Optional[Tuple[float, float]]:
+        """Most recent (timestamp, value) for a metric"""
+        with self._lock:
+            series = self._series.get(metric)
+            return series.latest() if series else None
@@ -2,8 +2,10 @@
 Network Connections Module
 """
 import psutil
+from src.utils.cache import cacheable
 
 
+@cacheable(ttl=5)
 def get_network_connections() -> str:
     """Koneksi jaringan aktif"""
     info = f"🔌 *KONEKSI AKTIF*\n\n"
@@ -3,8 +3,10 @@ Network Information Module
 """
 import psutil
 import socket
+from src.utils.cache import cacheable
 
 
+@cacheable(ttl=10)
 def get_network_info() -> str:
     """Informasi jaringan lengkap"""
     info = f"🌐 *INFORMASI JARINGAN*\n\n"
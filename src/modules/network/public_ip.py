@@ -2,8 +2,10 @@
 Public IP Module
 """
 import subprocess
+from src.utils.cache import cacheable
 
 
+@cacheable(ttl=300)
 def get_public_ip() -> str:
     """Dapatkan IP public"""
     info = f"🌍 *IP PUBLIC*\n\n"
@@ -3,8 +3,10 @@ Network Statistics Module
 """
 import psutil
 from src.utils.formatters import format_bytes
+from src.utils.cache import cacheable
 
 
+@cacheable(ttl=2)
 def get_network_stats() -> str:
     """Statistik penggunaan jaringan"""
     net_io = psutil.net_io_counters()
@@ -4,6 +4,7 @@ Ping, Routing, DNS
 """
 import subprocess
 import os
+from src.utils.cache import cacheable
 
 
 def ping_host(host: str) -> str:
@@ -36,6 +37,7 @@ def ping_host(host: str) -> str:
     return info
 
 
+@cacheable(ttl=30)
 def get_routing_table() -> str:
     """Tampilkan routing table"""
     info = f"🗺️ *ROUTING TABLE*\n\n"
@@ -59,6 +61,7 @@ def get_routing_table() -> str:
     return info
 
 
+@cacheable(ttl=60)
 def get_dns_info() -> str:
     """Informasi DNS"""
     info = f"🔍 *INFORMASI DNS*\n\n"
@@ -4,36 +4,26 @@ Advanced Network Tools Module
 Provides comprehensive network diagnostic and testing tools.
 """
 
-import subprocess
 import socket
 import time
 from typing import List, Dict, Optional, Tuple
 import re
 
+from ...utils.runner import command_runner
+from ...utils.capabilities import capabilities
+
 
 class NetworkTools:
     """Advanced network diagnostic tools"""
     
-    def __init__(self):
-        """Initialize network tools"""
-        pass
-    
-    def _run_command(self, command: List[str], timeout: int = 30) -> Tuple[bool, str]:
+    async def _run_command(self, command: List[str], timeout: int = 30) -> Tuple[bool, str]:
         """Run a command and return success status and output"""
-        try:
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                timeout=timeout
-            )
-            return (result.returncode == 0, result.stdout if result.returncode == 0 else result.stderr)
-        except subprocess.TimeoutExpired:
-            return (False, "Command timed out")
-        except (subprocess.SubprocessError, FileNotFoundError) as e:
-            return (False, str(e))
+        if not capabilities.has(command[0]):
+            return (False, f"{command[0]} is not installed")
+        result = await command_runner.run(command, timeout=timeout)
+        return (result.ok, result.output)
     
-    def ping_host(self, host: str, count: int = 4) -> Dict:
+    async def ping_host(self, host: str, count: int = 4) -> Dict:
         """
         Ping a host
         
@@ -45,7 +35,7 @@ class NetworkTools:
             Dict with ping results
         """
         cmd = ['ping', '-c', str(count), host]
-        success, output = self._run_command(cmd, timeout=count * 5)
+        success, output = await self._run_command(cmd, timeout=count * 5)
         
         result = {
             'host': host,
@@ -72,7 +62,7 @@ class NetworkTools:
         
         return result
     
-    def traceroute(self, host: str, max_hops: int = 30) -> Dict:
+    async def traceroute(self, host: str, max_hops: int = 30) -> Dict:
         """
         Traceroute to a host
         
@@ -84,7 +74,7 @@ class NetworkTools:
             Dict with traceroute results
         """
         cmd = ['traceroute', '-m', str(max_hops), host]
-        success, output = self._run_command(cmd, timeout=60)
+        success, output = await self._run_command(cmd, timeout=60)
         
         return {
             'host': host,
@@ -150,7 +140,7 @@ class NetworkTools:
         
         return open_ports
     
-    def dns_lookup(self, domain: str, record_type: str = 'A') -> Dict:
+    async def dns_lookup(self, domain: str, record_type: str = 'A') -> Dict:
         """
         DNS lookup
         
@@ -162,7 +152,7 @@ class NetworkTools:
             Dict with DNS results
         """
         cmd = ['dig', '+short', domain, record_type]
-        success, output = self._run_command(cmd, timeout=10)
+        success, output = await self._run_command(cmd, timeout=10)
         
         records = []
         if success and output.strip():
@@ -176,7 +166,7 @@ class NetworkTools:
             'count': len(records)
         }
     
-    def whois_lookup(self, domain: str) -> Dict:
+    async def whois_lookup(self, domain: str) -> Dict:
         """
         Whois lookup
         
@@ -187,7 +177,7 @@ class NetworkTools:
             Dict with whois results
         """
         cmd = ['whois', domain]
-        success, output = self._run_command(cmd, timeout=15)
+        success, output = await self._run_command(cmd, timeout=15)
         
         return {
             'domain': domain,
@@ -351,3 +341,7 @@ class NetworkTools:
     def get_dns_record_types(self):
         """Get DNS record types"""
         return self.DNS_RECORD_TYPES
+
+
+# Global network tools instance
+network_tools = NetworkTools()
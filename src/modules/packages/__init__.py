@@ -7,4 +7,7 @@ Requires apt/dpkg to be installed on the system.
 
 from .manager import PackageManager
 
-__all__ = ['PackageManager']
+# Global package manager instance
+package_manager = PackageManager()
+
+__all__ = ['PackageManager', 'package_manager']
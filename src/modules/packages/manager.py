@@ -4,57 +4,39 @@ Package Manager Module
 Provides APT package management functionality for Debian/Ubuntu systems.
 """
 
-import subprocess
 import re
 from typing import List, Dict, Optional, Tuple
 
+from ...utils.runner import command_runner
+from ...utils.capabilities import capabilities
+
 
 class PackageManager:
     """Manages APT package operations"""
     
-    def __init__(self):
-        """Initialize package manager"""
-        self.apt_available = self._check_apt()
-    
-    def _check_apt(self) -> bool:
-        """Check if APT is available"""
-        try:
-            result = subprocess.run(
-                ['apt', '--version'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            return result.returncode == 0
-        except (subprocess.SubprocessError, FileNotFoundError):
-            return False
+    @property
+    def apt_available(self) -> bool:
+        """Whether apt is installed (cached registry lookup)"""
+        return capabilities.has('apt')
     
-    def _run_command(self, command: List[str], timeout: int = 30) -> Tuple[bool, str]:
+    async def _run_command(self, command: List[str], timeout: int = 30,
+                           cancellable: bool = True) -> Tuple[bool, str]:
         """
         Run a command and return success status and output
         
         Returns:
             Tuple of (success, output)
         """
-        try:
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                timeout=timeout
-            )
-            return (result.returncode == 0, result.stdout + result.stderr)
-        except subprocess.TimeoutExpired:
-            return (False, "Command timed out")
-        except (subprocess.SubprocessError, FileNotFoundError) as e:
-            return (False, str(e))
+        result = await command_runner.run(command, timeout=timeout,
+                                          cancellable=cancellable, merge_stderr=True)
+        return (result.ok, result.output)
     
-    def get_installed_packages(self, limit: int = 50) -> List[Dict[str, str]]:
+    async def get_installed_packages(self, limit: Optional[int] = 50) -> List[Dict[str, str]]:
         """
         Get list of installed packages
         
         Args:
-            limit: Maximum number of packages to return
+            limit: Maximum number of packages to return (None = all)
         
         Returns:
             List of package dictionaries
@@ -62,7 +44,7 @@ class PackageManager:
         if not self.apt_available:
             return []
         
-        success, output = self._run_command(['dpkg', '-l'])
+        success, output = await self._run_command(['dpkg', '-l'])
         if not success:
             return []
         
@@ -80,7 +62,7 @@ class PackageManager:
         
         return packages[:limit]
     
-    def search_packages(self, query: str) -> List[Dict[str, str]]:
+    async def search_packages(self, query: str) -> List[Dict[str, str]]:
         """
         Search for packages
         
@@ -93,7 +75,7 @@ class PackageManager:
         if not self.apt_available:
             return []
         
-        success, output = self._run_command(['apt-cache', 'search', query])
+        success, output = await self._run_command(['apt-cache', 'search', query])
         if not success:
             return []
         
@@ -108,7 +90,7 @@ class PackageManager:
         
         return packages
     
-    def get_package_info(self, package_name: str) -> Optional[Dict[str, str]]:
+    async def get_package_info(self, package_name: str) -> Optional[Dict[str, str]]:
         """
         Get detailed information about a package
         
@@ -121,7 +103,7 @@ class PackageManager:
         if not self.apt_available:
             return None
         
-        success, output = self._run_command(['apt-cache', 'show', package_name])
+        success, output = await self._run_command(['apt-cache', 'show', package_name])
         if not success:
             return None
         
@@ -133,12 +115,12 @@ class PackageManager:
         
         return info
     
-    def is_package_installed(self, package_name: str) -> bool:
+    async def is_package_installed(self, package_name: str) -> bool:
         """Check if a package is installed"""
-        success, output = self._run_command(['dpkg', '-l', package_name])
+        success, output = await self._run_command(['dpkg', '-l', package_name])
         return success and 'ii' in output
     
-    def get_upgradeable_packages(self) -> List[Dict[str, str]]:
+    async def get_upgradeable_packages(self) -> List[Dict[str, str]]:
         """
         Get list of upgradeable packages
         
@@ -148,7 +130,7 @@ class PackageManager:
         if not self.apt_available:
             return []
         
-        success, output = self._run_command(['apt', 'list', '--upgradable'])
+        success, output = await self._run_command(['apt', 'list', '--upgradable'])
         if not success:
             return []
         
@@ -167,7 +149,7 @@ class PackageManager:
         
         return packages
     
-    def update_package_list(self) -> Tuple[bool, str]:
+    async def update_package_list(self) -> Tuple[bool, str]:
         """
         Update package list (apt update)
         
@@ -177,7 +159,7 @@ class PackageManager:
         if not self.apt_available:
             return (False, "APT not available")
         
-        success, output = self._run_command(['sudo', 'apt', 'update'], timeout=60)
+        success, output = await self._run_command(['sudo', 'apt', 'update'], timeout=60, cancellable=False)
         
         if success:
             # Parse output for summary
@@ -187,7 +169,7 @@ class PackageManager:
         else:
             return (False, f"Failed to update package list.\n{output[:500]}")
     
-    def upgrade_packages(self, package_name: Optional[str] = None) -> Tuple[bool, str]:
+    async def upgrade_packages(self, package_name: Optional[str] = None) -> Tuple[bool, str]:
         """
         Upgrade packages (apt upgrade)
         
@@ -205,14 +187,14 @@ class PackageManager:
         else:
             cmd = ['sudo', 'apt', 'upgrade', '-y']
         
-        success, output = self._run_command(cmd, timeout=300)
+        success, output = await self._run_command(cmd, timeout=300, cancellable=False)
         
         if success:
             return (True, "Packages upgraded successfully!")
         else:
             return (False, f"Failed to upgrade packages.\n{output[:500]}")
     
-    def install_package(self, package_name: str) -> Tuple[bool, str]:
+    async def install_package(self, package_name: str) -> Tuple[bool, str]:
         """
         Install a package
         
@@ -225,9 +207,10 @@ class PackageManager:
         if not self.apt_available:
             return (False, "APT not available")
         
-        success, output = self._run_command(
+        success, output = await self._run_command(
             ['sudo', 'apt', 'install', '-y', package_name],
-            timeout=300
+            timeout=300,
+            cancellable=False
         )
         
         if success:
@@ -235,7 +218,7 @@ class PackageManager:
         else:
             return (False, f"Failed to install '{package_name}'.\n{output[:500]}")
     
-    def remove_package(self, package_name: str) -> Tuple[bool, str]:
+    async def remove_package(self, package_name: str) -> Tuple[bool, str]:
         """
         Remove a package
         
@@ -248,9 +231,10 @@ class PackageManager:
         if not self.apt_available:
             return (False, "APT not available")
         
-        success, output = self._run_command(
+        success, output = await self._run_command(
             ['sudo', 'apt', 'remove', '-y', package_name],
-            timeout=120
+            timeout=120,
+            cancellable=False
         )
         
         if success:
@@ -258,7 +242,7 @@ class PackageManager:
         else:
             return (False, f"Failed to remove '{package_name}'.\n{output[:500]}")
     
-    def autoremove(self) -> Tuple[bool, str]:
+    async def autoremove(self) -> Tuple[bool, str]:
         """
         Remove unused packages (apt autoremove)
         
@@ -268,36 +252,37 @@ class PackageManager:
         if not self.apt_available:
             return (False, "APT not available")
         
-        success, output = self._run_command(['sudo', 'apt', 'autoremove', '-y'], timeout=120)
+        success, output = await self._run_command(['sudo', 'apt', 'autoremove', '-y'], timeout=120, cancellable=False)
         
         if success:
             return (True, "Unused packages removed successfully!")
         else:
             return (False, f"Failed to autoremove.\n{output[:500]}")
     
-    def get_package_count(self) -> Dict[str, int]:
+    async def get_package_count(self) -> Dict[str, int]:
         """Get package statistics"""
         if not self.apt_available:
             return {'installed': 0, 'upgradeable': 0}
         
         # Count installed
-        success, output = self._run_command(['dpkg', '-l'])
+        success, output = await self._run_command(['dpkg', '-l'])
         installed = len([l for l in output.split('\n') if l.startswith('ii')])
         
         # Count upgradeable
-        upgradeable = len(self.get_upgradeable_packages())
+        upgradeable = len(await self.get_upgradeable_packages())
         
         return {
             'installed': installed,
             'upgradeable': upgradeable
         }
     
-    def format_package_list(self, packages: List[Dict[str, str]], title: str = "Packages") -> str:
-        """Format package list for Telegram display"""
+    def format_package_list(self, packages: List[Dict[str, str]], title: str = "Packages",
+                            total: Optional[int] = None) -> str:
+        """Format package list for Telegram display (total: size of the whole list when paging)"""
         if not packages:
             return f"📦 <b>{title}</b>\n\nNo packages found."
         
-        lines = [f"📦 <b>{title} ({len(packages)})</b>\n"]
+        lines = [f"📦 <b>{title} ({total if total is not None else len(packages)})</b>\n"]
         
         for pkg in packages[:20]:  # Limit to 20
             name = pkg.get('name', 'Unknown')
@@ -2,6 +2,11 @@
 Process Manager Module
 Advanced process management
 """
+from .sampler import ProcessSampler, ProcessTable, ProcessRow
+from .procfs import ProcfsReader
 from .manager import ProcessManager
 
-__all__ = ['ProcessManager']
+# Global process sampler shared by every process view
+process_sampler = ProcessSampler()
+
+__all__ = ['ProcessManager', 'ProcessSampler', 'ProcessTable', 'ProcessRow', 'ProcfsReader', 'process_sampler']
@@ -5,99 +5,42 @@ Advanced process operations
 import psutil
 from typing import List, Dict, Optional
 import signal
+from .sampler import ProcessSampler
 
 
 class ProcessManager:
     """Manage system processes"""
     
-    def __init__(self):
-        self.cached_processes = []
-        self.last_update = 0
+    def __init__(self, sampler: Optional[ProcessSampler] = None):
+        if sampler is None:
+            from . import process_sampler as sampler
+        self.sampler = sampler
     
     def get_all_processes(self, sort_by='cpu', limit=20) -> List[Dict]:
         """Get all processes sorted by criteria"""
         try:
-            processes = []
-            
-            for proc in psutil.process_iter(['pid', 'name', 'username', 'cpu_percent', 'memory_percent', 'status', 'create_time']):
-                try:
-                    info = proc.info
-                    # Get CPU percent (will be 0.0 on first call)
-                    info['cpu_percent'] = proc.cpu_percent(interval=0.1)
-                    processes.append(info)
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-            
-            # Sort
-            if sort_by == 'cpu':
-                processes.sort(key=lambda x: x.get('cpu_percent', 0), reverse=True)
-            elif sort_by == 'memory':
-                processes.sort(key=lambda x: x.get('memory_percent', 0), reverse=True)
-            elif sort_by == 'name':
-                processes.sort(key=lambda x: x.get('name', '').lower())
-            elif sort_by == 'pid':
-                processes.sort(key=lambda x: x.get('pid', 0))
-            
-            return processes[:limit]
-        
+            return self.sampler.get_table().top(sort_by, limit)
         except Exception as e:
             return []
     
     def search_processes(self, query: str) -> List[Dict]:
         """Search processes by name"""
         try:
-            query_lower = query.lower()
-            processes = []
-            
-            for proc in psutil.process_iter(['pid', 'name', 'username', 'cpu_percent', 'memory_percent', 'status']):
-                try:
-                    info = proc.info
-                    if query_lower in info['name'].lower():
-                        info['cpu_percent'] = proc.cpu_percent(interval=0.1)
-                        processes.append(info)
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-            
-            return processes[:20]
-        
+            return self.sampler.get_table().search(query)
         except Exception as e:
             return []
     
     def filter_by_user(self, username: str) -> List[Dict]:
         """Filter processes by username"""
         try:
-            processes = []
-            
-            for proc in psutil.process_iter(['pid', 'name', 'username', 'cpu_percent', 'memory_percent', 'status']):
-                try:
-                    info = proc.info
-                    if info.get('username') == username:
-                        info['cpu_percent'] = proc.cpu_percent(interval=0.1)
-                        processes.append(info)
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-            
-            return processes[:20]
-        
+            return self.sampler.get_table().filter_by_user(username)
         except Exception as e:
             return []
     
     def filter_by_status(self, status: str) -> List[Dict]:
         """Filter processes by status (running, sleeping, etc)"""
         try:
-            processes = []
-            
-            for proc in psutil.process_iter(['pid', 'name', 'username', 'cpu_percent', 'memory_percent', 'status']):
-                try:
-                    info = proc.info
-                    if info.get('status', '').lower() == status.lower():
-                        info['cpu_percent'] = proc.cpu_percent(interval=0.1)
-                        processes.append(info)
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-            
-            return processes[:20]
-        
+            return self.sampler.get_table().filter_by_status(status)
         except Exception as e:
             return []
     
@@ -106,12 +49,15 @@ class ProcessManager:
         try:
             proc = psutil.Process(pid)
             
+            # CPU% from the shared table, no per-process sleep
+            row = self.sampler.get_table().get(pid)
+            
             info = {
                 'pid': proc.pid,
                 'name': proc.name(),
                 'status': proc.status(),
                 'username': proc.username(),
-                'cpu_percent': proc.cpu_percent(interval=0.1),
+                'cpu_percent': row['cpu_percent'] if row else 0.0,
                 'memory_percent': proc.memory_percent(),
                 'memory_mb': proc.memory_info().rss / (1024 * 1024),
                 'num_threads': proc.num_threads(),
@@ -196,25 +142,21 @@ class ProcessManager:
     def get_users(self) -> List[str]:
         """Get list of unique usernames"""
         try:
-            users = set()
-            for proc in psutil.process_iter(['username']):
-                try:
-                    username = proc.info.get('username')
-                    if username:
-                        users.add(username)
-                except:
-                    continue
-            return sorted(list(users))
+            return self.sampler.get_table().users()
         except Exception as e:
             return []
     
-    def format_process_list(self, processes: List[Dict], title: str = "PROCESSES") -> str:
-        """Format process list for Telegram"""
+    def format_process_list(self, processes: List[Dict], title: str = "PROCESSES",
+                            total: Optional[int] = None) -> str:
+        """Format process list for Telegram (total: size of the whole list when paging)"""
         if not processes:
             return f"*{title}*\n\n📭 No processes found"
         
         text = f"*{title}*\n"
-        text += f"_Showing {len(processes)} processes_\n\n"
+        if total is not None:
+            text += f"_Showing {len(processes)} of {total} processes_\n\n"
+        else:
+            text += f"_Showing {len(processes)} processes_\n\n"
         
         for proc in processes[:15]:  # Limit to 15 for readability
             pid = proc.get('pid', 0)
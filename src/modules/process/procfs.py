@@ -0,0 +1,159 @@
+"""
+Procfs Reader
+Linux-native process scanner reading /proc directly into slotted records
+"""
+import os
+import pwd
+import sys
+from typing import Dict, Optional
+
+PROC = '/proc'
+
+# /proc/[pid]/stat state letters to psutil status names
+STATUS_MAP = {
+    'R': 'running',
+    'S': 'sleeping',
+    'D': 'disk-sleep',
+    'Z': 'zombie',
+    'T': 'stopped',
+    't': 'tracing-stop',
+    'X': 'dead',
+    'x': 'dead',
+    'I': 'idle',
+    'W': 'waking',
+    'K': 'wake-kill',
+    'P': 'parked',
+}
+
+# Field offsets after the ")" that closes comm (state is 0)
+_UTIME, _STIME, _NUM_THREADS, _STARTTIME, _RSS = 11, 12, 17, 19, 21
+
+
+class ProcStat:
+    """Raw counters for one process; updated in place between scans"""
+
+    __slots__ = ('pid', 'name', 'uid', 'state', 'starttime', 'cpu_ticks',
+                 'prev_ticks', 'rss_pages', 'num_threads', 'seen')
+
+    def __init__(self, pid: int, starttime: int):
+        self.pid = pid
+        self.starttime = starttime
+        self.name = ''
+        self.uid = -1
+        self.state = ''
+        self.cpu_ticks = 0
+        self.prev_ticks: Optional[int] = None
+        self.rss_pages = 0
+        self.num_threads = 0
+        self.seen = 0
+
+
+def is_available() -> bool:
+    """Whether /proc can be used instead of psutil"""
+    return sys.platform.startswith('linux') and os.path.exists(f'{PROC}/stat')
+
+
+class ProcfsReader:
+    """
+    Scan /proc/[pid]/stat and /proc/[pid]/status into ProcStat records
+
+    Records and read buffers are reused between scans: a pid that is
+    still alive (same starttime) keeps its object, and its previous CPU
+    ticks stay on the record as prev_ticks for delta computation.
+    """
+
+    def __init__(self):
+        self.clock_ticks = os.sysconf('SC_CLK_TCK')
+        self.page_size = os.sysconf('SC_PAGE_SIZE')
+        self.boot_time = self._read_boot_time()
+        self.records: Dict[int, ProcStat] = {}
+        self._generation = 0
+        self._stat_buf = bytearray(1024)
+        self._status_buf = bytearray(1024)
+        self._usernames: Dict[int, str] = {}
+
+    def _read_boot_time(self) -> float:
+        """btime from /proc/stat"""
+        with open(f'{PROC}/stat', 'rb') as f:
+            for line in f:
+                if line.startswith(b'btime'):
+                    return float(line.split()[1])
+        return 0.0
+
+    def _read(self, path: str, buf: bytearray) -> Optional[bytes]:
+        """Read a small proc file into a reusable buffer"""
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            return None
+        try:
+            n = os.readv(fd, [buf])
+        except OSError:
+            return None
+        finally:
+            os.close(fd)
+        return bytes(memoryview(buf)[:n])
+
+    def username(self, uid: int) -> str:
+        """Resolve uid to user name (cached)"""
+        name = self._usernames.get(uid)
+        if name is None:
+            try:
+                name = pwd.getpwuid(uid).pw_name
+            except KeyError:
+                name = str(uid)
+            self._usernames[uid] = name
+        return name
+
+    def create_time(self, record: ProcStat) -> float:
+        """Process start time as epoch seconds (same formula as psutil)"""
+        return self.boot_time + record.starttime / self.clock_ticks
+
+    def scan(self) -> Dict[int, ProcStat]:
+        """Refresh records for every live process and drop exited ones"""
+        self._generation += 1
+        generation = self._generation
+        records = self.records
+
+        for entry in os.listdir(PROC):
+            if not entry.isdigit():
+                continue
+            pid = int(entry)
+
+            data = self._read(f'{PROC}/{entry}/stat', self._stat_buf)
+            if not data:
+                continue
+            close = data.rfind(b')')
+            fields = data[close + 2:].split()
+            starttime = int(fields[_STARTTIME])
+
+            record = records.get(pid)
+            if record is None or record.starttime != starttime:
+                # New process (or pid reuse): fresh record, no previous ticks
+                record = records[pid] = ProcStat(pid, starttime)
+            else:
+                record.prev_ticks = record.cpu_ticks
+
+            record.name = data[data.find(b'(') + 1:close].decode('utf-8', 'replace')
+            record.state = chr(fields[0][0])
+            record.cpu_ticks = int(fields[_UTIME]) + int(fields[_STIME])
+            record.num_threads = int(fields[_NUM_THREADS])
+            record.rss_pages = int(fields[_RSS])
+            record.uid = self._read_uid(entry, record.uid)
+            record.seen = generation
+
+        # Drop processes that disappeared since the last scan
+        for pid in [pid for pid, record in records.items() if record.seen != generation]:
+            del records[pid]
+
+        return records
+
+    def _read_uid(self, entry: str, default: int) -> int:
+        """Real uid from the Uid: line of /proc/[pid]/status"""
+        data = self._read(f'{PROC}/{entry}/status', self._status_buf)
+        if not data:
+            return default
+        start = data.find(b'\nUid:')
+        if start < 0:
+            return default
+        return int(data[start + 5:data.index(b'\n', start + 5)].split()[0])
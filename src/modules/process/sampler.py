@@ -0,0 +1,246 @@
+"""
+Process Table Sampler
+Compute per-process CPU% for every process from two cpu_times snapshots
+"""
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+import psutil
+
+from config.settings import config
+from . import procfs
+
+logger = logging.getLogger(__name__)
+
+# Attributes read on the second (full) scan
+PROCESS_ATTRS = ['pid', 'name', 'username', 'status', 'cpu_times', 'memory_info', 'create_time', 'num_threads']
+
+
+class ProcessRow:
+    """Compact process record; supports row['key'] / row.get() like a dict"""
+
+    __slots__ = ('pid', 'name', 'username', 'status', 'cpu_percent',
+                 'memory_percent', 'memory_rss', 'create_time', 'num_threads')
+
+    def __init__(self, pid, name, username, status, cpu_percent,
+                 memory_percent, memory_rss, create_time, num_threads):
+        self.pid = pid
+        self.name = name
+        self.username = username
+        self.status = status
+        self.cpu_percent = cpu_percent
+        self.memory_percent = memory_percent
+        self.memory_rss = memory_rss
+        self.create_time = create_time
+        self.num_threads = num_threads
+
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default)
+
+    def to_dict(self) -> Dict:
+        return {key: getattr(self, key) for key in self.__slots__}
+
+
+class ProcessTable:
+    """Immutable snapshot of all processes shared by every process view"""
+
+    def __init__(self, rows: List[ProcessRow], timestamp: float, interval: float):
+        self.rows = rows
+        self.timestamp = timestamp
+        self.interval = interval
+        self._by_pid = {row.pid: row for row in rows}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def get(self, pid: int) -> Optional[ProcessRow]:
+        """Row for a pid or None"""
+        return self._by_pid.get(pid)
+
+    def top(self, sort_by: str = 'cpu', limit: int = 20) -> List[ProcessRow]:
+        """Rows sorted by cpu, memory, name or pid"""
+        if sort_by == 'cpu':
+            rows = sorted(self.rows, key=lambda x: x.cpu_percent, reverse=True)
+        elif sort_by == 'memory':
+            rows = sorted(self.rows, key=lambda x: x.memory_percent, reverse=True)
+        elif sort_by == 'name':
+            rows = sorted(self.rows, key=lambda x: x.name.lower())
+        elif sort_by == 'pid':
+            rows = sorted(self.rows, key=lambda x: x.pid)
+        else:
+            rows = list(self.rows)
+        return rows[:limit]
+
+    def search(self, query: str, limit: int = 20) -> List[ProcessRow]:
+        """Rows whose name contains query, busiest first"""
+        query_lower = query.lower()
+        rows = [row for row in self.rows if query_lower in row.name.lower()]
+        rows.sort(key=lambda x: x.cpu_percent, reverse=True)
+        return rows[:limit]
+
+    def filter_by_user(self, username: str, limit: int = 20) -> List[ProcessRow]:
+        """Rows owned by username, busiest first"""
+        rows = [row for row in self.rows if row.username == username]
+        rows.sort(key=lambda x: x.cpu_percent, reverse=True)
+        return rows[:limit]
+
+    def filter_by_status(self, status: str, limit: int = 20) -> List[ProcessRow]:
+        """Rows in status (running, sleeping, ...), busiest first"""
+        status_lower = status.lower()
+        rows = [row for row in self.rows if row.status.lower() == status_lower]
+        rows.sort(key=lambda x: x.cpu_percent, reverse=True)
+        return rows[:limit]
+
+    def users(self) -> List[str]:
+        """Unique usernames owning processes"""
+        return sorted({row.username for row in self.rows if row.username})
+
+
+class ProcessSampler:
+    """
+    Build a ProcessTable from two full scans a fixed interval apart
+
+    CPU% of each process is its cpu_times delta divided by the wall time
+    between scans (same meaning as psutil Process.cpu_percent). Cost is
+    two scans plus one sleep, regardless of how many processes exist.
+    Tables are cached for `ttl` seconds and shared by all callers.
+
+    On Linux the scans read /proc directly (see procfs.ProcfsReader);
+    psutil is used elsewhere or if /proc reading fails.
+    """
+
+    def __init__(self, interval: Optional[float] = None, ttl: Optional[float] = None,
+                 use_procfs: Optional[bool] = None):
+        self.interval = interval or config.PROCESS_SAMPLE_INTERVAL
+        self.ttl = ttl or config.PROCESS_TABLE_TTL
+        self._table: Optional[ProcessTable] = None
+        self._lock = threading.Lock()
+
+        if use_procfs is None:
+            use_procfs = procfs.is_available()
+        self._reader = procfs.ProcfsReader() if use_procfs else None
+
+    def get_table(self, max_age: Optional[float] = None) -> ProcessTable:
+        """Get cached table or sample a fresh one"""
+        max_age = self.ttl if max_age is None else max_age
+        table = self._table
+        if table is not None and time.time() - table.timestamp <= max_age:
+            return table
+
+        with self._lock:
+            # Another caller may have refreshed while we waited
+            table = self._table
+            if table is not None and time.time() - table.timestamp <= max_age:
+                return table
+            table = self._table = self.sample()
+            return table
+
+    def sample(self) -> ProcessTable:
+        """Take two scans and compute CPU% for every process"""
+        if self._reader is not None:
+            try:
+                return self._sample_procfs()
+            except Exception as e:
+                logger.warning(f"/proc scan failed, falling back to psutil: {e}")
+                self._reader = None
+        return self._sample_psutil()
+
+    def _sample_procfs(self) -> ProcessTable:
+        """Two /proc scans; ticks delta is kept on the reused records"""
+        reader = self._reader
+        started = time.monotonic()
+        reader.scan()
+        time.sleep(self.interval)
+        elapsed = time.monotonic() - started
+        records = reader.scan()
+
+        total_memory = psutil.virtual_memory().total
+        page_size = reader.page_size
+        tick_percent = 100.0 / reader.clock_ticks / elapsed
+        status_map = procfs.STATUS_MAP
+        username = reader.username
+        boot_time = reader.boot_time
+        clock_ticks = reader.clock_ticks
+
+        rows = []
+        for record in records.values():
+            if record.prev_ticks is None:
+                cpu_percent = 0.0
+            else:
+                cpu_percent = round(max(0, record.cpu_ticks - record.prev_ticks) * tick_percent, 1)
+            rss = record.rss_pages * page_size
+            rows.append(ProcessRow(
+                record.pid,
+                record.name,
+                username(record.uid) if record.uid >= 0 else '',
+                status_map.get(record.state, record.state),
+                cpu_percent,
+                rss / total_memory * 100 if total_memory else 0.0,
+                rss,
+                boot_time + record.starttime / clock_ticks,
+                record.num_threads,
+            ))
+
+        return ProcessTable(rows, time.time(), self.interval)
+
+    def _sample_psutil(self) -> ProcessTable:
+        """Two psutil scans (portable fallback)"""
+        started = time.monotonic()
+        first = self._scan_cpu_times()
+        time.sleep(self.interval)
+
+        # Both scans walk pids in the same order, so the gap between scan
+        # starts is the elapsed time seen by each process
+        elapsed = time.monotonic() - started
+        total_memory = psutil.virtual_memory().total
+        rows = []
+        for proc in psutil.process_iter(PROCESS_ATTRS):
+            try:
+                info = proc.info
+                cpu_times = info['cpu_times']
+                if cpu_times is None:
+                    continue
+
+                prev = first.get((info['pid'], info['create_time']))
+                cpu_total = cpu_times.user + cpu_times.system
+                if prev is None:
+                    cpu_percent = 0.0
+                else:
+                    cpu_percent = max(0.0, (cpu_total - prev) / elapsed * 100)
+
+                rss = info['memory_info'].rss if info['memory_info'] else 0
+                rows.append(ProcessRow(
+                    info['pid'],
+                    info['name'] or '',
+                    info['username'] or '',
+                    info['status'] or '',
+                    round(cpu_percent, 1),
+                    rss / total_memory * 100 if total_memory else 0.0,
+                    rss,
+                    info['create_time'],
+                    info['num_threads'] or 0,
+                ))
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+
+        return ProcessTable(rows, time.time(), self.interval)
+
+    def _scan_cpu_times(self) -> Dict:
+        """First scan: total CPU time keyed by (pid, create_time)"""
+        times = {}
+        for proc in psutil.process_iter(['pid', 'create_time', 'cpu_times']):
+            try:
+                info = proc.info
+                if info['cpu_times'] is not None:
+                    times[(info['pid'], info['create_time'])] = info['cpu_times'].user + info['cpu_times'].system
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return times
@@ -2,10 +2,13 @@
 Report Generator
 Generate daily/weekly system reports
 """
-import psutil
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 import json
+from src.modules.metrics import get_snapshot, metrics_history, summarize_period
+from src.modules.process import process_sampler
+from src.utils.formatters import format_timedelta
 
 
 class ReportGenerator:
@@ -25,6 +28,7 @@ class ReportGenerator:
             'disk': self._get_disk_summary(),
             'network': self._get_network_summary(),
             'processes': self._get_process_summary(),
+            'history': self._get_history_summary(days=1),
             'alerts': self._get_alert_summary()
         }
         
@@ -65,15 +69,15 @@ class ReportGenerator:
     def _get_system_summary(self):
         """Get system metrics summary"""
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory = psutil.virtual_memory()
-            swap = psutil.swap_memory()
-            boot_time = datetime.fromtimestamp(psutil.boot_time())
+            snapshot = get_snapshot()
+            memory = snapshot.memory
+            swap = snapshot.swap
+            boot_time = datetime.fromtimestamp(snapshot.boot_time)
             uptime = datetime.now() - boot_time
             
             return {
-                'cpu_percent': round(cpu_percent, 1),
-                'cpu_count': psutil.cpu_count(),
+                'cpu_percent': round(snapshot.cpu_percent, 1),
+                'cpu_count': snapshot.cpu_count,
                 'memory_total_gb': round(memory.total / (1024**3), 2),
                 'memory_used_gb': round(memory.used / (1024**3), 2),
                 'memory_percent': memory.percent,
@@ -91,20 +95,18 @@ class ReportGenerator:
         """Get disk usage summary"""
         try:
             disks = []
-            for partition in psutil.disk_partitions():
-                try:
-                    usage = psutil.disk_usage(partition.mountpoint)
-                    disks.append({
-                        'device': partition.device,
-                        'mountpoint': partition.mountpoint,
-                        'fstype': partition.fstype,
-                        'total_gb': round(usage.total / (1024**3), 2),
-                        'used_gb': round(usage.used / (1024**3), 2),
-                        'free_gb': round(usage.free / (1024**3), 2),
-                        'percent': usage.percent
-                    })
-                except:
+            for disk in get_snapshot().disks:
+                if disk.percent is None:
                     continue
+                disks.append({
+                    'device': disk.device,
+                    'mountpoint': disk.mountpoint,
+                    'fstype': disk.fstype,
+                    'total_gb': round(disk.total / (1024**3), 2),
+                    'used_gb': round(disk.used / (1024**3), 2),
+                    'free_gb': round(disk.free / (1024**3), 2),
+                    'percent': disk.percent
+                })
             return disks
         except Exception as e:
             return {'error': str(e)}
@@ -112,7 +114,7 @@ class ReportGenerator:
     def _get_network_summary(self):
         """Get network stats summary"""
         try:
-            net_io = psutil.net_io_counters()
+            net_io = get_snapshot().net_io
             return {
                 'bytes_sent_mb': round(net_io.bytes_sent / (1024**2), 2),
                 'bytes_recv_mb': round(net_io.bytes_recv / (1024**2), 2),
@@ -129,26 +131,16 @@ class ReportGenerator:
     def _get_process_summary(self):
         """Get process summary"""
         try:
-            process_count = len(psutil.pids())
-            
-            # Get top processes by CPU
-            processes = []
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
-                try:
-                    processes.append(proc.info)
-                except:
-                    continue
-            
-            # Sort by CPU usage
-            top_cpu = sorted(processes, key=lambda x: x.get('cpu_percent', 0), reverse=True)[:5]
+            table = process_sampler.get_table()
+            top_cpu = table.top('cpu', 5)
             
             return {
-                'total_processes': process_count,
+                'total_processes': len(table),
                 'top_cpu_processes': [
                     {
                         'name': p['name'],
-                        'cpu_percent': round(p.get('cpu_percent', 0), 1),
-                        'memory_percent': round(p.get('memory_percent', 0), 1)
+                        'cpu_percent': round(p['cpu_percent'], 1),
+                        'memory_percent': round(p['memory_percent'], 1)
                     }
                     for p in top_cpu
                 ]
@@ -178,13 +170,63 @@ class ReportGenerator:
         except Exception as e:
             return {'error': str(e)}
     
+    def _get_history_summary(self, days):
+        """Get aggregated metrics (min/mean/max/p95/time above threshold) from stored history"""
+        try:
+            from src.modules.alerts.thresholds import AlertThresholds
+            
+            thresholds = {
+                metric: settings['threshold']
+                for metric, settings in AlertThresholds().thresholds.items()
+                if isinstance(settings, dict) and settings.get('threshold') is not None
+            }
+            
+            end = time.time()
+            summary = summarize_period(metrics_history, end - days * 86400, end, thresholds)
+            summary['days'] = days
+            return summary
+        except Exception as e:
+            return {'error': str(e)}
+    
     def _get_weekly_summary(self):
         """Get weekly trends and statistics"""
-        # This could be enhanced to read from stored daily reports
-        return {
-            'note': 'Weekly trends from current snapshot',
-            'days_covered': 7
-        }
+        return self._get_history_summary(days=7)
+    
+    def _format_trends(self, history):
+        """Format aggregated history section"""
+        if not history or 'error' in history:
+            return f"⚠️ History unavailable: {history.get('error', 'no data') if history else 'no data'}\n"
+        
+        text = ""
+        for key, emoji, label in (('cpu', '🔥', 'CPU'), ('memory', '🧠', 'Memory'), ('swap', '💿', 'Swap')):
+            stats = history.get(key)
+            if not stats:
+                continue
+            text += f"{emoji} {label}: avg {stats['mean']}% | p95 {stats['p95']}% | max {stats['max']}%\n"
+            if stats.get('seconds_above'):
+                duration = format_timedelta(timedelta(seconds=stats['seconds_above']))
+                text += f"   ⚠️ >{stats['threshold']}% for {duration} ({stats['percent_above']}%)\n"
+        
+        for mountpoint, stats in list(history.get('disk', {}).items())[:3]:
+            text += f"💾 {mountpoint}: avg {stats['mean']}% | max {stats['max']}%\n"
+            if stats.get('seconds_above'):
+                duration = format_timedelta(timedelta(seconds=stats['seconds_above']))
+                text += f"   ⚠️ >{stats['threshold']}% for {duration}\n"
+        
+        for nic, directions in history.get('network', {}).items():
+            sent = directions.get('sent') or {}
+            recv = directions.get('recv') or {}
+            if not sent.get('total_mb') and not recv.get('total_mb'):
+                continue
+            text += (
+                f"🌐 {nic}: 📤 {sent.get('total_mb', 0)} MB (peak {round(sent.get('max', 0) / 1024, 1)} KB/s) "
+                f"📥 {recv.get('total_mb', 0)} MB (peak {round(recv.get('max', 0) / 1024, 1)} KB/s)\n"
+            )
+        
+        if not text:
+            text = "No stored history for this period yet\n"
+        
+        return text
     
     def format_daily_report(self, report):
         """Format daily report for Telegram"""
@@ -192,6 +234,7 @@ class ReportGenerator:
         disk = report.get('disk', [])
         network = report.get('network', {})
         processes = report.get('processes', {})
+        history = report.get('history', {})
         alerts = report.get('alerts', {})
         
         text = f"""
@@ -226,6 +269,9 @@ Top CPU Consumers:
         for p in processes.get('top_cpu_processes', [])[:3]:
             text += f"  • {p['name']}: {p['cpu_percent']}%\n"
         
+        text += "\n*━━━━━━ LAST 24 HOURS ━━━━━━*\n"
+        text += self._format_trends(history)
+        
         text += f"""
 *━━━━━━ ALERTS ━━━━━━*
 ⚠️ Active: {alerts.get('active_count', 0)}
@@ -239,6 +285,7 @@ _Report generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}_
     def format_weekly_report(self, report):
         """Format weekly report for Telegram"""
         period = report.get('period', {})
+        summary = report.get('summary', {})
         system = report.get('system', {})
         disk = report.get('disk', [])
         alerts = report.get('alerts', {})
@@ -252,6 +299,12 @@ _Report generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}_
 🧠 Memory: {system.get('memory_percent', 0)}% ({system.get('memory_used_gb', 0)} GB used)
 ⏰ Uptime: {system.get('uptime_days', 0)} days
 
+*━━━━━━ WEEKLY TRENDS ━━━━━━*
+"""
+        
+        text += self._format_trends(summary)
+        
+        text += """
 *━━━━━━ DISK STATUS ━━━━━━*
 """
         
@@ -277,6 +330,9 @@ _Report generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}_
         
         # Generate recommendations
         recommendations = []
+        cpu_week = summary.get('cpu') or {}
+        if cpu_week.get('p95', 0) > 90:
+            recommendations.append("• CPU sustained high during the week - check heavy workloads")
         if system.get('memory_percent', 0) > 90:
             recommendations.append("• Consider freeing up memory")
         if any(d['percent'] > 90 for d in disk):
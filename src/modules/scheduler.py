@@ -12,6 +12,7 @@ from src.modules.alerts import alert_manager
 from src.modules.alerts.thresholds import AlertThresholds
 from src.modules.alerts.checker import AlertChecker
 from src.modules.reports import ReportGenerator
+from src.utils.executor import blocking_executor
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +31,7 @@ class BackgroundScheduler:
     async def check_alerts_task(self):
         """Periodic alert checking task"""
         try:
-            alerts = self.checker.check_all()
+            alerts = await blocking_executor.run(self.checker.check_all)
             
             # Send notifications for new alerts
             for alert in alerts:
@@ -55,7 +56,7 @@ class BackgroundScheduler:
         """Generate and send daily report"""
         try:
             logger.info("Generating daily report...")
-            report = self.report_generator.generate_daily_report()
+            report = await blocking_executor.run(self.report_generator.generate_daily_report)
             text = self.report_generator.format_daily_report(report)
             
             from config.settings import config
@@ -79,7 +80,7 @@ class BackgroundScheduler:
         """Generate and send weekly report"""
         try:
             logger.info("Generating weekly report...")
-            report = self.report_generator.generate_weekly_report()
+            report = await blocking_executor.run(self.report_generator.generate_weekly_report)
             text = self.report_generator.format_weekly_report(report)
             
             from config.settings import config
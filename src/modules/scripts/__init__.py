@@ -7,4 +7,7 @@ Preset scripts for common system tasks.
 
 from .manager import ScriptsManager
 
-__all__ = ['ScriptsManager']
+# Global scripts manager instance
+scripts_manager = ScriptsManager()
+
+__all__ = ['ScriptsManager', 'scripts_manager']
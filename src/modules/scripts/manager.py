@@ -4,12 +4,13 @@ Scripts Manager Module
 Provides custom bash script execution functionality.
 """
 
-import subprocess
 import json
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 from pathlib import Path
 
+from ...utils.runner import command_runner
+
 
 class ScriptsManager:
     """Manages custom script execution"""
@@ -19,7 +20,7 @@ class ScriptsManager:
         self.history_file = Path.home() / '.telegram_bot' / 'script_history.json'
         self.history_file.parent.mkdir(parents=True, exist_ok=True)
     
-    def execute_script(self, script: str, timeout: int = 30) -> Tuple[bool, str, str]:
+    async def execute_script(self, script: str, timeout: int = 30) -> Tuple[bool, str, str]:
         """
         Execute a bash script
         
@@ -30,21 +31,15 @@ class ScriptsManager:
         Returns:
             Tuple of (success, stdout, stderr)
         """
-        try:
-            result = subprocess.run(
-                ['bash', '-c', script],
-                capture_output=True,
-                text=True,
-                timeout=timeout
-            )
-            
-            success = result.returncode == 0
-            return (success, result.stdout, result.stderr)
+        # Scripts may change the system, so they run to completion
+        # even if the user navigates away
+        result = await command_runner.run(['bash', '-c', script], timeout=timeout, cancellable=False)
         
-        except subprocess.TimeoutExpired:
-            return (False, "", "Script execution timed out")
-        except Exception as e:
-            return (False, "", str(e))
+        if result.timed_out:
+            return (False, result.stdout, "Script execution timed out")
+        if result.error:
+            return (False, "", result.error)
+        return (result.ok, result.stdout, result.stderr)
     
     def save_to_history(self, script_name: str, category: str, success: bool, output: str) -> None:
         """Save script execution to history"""
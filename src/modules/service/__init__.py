@@ -11,6 +11,11 @@ from .manager import (
     disable_service,
     get_service_logs,
 )
+from .advanced_manager import ServiceManager
+from .systemd import SystemdBackend, Unit, systemd
+
+# Global advanced service manager instance
+service_manager = ServiceManager()
 
 __all__ = [
     'list_services',
@@ -21,4 +26,9 @@ __all__ = [
     'enable_service',
     'disable_service',
     'get_service_logs',
+    'ServiceManager',
+    'service_manager',
+    'SystemdBackend',
+    'Unit',
+    'systemd',
 ]
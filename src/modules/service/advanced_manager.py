@@ -4,47 +4,29 @@ Advanced Service Manager Module
 Provides comprehensive systemd service management.
 """
 
-import subprocess
 from typing import List, Dict, Optional, Tuple
-import json
+
+from ...utils.runner import command_runner
+from ...utils.capabilities import capabilities
+from ...utils.formatters import format_bytes
+from .systemd import systemd
 
 
 class ServiceManager:
     """Manages systemd services with advanced features"""
     
-    def __init__(self):
-        """Initialize service manager"""
-        self.systemctl_available = self._check_systemctl()
-    
-    def _check_systemctl(self) -> bool:
-        """Check if systemctl is available"""
-        try:
-            result = subprocess.run(
-                ['which', 'systemctl'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            return result.returncode == 0
-        except (subprocess.SubprocessError, FileNotFoundError):
-            return False
+    @property
+    def systemctl_available(self) -> bool:
+        """Whether systemctl is installed (cached registry lookup)"""
+        return capabilities.has('systemctl')
     
-    def _run_command(self, command: List[str], timeout: int = 10) -> Tuple[bool, str]:
+    async def _run_command(self, command: List[str], timeout: int = 10,
+                           cancellable: bool = True) -> Tuple[bool, str]:
         """Run a command and return success status and output"""
-        try:
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                timeout=timeout
-            )
-            return (result.returncode == 0, result.stdout if result.returncode == 0 else result.stderr)
-        except subprocess.TimeoutExpired:
-            return (False, "Command timed out")
-        except (subprocess.SubprocessError, FileNotFoundError) as e:
-            return (False, str(e))
+        result = await command_runner.run(command, timeout=timeout, cancellable=cancellable)
+        return (result.ok, result.output)
     
-    def get_services_list(self, filter_type: Optional[str] = None) -> List[Dict]:
+    async def get_services_list(self, filter_type: Optional[str] = None) -> List[Dict]:
         """
         Get list of systemd services
         
@@ -57,52 +39,31 @@ class ServiceManager:
         if not self.systemctl_available:
             return []
         
-        cmd = ['systemctl', 'list-units', '--type=service', '--all', '--no-pager', '--no-legend']
-        success, output = self._run_command(cmd)
-        
-        if not success:
-            return []
+        # Two systemctl processes regardless of the number of units
+        units = await systemd.list_units()
         
         services = []
-        for line in output.strip().split('\n'):
-            if not line.strip() or 'service' not in line.lower():
+        for unit in sorted(units.values(), key=lambda u: u.name):
+            # Apply filter
+            if filter_type == 'running' and unit.active != 'active':
+                continue
+            elif filter_type == 'failed' and unit.active != 'failed':
+                continue
+            elif filter_type == 'inactive' and unit.active in ('active', 'failed'):
+                continue
+            elif filter_type == 'enabled' and not unit.enabled:
+                continue
+            elif filter_type == 'disabled' and unit.unit_file_state != 'disabled':
+                continue
+            elif filter_type not in ('enabled', 'disabled') and unit.load == 'not-loaded':
+                # Installed but never loaded: only listed under enabled/disabled
                 continue
             
-            parts = line.split()
-            if len(parts) >= 4:
-                name = parts[0].replace('.service', '')
-                load = parts[1]
-                active = parts[2]
-                sub = parts[3]
-                description = ' '.join(parts[4:]) if len(parts) > 4 else ''
-                
-                # Apply filter
-                if filter_type == 'running' and active != 'active':
-                    continue
-                elif filter_type == 'failed' and active != 'failed':
-                    continue
-                elif filter_type == 'enabled':
-                    enabled_cmd = ['systemctl', 'is-enabled', f'{name}.service']
-                    enabled_success, enabled_output = self._run_command(enabled_cmd, timeout=5)
-                    if not (enabled_success and 'enabled' in enabled_output.lower()):
-                        continue
-                elif filter_type == 'disabled':
-                    enabled_cmd = ['systemctl', 'is-enabled', f'{name}.service']
-                    enabled_success, enabled_output = self._run_command(enabled_cmd, timeout=5)
-                    if enabled_success and 'enabled' in enabled_output.lower():
-                        continue
-                
-                services.append({
-                    'name': name,
-                    'load': load,
-                    'active': active,
-                    'sub': sub,
-                    'description': description
-                })
+            services.append(unit.to_dict())
         
         return services
     
-    def get_service_detail(self, service_name: str) -> Dict:
+    async def get_service_detail(self, service_name: str) -> Dict:
         """
         Get detailed information about a service
         
@@ -112,11 +73,9 @@ class ServiceManager:
         Returns:
             Service details dictionary
         """
-        if not service_name.endswith('.service'):
-            service_name += '.service'
-        
+        name = service_name.replace('.service', '')
         details = {
-            'name': service_name.replace('.service', ''),
+            'name': name,
             'status': 'unknown',
             'active': 'unknown',
             'enabled': 'unknown',
@@ -124,62 +83,48 @@ class ServiceManager:
             'uptime': 'N/A',
             'memory': 'N/A',
             'cpu': 'N/A',
+            'restarts': 0,
             'description': 'N/A',
             'loaded': 'N/A'
         }
         
-        # Get status
-        cmd = ['systemctl', 'status', service_name, '--no-pager']
-        success, output = self._run_command(cmd, timeout=10)
-        
-        if success or 'Active:' in output:
-            lines = output.split('\n')
-            for line in lines:
-                line = line.strip()
-                if line.startswith('Loaded:'):
-                    details['loaded'] = line.replace('Loaded:', '').strip()
-                elif line.startswith('Active:'):
-                    details['status'] = line.replace('Active:', '').strip()
-                    if 'active (running)' in line:
-                        details['active'] = 'active'
-                    elif 'inactive' in line:
-                        details['active'] = 'inactive'
-                    elif 'failed' in line:
-                        details['active'] = 'failed'
-                elif 'Main PID:' in line:
-                    parts = line.split()
-                    if len(parts) >= 3:
-                        details['pid'] = parts[2]
-                elif line.startswith('Memory:'):
-                    details['memory'] = line.replace('Memory:', '').strip()
-                elif line.startswith('CPU:'):
-                    details['cpu'] = line.replace('CPU:', '').strip()
-                elif 'Description:' in line or (not line.startswith('●') and 'service' not in line.lower() and len(line) > 20):
-                    if details['description'] == 'N/A':
-                        details['description'] = line
-        
-        # Check if enabled
-        cmd = ['systemctl', 'is-enabled', service_name]
-        success, output = self._run_command(cmd, timeout=5)
-        if success:
-            details['enabled'] = output.strip()
+        unit = await systemd.show_one(name)
+        if unit is None:
+            return details
+        
+        details['active'] = unit.active
+        details['status'] = f"{unit.active} ({unit.sub})"
+        details['enabled'] = unit.unit_file_state
+        details['loaded'] = f"{unit.load} ({unit.fragment_path or '-'}; {unit.unit_file_state})"
+        details['restarts'] = unit.restarts
+        if unit.active_since:
+            details['status'] += f" since {unit.active_since}"
+            details['uptime'] = unit.active_since
+        if unit.main_pid:
+            details['pid'] = str(unit.main_pid)
+        if unit.memory is not None:
+            details['memory'] = format_bytes(unit.memory)
+        if unit.cpu_ns is not None:
+            details['cpu'] = f"{unit.cpu_ns / 1e9:.3f}s"
+        if unit.description:
+            details['description'] = unit.description
         
         return details
     
-    def get_service_logs(self, service_name: str, lines: int = 50) -> str:
+    async def get_service_logs(self, service_name: str, lines: int = 50) -> str:
         """Get service logs from journalctl"""
         if not service_name.endswith('.service'):
             service_name += '.service'
         
         cmd = ['sudo', 'journalctl', '-u', service_name, '-n', str(lines), '--no-pager']
-        success, output = self._run_command(cmd, timeout=15)
+        success, output = await self._run_command(cmd, timeout=15)
         
         if success and output:
             return output
         else:
             return f"❌ Unable to retrieve logs for {service_name}"
     
-    def control_service(self, service_name: str, action: str) -> Tuple[bool, str]:
+    async def control_service(self, service_name: str, action: str) -> Tuple[bool, str]:
         """
         Control a service (start/stop/restart/reload/enable/disable)
         
@@ -198,29 +143,29 @@ class ServiceManager:
             return (False, f"Invalid action. Must be one of: {', '.join(valid_actions)}")
         
         cmd = ['sudo', 'systemctl', action, service_name]
-        success, output = self._run_command(cmd, timeout=15)
+        success, output = await self._run_command(cmd, timeout=15, cancellable=False)
         
         if success:
             return (True, f"✅ Successfully {action}ed {service_name.replace('.service', '')}")
         else:
             return (False, f"❌ Failed to {action} {service_name.replace('.service', '')}: {output}")
     
-    def get_service_dependencies(self, service_name: str) -> str:
+    async def get_service_dependencies(self, service_name: str) -> str:
         """Get service dependencies"""
         if not service_name.endswith('.service'):
             service_name += '.service'
         
         cmd = ['systemctl', 'list-dependencies', service_name, '--no-pager']
-        success, output = self._run_command(cmd)
+        success, output = await self._run_command(cmd)
         
         if success:
             return output
         else:
             return f"❌ Unable to get dependencies for {service_name}"
     
-    def search_services(self, query: str) -> List[Dict]:
+    async def search_services(self, query: str) -> List[Dict]:
         """Search services by name"""
-        all_services = self.get_services_list('all')
+        all_services = await self.get_services_list('all')
         query_lower = query.lower()
         
         matching = []
@@ -246,9 +191,9 @@ class ServiceManager:
         
         return f"<pre>{logs}</pre>"
     
-    def get_service_counts(self) -> Dict[str, int]:
+    async def get_service_counts(self) -> Dict[str, int]:
         """Get counts of services by status"""
-        all_services = self.get_services_list('all')
+        all_services = await self.get_services_list('all')
         
         running = sum(1 for s in all_services if s['active'] == 'active')
         failed = sum(1 for s in all_services if s['active'] == 'failed')
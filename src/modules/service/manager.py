@@ -4,8 +4,10 @@ Manajemen systemd services
 """
 import subprocess
 from typing import Optional
+from src.utils.cache import cacheable
 
 
+@cacheable(ttl=5)
 def list_services(filter_status: Optional[str] = None) -> str:
     """
     List semua service systemd
@@ -93,6 +95,7 @@ def list_services(filter_status: Optional[str] = None) -> str:
     return info
 
 
+@cacheable(ttl=3)
 def get_service_status(service_name: str) -> str:
     """Cek status detail sebuah service"""
     # Clean service name
@@ -292,6 +295,7 @@ def disable_service(service_name: str) -> str:
     return info
 
 
+@cacheable(ttl=5)
 def get_service_logs(service_name: str, lines: int = 50) -> str:
     """Dapatkan log service dari journalctl"""
     if not service_name.endswith('.service'):
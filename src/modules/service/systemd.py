@@ -0,0 +1,184 @@
+"""
+Systemd Backend
+Batched, machine-readable systemd queries (no per-unit processes)
+"""
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+
+from ...utils.runner import command_runner
+
+# Properties read with `systemctl show`
+SHOW_PROPERTIES = (
+    'Id', 'Description', 'LoadState', 'ActiveState', 'SubState', 'UnitFileState',
+    'MainPID', 'MemoryCurrent', 'CPUUsageNSec', 'NRestarts',
+    'ActiveEnterTimestamp', 'FragmentPath',
+)
+
+# Units per `systemctl show` call (keeps argv well below ARG_MAX)
+SHOW_BATCH = 200
+
+# systemd reports unset counters as UINT64_MAX
+_UNSET = 2**64 - 1
+
+
+@dataclass
+class Unit:
+    """One systemd service"""
+    name: str                       # without .service
+    load: str = 'not-found'
+    active: str = 'inactive'
+    sub: str = 'dead'
+    description: str = ''
+    unit_file_state: str = 'unknown'   # enabled, disabled, static, masked, ...
+    main_pid: int = 0
+    memory: Optional[int] = None    # bytes
+    cpu_ns: Optional[int] = None    # nanoseconds of CPU time
+    restarts: int = 0
+    active_since: str = ''
+    fragment_path: str = ''
+
+    @property
+    def enabled(self) -> bool:
+        return self.unit_file_state in ('enabled', 'enabled-runtime')
+
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'load': self.load,
+            'active': self.active,
+            'sub': self.sub,
+            'description': self.description,
+            'enabled': self.unit_file_state,
+        }
+
+
+def _unit_name(unit: str) -> str:
+    return unit[:-len('.service')] if unit.endswith('.service') else unit
+
+
+def _service(name: str) -> str:
+    return name if name.endswith('.service') else f'{name}.service'
+
+
+def _counter(value: str) -> Optional[int]:
+    try:
+        number = int(value)
+    except ValueError:
+        return None      # '[not set]'
+    return None if number == _UNSET else number
+
+
+def parse_list_units(output: str) -> Dict[str, Unit]:
+    """Parse `systemctl list-units --plain --no-legend` output"""
+    units = {}
+    for line in output.splitlines():
+        parts = line.split(None, 4)
+        if len(parts) < 4 or not parts[0].endswith('.service'):
+            continue
+        name = _unit_name(parts[0])
+        units[name] = Unit(name, load=parts[1], active=parts[2], sub=parts[3],
+                           description=parts[4] if len(parts) > 4 else '')
+    return units
+
+
+def parse_unit_files(output: str) -> Dict[str, str]:
+    """Parse `systemctl list-unit-files --no-legend` output into name -> state"""
+    states = {}
+    for line in output.splitlines():
+        parts = line.split()
+        if len(parts) < 2 or not parts[0].endswith('.service'):
+            continue
+        if parts[0].endswith('@.service'):
+            continue    # templates are not units by themselves
+        states[_unit_name(parts[0])] = parts[1]
+    return states
+
+
+def parse_show(output: str) -> Dict[str, Unit]:
+    """Parse `systemctl show -p ...` output (blank line between units)"""
+    units = {}
+    for block in output.split('\n\n'):
+        props = {}
+        for line in block.splitlines():
+            key, sep, value = line.partition('=')
+            if sep:
+                props[key] = value
+        if 'Id' not in props:
+            continue
+        name = _unit_name(props['Id'])
+        units[name] = Unit(
+            name,
+            load=props.get('LoadState', 'not-found'),
+            active=props.get('ActiveState', 'inactive'),
+            sub=props.get('SubState', 'dead'),
+            description=props.get('Description', ''),
+            unit_file_state=props.get('UnitFileState') or 'unknown',
+            main_pid=_counter(props.get('MainPID', '0')) or 0,
+            memory=_counter(props.get('MemoryCurrent', '')),
+            cpu_ns=_counter(props.get('CPUUsageNSec', '')),
+            restarts=_counter(props.get('NRestarts', '0')) or 0,
+            active_since=props.get('ActiveEnterTimestamp', ''),
+            fragment_path=props.get('FragmentPath', ''),
+        )
+    return units
+
+
+class SystemdBackend:
+    """
+    Read service state from systemd in a fixed number of processes
+
+    - list_units(): `list-units` + `list-unit-files` (2 processes)
+    - show(): one `systemctl show` per SHOW_BATCH units (keyed by Id)
+    """
+
+    async def _systemctl(self, *args: str, timeout: float = 10) -> Optional[str]:
+        result = await command_runner.run(['systemctl', *args, '--no-pager'], timeout=timeout)
+        return result.stdout if result.ok else None
+
+    async def list_units(self) -> Dict[str, Unit]:
+        """
+        All services with state and enablement
+
+        Loaded units come from list-units; installed but never loaded
+        units (typically disabled ones) come from list-unit-files.
+        """
+        loaded = await self._systemctl('list-units', '--type=service', '--all', '--plain', '--no-legend')
+        if loaded is None:
+            return {}
+        units = parse_list_units(loaded)
+
+        files = await self._systemctl('list-unit-files', '--type=service', '--no-legend')
+        for name, state in parse_unit_files(files or '').items():
+            unit = units.get(name)
+            if unit is None:
+                unit = units[name] = Unit(name, load='not-loaded')
+            unit.unit_file_state = state
+        return units
+
+    async def show(self, names: Iterable[str]) -> Dict[str, Unit]:
+        """Full properties (PID, memory, CPU, restarts) for many units"""
+        names = [_service(name) for name in names]
+        units = {}
+        for start in range(0, len(names), SHOW_BATCH):
+            output = await self._systemctl(
+                'show', '-p', ','.join(SHOW_PROPERTIES), *names[start:start + SHOW_BATCH],
+                timeout=15
+            )
+            if output:
+                units.update(parse_show(output))
+        return units
+
+    async def show_one(self, name: str) -> Optional[Unit]:
+        """
+        Full properties of one unit
+
+        An alias (mysql -> mariadb.service, sshd -> ssh.service) is
+        reported under its canonical Id, so the only unit returned is
+        taken instead of looking the requested name up.
+        """
+        units = await self.show([name])
+        return next(iter(units.values()), None) if len(units) == 1 else None
+
+
+# Global systemd backend instance
+systemd = SystemdBackend()
@@ -1,26 +1,35 @@
 """
 CPU Information Module
 """
-import psutil
+from datetime import datetime
 
+from src.modules.metrics import get_snapshot
+from src.utils.cache import cacheable
 
+
+@cacheable(ttl=2)
 def get_cpu_info() -> str:
     """Informasi CPU"""
-    cpu_freq = psutil.cpu_freq()
-    cpu_percent = psutil.cpu_percent(interval=1, percpu=True)
+    snapshot = get_snapshot()
+    cpu_freq = snapshot.cpu_freq
     
     info = f"💻 *INFORMASI CPU*\n\n"
-    info += f"*Physical cores:* {psutil.cpu_count(logical=False)}\n"
-    info += f"*Total cores:* {psutil.cpu_count(logical=True)}\n"
+    info += f"*Physical cores:* {snapshot.cpu_count_physical}\n"
+    info += f"*Total cores:* {snapshot.cpu_count}\n"
     
     if cpu_freq:
         info += f"*Frekuensi Max:* {cpu_freq.max:.2f}Mhz\n"
         info += f"*Frekuensi Min:* {cpu_freq.min:.2f}Mhz\n"
         info += f"*Frekuensi Current:* {cpu_freq.current:.2f}Mhz\n"
     
-    info += f"*CPU Usage Total:* {psutil.cpu_percent(interval=1)}%\n\n"
+    load_1, load_5, load_15 = snapshot.load_avg
+    info += f"*Load Average:* {load_1:.2f} / {load_5:.2f} / {load_15:.2f}\n"
+    info += f"*CPU Usage Total:* {snapshot.cpu_percent}%\n\n"
     info += "*CPU Usage Per Core:*\n"
-    for i, percentage in enumerate(cpu_percent):
+    for i, percentage in enumerate(snapshot.cpu_per_core):
         info += f"Core {i}: {percentage}%\n"
     
+    if snapshot.stale:
+        info += f"\n⚠️ _Data terakhir dari {datetime.fromtimestamp(snapshot.timestamp).strftime('%H:%M:%S')}_\n"
+    
     return info
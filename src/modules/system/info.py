@@ -2,8 +2,10 @@
 System Information Module
 """
 import platform
+from src.utils.cache import cacheable
 
 
+@cacheable()
 def get_system_info() -> str:
     """Informasi sistem lengkap"""
     uname = platform.uname()
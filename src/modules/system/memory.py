@@ -1,14 +1,19 @@
 """
 Memory Information Module
 """
-import psutil
+from datetime import datetime
+
+from src.modules.metrics import get_snapshot
 from src.utils.formatters import format_bytes
+from src.utils.cache import cacheable
 
 
+@cacheable(ttl=2)
 def get_memory_info() -> str:
     """Informasi RAM"""
-    svmem = psutil.virtual_memory()
-    swap = psutil.swap_memory()
+    snapshot = get_snapshot()
+    svmem = snapshot.memory
+    swap = snapshot.swap
     
     info = f"🧠 *INFORMASI MEMORY*\n\n"
     info += f"*Total:* {format_bytes(svmem.total)}\n"
@@ -21,4 +26,7 @@ def get_memory_info() -> str:
     info += f"*Free:* {format_bytes(swap.free)}\n"
     info += f"*Used:* {format_bytes(swap.used)} ({swap.percent}%)\n"
     
+    if snapshot.stale:
+        info += f"\n⚠️ _Data terakhir dari {datetime.fromtimestamp(snapshot.timestamp).strftime('%H:%M:%S')}_\n"
+    
     return info
@@ -1,14 +1,16 @@
 """
 System Uptime Module
 """
-import psutil
 from datetime import datetime
+from src.modules.metrics import get_snapshot
 from src.utils.formatters import format_timedelta
+from src.utils.cache import cacheable
 
 
+@cacheable(ttl=1)
 def get_uptime() -> str:
     """Informasi uptime sistem"""
-    boot_time = datetime.fromtimestamp(psutil.boot_time())
+    boot_time = datetime.fromtimestamp(get_snapshot().boot_time)
     uptime_duration = datetime.now() - boot_time
     
     info = f"⏰ *UPTIME SISTEM*\n\n"
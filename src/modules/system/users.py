@@ -3,8 +3,10 @@ Users Information Module
 """
 import psutil
 from datetime import datetime
+from src.utils.cache import cacheable
 
 
+@cacheable(ttl=10)
 def get_users_info() -> str:
     """Informasi user yang login"""
     users = psutil.users()
@@ -0,0 +1,155 @@
+"""
+Response Cache
+Single-flight TTL cache for read-only module functions
+"""
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Union
+
+from src.utils.executor import blocking_executor, function_key
+
+# Cached results kept at most (oldest dropped first)
+MAX_ENTRIES = 256
+
+
+def cacheable(ttl: Optional[float] = None):
+    """
+    Mark a read-only module function as cacheable
+
+    Args:
+        ttl: Seconds a result stays valid; None keeps it until
+            response_cache.invalidate() (static data like uname)
+
+    The function itself is unchanged; response_cache.run() reads the TTL.
+    """
+    def decorator(func):
+        func.cache_ttl = ttl
+        func.cacheable = True
+        return func
+    return decorator
+
+
+@dataclass
+class CacheStats:
+    """Counters for one data source"""
+    hits: int = 0
+    misses: int = 0
+    shared: int = 0       # joined a computation already in flight
+    errors: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'shared': self.shared, 'errors': self.errors}
+
+
+class ResponseCache:
+    """
+    Cache results of blocking read-only functions
+
+    - each function carries its own TTL (see @cacheable)
+    - identical calls arriving while the first one is still computing
+      wait for that result instead of starting another scan
+    - the computation runs in its own task, so a caller that is
+      cancelled does not cancel it for the others
+    - errors are not cached
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: Dict[Tuple[str, Hashable], Tuple[Any, Optional[float]]] = {}
+        self._inflight: Dict[Tuple[str, Hashable], asyncio.Task] = {}
+        self.stats: Dict[str, CacheStats] = {}
+
+    async def run(self, func: Callable, *args, timeout: Optional[float] = None):
+        """
+        blocking_executor.run(func, *args) with caching when func is @cacheable
+
+        Raises:
+            asyncio.TimeoutError: result not ready in time
+        """
+        if not getattr(func, 'cacheable', False):
+            return await blocking_executor.run(func, *args, timeout=timeout)
+
+        source = function_key(func)
+        key = (source, args)
+        stats = self.stats.setdefault(source, CacheStats())
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, expires = entry
+            if expires is None or time.monotonic() < expires:
+                stats.hits += 1
+                return value
+            del self._entries[key]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            stats.shared += 1
+        else:
+            stats.misses += 1
+            task = asyncio.ensure_future(self._compute(key, func, args, timeout, stats))
+            # Callers may all be gone by the time it fails; mark the error as seen
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _compute(self, key, func: Callable, args: tuple, timeout: Optional[float],
+                       stats: CacheStats):
+        try:
+            value = await blocking_executor.run(func, *args, timeout=timeout)
+        except BaseException:
+            stats.errors += 1
+            raise
+        else:
+            ttl = getattr(func, 'cache_ttl', None)
+            self._store(key, value, None if ttl is None else time.monotonic() + ttl)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def _store(self, key, value, expires: Optional[float]):
+        self._entries.pop(key, None)
+        self._entries[key] = (value, expires)
+        while len(self._entries) > self.max_entries:
+            self._entries.pop(next(iter(self._entries)))
+
+    def invalidate(self, target: Union[Callable, str, None] = None) -> int:
+        """
+        Drop cached results
+
+        Args:
+            target: A cacheable function, a module prefix
+                ('src.modules.service'), or None for everything
+
+        Returns:
+            Number of entries removed
+        """
+        if target is None:
+            removed = len(self._entries)
+            self._entries.clear()
+            return removed
+
+        prefix = target if isinstance(target, str) else function_key(target)
+        keys = [key for key in self._entries if key[0] == prefix or key[0].startswith(prefix + '.')]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Totals plus per-source hit / miss counters"""
+        total = CacheStats()
+        for stats in self.stats.values():
+            total.hits += stats.hits
+            total.misses += stats.misses
+            total.shared += stats.shared
+            total.errors += stats.errors
+        return {
+            'entries': len(self._entries),
+            'inflight': len(self._inflight),
+            **total.to_dict(),
+            'sources': {source: stats.to_dict() for source, stats in self.stats.items()},
+        }
+
+
+# Global response cache instance
+response_cache = ResponseCache()
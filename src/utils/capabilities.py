@@ -0,0 +1,123 @@
+"""
+Capability Registry
+Detect external tools once per process and share the result with all managers
+"""
+import asyncio
+import logging
+import os
+import shutil
+import time
+from typing import Dict, List, Optional, Tuple
+
+from config.settings import config
+from src.utils.runner import command_runner
+
+logger = logging.getLogger(__name__)
+
+# Tools the managers depend on
+TOOLS = (
+    'systemctl', 'journalctl', 'docker', 'ufw', 'apt',
+    'dig', 'traceroute', 'whois', 'dmidecode',
+)
+
+# Admin tools live in sbin, which is often not in PATH for non-root users
+_EXTRA_PATH = ('/usr/local/sbin', '/usr/sbin', '/sbin')
+
+
+def _search_path() -> str:
+    parts = os.environ.get('PATH', os.defpath).split(os.pathsep)
+    return os.pathsep.join(parts + [p for p in _EXTRA_PATH if p not in parts])
+
+
+class CapabilityRegistry:
+    """
+    Cached answers to "is this tool installed / is this daemon up"
+
+    - tool lookups are a PATH search (stat calls, no fork), cached for
+      `ttl` seconds
+    - daemon checks (`docker info`) run through the command runner at
+      most once per `ttl`; concurrent callers share the same probe
+    - refresh() drops the cache, e.g. after installing a package
+    """
+
+    def __init__(self, ttl: Optional[float] = None):
+        self.ttl = ttl or config.CAPABILITY_TTL
+        self._tools: Dict[str, Tuple[Optional[str], float]] = {}
+        self._checks: Dict[str, Tuple[bool, float]] = {}
+        self._pending: Dict[str, asyncio.Task] = {}
+
+    def _fresh(self, checked: float) -> bool:
+        return time.monotonic() - checked < self.ttl
+
+    def which(self, tool: str) -> Optional[str]:
+        """Full path of tool, or None if not installed"""
+        cached = self._tools.get(tool)
+        if cached is not None and self._fresh(cached[1]):
+            return cached[0]
+        path = shutil.which(tool, path=_search_path())
+        self._tools[tool] = (path, time.monotonic())
+        return path
+
+    def has(self, tool: str) -> bool:
+        """Whether tool is installed"""
+        return self.which(tool) is not None
+
+    def last(self, name: str, default: bool = True) -> bool:
+        """Last result of check(name), without probing"""
+        cached = self._checks.get(name)
+        return cached[0] if cached is not None else default
+
+    async def check(self, name: str, command: List[str], timeout: float = 5) -> bool:
+        """
+        Cached result of a probe command (exit status 0 = available)
+
+        Args:
+            name: Cache key, e.g. 'docker-daemon'
+            command: Probe command; not run if its binary is missing
+            timeout: Seconds before the probe counts as failed
+        """
+        cached = self._checks.get(name)
+        if cached is not None and self._fresh(cached[1]):
+            return cached[0]
+
+        # The probe runs in its own task, so a caller being cancelled
+        # (superseded handler) does not fail the others waiting on it
+        pending = self._pending.get(name)
+        if pending is None:
+            pending = self._pending[name] = asyncio.ensure_future(self._probe(name, command, timeout))
+            # Every caller may be gone; avoid "exception never retrieved"
+            pending.add_done_callback(lambda task: task.cancelled() or task.exception())
+        return await asyncio.shield(pending)
+
+    async def _probe(self, name: str, command: List[str], timeout: float) -> bool:
+        try:
+            if not self.has(command[0]):
+                ok = False
+            else:
+                # Probe must finish even if the user that triggered it moves on
+                result = await command_runner.run(command, timeout=timeout, cancellable=False)
+                ok = result.ok
+            self._checks[name] = (ok, time.monotonic())
+            return ok
+        finally:
+            del self._pending[name]
+
+    def refresh(self, name: Optional[str] = None):
+        """Forget cached results (all, or one tool / check)"""
+        if name is None:
+            self._tools.clear()
+            self._checks.clear()
+        else:
+            self._tools.pop(name, None)
+            self._checks.pop(name, None)
+        logger.info(f"Capability cache cleared ({name or 'all'})")
+
+    def get_stats(self) -> Dict[str, bool]:
+        """Availability of every known tool and cached check"""
+        stats = {tool: self.has(tool) for tool in TOOLS}
+        stats.update({name: ok for name, (ok, _) in self._checks.items()})
+        return stats
+
+
+# Global capability registry
+capabilities = CapabilityRegistry()
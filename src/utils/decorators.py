@@ -1,15 +1,43 @@
 """
 Authorization Decorator
 """
+import asyncio
 from functools import wraps
 from telegram import Update
 from telegram.ext import ContextTypes
 from config.settings import config
+from src.utils.runner import command_runner, command_owner
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+async def _run_as_owner(update: Update, handler):
+    """
+    Run handler coroutine on behalf of the chat
+
+    A new update from the same chat cancels commands the previous handler
+    is still waiting on (user navigated away); that handler then stops
+    silently instead of editing a message the user has left.
+    """
+    chat = update.effective_chat
+    owner = chat.id if chat else update.effective_user.id
+    command_runner.cancel(owner)
+
+    token = command_owner.set(owner)
+    try:
+        return await handler
+    except asyncio.CancelledError:
+        task = asyncio.current_task()
+        if not command_runner.consume_superseded(task):
+            raise
+        if hasattr(task, 'uncancel'):
+            task.uncancel()
+        logger.info(f"Handler for chat {owner} superseded by a newer update")
+    finally:
+        command_owner.reset(token)
+
+
 def require_admin(func):
     """
     Decorator untuk memastikan hanya admin yang bisa akses command
@@ -39,7 +67,7 @@ def require_admin(func):
             f"Authorized command from user {user_id} "
             f"(@{username}) - {user.full_name}: {update.message.text}"
         )
-        return await func(update, context, *args, **kwargs)
+        return await _run_as_owner(update, func(update, context, *args, **kwargs))
     
     return wrapper
 
@@ -67,6 +95,6 @@ def require_admin_callback(func):
             return
         
         # User is authorized, proceed
-        return await func(update, context, *args, **kwargs)
+        return await _run_as_owner(update, func(update, context, *args, **kwargs))
     
     return wrapper
@@ -0,0 +1,238 @@
+"""
+Blocking Executor
+Run blocking module calls (psutil, statvfs, matplotlib) off the event loop
+"""
+import asyncio
+import functools
+import logging
+import multiprocessing
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from config.settings import config
+
+logger = logging.getLogger(__name__)
+
+
+def _timed_call(func: Callable, args: tuple):
+    """Worker-side wrapper: report when the call actually started"""
+    return time.monotonic(), func(*args)
+
+
+def _noop():
+    return None
+
+
+def function_key(func: Callable) -> str:
+    """Name used for the per-function concurrency cap"""
+    while isinstance(func, functools.partial):
+        func = func.func
+    return f"{getattr(func, '__module__', '')}.{getattr(func, '__qualname__', repr(func))}"
+
+
+@dataclass
+class PoolStats:
+    """Counters for one pool"""
+    workers: int
+    capped: int = 0        # waiting for the per-function cap
+    pending: int = 0       # submitted to the pool, not finished
+    completed: int = 0
+    timeouts: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+
+    @property
+    def queued(self) -> int:
+        """Submitted calls still waiting for a free worker"""
+        return max(0, self.pending - self.workers)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'workers': self.workers,
+            'running': min(self.pending, self.workers),
+            'queued': self.queued,
+            'capped': self.capped,
+            'completed': self.completed,
+            'timeouts': self.timeouts,
+            'avg_wait_ms': round(self.wait_total / self.completed * 1000, 1) if self.completed else 0.0,
+            'max_wait_ms': round(self.wait_max * 1000, 1),
+        }
+
+
+class BlockingExecutor:
+    """
+    Facade over a thread pool and a process pool
+
+    - run(): bounded thread pool for blocking I/O (psutil, statvfs, /proc)
+    - run_cpu(): process pool for CPU-heavy work (chart rendering); falls
+      back to the thread pool when processes are disabled or broken
+    - every function has its own concurrency cap, so calls stuck in the
+      kernel (statvfs on a hung NFS mount) can hold at most that many
+      workers and the rest of the bot keeps answering
+    - a timed-out call keeps its worker and its cap slot until the
+      underlying call really returns; waiting for a cap slot counts
+      against the same timeout, so callers of a stuck function time out
+      instead of queueing behind it
+    """
+
+    def __init__(self, max_threads: Optional[int] = None, max_processes: Optional[int] = None,
+                 per_function: Optional[int] = None, timeout: Optional[float] = None):
+        self.max_threads = max_threads or config.EXECUTOR_THREADS
+        self.max_processes = config.EXECUTOR_PROCESSES if max_processes is None else max_processes
+        self.per_function = per_function or config.EXECUTOR_PER_FUNCTION
+        self.timeout = timeout or config.EXECUTOR_TIMEOUT
+
+        self._threads = ThreadPoolExecutor(max_workers=self.max_threads, thread_name_prefix='blocking')
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._caps: Dict[str, asyncio.Semaphore] = {}
+        self.thread_stats = PoolStats(self.max_threads)
+        self.process_stats = PoolStats(self.max_processes)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """
+        Create the process pool and fork its workers
+
+        Call from main() before other threads start: with the fork start
+        method all workers are created on the first submit, so they are
+        forked while the process is still single-threaded.
+        """
+        pool = self._process_pool()
+        if pool is not None:
+            pool.submit(_noop).result()
+            logger.info(f"Process pool started with {self.max_processes} worker(s)")
+
+    def shutdown(self):
+        """Stop both pools without waiting for stuck calls"""
+        self._threads.shutdown(wait=False, cancel_futures=True)
+        if self._processes is not None:
+            self._processes.shutdown(wait=False, cancel_futures=True)
+            self._processes = None
+
+    def _process_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.max_processes <= 0:
+            return None
+        if self._processes is None:
+            try:
+                context = multiprocessing.get_context('fork')
+            except ValueError:
+                # No fork on this platform; spawn would re-import the bot
+                logger.warning("fork start method not available, CPU work runs in threads")
+                self.max_processes = 0
+                return None
+            self._processes = ProcessPoolExecutor(max_workers=self.max_processes, mp_context=context)
+        return self._processes
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def run(self, func: Callable, *args, timeout: Optional[float] = None):
+        """
+        Run a blocking function in the thread pool
+
+        Args:
+            func: Function to call (use functools.partial for kwargs)
+            timeout: Seconds to wait for the result (default EXECUTOR_TIMEOUT)
+
+        Raises:
+            asyncio.TimeoutError: result not ready in time (the call
+                itself keeps running in its thread)
+        """
+        return await self._submit(self._threads, self.thread_stats, func, args, timeout)
+
+    async def run_cpu(self, func: Callable, *args, timeout: Optional[float] = None):
+        """
+        Run a CPU-heavy function in the process pool
+
+        func and args must be picklable (module-level function, plain data).
+        """
+        pool = self._process_pool()
+        if pool is None:
+            return await self.run(func, *args, timeout=timeout)
+        try:
+            return await self._submit(pool, self.process_stats, func, args, timeout)
+        except BrokenProcessPool:
+            # A worker died (OOM, segfault): drop the pool, retry in a thread
+            logger.error("Process pool broken, recreating it on next use")
+            self._processes = None
+            return await self.run(func, *args, timeout=timeout)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Queue depth and wait time for both pools"""
+        return {
+            'threads': self.thread_stats.to_dict(),
+            'processes': self.process_stats.to_dict(),
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    async def _submit(self, pool, stats: PoolStats, func: Callable, args: tuple,
+                      timeout: Optional[float]):
+        loop = asyncio.get_running_loop()
+        key = function_key(func)
+        cap = self._caps.get(key)
+        if cap is None:
+            cap = self._caps[key] = asyncio.Semaphore(self.per_function)
+
+        limit = timeout if timeout is not None else self.timeout
+        submitted = time.monotonic()
+        stats.capped += 1
+        try:
+            await asyncio.wait_for(cap.acquire(), limit)
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            logger.warning(f"{key} still running in all {self.per_function} slot(s) after {limit}s")
+            raise
+        finally:
+            stats.capped -= 1
+
+        try:
+            future: Future = pool.submit(_timed_call, func, args)
+        except BaseException:
+            cap.release()
+            raise
+        stats.pending += 1
+
+        def finished(f: Future):
+            # Runs on the loop once the call has really returned
+            cap.release()
+            stats.pending -= 1
+            if f.cancelled() or f.exception() is not None:
+                return
+            stats.completed += 1
+            wait = max(0.0, f.result()[0] - submitted)
+            stats.wait_total += wait
+            stats.wait_max = max(stats.wait_max, wait)
+
+        def on_done(f: Future):
+            try:
+                loop.call_soon_threadsafe(finished, f)
+            except RuntimeError:
+                # Loop already closed during shutdown
+                pass
+
+        future.add_done_callback(on_done)
+
+        try:
+            _, result = await asyncio.wait_for(
+                asyncio.wrap_future(future),
+                max(0.0, submitted + limit - time.monotonic())
+            )
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            logger.warning(f"{key} did not finish within {limit}s")
+            raise
+        return result
+
+
+# Global executor instance
+blocking_executor = BlockingExecutor()
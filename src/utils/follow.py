@@ -0,0 +1,264 @@
+"""
+Follow Hub
+Live log views: one streaming reader per source, shared by every chat watching it
+"""
+import asyncio
+import html
+import logging
+import time
+from collections import deque
+from datetime import datetime
+from typing import AsyncIterator, Callable, Deque, Dict, Optional, Set
+
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.constants import ParseMode
+from telegram.error import BadRequest, RetryAfter, TelegramError
+
+from config.settings import config
+
+logger = logging.getLogger(__name__)
+
+# Lines kept per source (the newest that fit are shown)
+BUFFER_LINES = 200
+
+# Characters of log text in one message, and of one line
+MESSAGE_BUDGET = 3500
+LINE_WIDTH = 500
+
+# Seconds a reader keeps running without watchers (a resumed view reuses it)
+READER_GRACE = 30
+
+# Seconds between editor passes, and edits at most per pass (all chats;
+# Telegram allows about 30 messages per second per bot)
+TICK = 1
+MAX_EDITS_PER_TICK = 20
+
+
+class FollowSource:
+    """One streaming reader and its newest lines"""
+
+    def __init__(self, key: str, title: str, open_stream: Callable[[], AsyncIterator[str]]):
+        self.key = key
+        self.title = title
+        self.open_stream = open_stream
+        self.lines: Deque[str] = deque(maxlen=BUFFER_LINES)
+        # Increases with every line, so watchers know when to edit
+        self.version = 0
+        self.watchers: Set['FollowWatch'] = set()
+        self.ended: Optional[str] = None
+        self.idle_since: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+
+    async def run(self):
+        try:
+            async for line in self.open_stream():
+                self.lines.append(line[:LINE_WIDTH])
+                self.version += 1
+            self.ended = "ended"
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Follow reader {self.key} stopped: {e}")
+            self.ended = f"failed: {str(e)[:200] or type(e).__name__}"
+        self.version += 1
+
+
+class FollowWatch:
+    """One chat message showing a source"""
+    __slots__ = ('bot', 'chat_id', 'message_id', 'source', 'resume_data', 'back_data',
+                 'started', 'last_edit', 'shown', 'retry_at')
+
+    def __init__(self, bot, chat_id: int, message_id: int, source: FollowSource,
+                 resume_data: str, back_data: str):
+        self.bot = bot
+        self.chat_id = chat_id
+        self.message_id = message_id
+        self.source = source
+        self.resume_data = resume_data
+        self.back_data = back_data
+        self.started = time.monotonic()
+        self.last_edit = 0.0
+        self.shown = -1
+        self.retry_at = 0.0
+
+
+class FollowHub:
+    """
+    Live follow mode for journal units, log files and containers
+
+    - a source (key -> async line iterator) is read by one task however
+      many chats watch it; its newest BUFFER_LINES are kept
+    - one editor task edits each watching message with the newest lines,
+      at most every `edit_interval` seconds per chat and only when new
+      lines arrived; Telegram's RetryAfter pauses that chat
+    - a chat watches one message at a time; pressing any other button on
+      that message (or starting another follow) leaves follow mode
+    - a watch stops by itself after `timeout` seconds (Follow again
+      continues); a reader without watchers stops after READER_GRACE
+    """
+
+    def __init__(self, edit_interval: Optional[float] = None, timeout: Optional[float] = None):
+        self.edit_interval = config.FOLLOW_EDIT_INTERVAL if edit_interval is None else edit_interval
+        self.timeout = config.FOLLOW_TIMEOUT if timeout is None else timeout
+        self._sources: Dict[str, FollowSource] = {}
+        self._watches: Dict[int, FollowWatch] = {}
+        self._editor: Optional[asyncio.Task] = None
+        self.edits = 0
+
+    async def watch(self, bot, chat_id: int, message_id: int, key: str, title: str,
+                    open_stream: Callable[[], AsyncIterator[str]], resume_data: str, back_data: str):
+        """
+        Show `key` live in a message (the reader starts if nobody watches it yet)
+
+        Args:
+            bot: Bot used to edit the message
+            key: Source identity, e.g. 'journal:system' or 'docker:<id>'
+            title: HTML header of the message
+            open_stream: Returns the line iterator (called once per reader)
+            resume_data: Callback data of the Follow again button
+            back_data: Callback data of the Back button
+        """
+        previous = self._watches.get(chat_id)
+        if previous is not None and previous.message_id != message_id:
+            await self.unwatch(chat_id, previous.message_id)
+        else:
+            self.release(chat_id, message_id)
+
+        source = self._sources.get(key)
+        if source is None or source.ended:
+            source = self._sources[key] = FollowSource(key, title, open_stream)
+            source.task = asyncio.get_running_loop().create_task(source.run())
+        source.idle_since = None
+
+        watch = FollowWatch(bot, chat_id, message_id, source, resume_data, back_data)
+        source.watchers.add(watch)
+        self._watches[chat_id] = watch
+        await self._edit(watch)
+        if self._editor is None or self._editor.done():
+            self._editor = asyncio.get_running_loop().create_task(self._run_editor())
+
+    def release(self, chat_id: int, message_id: int) -> bool:
+        """Leave follow mode without touching the message (the caller edits it)"""
+        watch = self._watches.get(chat_id)
+        if watch is None or watch.message_id != message_id:
+            return False
+        del self._watches[chat_id]
+        watch.source.watchers.discard(watch)
+        if not watch.source.watchers:
+            watch.source.idle_since = time.monotonic()
+        return True
+
+    async def unwatch(self, chat_id: int, message_id: int, reason: str = "stopped") -> bool:
+        """Leave follow mode and show the last lines with a Follow again button"""
+        watch = self._watches.get(chat_id)
+        if watch is None or not self.release(chat_id, message_id):
+            return False
+        await self._edit(watch, final=reason)
+        return True
+
+    def render(self, source: FollowSource, status: str) -> str:
+        text = []
+        size = 0
+        for line in reversed(source.lines):
+            line = html.escape(line)
+            size += len(line) + 1
+            if size > MESSAGE_BUDGET:
+                break
+            text.append(line)
+        body = '\n'.join(reversed(text)) if text else 'Waiting for new lines...'
+        return f"{source.title}\n\n<pre>{body}</pre>\n{status}"
+
+    async def _edit(self, watch: FollowWatch, final: Optional[str] = None):
+        source = watch.source
+        if final is None and source.ended:
+            final = html.escape(source.ended)
+        if final is None:
+            status = f"🔴 <i>Live, updated {datetime.now().strftime('%H:%M:%S')}</i>"
+            keyboard = [[InlineKeyboardButton("⏹ Stop", callback_data='follow_stop'),
+                         InlineKeyboardButton("◀️ Back", callback_data=watch.back_data)]]
+        else:
+            status = f"⏸ <i>Follow {final}</i>"
+            keyboard = [[InlineKeyboardButton("▶️ Follow again", callback_data=watch.resume_data),
+                         InlineKeyboardButton("◀️ Back", callback_data=watch.back_data)]]
+
+        watch.shown = source.version
+        watch.last_edit = time.monotonic()
+        try:
+            await watch.bot.edit_message_text(
+                self.render(source, status), chat_id=watch.chat_id, message_id=watch.message_id,
+                reply_markup=InlineKeyboardMarkup(keyboard), parse_mode=ParseMode.HTML
+            )
+            self.edits += 1
+        except RetryAfter as e:
+            retry_after = e.retry_after.total_seconds() if hasattr(e.retry_after, 'total_seconds') else e.retry_after
+            watch.retry_at = time.monotonic() + float(retry_after)
+            watch.shown = -1
+        except BadRequest as e:
+            if 'not modified' not in str(e).lower():
+                # Message deleted or too old to edit
+                logger.info(f"Follow message in chat {watch.chat_id} cannot be edited: {e}")
+                self.release(watch.chat_id, watch.message_id)
+        except TelegramError as e:
+            logger.warning(f"Follow edit in chat {watch.chat_id} failed: {e}")
+            watch.shown = -1
+
+    async def _run_editor(self):
+        while self._watches or self._sources:
+            await asyncio.sleep(TICK)
+            now = time.monotonic()
+
+            for watch in list(self._watches.values()):
+                if now - watch.started > self.timeout:
+                    duration = f"{int(self.timeout // 60)} min" if self.timeout >= 60 else f"{int(self.timeout)} s"
+                    await self.unwatch(watch.chat_id, watch.message_id, f"paused after {duration}")
+                elif watch.source.ended:
+                    self.release(watch.chat_id, watch.message_id)
+                    await self._edit(watch)
+
+            due = [watch for watch in self._watches.values()
+                   if watch.shown != watch.source.version
+                   and now - watch.last_edit >= self.edit_interval and now >= watch.retry_at]
+            due.sort(key=lambda watch: watch.last_edit)
+            for watch in due[:MAX_EDITS_PER_TICK]:
+                await self._edit(watch)
+
+            for key, source in list(self._sources.items()):
+                if source.watchers:
+                    continue
+                if source.ended or (source.idle_since is not None and now - source.idle_since > READER_GRACE):
+                    del self._sources[key]
+                    await self._stop_source(source)
+
+    @staticmethod
+    async def _stop_source(source: FollowSource):
+        if source.task is not None and not source.task.done():
+            source.task.cancel()
+            try:
+                await source.task
+            except asyncio.CancelledError:
+                pass
+
+    async def stop(self):
+        """Stop every reader and the editor (bot shutdown)"""
+        self._watches.clear()
+        if self._editor is not None:
+            self._editor.cancel()
+            try:
+                await self._editor
+            except asyncio.CancelledError:
+                pass
+            self._editor = None
+        for source in list(self._sources.values()):
+            await self._stop_source(source)
+        self._sources.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'readers': sum(1 for source in self._sources.values() if not source.ended),
+            'watches': len(self._watches),
+            'edits': self.edits,
+        }
+
+
+# Global follow hub
+follow_hub = FollowHub()
@@ -0,0 +1,327 @@
+"""
+Command Runner
+Shared async subprocess execution for all managers
+"""
+import asyncio
+import logging
+import os
+import signal
+import time
+import weakref
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Mapping, Optional, Set
+
+from config.settings import config
+
+logger = logging.getLogger(__name__)
+
+# Chat being served by the current handler. Set by the auth decorators so
+# commands started for an update can be cancelled when the user moves on.
+command_owner: ContextVar[Optional[int]] = ContextVar('command_owner', default=None)
+
+# Seconds between SIGTERM and SIGKILL when stopping a child
+KILL_GRACE = 2
+
+
+@dataclass
+class CommandResult:
+    """Outcome of one command"""
+    command: List[str]
+    returncode: Optional[int]
+    stdout: str = ''
+    stderr: str = ''
+    timed_out: bool = False
+    error: Optional[str] = None
+    duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Exited with status 0"""
+        return self.returncode == 0 and not self.timed_out and self.error is None
+
+    @property
+    def output(self) -> str:
+        """stdout on success, otherwise the most useful error text"""
+        if self.timed_out:
+            return "Command timed out"
+        if self.error:
+            return self.error
+        return self.stdout if self.ok else (self.stderr or self.stdout)
+
+
+class CommandRunner:
+    """
+    Run external commands with asyncio.create_subprocess_exec
+
+    - every command has a timeout; on expiry the whole process group is
+      terminated, then killed
+    - at most `max_concurrent` commands run at once, others wait
+    - read-only commands (cancellable=True) started while serving a chat
+      are cancelled when that chat triggers a new handler
+    """
+
+    def __init__(self, max_concurrent: Optional[int] = None):
+        self.max_concurrent = max_concurrent or config.MAX_CONCURRENT_COMMANDS
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._cancellable: Dict[int, Set[asyncio.Task]] = {}
+        self._superseded: 'weakref.WeakSet[asyncio.Task]' = weakref.WeakSet()
+        self.running = 0
+        self.waiting = 0
+        self.following = 0
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        return self._semaphore
+
+    def get_stats(self) -> Dict[str, int]:
+        """Current load of the runner"""
+        return {
+            'running': self.running,
+            'waiting': self.waiting,
+            'limit': self.max_concurrent,
+            'following': self.following,
+        }
+
+    # ------------------------------------------------------------------
+    # Cancellation
+    # ------------------------------------------------------------------
+
+    def cancel(self, owner: int) -> int:
+        """Cancel handlers of `owner` that are waiting on cancellable commands"""
+        tasks = self._cancellable.pop(owner, set())
+        current = asyncio.current_task()
+        cancelled = 0
+        for task in tasks:
+            if task is current or task.done():
+                continue
+            self._superseded.add(task)
+            task.cancel()
+            cancelled += 1
+        if cancelled:
+            logger.info(f"Cancelled {cancelled} running command(s) for chat {owner}")
+        return cancelled
+
+    def consume_superseded(self, task: Optional[asyncio.Task]) -> bool:
+        """Whether task was cancelled by cancel() (not by shutdown); clears the mark"""
+        if task is None or task not in self._superseded:
+            return False
+        self._superseded.discard(task)
+        return True
+
+    def _track(self, cancellable: bool) -> Optional[tuple]:
+        owner = command_owner.get()
+        task = asyncio.current_task()
+        if not cancellable or owner is None or task is None:
+            return None
+        self._cancellable.setdefault(owner, set()).add(task)
+        return owner, task
+
+    def _untrack(self, key: Optional[tuple]):
+        if key is None:
+            return
+        owner, task = key
+        tasks = self._cancellable.get(owner)
+        if tasks is not None:
+            tasks.discard(task)
+            if not tasks:
+                del self._cancellable[owner]
+
+    # ------------------------------------------------------------------
+    # Process control
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    async def _spawn(command: List[str], stdin: bool, merge_stderr: bool,
+                     env: Optional[Mapping[str, str]]) -> asyncio.subprocess.Process:
+        return await asyncio.create_subprocess_exec(
+            *command,
+            stdin=asyncio.subprocess.PIPE if stdin else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT if merge_stderr else asyncio.subprocess.PIPE,
+            env={**os.environ, **env} if env else None,
+            # Own process group so timeouts also stop grandchildren
+            start_new_session=True
+        )
+
+    @staticmethod
+    def _signal(proc: asyncio.subprocess.Process, sig: int):
+        try:
+            os.killpg(proc.pid, sig)
+        except ProcessLookupError:
+            pass
+        except PermissionError:
+            # e.g. a root child under sudo; sudo relays TERM to it
+            try:
+                proc.send_signal(sig)
+            except ProcessLookupError:
+                pass
+
+    async def _terminate(self, proc: asyncio.subprocess.Process):
+        """Stop a child and its group: SIGTERM, then SIGKILL after a grace period"""
+        if proc.returncode is not None:
+            return
+        self._signal(proc, signal.SIGTERM)
+        try:
+            await asyncio.wait_for(proc.wait(), KILL_GRACE)
+        except asyncio.TimeoutError:
+            self._signal(proc, signal.SIGKILL)
+            try:
+                await asyncio.wait_for(proc.wait(), KILL_GRACE)
+            except asyncio.TimeoutError:
+                logger.error(f"Process {proc.pid} did not exit after SIGKILL")
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def run(self, command: List[str], timeout: float = 10,
+                  input: Optional[str] = None, env: Optional[Mapping[str, str]] = None,
+                  cancellable: bool = True, merge_stderr: bool = False) -> CommandResult:
+        """
+        Run a command to completion
+
+        Args:
+            command: Program and arguments (no shell)
+            timeout: Seconds before the child is killed
+            input: Text sent to stdin
+            env: Extra environment variables
+            cancellable: Read-only command that may be cancelled when the
+                user navigates away (pass False for state-changing commands)
+            merge_stderr: Send stderr to stdout
+
+        Returns:
+            CommandResult (never raises for command failures)
+        """
+        start = time.monotonic()
+        key = self._track(cancellable)
+        self.waiting += 1
+        acquired = False
+        try:
+            async with self.semaphore:
+                self.waiting -= 1
+                acquired = True
+                self.running += 1
+                try:
+                    return await self._run(command, timeout, input, env, merge_stderr, start)
+                finally:
+                    self.running -= 1
+        finally:
+            if not acquired:
+                self.waiting -= 1
+            self._untrack(key)
+
+    async def _run(self, command, timeout, input, env, merge_stderr, start) -> CommandResult:
+        try:
+            proc = await self._spawn(command, input is not None, merge_stderr, env)
+        except OSError as e:
+            # Missing binary, permission denied, ...
+            return CommandResult(command, None, error=str(e), duration=time.monotonic() - start)
+
+        try:
+            stdout, stderr = await asyncio.wait_for(
+                proc.communicate(input.encode() if input is not None else None),
+                timeout
+            )
+        except asyncio.TimeoutError:
+            await self._terminate(proc)
+            logger.warning(f"Command timed out after {timeout}s: {' '.join(command)}")
+            return CommandResult(command, proc.returncode, timed_out=True,
+                                 duration=time.monotonic() - start)
+        except asyncio.CancelledError:
+            await self._terminate(proc)
+            raise
+
+        return CommandResult(
+            command,
+            proc.returncode,
+            stdout.decode('utf-8', 'replace') if stdout else '',
+            stderr.decode('utf-8', 'replace') if stderr else '',
+            duration=time.monotonic() - start
+        )
+
+    async def stream(self, command: List[str], timeout: float = 60,
+                     env: Optional[Mapping[str, str]] = None,
+                     cancellable: bool = True) -> AsyncIterator[str]:
+        """
+        Run a command and yield stdout lines (stderr merged) as they arrive
+
+        The child is killed when the timeout expires, when the consumer
+        stops iterating, or on cancellation.
+        """
+        key = self._track(cancellable)
+        self.waiting += 1
+        acquired = False
+        try:
+            async with self.semaphore:
+                self.waiting -= 1
+                acquired = True
+                self.running += 1
+                proc = None
+                try:
+                    proc = await self._spawn(command, False, True, env)
+                    deadline = time.monotonic() + timeout
+                    while True:
+                        remaining = deadline - time.monotonic()
+                        try:
+                            if remaining <= 0:
+                                raise asyncio.TimeoutError
+                            line = await asyncio.wait_for(proc.stdout.readline(), remaining)
+                        except asyncio.TimeoutError:
+                            logger.warning(f"Command timed out after {timeout}s: {' '.join(command)}")
+                            break
+                        if not line:
+                            break
+                        yield line.decode('utf-8', 'replace').rstrip('\n')
+                finally:
+                    if proc is not None:
+                        await self._terminate(proc)
+                    self.running -= 1
+        finally:
+            if not acquired:
+                self.waiting -= 1
+            self._untrack(key)
+
+    async def follow(self, command: List[str], env: Optional[Mapping[str, str]] = None,
+                     line_limit: int = 1 << 20, merge_stderr: bool = False) -> AsyncIterator[str]:
+        """
+        Yield stdout lines of a long-lived command (journalctl -f, ...)
+
+        For background followers: no timeout, no concurrency slot (it
+        would be held forever) and never cancelled per chat. The child is
+        killed when the consumer stops iterating; the iteration ends when
+        the command exits. merge_stderr also yields what the command
+        writes to stderr (docker logs -f, tail -F notices).
+
+        Raises:
+            RuntimeError: the command exited with a non-zero status
+        """
+        proc = await asyncio.create_subprocess_exec(
+            *command,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT if merge_stderr else asyncio.subprocess.PIPE,
+            env={**os.environ, **env} if env else None,
+            start_new_session=True,
+            limit=line_limit
+        )
+        self.following += 1
+        try:
+            while True:
+                line = await proc.stdout.readline()
+                if not line:
+                    break
+                yield line.decode('utf-8', 'replace').rstrip('\n')
+            await proc.wait()
+            if proc.returncode:
+                error = '' if merge_stderr else (await proc.stderr.read()).decode('utf-8', 'replace').strip()
+                raise RuntimeError(f"{' '.join(command)} exited with {proc.returncode}: {error[-300:]}")
+        finally:
+            await self._terminate(proc)
+            self.following -= 1
+
+
+# Global command runner instance
+command_runner = CommandRunner()
@@ -0,0 +1,102 @@
+"""
+Session Snapshots
+Per-chat list snapshots so paginated views do not rescan on every page turn
+"""
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from config.settings import config
+
+
+@dataclass
+class Snapshot:
+    """One list captured at the start of a browse session"""
+    items: List[Any]
+    created: float
+    expires: float
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.created
+
+    def page(self, page: int, per_page: int) -> Tuple[List[Any], int, int]:
+        """
+        Slice one page
+
+        Returns:
+            Tuple of (items on the page, page clamped to range, page count)
+        """
+        pages = max(1, math.ceil(len(self.items) / per_page))
+        page = min(max(page, 0), pages - 1)
+        start = page * per_page
+        return self.items[start:start + per_page], page, pages
+
+
+class SessionStore:
+    """
+    Snapshots keyed by (chat, view), e.g. (1234, 'services:running')
+
+    - get(refresh=True) rebuilds the snapshot (opening a list, Refresh)
+    - get() reuses it while it is fresh (Prev / Next)
+    - at most `max_snapshots` are kept; the least recently used one is
+      dropped first, so one busy chat cannot grow memory without bound
+    """
+
+    def __init__(self, ttl: Optional[float] = None, max_snapshots: Optional[int] = None):
+        self.ttl = ttl or config.SESSION_TTL
+        self.max_snapshots = max_snapshots or config.SESSION_MAX_SNAPSHOTS
+        self._snapshots: 'OrderedDict[Tuple[int, str], Snapshot]' = OrderedDict()
+        self.hits = 0
+        self.builds = 0
+        self.evictions = 0
+
+    async def get(self, chat_id: int, view: str, build: Callable[[], Awaitable[List[Any]]],
+                  refresh: bool = False) -> Snapshot:
+        """
+        Snapshot for a chat's view, building it when missing, expired or refresh
+
+        Args:
+            chat_id: Telegram chat id
+            view: View name including its filter
+            build: Coroutine function returning the full list
+            refresh: Rebuild even if a fresh snapshot exists
+        """
+        key = (chat_id, view)
+        snapshot = self._snapshots.get(key)
+        if snapshot is not None and not refresh and time.monotonic() < snapshot.expires:
+            self._snapshots.move_to_end(key)
+            self.hits += 1
+            return snapshot
+
+        items = list(await build())
+        now = time.monotonic()
+        snapshot = Snapshot(items, now, now + self.ttl)
+        self._snapshots[key] = snapshot
+        self._snapshots.move_to_end(key)
+        self.builds += 1
+
+        while len(self._snapshots) > self.max_snapshots:
+            self._snapshots.popitem(last=False)
+            self.evictions += 1
+        return snapshot
+
+    def drop(self, chat_id: int, view: Optional[str] = None):
+        """Forget one view (or every view) of a chat"""
+        for key in [k for k in self._snapshots if k[0] == chat_id and (view is None or k[1] == view)]:
+            del self._snapshots[key]
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'snapshots': len(self._snapshots),
+            'limit': self.max_snapshots,
+            'hits': self.hits,
+            'builds': self.builds,
+            'evictions': self.evictions,
+        }
+
+
+# Global session snapshot store
+session_store = SessionStore()
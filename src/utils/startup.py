@@ -0,0 +1,51 @@
+"""
+Startup Timer
+Measure how long the bot takes from process launch to the first handled update
+"""
+import logging
+import time
+from typing import Dict, Optional
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimer:
+    """
+    Record startup milestones
+
+    Times are seconds since the process was launched (not since this
+    module was imported), so interpreter and import time are included.
+    """
+
+    def __init__(self):
+        try:
+            launched_ago = time.time() - psutil.Process().create_time()
+        except Exception:
+            launched_ago = 0.0
+        self.origin = time.monotonic() - max(0.0, launched_ago)
+        self.marks: Dict[str, float] = {}
+
+    def elapsed(self) -> float:
+        """Seconds since process launch"""
+        return time.monotonic() - self.origin
+
+    def mark(self, name: str, log: bool = True) -> float:
+        """Record a milestone once; returns its time"""
+        if name not in self.marks:
+            self.marks[name] = round(self.elapsed(), 3)
+            if log:
+                logger.info(f"Startup: {name} after {self.marks[name]:.2f}s")
+        return self.marks[name]
+
+    def get(self, name: str) -> Optional[float]:
+        return self.marks.get(name)
+
+    def get_stats(self) -> Dict[str, float]:
+        """All milestones in the order they happened"""
+        return dict(self.marks)
+
+
+# Global startup timer (import as early as possible)
+startup_timer = StartupTimer()
@@ -0,0 +1,12 @@
+"""
+Test setup: the repository root on sys.path and a dummy bot token
+(config.settings refuses to load without one)
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+os.environ.setdefault('TELEGRAM_BOT_TOKEN', 'test-token')
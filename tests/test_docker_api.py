@@ -0,0 +1,194 @@
+"""
+Docker API client against a stand-in dockerd on a unix socket
+"""
+import asyncio
+import json
+import os
+import tempfile
+
+import pytest
+
+from src.modules.docker.api import DockerAPI, DockerAPIError, demux_logs
+
+
+def frame(stream: int, text: str) -> bytes:
+    """One multiplexed log frame (stream, 0, 0, 0, big-endian size, payload)"""
+    payload = text.encode()
+    return bytes([stream, 0, 0, 0]) + len(payload).to_bytes(4, 'big') + payload
+
+
+def chunk(data: bytes) -> bytes:
+    return f"{len(data):x}\r\n".encode() + data + b"\r\n"
+
+
+class StandInDaemon:
+    """
+    Minimal dockerd: answers a fixed set of paths over HTTP/1.1 keep-alive
+
+    Every accepted connection is counted, so tests can check reuse.
+    """
+
+    CONTAINERS = [{'Id': 'abc123', 'Names': ['/web'], 'State': 'running'}]
+    LOGS = frame(1, "first line\n") + frame(2, "an error\n") + frame(1, "last line\n")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.connections = 0
+        self.requests = []
+        self.server = None
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_unix_server(self.handle, self.path)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode().split(' ', 2)
+                length = 0
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b''):
+                        break
+                    name, _, value = line.decode().partition(':')
+                    if name.strip().lower() == 'content-length':
+                        length = int(value)
+                if length:
+                    await reader.readexactly(length)
+                self.requests.append((method, target))
+                if not await self.respond(writer, method, target.split('?', 1)[0]):
+                    break
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, writer: asyncio.StreamWriter, method: str, path: str) -> bool:
+        """Write the response; False closes the connection"""
+        if path == '/_ping':
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nOK")
+        elif path == '/containers/json':
+            body = json.dumps(self.CONTAINERS).encode()
+            # Chunked on purpose, split in the middle of the JSON
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                         b"Transfer-Encoding: chunked\r\n\r\n"
+                         + chunk(body[:10]) + chunk(body[10:]) + b"0\r\n\r\n")
+        elif path == '/containers/missing/json':
+            body = json.dumps({'message': 'No such container: missing'}).encode()
+            writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Type: application/json\r\n"
+                         + f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+        elif path == '/containers/abc123/start':
+            writer.write(b"HTTP/1.1 304 Not Modified\r\n\r\n")
+        elif path == '/containers/abc123/logs':
+            writer.write(b"HTTP/1.1 200 OK\r\n"
+                         b"Content-Type: application/vnd.docker.multiplexed-stream\r\n"
+                         + f"Content-Length: {len(self.LOGS)}\r\n\r\n".encode() + self.LOGS)
+        elif path == '/containers/follow/logs':
+            await self.follow(writer)
+            return False
+        else:
+            writer.write(b"HTTP/1.1 500 Internal Server Error\r\nContent-Length: 4\r\n\r\noops")
+        await writer.drain()
+        return True
+
+    async def follow(self, writer: asyncio.StreamWriter):
+        """A followed log: frames cut at every awkward place, then the stream ends"""
+        data = frame(1, "one\n") + frame(2, "two\nthr") + frame(1, "ee\n") + frame(1, "héllo\n") + frame(1, "tail")
+        # Split inside a header, inside a payload and inside a UTF-8 character
+        cuts = [3, 10, 17, data.index("é".encode()) + 1, len(data)]
+        writer.write(b"HTTP/1.1 200 OK\r\n"
+                     b"Content-Type: application/vnd.docker.multiplexed-stream\r\n"
+                     b"Transfer-Encoding: chunked\r\n\r\n")
+        start = 0
+        for end in cuts:
+            writer.write(chunk(data[start:end]))
+            await writer.drain()
+            await asyncio.sleep(0.01)
+            start = end
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+def run_with_daemon(test):
+    """Run `test(api, daemon)` with a fresh client and stand-in daemon"""
+    async def main():
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'docker.sock')
+            async with StandInDaemon(path) as daemon:
+                api = DockerAPI(socket_path=path)
+                try:
+                    await test(api, daemon)
+                finally:
+                    api.close()
+    asyncio.run(main())
+
+
+def test_chunked_body_is_joined():
+    async def test(api, daemon):
+        containers = await api.containers()
+        assert containers == StandInDaemon.CONTAINERS
+    run_with_daemon(test)
+
+
+def test_connection_is_reused():
+    async def test(api, daemon):
+        assert await api.ping()
+        await api.containers()
+        await api.container_action('abc123', 'start')
+        await api.logs('abc123')
+        assert api.connects == 1
+        assert daemon.connections == 1
+        assert api.requests == 4
+    run_with_daemon(test)
+
+
+def test_error_status_raises():
+    async def test(api, daemon):
+        with pytest.raises(DockerAPIError) as error:
+            await api.inspect('missing')
+        assert error.value.status == 404
+        assert error.value.message == 'No such container: missing'
+
+        with pytest.raises(DockerAPIError) as error:
+            await api.get_json('/unknown')
+        assert error.value.status == 500
+        assert error.value.message == 'oops'
+
+        # An error response is complete, so the connection stays usable
+        assert await api.ping()
+        assert daemon.connections == 1
+    run_with_daemon(test)
+
+
+def test_logs_are_demultiplexed():
+    async def test(api, daemon):
+        assert await api.logs('abc123') == "first line\nan error\nlast line\n"
+        assert daemon.requests[-1][1].startswith('/containers/abc123/logs?')
+    run_with_daemon(test)
+
+
+def test_demux_logs():
+    assert demux_logs(frame(1, "a\n") + frame(2, "b\n")) == "a\nb\n"
+    # TTY containers send raw text
+    assert demux_logs(b"plain text\n") == "plain text\n"
+    assert demux_logs(frame(1, "a"), multiplexed=False) == frame(1, "a").decode()
+    # A truncated last frame keeps what arrived
+    assert demux_logs(frame(1, "complete") + frame(1, "cut")[:-1]) == "completecu"
+
+
+def test_follow_logs_frames_split_across_chunks():
+    async def test(api, daemon):
+        lines = [line async for line in api.follow_logs('follow')]
+        assert lines == ["one", "two", "three", "héllo", "tail"]
+        # Streams use their own connection, never the pool
+        assert api.connects == 1
+        assert not api._idle
+    run_with_daemon(test)